@@ -174,7 +174,7 @@ class ChallengeVerifierAgent(BaseAgent):
         # Get evidence from CAS (if evidence_hash provided)
         evidence_hash = proof_data.get("evidence_hash")
         if evidence_hash and cas.has_blob(evidence_hash):
-            evidence_data = cas.get_json(evidence_hash)
+            evidence_data = self.verifier.load_artifact_json(cas.get_view(evidence_hash))
         else:
             # Use proof_data as evidence
             evidence_data = proof_data.get("evidence", {})
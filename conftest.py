@@ -1,9 +1,15 @@
 """
 Pytest configuration for property tests.
 
-Adds --chaos flag for running tests under adversarial conditions.
+Adds --chaos flag for running tests under adversarial conditions, and a
+fixture that starts a local JetStream server for bus tests.
 """
 
+import shutil
+import socket
+import subprocess
+import time
+
 import pytest
 
 
@@ -13,7 +19,7 @@ def pytest_addoption(parser):
         "--chaos",
         action="store_true",
         default=False,
-        help="Run tests under chaos conditions (network partitions, delays, etc.)"
+        help="Run tests under chaos conditions (network partitions, delays, etc.)",
     )
 
 
@@ -21,12 +27,43 @@ def pytest_configure(config):
     """Configure pytest based on command line options"""
     if config.getoption("--chaos"):
         print("\n🌪️  CHAOS MODE ENABLED - Testing under adversarial conditions\n")
-        config.addinivalue_line(
-            "markers", "chaos: marks tests as chaos resilience tests"
-        )
+        config.addinivalue_line("markers", "chaos: marks tests as chaos resilience tests")
 
 
 @pytest.fixture(scope="session")
 def chaos_mode(request):
     """Fixture that provides chaos mode status"""
     return request.config.getoption("--chaos")
+
+
+@pytest.fixture
+def nats_server(tmp_path):
+    """URL of a local JetStream-enabled nats-server (skips if not installed)"""
+    binary = shutil.which("nats-server")
+    if binary is None:
+        pytest.skip("nats-server not installed")
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    proc = subprocess.Popen(
+        [binary, "-js", "-p", str(port), "-sd", str(tmp_path / "jetstream")],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                proc.kill()
+                pytest.fail("nats-server did not start")
+            time.sleep(0.05)
+
+    yield f"nats://127.0.0.1:{port}"
+
+    proc.terminate()
+    proc.wait(timeout=10)
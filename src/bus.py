@@ -1,13 +1,18 @@
-import asyncio, os, json
+import asyncio, os, json, time
+import multiprocessing
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from nats.aio.client import Client as NATS
 from nats.js import JetStreamContext
-from typing import Callable, Awaitable
+from typing import Callable, Awaitable, Iterable, Optional
 import logging
 
 from audit import log_event
 from envelope import observe_envelope
 
-from policy import validate_envelope  # Rule book v0 compatibility gate
+from policy import validate_envelope, validate_envelopes  # Rule book v0 compatibility gate
+from policy import current_policy_hash, set_current_policy_hash
+from policy.capsule import PolicyCapsule, get_capsule_manager, init_capsule_manager
 from policy.gates import GateEnforcer
 
 # Backward compatibility: allow importing `bus.*` submodules while this file remains a module.
@@ -26,6 +31,12 @@ try:
 except ImportError:
     TRACING_ENABLED = False
 
+# Prometheus metrics (recording is skipped when obs_metrics.ENABLED is off)
+try:
+    from observability import metrics as obs_metrics
+except ImportError:
+    obs_metrics = None
+
 logger = logging.getLogger(__name__)
 
 # Global gate enforcer instance
@@ -44,12 +55,52 @@ NATS_URL = os.getenv("NATS_URL", "nats://127.0.0.1:4222")
 STREAM = os.getenv("SWARM_STREAM", "THREADS")
 SUBJECTS = os.getenv("SWARM_SUBJECTS", "thread.*.*")  # e.g. thread.{threadId}.{role}
 
+# Subscriber micro-batching: up to INGEST_BATCH_SIZE messages, waiting at most
+# INGEST_BATCH_WINDOW seconds after the first one for the rest of the batch
+INGEST_BATCH_SIZE = int(os.getenv("SWARM_INGEST_BATCH_SIZE", "16"))
+INGEST_BATCH_WINDOW = float(os.getenv("SWARM_INGEST_BATCH_WINDOW_MS", "2")) / 1000
+
+# Where the CPU-bound half of ingest (decode, validation, INGRESS policy) runs:
+# "inline" on the event loop, or on a shared "thread" or "process" pool of
+# INGEST_WORKERS workers, with up to INGEST_QUEUE_DEPTH batches per
+# subscription checked ahead of delivery
+INGEST_EXECUTOR = os.getenv("SWARM_INGEST_EXECUTOR", "inline")
+INGEST_WORKERS = int(os.getenv("SWARM_INGEST_WORKERS", "0")) or (os.cpu_count() or 1)
+INGEST_QUEUE_DEPTH = int(os.getenv("SWARM_INGEST_QUEUE_DEPTH", "4"))
+
+# Shared ingest executors by (kind, workers)
+_ingest_executors: dict[tuple[str, int], Executor] = {}
+
+# Acks waiting on concurrently running handlers
+_settling: set[asyncio.Task] = set()
+
+# Pull-consumer ingest: fetch up to the batch size per request, with at most
+# INGEST_MAX_ACK_PENDING fetched messages unsettled and acks sent in groups of
+# INGEST_ACK_BATCH, or after INGEST_ACK_DELAY seconds at the latest
+INGEST_PULL = os.getenv("SWARM_INGEST_PULL", "false").lower() == "true"
+INGEST_MAX_ACK_PENDING = int(os.getenv("SWARM_INGEST_MAX_ACK_PENDING", "1024"))
+INGEST_ACK_BATCH = int(os.getenv("SWARM_INGEST_ACK_BATCH", "32"))
+INGEST_ACK_DELAY = float(os.getenv("SWARM_INGEST_ACK_DELAY_MS", "20")) / 1000
+INGEST_FETCH_TIMEOUT = float(os.getenv("SWARM_INGEST_FETCH_TIMEOUT", "1.0"))
+
+# Seconds publish_many waits for a batch's acks
+PUBLISH_ACK_TIMEOUT = float(os.getenv("SWARM_PUBLISH_ACK_TIMEOUT", "5.0"))
+
+# Servers whose stream is known to exist
+_streams_ready: set[str] = set()
+
+# Shared connection: (event loop, NATS, JetStreamContext)
+_shared_connection = None
+
 
 async def _ensure_stream(js: JetStreamContext):
+    if NATS_URL in _streams_ready:
+        return
     streams = await js.streams_info()
     names = {s.config.name for s in streams}
     if STREAM not in names:
         await js.add_stream(name=STREAM, subjects=[SUBJECTS])
+    _streams_ready.add(NATS_URL)
 
 
 async def connect() -> tuple[NATS, JetStreamContext]:
@@ -60,66 +111,232 @@ async def connect() -> tuple[NATS, JetStreamContext]:
     return nc, js
 
 
+async def shared_connection() -> tuple[NATS, JetStreamContext]:
+    """
+    Get the connection shared by pull subscribers on this event loop.
+
+    Connects on first use, and again if the connection was closed.
+    """
+    global _shared_connection
+    loop = asyncio.get_running_loop()
+    shared = _shared_connection
+    if shared is None or shared[0] is not loop or shared[1].is_closed:
+        nc, js = await connect()
+        shared = _shared_connection
+        if shared is None or shared[0] is not loop or shared[1].is_closed:
+            shared = _shared_connection = (loop, nc, js)
+        else:
+            await nc.close()  # another caller connected first
+    return shared[1], shared[2]
+
+
+class _PulledMsg:
+    """Fetched message whose ack is buffered by its PullConsumer"""
+
+    __slots__ = ("_consumer", "_msg", "data", "settled")
+
+    def __init__(self, consumer: "PullConsumer", msg):
+        self._consumer = consumer
+        self._msg = msg
+        self.data = msg.data
+        self.settled = False  # counted out of the consumer's in-flight total
+
+    async def ack(self):
+        if self.settled:
+            await self._msg.ack()
+            return
+        self.settled = True
+        await self._consumer._ack(self._msg)
+
+    async def nak(self):
+        await self._msg.nak()
+        self._settle()
+
+    async def term(self):
+        await self._msg.term()
+        self._settle()
+
+    def _settle(self):
+        if not self.settled:
+            self.settled = True
+            self._consumer._settle(1)
+
+
+class PullConsumer:
+    """
+    Batch fetch from a JetStream pull subscription with ack flow control.
+
+    At most ``max_ack_pending`` fetched messages are unsettled (not yet
+    acked, nak'ed or termed) at once; fetching waits for room, so a slow
+    subscriber applies backpressure instead of buffering deliveries. Acks
+    are held until ``ack_batch`` accumulate, the oldest has waited
+    ``ack_delay`` seconds, or the next fetch is due.
+    """
+
+    def __init__(
+        self,
+        psub,
+        batch_size: int = None,
+        max_ack_pending: int = None,
+        ack_batch: int = None,
+        fetch_timeout: float = None,
+        ack_delay: float = None,
+    ):
+        """
+        Args:
+            psub: Pull subscription (``js.pull_subscribe``)
+            batch_size: Messages per fetch (default INGEST_BATCH_SIZE)
+            max_ack_pending: Unsettled message limit (default INGEST_MAX_ACK_PENDING)
+            ack_batch: Acks sent together (default INGEST_ACK_BATCH)
+            fetch_timeout: Seconds a fetch waits for messages (default INGEST_FETCH_TIMEOUT)
+            ack_delay: Longest an ack is held, in seconds (default INGEST_ACK_DELAY)
+        """
+        self.psub = psub
+        self.batch_size = batch_size or INGEST_BATCH_SIZE
+        self.max_ack_pending = max_ack_pending or INGEST_MAX_ACK_PENDING
+        self.ack_batch = ack_batch or INGEST_ACK_BATCH
+        self.fetch_timeout = INGEST_FETCH_TIMEOUT if fetch_timeout is None else fetch_timeout
+        self.ack_delay = INGEST_ACK_DELAY if ack_delay is None else ack_delay
+        self.in_flight = 0
+        self._acks = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._settled = asyncio.Event()
+
+    async def batches(self):
+        """
+        Yield fetched batches until the connection closes.
+
+        Each message is wrapped so its ack goes through this consumer.
+        """
+        from nats.errors import ConnectionClosedError, TimeoutError as NATSTimeoutError
+
+        while True:
+            await self.flush()
+            room = min(self.batch_size, self.max_ack_pending - self.in_flight)
+            if room <= 0:
+                self._settled.clear()
+                await self._settled.wait()
+                continue
+            try:
+                msgs = await self.psub.fetch(room, timeout=self.fetch_timeout)
+            except NATSTimeoutError:
+                continue
+            except ConnectionClosedError:
+                return
+            self.in_flight += len(msgs)
+            yield [_PulledMsg(self, msg) for msg in msgs]
+
+    async def flush(self):
+        """Send buffered acks"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        acks, self._acks = self._acks, []
+        for msg in acks:
+            await msg.ack()
+        self._settle(len(acks))
+
+    async def _ack(self, msg):
+        self._acks.append(msg)
+        if len(self._acks) >= self.ack_batch:
+            await self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self.ack_delay, self._flush_later
+            )
+
+    def _flush_later(self):
+        self._flush_timer = None
+        task = asyncio.ensure_future(self.flush())
+        _settling.add(task)
+        task.add_done_callback(_settling.discard)
+
+    def release(self, msgs: list) -> None:
+        """
+        Stop counting fetched messages that will not be settled here.
+
+        Used when delivering a batch fails part way; the server redelivers
+        the released messages once their ack wait expires.
+        """
+        released = 0
+        for msg in msgs:
+            if not msg.settled:
+                msg.settled = True
+                released += 1
+        self._settle(released)
+
+    def _settle(self, count: int):
+        if count:
+            self.in_flight -= count
+            self._settled.set()
+
+
+async def _pull_subscribe(js: JetStreamContext, subject: str, durable: str, max_ack_pending: int):
+    """Create (or bind to) a durable pull consumer with server-side ack flow control"""
+    from nats.js.api import AckPolicy, ConsumerConfig
+
+    config = ConsumerConfig(ack_policy=AckPolicy.EXPLICIT, max_ack_pending=max_ack_pending)
+    return await js.pull_subscribe(subject, durable=durable, config=config)
+
+
 class ConnectionPool:
     """
     Connection pool for NATS connections.
 
     Maintains a pool of reusable connections to avoid overhead
-    of creating new connections for each publish.
+    of creating new connections for each publish. At most ``max_size``
+    connections are handed out at once; further callers wait on a
+    semaphore until one is released.
     """
 
     def __init__(self, max_size: int = 10):
         self.max_size = max_size
         self._pool: list[tuple[NATS, JetStreamContext]] = []
         self._in_use: set[tuple[NATS, JetStreamContext]] = set()
-        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_size)
 
     async def get(self) -> tuple[NATS, JetStreamContext]:
-        """Get a connection from the pool."""
-        async with self._lock:
-            # Try to reuse existing connection
-            if self._pool:
-                conn = self._pool.pop()
-                self._in_use.add(conn)
-                return conn
-
-            # Create new if under limit
-            if len(self._in_use) < self.max_size:
+        """Get a connection from the pool, waiting while all are in use."""
+        await self._slots.acquire()
+        if self._pool:
+            conn = self._pool.pop()
+        else:
+            try:
                 conn = await connect()
-                self._in_use.add(conn)
-                return conn
-
-            # Wait and retry if at limit
-            # (In production, might want to wait for release or raise)
-            await asyncio.sleep(0.01)
-            return await self.get()
+            except BaseException:
+                self._slots.release()
+                raise
+        self._in_use.add(conn)
+        return conn
 
     async def release(self, conn: tuple[NATS, JetStreamContext]):
         """Return a connection to the pool."""
-        async with self._lock:
-            if conn in self._in_use:
-                self._in_use.remove(conn)
-                self._pool.append(conn)
+        if conn in self._in_use:
+            self._in_use.remove(conn)
+            self._pool.append(conn)
+            self._slots.release()
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connection for the duration of the block."""
+        conn = await self.get()
+        try:
+            yield conn
+        finally:
+            await self.release(conn)
 
     async def close_all(self):
         """Close all connections in the pool."""
-        async with self._lock:
-            # Close all pooled connections
-            for nc, _ in self._pool:
-                try:
-                    await nc.drain()
-                except Exception:
-                    pass
-
-            # Close all in-use connections
-            for nc, _ in self._in_use:
-                try:
-                    await nc.drain()
-                except Exception:
-                    pass
+        # Close pooled and in-use connections
+        for nc, _ in self._pool + list(self._in_use):
+            try:
+                await nc.drain()
+            except Exception:
+                pass
 
-            self._pool.clear()
-            self._in_use.clear()
+        self._pool.clear()
+        self._in_use.clear()
+        self._slots = asyncio.Semaphore(self.max_size)
 
 
 # Global connection pool
@@ -132,14 +349,61 @@ async def publish_raw(thread_id: str, subject: str, message: dict):
 
     Now uses connection pooling for better performance.
     """
-    nc, js = await _connection_pool.get()
-    try:
+    async with _connection_pool.connection() as (nc, js):
         data = json.dumps(message).encode()
+        timed = obs_metrics is not None and obs_metrics.ENABLED
+        start = time.perf_counter() if timed else 0.0
         await js.publish(subject, data)
+        if timed:
+            obs_metrics.record_publish(
+                message.get("kind", "unknown"), subject, time.perf_counter() - start
+            )
         log_event(thread_id=thread_id, subject=subject, kind="BUS.PUBLISH", payload=message)
-    finally:
-        # Return connection to pool instead of draining
-        await _connection_pool.release((nc, js))
+
+
+async def publish_raw_many(
+    thread_id: str, messages: Iterable[tuple[str, dict]], timeout: float = None
+) -> list:
+    """
+    Publish several messages pipelined on one pooled connection.
+
+    Every message is written before any ack is awaited, then the acks are
+    awaited as a group, so a batch costs about one round trip instead of
+    one per message. Messages reach the stream in the given order.
+
+    Args:
+        thread_id: Thread for the audit log
+        messages: (subject, message) pairs
+        timeout: Seconds to wait for all acks (default PUBLISH_ACK_TIMEOUT)
+
+    Returns:
+        JetStream PubAcks, in message order
+
+    Raises:
+        asyncio.TimeoutError: If the acks do not all arrive in time
+    """
+    messages = list(messages)
+    if not messages:
+        return []
+
+    async with _connection_pool.connection() as (nc, js):
+        timed = obs_metrics is not None and obs_metrics.ENABLED
+        start = time.perf_counter() if timed else 0.0
+        pending = [
+            await js.publish_async(subject, json.dumps(message).encode())
+            for subject, message in messages
+        ]
+        acks = await asyncio.wait_for(
+            asyncio.gather(*pending), PUBLISH_ACK_TIMEOUT if timeout is None else timeout
+        )
+        if timed:
+            elapsed = time.perf_counter() - start
+            for subject, message in messages:
+                obs_metrics.record_publish(message.get("kind", "unknown"), subject, elapsed)
+
+    for subject, message in messages:
+        log_event(thread_id=thread_id, subject=subject, kind="BUS.PUBLISH", payload=message)
+    return acks
 
 
 async def publish(thread_id: str, subject: str, message: dict):
@@ -193,76 +457,509 @@ async def publish_envelope(thread_id: str, subject: str, envelope: dict):
         await publish_raw(thread_id, subject, envelope)
 
 
-async def subscribe_envelopes(
+async def publish_many(
+    thread_id: str, envelopes: Iterable[tuple[str, dict]], timeout: float = None
+) -> list:
+    """
+    Publish several SIGNED ENVELOPES in one pipelined batch.
+
+    For handlers that emit more than one envelope (e.g. a PROPOSE per
+    subtask). Every envelope must pass the rule book and the PREFLIGHT gate;
+    if any fails, nothing is published.
+
+    Args:
+        thread_id: Thread for the audit log
+        envelopes: (subject, envelope) pairs, published in order
+        timeout: Seconds to wait for all acks (default PUBLISH_ACK_TIMEOUT)
+
+    Returns:
+        JetStream PubAcks, in envelope order
+
+    Raises:
+        PolicyError: If an envelope fails the rule book
+        ValueError: If an envelope fails the PREFLIGHT gate
+    """
+    envelopes = list(envelopes)
+
+    for error in validate_envelopes([envelope for _, envelope in envelopes]):
+        if error is not None:
+            raise error
+
+    gate_enforcer = get_gate_enforcer()
+    for _, envelope in envelopes:
+        decision = gate_enforcer.preflight_validate(envelope)
+        if not decision.allowed:
+            logger.error(f"Preflight validation failed: {decision.reason}")
+            raise ValueError(f"Preflight validation failed: {decision.reason}")
+
+    if TRACING_ENABLED:
+        with create_span(
+            "bus.publish_many",
+            attributes={"thread_id": thread_id, "count": len(envelopes)},
+            kind=SpanKind.PRODUCER,
+        ):
+            for _, envelope in envelopes:
+                propagate_context(envelope)
+            return await publish_raw_many(thread_id, envelopes, timeout)
+    return await publish_raw_many(thread_id, envelopes, timeout)
+
+
+async def _next_batch(sub, batch_size: int, batch_window: float) -> list:
+    """
+    Wait for the next message, then collect up to batch_size within batch_window.
+
+    Raises:
+        nats.errors.ConnectionClosedError: If the connection closed while waiting
+    """
+    from nats.errors import TimeoutError as NATSTimeoutError
+
+    msgs = [await sub.next_msg(timeout=None)]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + batch_window
+    while len(msgs) < batch_size:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            msgs.append(await sub.next_msg(timeout=remaining))
+        except NATSTimeoutError:
+            break
+    return msgs
+
+
+def _init_ingest_worker():
+    """Build the worker's gate enforcer (and compile its policy) up front"""
+    get_gate_enforcer()
+
+
+def get_ingest_executor(kind: str = None, workers: int = None) -> Optional[Executor]:
+    """
+    Get the shared executor for CPU-bound ingest work.
+
+    Args:
+        kind: "inline", "thread" or "process" (default INGEST_EXECUTOR)
+        workers: Pool size (default INGEST_WORKERS)
+
+    Returns:
+        The executor, or None for inline ingest
+
+    Raises:
+        ValueError: If kind is not a known executor kind
+    """
+    kind = kind or INGEST_EXECUTOR
+    if kind == "inline":
+        return None
+    workers = workers or INGEST_WORKERS
+
+    executor = _ingest_executors.get((kind, workers))
+    if executor is None:
+        if kind == "thread":
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bus-ingest")
+        elif kind == "process":
+            # spawn: forking a process with a running event loop and threads is unsafe
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ingest_worker,
+            )
+        else:
+            raise ValueError(f"Unknown ingest executor: {kind!r} (use inline, thread or process)")
+        _ingest_executors[(kind, workers)] = executor
+    return executor
+
+
+def shutdown_ingest_executors() -> None:
+    """Shut down all shared ingest executors"""
+    for executor in _ingest_executors.values():
+        executor.shutdown(wait=True, cancel_futures=True)
+    _ingest_executors.clear()
+
+
+def _worker_policy(executor: Optional[Executor]) -> Optional[tuple]:
+    """
+    The policy a batch must be checked against, for executors that need it.
+
+    Worker processes do not see capsule activations, so batches sent to a
+    process pool carry the envelope policy hash and the active capsule.
+    Executors sharing this process get None.
+    """
+    if not isinstance(executor, ProcessPoolExecutor):
+        return None
+    return current_policy_hash(), get_capsule_manager().active_capsule
+
+
+def _sync_worker_policy(policy_hash: str, capsule: Optional[PolicyCapsule]) -> None:
+    """
+    Bring a worker process's policy in line with the parent's.
+
+    A capsule the worker has not activated yet is compiled and activated on
+    the worker's global CapsuleManager, which swaps it into the worker's gate
+    enforcer. If the parent no longer has an active capsule, the worker drops
+    its own and rebuilds its gate enforcer with the built-in policy.
+    """
+    global _gate_enforcer
+    manager = get_capsule_manager()
+    if capsule is None:
+        if manager.active_capsule is not None:
+            init_capsule_manager()
+            _gate_enforcer = None
+    elif capsule.policy_engine_hash != manager.active_policy_hash:
+        manager.received_capsules[capsule.policy_engine_hash] = capsule
+        if not manager.activate_capsule(capsule.policy_engine_hash):
+            logger.error(
+                f"Ingest worker could not activate capsule {capsule.policy_engine_hash[:16]}..."
+            )
+
+    if policy_hash != current_policy_hash():
+        set_current_policy_hash(policy_hash)
+
+
+def _check_batch(datas: list, policy: Optional[tuple] = None) -> list:
+    """
+    Decode, validate and INGRESS-check a micro-batch of message payloads.
+
+    This is the CPU-bound half of ingest. It touches no event loop state, so
+    it can run inline, on a thread pool or in a worker process.
+
+    Args:
+        datas: Raw message payloads
+        policy: (policy hash, active capsule) from _worker_policy, passed to
+            worker processes, which do not see capsule activations
+
+    Returns:
+        One (envelope, rejection, reason) tuple per payload, where rejection
+        is None if the envelope was accepted, otherwise "malformed",
+        "validation" or "ingress"
+    """
+    if policy is not None:
+        _sync_worker_policy(*policy)
+
+    results = [None] * len(datas)
+    decoded = []
+    for i, data in enumerate(datas):
+        try:
+            decoded.append((i, json.loads(data.decode())))
+        except Exception:
+            results[i] = ({"_raw": data.decode(errors="ignore")}, "malformed", None)
+
+    # ✅ Verify via policy (defense in depth on receive)
+    valid = []
+    for (i, env), error in zip(decoded, validate_envelopes([env for _, env in decoded])):
+        if error is not None:
+            results[i] = (env, "validation", str(error))
+        else:
+            valid.append((i, env))
+
+    # ✅ INGRESS gate: Full WASM evaluation on receive
+    decisions = get_gate_enforcer().ingress_validate_batch([env for _, env in valid])
+    for (i, env), decision in zip(valid, decisions):
+        results[i] = (env, None if decision.allowed else "ingress", decision.reason)
+
+    return results
+
+
+def _ack_on_completion(msg, completion: Awaitable, kind: str, subject: str, received: float):
+    """Ack msg once its handler completes; nak it for redelivery if the handler fails"""
+
+    async def _settle():
+        try:
+            await completion
+        except Exception as e:
+            logger.error(f"Handler for {kind} failed, message left for redelivery: {e}")
+            if obs_metrics is not None and obs_metrics.ENABLED:
+                obs_metrics.record_rejected(kind, "deliver", type(e).__name__)
+            await msg.nak()
+            return
+        await msg.ack()
+        if obs_metrics is not None and obs_metrics.ENABLED:
+            obs_metrics.record_delivery(kind, subject, time.perf_counter() - received)
+
+    task = asyncio.ensure_future(_settle())
+    _settling.add(task)
+    task.add_done_callback(_settling.discard)
+
+
+async def _call_handler(handler: Callable[[dict], Awaitable[None]], env: dict):
+    """Await handler(env), returning the exception it raised (None on success)"""
+    try:
+        await handler(env)
+    except Exception as e:
+        return e
+    return None
+
+
+async def _nak_failed(msg, env: dict, error: Exception, timed: bool):
+    """Nak a message whose handler failed, leaving it for redelivery"""
+    kind = str(env.get("kind"))
+    logger.error(f"Handler for {kind} failed, message left for redelivery: {error}")
+    if timed:
+        obs_metrics.record_rejected(kind, "deliver", type(error).__name__)
+    await msg.nak()
+
+
+async def _deliver_batch(
     thread_id: str,
     subject: str,
+    msgs: list,
+    checked: list,
     handler: Callable[[dict], Awaitable[None]],
-    durable_name: str = None,
+    received: float = 0.0,
+    concurrent: bool = False,
 ):
     """
-    Subscribe and ONLY deliver envelopes that pass the rule book to your handler.
+    Deliver a checked micro-batch in arrival order.
+
+    Logs every message, terms rejected ones and acks each accepted message
+    after its handler completes, or naks it for redelivery if the handler
+    raises; the rest of the batch is still delivered. With ``concurrent``
+    the handler is called without awaiting it, and the message is acked
+    when the awaitable it returned completes.
     """
-    nc, js = await connect()
-    durable = durable_name or subject.replace(".", "_").replace("*", "ALL").replace(">", "ALL")
-    sub = await js.subscribe(subject, durable=durable)
+    timed = obs_metrics is not None and obs_metrics.ENABLED
 
-    async def _runner():
-        async for msg in sub.messages:
-            # Decode (malformed messages are dropped but still logged)
+    for msg, (env, rejection, reason) in zip(msgs, checked):
+        # Always log delivery (CCTV)
+        log_event(thread_id=thread_id, subject=subject, kind="BUS.DELIVER", payload=env)
+
+        if rejection is not None:
+            if rejection == "validation":
+                logger.warning(f"Envelope validation failed: {reason}")
+            elif rejection == "ingress":
+                logger.warning(f"Ingress validation failed: {reason}")
+            if timed:
+                kind = "unknown" if rejection == "malformed" else str(env.get("kind"))
+                obs_metrics.record_rejected(kind, "deliver", rejection)
+            await msg.term()  # drop malformed and rejected
+            continue
+
+        logger.debug(f"Ingress passed for {env.get('operation')}")
+
+        # Update local Lamport clock from the verified envelope
+        observe_envelope(env)
+
+        if concurrent:
             try:
-                env = json.loads(msg.data.decode())
-            except Exception:
-                env = {"_raw": msg.data.decode(errors="ignore")}
-                log_event(
-                    thread_id=thread_id,
-                    subject=subject,
-                    kind="BUS.DELIVER",
-                    payload=env,
-                )
-                await msg.term()  # drop malformed
+                completion = handler(env)
+            except Exception as e:
+                await _nak_failed(msg, env, e, timed)
                 continue
+            _ack_on_completion(msg, completion, str(env.get("kind")), subject, received)
+            continue
+
+        # Extract trace context and continue distributed trace
+        if TRACING_ENABLED:
+            with start_span_from_context(
+                "bus.handle_envelope",
+                env,
+                attributes={
+                    "thread_id": thread_id,
+                    "subject": subject,
+                    "operation": env.get("operation", "unknown"),
+                },
+                kind=SpanKind.CONSUMER,
+            ):
+                error = await _call_handler(handler, env)
+        else:
+            error = await _call_handler(handler, env)
 
-            # Always log delivery (CCTV)
-            log_event(thread_id=thread_id, subject=subject, kind="BUS.DELIVER", payload=env)
+        if error is not None:
+            await _nak_failed(msg, env, error, timed)
+            continue
 
-            # ✅ Verify via policy (defense in depth on receive)
+        await msg.ack()
+        if timed:
+            obs_metrics.record_delivery(
+                str(env.get("kind")), subject, time.perf_counter() - received
+            )
+
+
+async def _ingest_batch(
+    thread_id: str,
+    subject: str,
+    msgs: list,
+    handler: Callable[[dict], Awaitable[None]],
+    concurrent: bool = False,
+):
+    """
+    Validate a micro-batch of envelope messages and deliver the accepted ones.
+
+    Runs validate_envelope and the INGRESS gate over the whole batch, terms
+    rejected messages and acks each accepted message after its handler
+    returns. Accepted envelopes are handled in arrival order.
+    """
+    received = time.perf_counter()
+    checked = _check_batch([msg.data for msg in msgs])
+    await _deliver_batch(thread_id, subject, msgs, checked, handler, received, concurrent)
+
+
+async def _offloaded_ingest(
+    thread_id: str,
+    subject: str,
+    sub,
+    handler: Callable[[dict], Awaitable[None]],
+    executor: Executor,
+    batch_size: int,
+    batch_window: float,
+    queue_depth: int,
+    concurrent: bool = False,
+):
+    """
+    Ingest loop with the CPU-bound checks on an executor.
+
+    Batches are checked concurrently while earlier ones are delivered; at
+    most ``queue_depth`` checked or in-flight batches wait for delivery
+    before fetching pauses. Results are awaited in arrival order, so the
+    handler sees envelopes in delivery order. Handlers, acks and audit
+    logging stay on the event loop.
+    """
+    from nats.errors import ConnectionClosedError
+
+    loop = asyncio.get_running_loop()
+    pending: asyncio.Queue = asyncio.Queue(maxsize=queue_depth)
+
+    async def _fetch():
+        try:
+            while True:
+                msgs = await _next_batch(sub, batch_size, batch_window)
+                received = time.perf_counter()
+                datas = [msg.data for msg in msgs]
+                policy = _worker_policy(executor)
+                future = loop.run_in_executor(executor, _check_batch, datas, policy)
+                await pending.put((msgs, datas, future, received))
+        except ConnectionClosedError:
+            pass
+        except Exception:
+            await pending.put(None)
+            raise
+        await pending.put(None)
+
+    fetcher = asyncio.create_task(_fetch())
+    try:
+        while (item := await pending.get()) is not None:
+            msgs, datas, future, received = item
             try:
-                validate_envelope(env)
+                checked = await future
             except Exception as e:
-                logger.warning(f"Envelope validation failed: {e}")
-                await msg.term()
-                continue
+                # e.g. a broken process pool: check this batch on the loop instead
+                logger.error(f"Offloaded ingest check failed, checking inline: {e}")
+                checked = _check_batch(datas)
+            await _deliver_batch(thread_id, subject, msgs, checked, handler, received, concurrent)
+        await fetcher
+    finally:
+        fetcher.cancel()
 
-            # ✅ INGRESS gate: Full WASM evaluation on receive
-            gate_enforcer = get_gate_enforcer()
-            decision = gate_enforcer.ingress_validate(env)
-            if not decision.allowed:
-                logger.warning(f"Ingress validation failed: {decision.reason}")
-                await msg.term()
-                continue
 
-            logger.debug(f"Ingress passed for {env.get('operation')}")
-
-            # Update local Lamport clock from the verified envelope
-            observe_envelope(env)
-
-            # Extract trace context and continue distributed trace
-            if TRACING_ENABLED:
-                with start_span_from_context(
-                    "bus.handle_envelope",
-                    env,
-                    attributes={
-                        "thread_id": thread_id,
-                        "subject": subject,
-                        "operation": env.get("operation", "unknown"),
-                    },
-                    kind=SpanKind.CONSUMER,
-                ):
-                    await handler(env)
-            else:
-                await handler(env)
+async def _pull_ingest(
+    thread_id: str,
+    subject: str,
+    consumer: PullConsumer,
+    handler: Callable[[dict], Awaitable[None]],
+    executor: Optional[Executor] = None,
+    concurrent: bool = False,
+):
+    """Ingest loop over batches fetched by a PullConsumer"""
+    loop = asyncio.get_running_loop()
+
+    async for msgs in consumer.batches():
+        received = time.perf_counter()
+        datas = [msg.data for msg in msgs]
+        checked = None
+        if executor is not None:
+            policy = _worker_policy(executor)
+            try:
+                checked = await loop.run_in_executor(executor, _check_batch, datas, policy)
+            except Exception as e:
+                logger.error(f"Offloaded ingest check failed, checking inline: {e}")
+        if checked is None:
+            checked = _check_batch(datas)
+        try:
+            await _deliver_batch(thread_id, subject, msgs, checked, handler, received, concurrent)
+        except BaseException:
+            # Messages this batch never settled must not hold the window shut
+            consumer.release(msgs)
+            raise
 
-            await msg.ack()
+
+async def subscribe_envelopes(
+    thread_id: str,
+    subject: str,
+    handler: Callable[[dict], Awaitable[None]],
+    durable_name: str = None,
+    batch_size: int = None,
+    batch_window: float = None,
+    executor: str = None,
+    workers: int = None,
+    queue_depth: int = None,
+    concurrent: bool = False,
+    pull: bool = None,
+    max_ack_pending: int = None,
+):
+    """
+    Subscribe and ONLY deliver envelopes that pass the rule book to your handler.
+
+    Messages are validated in micro-batches of up to ``batch_size`` (default
+    INGEST_BATCH_SIZE), collected for at most ``batch_window`` seconds
+    (default INGEST_BATCH_WINDOW) after the first message of a batch arrives.
+
+    Validation runs on the event loop unless ``executor`` (default
+    INGEST_EXECUTOR) is "thread" or "process", in which case batches are
+    checked on a shared pool of ``workers`` (default INGEST_WORKERS) with up
+    to ``queue_depth`` (default INGEST_QUEUE_DEPTH) batches in flight. The
+    handler always runs on the loop, in delivery order.
+
+    With ``concurrent`` the handler is not awaited before the next envelope
+    is delivered. It must take each envelope in order before returning an
+    awaitable for its completion (e.g. ``VerbDispatcher.submit``); the message
+    is acked once that completes, or nak'ed if it fails. The consumer's
+    max_ack_pending bounds how many envelopes are outstanding.
+
+    With ``pull`` (default INGEST_PULL) a durable pull consumer on the shared
+    connection fetches batches of up to ``batch_size``, keeping at most
+    ``max_ack_pending`` (default INGEST_MAX_ACK_PENDING) messages unsettled
+    and sending acks in batches (see PullConsumer).
+    """
+    from nats.errors import ConnectionClosedError
+
+    batch_size = batch_size or INGEST_BATCH_SIZE
+    batch_window = INGEST_BATCH_WINDOW if batch_window is None else batch_window
+    pool = get_ingest_executor(executor, workers)
+    durable = durable_name or subject.replace(".", "_").replace("*", "ALL").replace(">", "ALL")
+
+    if INGEST_PULL if pull is None else pull:
+        max_ack_pending = max_ack_pending or INGEST_MAX_ACK_PENDING
+        _, js = await shared_connection()
+        psub = await _pull_subscribe(js, subject, durable, max_ack_pending)
+        consumer = PullConsumer(psub, batch_size, max_ack_pending)
+        try:
+            await _pull_ingest(thread_id, subject, consumer, handler, pool, concurrent)
+        finally:
+            await consumer.flush()
+            await psub.unsubscribe()
+        return
+
+    nc, js = await connect()
+    sub = await js.subscribe(subject, durable=durable)
+
+    async def _runner():
+        if pool is not None:
+            await _offloaded_ingest(
+                thread_id,
+                subject,
+                sub,
+                handler,
+                pool,
+                batch_size,
+                batch_window,
+                queue_depth or INGEST_QUEUE_DEPTH,
+                concurrent,
+            )
+            return
+        while True:
+            try:
+                msgs = await _next_batch(sub, batch_size, batch_window)
+            except ConnectionClosedError:
+                return
+            await _ingest_batch(thread_id, subject, msgs, handler, concurrent)
 
     try:
         await _runner()
@@ -275,34 +972,58 @@ async def subscribe(
     subject: str,
     handler: Callable[[dict], Awaitable[None]],
     durable_name: str = None,
+    pull: bool = None,
+    batch_size: int = None,
+    max_ack_pending: int = None,
 ):
     """
     Backward-compatible wrapper: subscribe to simple messages (not envelopes).
     Logs to audit trail but does NOT validate as envelopes.
+
+    With ``pull`` (default INGEST_PULL) messages are fetched in batches on
+    the shared connection, as in subscribe_envelopes.
     """
-    nc, js = await connect()
     durable = durable_name or subject.replace(".", "_").replace("*", "ALL").replace(">", "ALL")
+
+    async def _deliver(msg):
+        # Decode message
+        try:
+            payload = json.loads(msg.data.decode())
+        except Exception:
+            payload = {"_raw": msg.data.decode(errors="ignore")}
+
+        # Always log delivery (CCTV)
+        log_event(
+            thread_id=thread_id,
+            subject=subject,
+            kind="BUS.DELIVER",
+            payload=payload,
+        )
+
+        # Call handler (no envelope validation)
+        await handler(payload)
+        await msg.ack()
+
+    if INGEST_PULL if pull is None else pull:
+        max_ack_pending = max_ack_pending or INGEST_MAX_ACK_PENDING
+        _, js = await shared_connection()
+        psub = await _pull_subscribe(js, subject, durable, max_ack_pending)
+        consumer = PullConsumer(psub, batch_size, max_ack_pending)
+        try:
+            async for msgs in consumer.batches():
+                for msg in msgs:
+                    await _deliver(msg)
+        finally:
+            await consumer.flush()
+            await psub.unsubscribe()
+        return
+
+    nc, js = await connect()
     sub = await js.subscribe(subject, durable=durable)
 
     async def _runner():
         async for msg in sub.messages:
-            # Decode message
-            try:
-                payload = json.loads(msg.data.decode())
-            except Exception:
-                payload = {"_raw": msg.data.decode(errors="ignore")}
-
-            # Always log delivery (CCTV)
-            log_event(
-                thread_id=thread_id,
-                subject=subject,
-                kind="BUS.DELIVER",
-                payload=payload,
-            )
-
-            # Call handler (no envelope validation)
-            await handler(payload)
-            await msg.ack()
+            await _deliver(msg)
 
     try:
         await _runner()
@@ -1,6 +1,40 @@
 """CAS (Content-Addressable Storage) module for agent-swarm"""
 
 # Import from cas_core.py in parent src directory
-from cas_core import get_cas_store, FileCAS, CAS
+from cas_core import (
+    get_cas_store,
+    get_default_store,
+    set_default_store,
+    put_bytes,
+    get_bytes,
+    get_view,
+    iter_chunks,
+    has_blob,
+    put_json,
+    get_json,
+    FileCAS,
+    ExistenceCache,
+    CAS,
+)
+from cas.chunking import ContentDefinedChunker, ChunkManifest
+from cas.cached_store import CachedContentStore, CacheStats
 
-__all__ = ["get_cas_store", "FileCAS", "CAS"]
+__all__ = [
+    "get_cas_store",
+    "get_default_store",
+    "set_default_store",
+    "put_bytes",
+    "get_bytes",
+    "get_view",
+    "iter_chunks",
+    "has_blob",
+    "put_json",
+    "get_json",
+    "FileCAS",
+    "ExistenceCache",
+    "CAS",
+    "ContentDefinedChunker",
+    "ChunkManifest",
+    "CachedContentStore",
+    "CacheStats",
+]
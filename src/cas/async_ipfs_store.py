@@ -0,0 +1,423 @@
+"""
+Async IPFS-backed Content-Addressable Storage
+
+Talks to the local IPFS daemon's HTTP API directly over a pool of
+keep-alive connections. Requests are plain coroutines with per-request
+timeouts (no thread per call), and ``get_many``/``put_many`` run batches
+concurrently up to the pool size.
+
+Only the standard library is used: the daemon API is a handful of POST
+endpoints, so a small HTTP/1.1 client is simpler than another dependency.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+
+class _HTTPConnection:
+    """Single keep-alive HTTP/1.1 connection to the daemon"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "_HTTPConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    def close(self) -> None:
+        self.reusable = False
+        self.writer.close()
+
+    async def request(
+        self, host: str, path: str, body: bytes = b"", content_type: Optional[str] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Send a POST request and read the full response.
+
+        Returns:
+            Tuple of (status, lower-cased headers, body)
+        """
+        head = [
+            f"POST {path} HTTP/1.1",
+            f"Host: {host}",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive",
+        ]
+        if content_type:
+            head.append(f"Content-Type: {content_type}")
+
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        if body:
+            self.writer.write(body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by IPFS daemon")
+        status = int(status_line.split()[1])
+
+        headers = await self._read_headers()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data, trailers = await self._read_chunked()
+            stream_error = trailers.get("x-stream-error")
+            if stream_error:
+                raise RuntimeError(f"IPFS stream error: {stream_error}")
+        elif "content-length" in headers:
+            data = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await self.reader.read()
+            self.reusable = False
+
+        if headers.get("connection", "").lower() == "close":
+            self.reusable = False
+
+        return status, headers, data
+
+    async def _read_headers(self) -> Dict[str, str]:
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    async def _read_chunked(self) -> Tuple[bytes, Dict[str, str]]:
+        parts = []
+        while True:
+            size_line = await self.reader.readline()
+            size = int(size_line.split(b";")[0].strip(), 16)
+            if size == 0:
+                return b"".join(parts), await self._read_headers()
+            parts.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)  # CRLF after each chunk
+
+
+class _ConnectionPool:
+    """
+    Bounded pool of keep-alive connections.
+
+    The semaphore caps concurrent requests at ``max_connections``; idle
+    connections are reused LIFO so the warmest socket is picked first.
+
+    The semaphore is created on first acquire(), inside the running loop:
+    before Python 3.10 it binds to the loop current at construction, and
+    stores are often built before the loop that uses them is running.
+    """
+
+    def __init__(self, host: str, port: int, max_connections: int):
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self._idle: List[_HTTPConnection] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.connections_opened = 0
+
+    async def acquire(self) -> _HTTPConnection:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+        await self._semaphore.acquire()
+        try:
+            while self._idle:
+                conn = self._idle.pop()
+                if conn.reusable and not conn.reader.at_eof():
+                    return conn
+                conn.close()
+
+            conn = await _HTTPConnection.open(self.host, self.port)
+            self.connections_opened += 1
+            return conn
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def release(self, conn: _HTTPConnection, reuse: bool) -> None:
+        if reuse and conn.reusable:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._semaphore.release()
+
+    def close(self) -> None:
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+
+
+class AsyncIPFSContentStore:
+    """
+    Asyncio IPFS content store.
+
+    Mirrors IPFSContentStore (put/get/exists/pin with a circuit breaker) as
+    coroutines, plus concurrent batch APIs. All calls must be made from the
+    event loop the store is first used on.
+    """
+
+    def __init__(
+        self,
+        ipfs_host: str = "127.0.0.1",
+        ipfs_port: int = 5001,
+        auto_pin: bool = True,
+        chunker: Optional[str] = None,
+        max_connections: int = 16,
+        timeout: float = 5.0,
+    ):
+        """
+        Initialize async IPFS content store.
+
+        Args:
+            ipfs_host: IPFS API host
+            ipfs_port: IPFS API port
+            auto_pin: Pin added content
+            chunker: Daemon chunker for added content (see IPFSConfig.chunker)
+            max_connections: Pool size; also the cap on in-flight requests
+            timeout: Default per-request timeout in seconds
+        """
+        self.host = ipfs_host
+        self.port = ipfs_port
+        self.auto_pin = auto_pin
+        self.chunker = chunker
+        self.timeout = timeout
+        self._pool = _ConnectionPool(ipfs_host, ipfs_port, max_connections)
+
+        # Circuit breaker state
+        self._circuit_breaker_open = False
+        self._circuit_open_time = 0.0
+        self._failure_count = 0
+        self._max_failures = 3
+        self._circuit_cooldown = 60  # seconds
+
+    @property
+    def connections_opened(self) -> int:
+        """Total TCP connections opened (for pool diagnostics)"""
+        return self._pool.connections_opened
+
+    async def connect(self) -> str:
+        """
+        Check the daemon is reachable.
+
+        Returns:
+            Peer ID of the daemon
+
+        Raises:
+            ConnectionError: If the daemon cannot be reached
+        """
+        try:
+            status, _, body = await self._call("/api/v0/id", timeout=self.timeout)
+            if status != 200:
+                raise ConnectionError(f"IPFS daemon returned HTTP {status}")
+            peer_id = json.loads(body).get("ID")
+        except (OSError, EOFError, ValueError, asyncio.TimeoutError) as e:
+            raise ConnectionError(
+                f"Could not connect to IPFS at {self.host}:{self.port}. "
+                f"Make sure IPFS daemon is running. ({e})"
+            )
+
+        logger.info(
+            f"Async IPFS content store connected: {self.host}:{self.port} (peer: {peer_id})"
+        )
+        return peer_id
+
+    async def _call(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+        content_type: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        path = endpoint + ("?" + urlencode(params) if params else "")
+        conn = await self._pool.acquire()
+        reuse = False
+        try:
+            result = await asyncio.wait_for(
+                conn.request(f"{self.host}:{self.port}", path, body, content_type),
+                timeout=timeout if timeout is not None else self.timeout,
+            )
+            reuse = True
+            return result
+        finally:
+            # A timed-out or failed request leaves the socket mid-response
+            self._pool.release(conn, reuse)
+
+    def _check_circuit(self) -> None:
+        if not self._circuit_breaker_open:
+            return
+
+        elapsed = time.time() - self._circuit_open_time
+        if elapsed < self._circuit_cooldown:
+            raise RuntimeError(
+                f"Circuit breaker open: IPFS unavailable (retry in "
+                f"{int(self._circuit_cooldown - elapsed)}s)"
+            )
+
+        logger.info("Circuit breaker closing: attempting IPFS reconnection")
+        self._circuit_breaker_open = False
+        self._failure_count = 0
+
+    def _record_failure(self, reason: str) -> None:
+        self._failure_count += 1
+        logger.warning(f"IPFS {reason} (failure {self._failure_count}/{self._max_failures})")
+
+        if self._failure_count >= self._max_failures:
+            self._circuit_breaker_open = True
+            self._circuit_open_time = time.time()
+            logger.error(
+                f"Circuit breaker opened: {self._failure_count} consecutive failures. "
+                f"IPFS unavailable for {self._circuit_cooldown}s"
+            )
+
+    @staticmethod
+    def _error_message(body: bytes) -> str:
+        try:
+            return json.loads(body).get("Message", "")
+        except ValueError:
+            return body.decode("utf-8", "replace")
+
+    async def put(self, data: bytes) -> str:
+        """
+        Store content in IPFS and return its CID.
+
+        Raises:
+            RuntimeError: If content cannot be stored
+        """
+        if not isinstance(data, bytes):
+            raise TypeError(f"Expected bytes, got {type(data)}")
+
+        self._check_circuit()
+
+        boundary = uuid.uuid4().hex
+        body = b"".join(
+            [
+                f"--{boundary}\r\n".encode(),
+                b'Content-Disposition: form-data; name="file"; filename="file"\r\n',
+                b"Content-Type: application/octet-stream\r\n\r\n",
+                data,
+                f"\r\n--{boundary}--\r\n".encode(),
+            ]
+        )
+        params = {"pin": "true" if self.auto_pin else "false"}
+        if self.chunker:
+            params["chunker"] = self.chunker
+
+        try:
+            status, _, resp = await self._call(
+                "/api/v0/add", params, body, f"multipart/form-data; boundary={boundary}"
+            )
+        except asyncio.TimeoutError:
+            self._record_failure("add timeout")
+            raise RuntimeError(f"IPFS add timeout after {self.timeout}s")
+        except (OSError, EOFError, ValueError) as e:
+            self._record_failure(f"add error: {e!r}")
+            raise RuntimeError(f"Failed to store content in IPFS: {e!r}")
+
+        if status != 200:
+            raise RuntimeError(f"Failed to store content in IPFS: {self._error_message(resp)}")
+
+        # add streams one JSON object per line; the last one is the root
+        cid = json.loads(resp.strip().splitlines()[-1])["Hash"]
+        self._failure_count = 0
+        logger.debug(f"Stored content in IPFS: {cid} ({len(data)} bytes)")
+        return cid
+
+    async def get(self, cid: str, timeout: Optional[float] = None) -> bytes:
+        """
+        Retrieve content from IPFS by CID.
+
+        Raises:
+            KeyError: If the daemon cannot resolve the CID
+            RuntimeError: On timeout, connection failure or open circuit
+        """
+        if not cid:
+            raise ValueError("CID cannot be empty")
+
+        self._check_circuit()
+
+        try:
+            status, _, body = await self._call("/api/v0/cat", {"arg": cid}, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._record_failure(f"get timeout for {cid}")
+            raise RuntimeError(f"IPFS get timeout after {timeout or self.timeout}s for CID: {cid}")
+        except (OSError, EOFError, ValueError, RuntimeError) as e:
+            self._record_failure(f"get error: {e!r}")
+            raise RuntimeError(f"Failed to retrieve content from IPFS: {e!r}")
+
+        if status != 200:
+            raise KeyError(f"Content not found: {cid} ({self._error_message(body)})")
+
+        if self._failure_count > 0:
+            logger.info(f"IPFS get succeeded, resetting failure count from {self._failure_count}")
+            self._failure_count = 0
+
+        logger.debug(f"Retrieved content from IPFS: {cid} ({len(body)} bytes)")
+        return body
+
+    async def exists(self, cid: str, timeout: Optional[float] = None) -> bool:
+        """Check if content is resolvable (fetches only the root block)"""
+        try:
+            status, _, _ = await self._call("/api/v0/block/stat", {"arg": cid}, timeout=timeout)
+            return status == 200
+        except Exception:
+            return False
+
+    async def pin(self, cid: str) -> None:
+        """
+        Pin content to prevent garbage collection.
+
+        Raises:
+            RuntimeError: If pinning fails
+        """
+        status, _, body = await self._call("/api/v0/pin/add", {"arg": cid})
+        if status != 200:
+            raise RuntimeError(f"Failed to pin content: {self._error_message(body)}")
+
+    async def get_many(
+        self, cids: Sequence[str], return_exceptions: bool = False
+    ) -> Dict[str, Union[bytes, Exception]]:
+        """
+        Fetch many CIDs concurrently (bounded by the pool size).
+
+        Args:
+            cids: CIDs to fetch
+            return_exceptions: Return per-CID exceptions instead of raising
+                the first one
+
+        Returns:
+            Dict of cid -> content (or exception)
+        """
+        unique = list(dict.fromkeys(cids))
+        results = await asyncio.gather(
+            *(self.get(cid) for cid in unique), return_exceptions=return_exceptions
+        )
+        return dict(zip(unique, results))
+
+    async def put_many(
+        self, blobs: Sequence[bytes], return_exceptions: bool = False
+    ) -> List[Union[str, Exception]]:
+        """
+        Store many blobs concurrently (bounded by the pool size).
+
+        Returns:
+            CIDs in the same order as ``blobs`` (or exceptions)
+        """
+        return list(
+            await asyncio.gather(
+                *(self.put(data) for data in blobs), return_exceptions=return_exceptions
+            )
+        )
+
+    async def close(self) -> None:
+        """Close pooled connections"""
+        self._pool.close()
+        logger.info("Async IPFS content store closed")
@@ -0,0 +1,414 @@
+"""
+Read-through cache for remote CAS backends
+
+Content addressed by CID is immutable, so a local copy never goes stale and
+needs no invalidation. CachedContentStore wraps a backend such as
+IPFSContentStore with two local tiers:
+
+- memory: bounded LRU of small blobs
+- disk: FileCAS-backed store with a CID index and size-based LRU eviction
+
+Misses are cached negatively for a short TTL so repeated lookups of absent
+CIDs do not hit the daemon, and ``prefetch`` warms the cache for a batch of
+CIDs (e.g. every link in a thread DAG) with concurrent fetches.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from cas_core import FileCAS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Lookup counters for a CachedContentStore"""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    prefetched: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.memory_hits + self.disk_hits + self.negative_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered without contacting the backend"""
+        if not self.lookups:
+            return 0.0
+        return (self.lookups - self.misses) / self.lookups
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "lookups": self.lookups, "hit_rate": self.hit_rate}
+
+
+class CachedContentStore:
+    """
+    Two-level read-through cache in front of a CAS backend.
+
+    Exposes the same interface as the backend (put/get/get_view/exists);
+    anything else (pin, list_pins, gc, ...) is delegated unchanged. Puts are
+    written through so freshly stored content is served locally.
+    """
+
+    def __init__(
+        self,
+        backend,
+        cache_dir: Optional[Path] = None,
+        memory_max_bytes: int = 64 * 1024 * 1024,
+        memory_max_blob_size: int = 256 * 1024,
+        disk_max_bytes: int = 1024 * 1024 * 1024,
+        negative_ttl: float = 30.0,
+        negative_capacity: int = 10_000,
+        prefetch_workers: int = 8,
+    ):
+        """
+        Initialize cached store.
+
+        Args:
+            backend: Store to read through to (e.g. IPFSContentStore)
+            cache_dir: Directory for the disk tier (None for memory only)
+            memory_max_bytes: Total bytes held by the memory tier
+            memory_max_blob_size: Larger blobs skip the memory tier
+            disk_max_bytes: Total bytes held by the disk tier
+            negative_ttl: Seconds a miss is remembered
+            negative_capacity: Maximum remembered misses
+            prefetch_workers: Concurrent backend fetches during prefetch
+        """
+        self.backend = backend
+        self.memory_max_bytes = memory_max_bytes
+        self.memory_max_blob_size = memory_max_blob_size
+        self.disk_max_bytes = disk_max_bytes
+        self.negative_ttl = negative_ttl
+        self.negative_capacity = negative_capacity
+        self.prefetch_workers = prefetch_workers
+
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._missing: OrderedDict[str, float] = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self._disk: Optional[FileCAS] = None
+        self._disk_bytes = 0
+        if cache_dir is not None:
+            cache_dir = Path(cache_dir)
+            self._disk = FileCAS(cache_dir / "blobs")
+            self._conn = sqlite3.connect(str(cache_dir / "index.db"), check_same_thread=False)
+            self._init_schema()
+
+    def _init_schema(self):
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    cid TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON entries(last_access)")
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        self._disk_bytes = row[0]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    # ------------------------------------------------------------------
+    # Tiers
+
+    def _memory_get(self, cid: str) -> Optional[bytes]:
+        data = self._memory.get(cid)
+        if data is not None:
+            self._memory.move_to_end(cid)
+        return data
+
+    def _memory_put(self, cid: str, data: bytes) -> None:
+        if len(data) > self.memory_max_blob_size or cid in self._memory:
+            return
+
+        self._memory[cid] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats.memory_evictions += 1
+
+    def _disk_lookup(self, cid: str) -> Optional[str]:
+        """Content hash of a disk-cached CID, refreshing its LRU position"""
+        row = self._conn.execute(
+            "SELECT content_hash FROM entries WHERE cid = ?", (cid,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        with self._conn:
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE cid = ?", (time.time_ns(), cid)
+            )
+        return row[0]
+
+    def _disk_index(self, cid: str, content_hash: str, size: int) -> None:
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO entries (cid, content_hash, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (cid, content_hash, size, time.time_ns()),
+            )
+        if cursor.rowcount:
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.disk_max_bytes:
+            row = self._conn.execute(
+                "SELECT cid, content_hash, size FROM entries ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self._disk_bytes = 0
+                return
+
+            cid, content_hash, size = row
+            with self._conn:
+                self._conn.execute("DELETE FROM entries WHERE cid = ?", (cid,))
+                shared = self._conn.execute(
+                    "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)
+                ).fetchone()
+            if not shared:
+                self._disk.discard(content_hash)
+
+            self._disk_bytes -= size
+            self.stats.disk_evictions += 1
+            logger.debug(f"Evicted {cid} from disk cache ({size} bytes)")
+
+    def _is_missing(self, cid: str) -> bool:
+        expires = self._missing.get(cid)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._missing[cid]
+            return False
+        return True
+
+    def _remember_missing(self, cid: str) -> None:
+        with self._lock:
+            self._missing[cid] = time.monotonic() + self.negative_ttl
+            self._missing.move_to_end(cid)
+            while len(self._missing) > self.negative_capacity:
+                self._missing.popitem(last=False)
+
+    def _lookup(self, cid: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Find a CID in the local tiers.
+
+        Returns:
+            (data, None) on a memory hit, (None, content_hash) on a disk hit,
+            (None, None) on a miss
+
+        Raises:
+            KeyError: If the CID is negatively cached
+        """
+        with self._lock:
+            data = self._memory_get(cid)
+            if data is not None:
+                self.stats.memory_hits += 1
+                return data, None
+
+            if self._is_missing(cid):
+                self.stats.negative_hits += 1
+                raise KeyError(f"Content not found: {cid} (cached miss)")
+
+            if self._disk is not None:
+                content_hash = self._disk_lookup(cid)
+                if content_hash is not None:
+                    self.stats.disk_hits += 1
+                    return None, content_hash
+
+            self.stats.misses += 1
+            return None, None
+
+    def _store(self, cid: str, data: bytes) -> None:
+        with self._lock:
+            self._missing.pop(cid, None)
+            self._memory_put(cid, data)
+
+        if self._disk is not None:
+            # Blob write happens outside the lock; FileCAS writes are atomic
+            content_hash = self._disk.put(data)
+            with self._lock:
+                self._disk_index(cid, content_hash, len(data))
+
+    def _fetch(self, cid: str, timeout: Optional[float] = None) -> bytes:
+        """Fetch from the backend, coalescing concurrent fetches of one CID"""
+        with self._lock:
+            future = self._inflight.get(cid)
+            owner = future is None
+            if owner:
+                future = self._inflight[cid] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            if timeout is None:
+                data = self.backend.get(cid)
+            else:
+                data = self.backend.get(cid, timeout=timeout)
+        except KeyError as e:
+            self._remember_missing(cid)
+            future.set_exception(e)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._store(cid, data)
+            future.set_result(data)
+            return data
+        finally:
+            with self._lock:
+                self._inflight.pop(cid, None)
+
+    # ------------------------------------------------------------------
+    # Store interface
+
+    def put(self, data: bytes) -> str:
+        """Store content in the backend and cache it locally"""
+        cid = self.backend.put(data)
+        self._store(cid, data)
+        return cid
+
+    def get(self, cid: str, timeout: Optional[float] = None) -> bytes:
+        """
+        Retrieve content, from the local tiers when possible.
+
+        Raises:
+            KeyError: If content not found (possibly a cached miss)
+        """
+        data, content_hash = self._lookup(cid)
+        if data is not None:
+            return data
+
+        if content_hash is not None:
+            try:
+                data = self._disk.get(content_hash)
+            except KeyError:
+                # Evicted between lookup and read
+                return self._fetch(cid, timeout)
+            with self._lock:
+                self._memory_put(cid, data)
+            return data
+
+        return self._fetch(cid, timeout)
+
+    def get_view(self, cid: str, timeout: Optional[float] = None) -> memoryview:
+        """Read content as a ``memoryview`` (memory-mapped on a disk hit)"""
+        data, content_hash = self._lookup(cid)
+        if data is not None:
+            return memoryview(data)
+
+        if content_hash is not None:
+            try:
+                return self._disk.get_view(content_hash)
+            except KeyError:
+                pass
+
+        return memoryview(self._fetch(cid, timeout))
+
+    def exists(self, cid: str) -> bool:
+        """Check if content exists, locally or in the backend"""
+        with self._lock:
+            if cid in self._memory:
+                return True
+            if self._is_missing(cid):
+                return False
+            if self._disk is not None and self._disk_lookup(cid) is not None:
+                return True
+
+        if self.backend.exists(cid):
+            return True
+        self._remember_missing(cid)
+        return False
+
+    def prefetch(self, cids: Iterable[str]) -> int:
+        """
+        Fetch CIDs that are not cached yet, concurrently.
+
+        Blocks until every fetch has finished; failures are logged and left
+        for a later ``get`` to surface.
+
+        Args:
+            cids: CIDs to warm
+
+        Returns:
+            Number of CIDs fetched from the backend
+        """
+        pending = []
+        with self._lock:
+            for cid in dict.fromkeys(cids):
+                if cid in self._memory or cid in self._inflight or self._is_missing(cid):
+                    continue
+                if self._disk is not None and self._disk_lookup(cid) is not None:
+                    continue
+                pending.append(cid)
+
+        if not pending:
+            return 0
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.prefetch_workers, thread_name_prefix="cas-prefetch"
+            )
+
+        fetched = 0
+        futures = {cid: self._executor.submit(self._fetch, cid) for cid in pending}
+        for cid, future in futures.items():
+            try:
+                future.result()
+                fetched += 1
+            except Exception as e:
+                logger.debug(f"Prefetch of {cid} failed: {e}")
+
+        with self._lock:
+            self.stats.prefetched += fetched
+        logger.debug(f"Prefetched {fetched}/{len(pending)} CIDs")
+        return fetched
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics and tier occupancy"""
+        with self._lock:
+            stats = self.stats.to_dict()
+            stats.update(
+                memory_entries=len(self._memory),
+                memory_bytes=self._memory_bytes,
+                negative_entries=len(self._missing),
+                disk_bytes=self._disk_bytes,
+            )
+        return stats
+
+    def close(self):
+        """Shut down prefetch workers, the disk index and the backend"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._disk is not None:
+            self._conn.close()
+        if hasattr(self.backend, "close"):
+            self.backend.close()
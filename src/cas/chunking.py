@@ -0,0 +1,217 @@
+"""
+Content-Defined Chunking for CAS artifacts
+
+Splits artifacts at boundaries chosen by a rolling hash over the content
+itself, so an insertion or edit only changes the chunks around it. Iterative
+worker outputs that share most of their bytes then share most of their
+chunks, and each shared chunk is stored (and transferred) once.
+
+Artifacts are stored as a manifest addressed by the whole-artifact hash that
+lists the chunk hashes in order; readers reassemble transparently.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import List, Tuple, Union
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_TYPE = "cas.chunk_manifest"
+MANIFEST_VERSION = 1
+
+_MASK64 = (1 << 64) - 1
+
+# Fixed pseudo-random byte -> uint64 table. Must never change: chunk
+# boundaries (and therefore dedup across stores) depend on it.
+_TABLE = [
+    int.from_bytes(hashlib.sha256(b"cas-rollsum" + bytes([i])).digest()[:8], "little")
+    for i in range(256)
+]
+
+if HAS_NUMPY:
+    _NP_TABLE = np.array(_TABLE, dtype=np.uint64)
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+@dataclass
+class ChunkManifest:
+    """
+    Ordered list of chunks making up one artifact.
+
+    Attributes:
+        content_hash: SHA-256 of the whole artifact
+        size: Total artifact size in bytes
+        chunks: List of (chunk_hash, chunk_size) in artifact order
+    """
+
+    content_hash: str
+    size: int
+    chunks: List[Tuple[str, int]] = field(default_factory=list)
+
+    def to_bytes(self) -> bytes:
+        """Serialize to canonical JSON"""
+        return json.dumps(
+            {
+                "type": MANIFEST_TYPE,
+                "v": MANIFEST_VERSION,
+                "hash": self.content_hash,
+                "size": self.size,
+                "chunks": [[h, n] for h, n in self.chunks],
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        ).encode()
+
+    @classmethod
+    def from_bytes(cls, data: Buffer) -> "ChunkManifest":
+        """Parse a serialized manifest"""
+        obj = json.loads(bytes(data))
+        if obj.get("type") != MANIFEST_TYPE:
+            raise ValueError("Not a chunk manifest")
+        if obj.get("v") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported chunk manifest version: {obj.get('v')}")
+
+        manifest = cls(
+            content_hash=obj["hash"],
+            size=obj["size"],
+            chunks=[(h, n) for h, n in obj["chunks"]],
+        )
+        if sum(n for _, n in manifest.chunks) != manifest.size:
+            raise ValueError("Chunk sizes do not add up to manifest size")
+        return manifest
+
+
+class ContentDefinedChunker:
+    """
+    Rolling-sum content-defined chunker.
+
+    A boundary is placed after byte ``i`` when the sum of table values over
+    the preceding ``window`` bytes has its low bits all zero. With
+    ``avg_size = 2**k`` that happens on average once every ``avg_size``
+    bytes; ``min_size``/``max_size`` bound the chunk sizes.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 4 * 1024,
+        avg_size: int = 16 * 1024,
+        max_size: int = 64 * 1024,
+        window: int = 48,
+    ):
+        """
+        Initialize chunker.
+
+        Args:
+            min_size: Smallest chunk emitted (except the final one)
+            avg_size: Target average chunk size, must be a power of two
+            max_size: Largest chunk emitted
+            window: Rolling hash window in bytes
+        """
+        if avg_size & (avg_size - 1):
+            raise ValueError("avg_size must be a power of two")
+        if not 0 < min_size <= avg_size <= max_size:
+            raise ValueError("Require 0 < min_size <= avg_size <= max_size")
+
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+        self.window = window
+        self._mask = avg_size - 1
+
+    def boundaries(self, data: Buffer) -> List[int]:
+        """
+        Compute chunk end offsets.
+
+        Returns:
+            Sorted list of exclusive end offsets; the last one is ``len(data)``
+        """
+        n = len(data)
+        if n == 0:
+            return []
+
+        candidates = self._candidates(data)
+
+        cuts = []
+        start = 0
+        i = 0
+        while start < n:
+            lo = start + self.min_size
+            hi = min(start + self.max_size, n)
+
+            # First rolling-hash candidate that leaves a chunk >= min_size
+            while i < len(candidates) and candidates[i] < lo:
+                i += 1
+
+            if i < len(candidates) and candidates[i] <= hi:
+                end = candidates[i]
+            else:
+                end = hi
+
+            cuts.append(end)
+            start = end
+
+        return cuts
+
+    def split(self, data: Buffer) -> List[memoryview]:
+        """Split data into chunk views (no copies)"""
+        view = memoryview(data)
+        chunks = []
+        start = 0
+        for end in self.boundaries(view):
+            chunks.append(view[start:end])
+            start = end
+        return chunks
+
+    def _candidates(self, data: Buffer) -> List[int]:
+        """End offsets (i + 1) of every position whose rolling hash matches"""
+        if HAS_NUMPY:
+            return self._candidates_numpy(data)
+        return self._candidates_python(data)
+
+    def _candidates_python(self, data: Buffer) -> List[int]:
+        table = _TABLE
+        window = self.window
+        mask = self._mask
+        view = memoryview(data).cast("B")
+
+        h = 0
+        out = []
+        for i in range(len(view)):
+            h = (h + table[view[i]]) & _MASK64
+            if i >= window:
+                h = (h - table[view[i - window]]) & _MASK64
+            if h & mask == 0:
+                out.append(i + 1)
+        return out
+
+    def _candidates_numpy(self, data: Buffer, block_size: int = 1 << 20) -> List[int]:
+        # Rolling sum = difference of prefix sums; uint64 arithmetic wraps
+        # exactly like the pure-Python path. Processed in blocks to bound the
+        # temporary arrays to a few MiB regardless of artifact size.
+        arr = np.frombuffer(data, dtype=np.uint8)
+        window = self.window
+        mask = np.uint64(self._mask)
+        out = []
+
+        for start in range(0, len(arr), block_size):
+            lead = min(window, start)
+            block = arr[start - lead : start + block_size]
+
+            csum = np.cumsum(_NP_TABLE[block], dtype=np.uint64)
+            h = csum.copy()
+            h[window:] -= csum[:-window]
+
+            hits = np.flatnonzero((h[lead:] & mask) == 0)
+            out.extend((hits + start + 1).tolist())
+
+        return out
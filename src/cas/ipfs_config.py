@@ -5,6 +5,7 @@ Provides connection settings, pinning strategies, and garbage collection
 configuration for the IPFS Content-Addressable Storage system.
 """
 
+import io
 import os
 import logging
 from typing import Optional, Dict, Any, List
@@ -38,6 +39,9 @@ class IPFSConfig:
         max_storage_gb: Maximum storage in GB (for pinning strategies)
         gc_interval_hours: Garbage collection interval in hours
         gc_enabled: Whether garbage collection is enabled
+        chunker: Daemon-side chunker for added content (e.g. ``buzhash`` or
+            ``rabin-4096-16384-65536`` for content-defined chunking with
+            block-level dedup; None uses the daemon's fixed-size default)
     """
 
     api_host: str = "127.0.0.1"
@@ -50,6 +54,7 @@ class IPFSConfig:
     gc_enabled: bool = True
     pin_recent_days: int = 30  # For PIN_RECENT strategy
     pin_size_threshold_mb: float = 10.0  # For PIN_BY_SIZE strategy
+    chunker: Optional[str] = None
 
     def get_api_url(self) -> str:
         """Get IPFS API URL"""
@@ -73,6 +78,7 @@ class IPFSConfig:
             gc_enabled=os.getenv("IPFS_GC_ENABLED", "true").lower() == "true",
             pin_recent_days=int(os.getenv("IPFS_PIN_RECENT_DAYS", "30")),
             pin_size_threshold_mb=float(os.getenv("IPFS_PIN_SIZE_THRESHOLD_MB", "10.0")),
+            chunker=os.getenv("IPFS_CHUNKER") or None,
         )
 
 
@@ -177,8 +183,12 @@ class IPFSClient:
             # Determine pinning based on strategy
             should_pin = pin if pin is not None else self._should_pin(len(data))
 
-            # Add content (ipfshttpclient 0.8.0a2 API)
-            result = self._client.add_bytes(data)
+            # Add content (ipfshttpclient 0.8.0a2 API). add_bytes() cannot
+            # pass a chunker, so content-defined chunking goes through add().
+            if self.config.chunker:
+                result = self._client.add(io.BytesIO(data), chunker=self.config.chunker)
+            else:
+                result = self._client.add_bytes(data)
 
             # Handle both string and dict responses
             if isinstance(result, dict):
@@ -217,6 +227,27 @@ class IPFSClient:
             logger.error(f"Failed to get content: {e}", exc_info=True)
             return None
 
+    def get_content_range(self, cid: str, offset: int, length: int) -> Optional[bytes]:
+        """
+        Get a byte range of content from IPFS.
+
+        Args:
+            cid: IPFS CID hash
+            offset: First byte to return
+            length: Maximum number of bytes to return
+
+        Returns:
+            Content bytes (shorter than length at end of content)
+        """
+        try:
+            if not self.is_connected():
+                self.connect()
+
+            return self._client.cat(cid, offset=offset, length=length)
+        except Exception as e:
+            logger.error(f"Failed to get content range: {e}", exc_info=True)
+            return None
+
     def pin_content(self, cid: str) -> bool:
         """
         Pin content in IPFS.
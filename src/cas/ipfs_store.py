@@ -7,6 +7,7 @@ distributed availability, and cryptographic integrity.
 """
 
 import logging
+from typing import Optional
 
 from .ipfs_config import IPFSClient, IPFSConfig
 
@@ -22,7 +23,13 @@ class IPFSContentStore:
     cryptographic hashes of the content.
     """
 
-    def __init__(self, ipfs_host: str = "127.0.0.1", ipfs_port: int = 5001, auto_pin: bool = True):
+    def __init__(
+        self,
+        ipfs_host: str = "127.0.0.1",
+        ipfs_port: int = 5001,
+        auto_pin: bool = True,
+        chunker: Optional[str] = None,
+    ):
         """
         Initialize IPFS content store.
 
@@ -30,9 +37,11 @@ class IPFSContentStore:
             ipfs_host: IPFS API host
             ipfs_port: IPFS API port
             auto_pin: Automatically pin added content
+            chunker: Daemon chunker, e.g. ``buzhash`` to dedup near-identical
+                artifacts at block level (see IPFSConfig.chunker)
         """
         # Create IPFS config with provided connection settings
-        config = IPFSConfig(api_host=ipfs_host, api_port=ipfs_port)
+        config = IPFSConfig(api_host=ipfs_host, api_port=ipfs_port, chunker=chunker)
 
         self.client = IPFSClient(config)
         self.auto_pin = auto_pin
@@ -185,6 +194,45 @@ class IPFSContentStore:
         logger.debug(f"Retrieved content from IPFS: {cid} ({len(content)} bytes)")
         return content
 
+    def get_view(self, cid: str, timeout: int = 5) -> memoryview:
+        """
+        Read content as a ``memoryview``.
+
+        Matches ``FileCAS.get_view`` so callers can slice and hash without
+        further copies; the content itself still has to be fetched once.
+        """
+        return memoryview(self.get(cid, timeout=timeout))
+
+    def iter_chunks(self, cid: str, chunk_size: int = 1 << 20):
+        """
+        Stream content from IPFS in ``memoryview`` chunks.
+
+        Each chunk is a ranged ``cat`` request, so at most one chunk is held
+        in memory at a time.
+
+        Args:
+            cid: IPFS Content Identifier
+            chunk_size: Bytes requested per round-trip
+
+        Raises:
+            KeyError: If content not found
+        """
+        if not cid:
+            raise ValueError("CID cannot be empty")
+
+        offset = 0
+        while True:
+            chunk = self.client.get_content_range(cid, offset, chunk_size)
+            if chunk is None:
+                if offset == 0:
+                    raise KeyError(f"Content not found: {cid}")
+                raise RuntimeError(f"Failed to retrieve content from IPFS: {cid} @ {offset}")
+            if chunk:
+                yield memoryview(chunk)
+                offset += len(chunk)
+            if len(chunk) < chunk_size:
+                return
+
     def exists(self, cid: str) -> bool:
         """
         Check if content exists in IPFS.
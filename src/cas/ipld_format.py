@@ -13,6 +13,13 @@ from dataclasses import dataclass
 logger = logging.getLogger(__name__)
 
 
+def _prefetch(cas_store, cids: List[str]) -> None:
+    """Warm a caching CAS store (see CachedContentStore.prefetch) in one batch"""
+    prefetch = getattr(cas_store, "prefetch", None)
+    if prefetch is not None and len(cids) > 1:
+        prefetch(cids)
+
+
 class EnvelopeIPLD:
     """
     Converts envelopes to/from IPLD DAG format.
@@ -97,6 +104,11 @@ class EnvelopeIPLD:
         """
         envelope = {}
 
+        if cas_store:
+            _prefetch(
+                cas_store, [v["/"] for v in ipld_data.values() if EnvelopeIPLD.is_ipld_link(v)]
+            )
+
         # Copy all fields
         for key, value in ipld_data.items():
             # Check if value is a CID link
@@ -199,15 +211,25 @@ class ThreadIPLD:
         """
         Reconstruct envelopes from thread DAG.
 
+        With a caching CAS store, every envelope CID and then every payload
+        CID they link to is prefetched in one concurrent batch, so the
+        per-envelope resolution below is served locally.
+
         Args:
             thread_dag: Thread DAG structure
 
         Returns:
             List of reconstructed envelopes
         """
-        envelopes = []
+        links = thread_dag.get("envelopes", [])
+        ipld_envelopes = []
+
+        if self.cas_store:
+            _prefetch(
+                self.cas_store, [link["/"] for link in links if EnvelopeIPLD.is_ipld_link(link)]
+            )
 
-        for envelope_link in thread_dag.get("envelopes", []):
+        for envelope_link in links:
             # Check if it's a CID link
             if isinstance(envelope_link, dict) and "/" in envelope_link:
                 cid = envelope_link["/"]
@@ -216,19 +238,34 @@ class ThreadIPLD:
                     try:
                         # Retrieve envelope from CAS
                         envelope_bytes = self.cas_store.get(cid)
-                        ipld_envelope = json.loads(envelope_bytes.decode("utf-8"))
-
-                        # Reconstruct from IPLD
-                        envelope = EnvelopeIPLD.from_ipld(ipld_envelope, self.cas_store)
-                        envelopes.append(envelope)
+                        ipld_envelopes.append(json.loads(envelope_bytes.decode("utf-8")))
                     except Exception as e:
                         logger.error(f"Failed to retrieve envelope {cid}: {e}")
                 else:
                     logger.warning(f"No CAS store to resolve envelope CID: {cid}")
             else:
                 # Inline envelope
-                envelope = EnvelopeIPLD.from_ipld(envelope_link, self.cas_store)
-                envelopes.append(envelope)
+                ipld_envelopes.append(envelope_link)
+
+        if self.cas_store:
+            _prefetch(
+                self.cas_store,
+                [
+                    value["/"]
+                    for ipld_envelope in ipld_envelopes
+                    if isinstance(ipld_envelope, dict)
+                    for value in ipld_envelope.values()
+                    if EnvelopeIPLD.is_ipld_link(value)
+                ],
+            )
+
+        # Reconstruct from IPLD, skipping envelopes that fail to decode
+        envelopes = []
+        for ipld_envelope in ipld_envelopes:
+            try:
+                envelopes.append(EnvelopeIPLD.from_ipld(ipld_envelope, self.cas_store))
+            except Exception as e:
+                logger.error(f"Failed to decode envelope: {e}")
 
         return envelopes
 
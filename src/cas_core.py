@@ -1,53 +1,623 @@
 import hashlib
+import io
+import json
+import mmap
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
-
-from typing import Optional
+from typing import Any, BinaryIO, Iterator, Optional
 import logging
 
+try:
+    from observability import metrics as obs_metrics
+except ImportError:
+    obs_metrics = None
+
 logger = logging.getLogger(__name__)
 
+# SHA-256 hex digests are the only names FileCAS ever stores under
+_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Default read size for streaming puts (1 MiB)
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Chunked artifacts are stored as <shard>/<hash>.manifest next to plain blobs
+MANIFEST_SUFFIX = ".manifest"
+
 
 def sha256_hash(data: bytes) -> str:
     """Compute SHA256 hash of data"""
     return hashlib.sha256(data).hexdigest()
 
 
+class ExistenceCache:
+    """
+    Answers "is this hash stored?" without touching the filesystem.
+
+    Combines an LRU set of hashes known to be present with a Bloom filter
+    over every hash this process has seen stored. Content is immutable and
+    never deleted, so positive answers stay valid forever. The Bloom filter
+    can only prove absence, which is only safe when this process is the
+    sole writer of the store (see ``FileCAS(exclusive=True)``).
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        expected_items: int = 1_000_000,
+        false_positive_rate: float = 0.01,
+    ):
+        """
+        Initialize existence cache.
+
+        Args:
+            capacity: Maximum hashes kept in the LRU
+            expected_items: Bloom filter sizing hint
+            false_positive_rate: Target Bloom filter false positive rate
+        """
+        import math
+
+        self.capacity = capacity
+        self._lru: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Standard Bloom sizing: m = -n ln(p) / ln(2)^2, k = m/n ln(2)
+        n = max(1, expected_items)
+        self._num_bits = max(64, int(-n * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self._num_hashes = max(1, min(8, round(self._num_bits / n * math.log(2))))
+        self._bits = bytearray((self._num_bits + 7) // 8)
+
+        self.hits = 0
+        self.misses = 0
+
+    def _bit_positions(self, content_hash: str):
+        # Content hashes are already uniformly distributed, so slices of the
+        # digest serve as independent hash functions. Anything else is
+        # re-hashed first.
+        digest = (
+            content_hash if _HASH_RE.match(content_hash) else sha256_hash(content_hash.encode())
+        )
+        for i in range(self._num_hashes):
+            yield int(digest[i * 8 : (i + 1) * 8], 16) % self._num_bits
+
+    def add(self, content_hash: str) -> None:
+        """Record that a hash is present in the store"""
+        with self._lock:
+            for pos in self._bit_positions(content_hash):
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+
+            self._lru[content_hash] = None
+            self._lru.move_to_end(content_hash)
+            while len(self._lru) > self.capacity:
+                self._lru.popitem(last=False)
+
+    def contains(self, content_hash: str) -> bool:
+        """True if the hash is known to be present (LRU hit)"""
+        with self._lock:
+            if content_hash in self._lru:
+                self._lru.move_to_end(content_hash)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def discard(self, content_hash: str) -> None:
+        """Forget a hash that was removed from the store (LRU only)"""
+        with self._lock:
+            self._lru.pop(content_hash, None)
+
+    def might_contain(self, content_hash: str) -> bool:
+        """False if the hash was definitely never added (Bloom filter)"""
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._bit_positions(content_hash)
+        )
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+
+class ChunkedReader(io.RawIOBase):
+    """
+    Read-only raw stream over the chunk files of a chunked artifact.
+
+    Opens one chunk file at a time, so reading never holds more than the
+    caller's buffer in memory.
+    """
+
+    def __init__(self, paths: list):
+        self._paths = list(paths)
+        self._index = 0
+        self._file: Optional[BinaryIO] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while self._index < len(self._paths):
+            if self._file is None:
+                self._file = self._paths[self._index].open("rb")
+            count = self._file.readinto(buffer)
+            if count:
+                return count
+            self._file.close()
+            self._file = None
+            self._index += 1
+        return 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        super().close()
+
+
 class FileCAS:
-    """File-based content-addressable storage"""
+    """
+    File-based content-addressable storage.
+
+    Blobs are stored under a fan-out directory layout
+    (``<base>/ab/cd/abcd...``) so no single directory grows without bound.
+    Writes go to a temp file in the target directory and are renamed into
+    place, so readers never observe partially written blobs. Stores created
+    with the old flat layout (``<base>/<hash>``) are migrated online: blobs
+    are moved into their shard the first time they are read, or all at once
+    via ``migrate_flat_layout()``.
+
+    In chunked mode, artifacts are split with content-defined chunking and
+    stored as a manifest (addressed by the whole-artifact hash) plus chunk
+    blobs shared across every artifact that contains them. Reads reassemble
+    transparently; plain and chunked artifacts can live in the same store.
+    """
+
+    def __init__(
+        self,
+        base_path: Path = None,
+        shard_depth: int = 2,
+        shard_width: int = 2,
+        cache_size: int = 100_000,
+        exclusive: bool = False,
+        chunked: bool = False,
+        chunker=None,
+    ):
+        """
+        Initialize file CAS.
+
+        Args:
+            base_path: Root directory (default ``.cas``)
+            shard_depth: Number of fan-out directory levels
+            shard_width: Hex characters per fan-out level
+            cache_size: Hashes kept in the in-memory existence cache
+            exclusive: Set when this process is the only writer. The store is
+                scanned once at startup and ``exists`` misses are then answered
+                from the Bloom filter without a syscall.
+            chunked: Store new artifacts as content-defined chunks
+            chunker: ContentDefinedChunker to use (implies ``chunked``)
+        """
+        if shard_depth * shard_width > 32:
+            raise ValueError("Shard prefix must leave at least half the hash as the file name")
 
-    def __init__(self, base_path: Path = None):
-        self.base_path = base_path or Path(".cas")
+        self.base_path = Path(base_path) if base_path is not None else Path(".cas")
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.shard_depth = shard_depth
+        self.shard_width = shard_width
+        self.exclusive = exclusive
+
+        self._cache = ExistenceCache(capacity=cache_size)
+
+        if chunker is None and chunked:
+            from cas.chunking import ContentDefinedChunker
+
+            chunker = ContentDefinedChunker()
+        self.chunker = chunker
+
+        if exclusive:
+            for root, _dirs, files in os.walk(self.base_path):
+                for name in files:
+                    content_hash = (
+                        name[: -len(MANIFEST_SUFFIX)] if name.endswith(MANIFEST_SUFFIX) else name
+                    )
+                    if _HASH_RE.match(content_hash):
+                        self._cache.add(content_hash)
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def path_for(self, content_hash: str) -> Path:
+        """Sharded on-disk path for a hash"""
+        if not _HASH_RE.match(content_hash):
+            raise KeyError(f"Invalid content hash: {content_hash!r}")
+
+        path = self.base_path
+        for level in range(self.shard_depth):
+            start = level * self.shard_width
+            path = path / content_hash[start : start + self.shard_width]
+        return path / content_hash
+
+    def _locate(self, content_hash: str) -> Optional[Path]:
+        """
+        Find the blob on disk, migrating it out of the flat layout if needed.
+
+        Returns:
+            Path to the blob, or None if it is not stored
+        """
+        path = self.path_for(content_hash)
+        if path.is_file():
+            return path
+
+        flat_path = self.base_path / content_hash
+        if flat_path.is_file():
+            self._move_into_shard(flat_path, path)
+            return path
+
+        # A concurrent migration may have moved the blob between the checks
+        if path.is_file():
+            return path
+        return None
+
+    def manifest_path_for(self, content_hash: str) -> Path:
+        """On-disk path of the chunk manifest for a hash"""
+        return self.path_for(content_hash).with_name(content_hash + MANIFEST_SUFFIX)
+
+    def get_manifest(self, content_hash: str):
+        """
+        Load the chunk manifest of a chunked artifact.
+
+        Returns:
+            ChunkManifest, or None if the artifact is absent or stored whole
+        """
+        from cas.chunking import ChunkManifest
+
+        try:
+            return ChunkManifest.from_bytes(self.manifest_path_for(content_hash).read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def _move_into_shard(self, flat_path: Path, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(flat_path, path)
+            logger.debug(f"Migrated {flat_path.name} into sharded layout")
+        except FileNotFoundError:
+            # Another process migrated it first
+            pass
+
+    def migrate_flat_layout(self) -> int:
+        """
+        Move every blob stored in the legacy flat layout into its shard.
+
+        Safe to run while the store is serving reads and writes: each move is
+        a single atomic rename and readers fall back to the flat path.
+
+        Returns:
+            Number of blobs migrated
+        """
+        migrated = 0
+        for entry in os.scandir(self.base_path):
+            if entry.is_file() and _HASH_RE.match(entry.name):
+                self._move_into_shard(Path(entry.path), self.path_for(entry.name))
+                self._cache.add(entry.name)
+                migrated += 1
+
+        if migrated:
+            logger.info(f"Migrated {migrated} blobs from flat to sharded CAS layout")
+        return migrated
+
+    def iter_blobs(self):
+        """Yield ``(hash, path)`` for every stored blob, in either layout"""
+        for root, _dirs, files in os.walk(self.base_path):
+            for name in files:
+                if _HASH_RE.match(name):
+                    yield name, Path(root) / name
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _write_atomic(self, path: Path, data) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
 
     def put(self, data: bytes) -> str:
         """Store data and return its hash"""
         if not isinstance(data, bytes):
             raise TypeError(f"Expected bytes, got {type(data)}")
 
+        timed = obs_metrics is not None and obs_metrics.ENABLED
+        start = time.perf_counter() if timed else 0.0
+
         h = sha256_hash(data)
-        path = self.base_path / h
 
-        if not path.exists():
-            path.write_bytes(data)
+        if not self.exists(h):
+            if self.chunker is not None and len(data) > self.chunker.min_size:
+                self._put_chunked(h, memoryview(data))
+            else:
+                self._write_atomic(self.path_for(h), data)
             logger.debug(f"Stored content: {h} ({len(data)} bytes)")
 
+        self._cache.add(h)
+        if timed:
+            obs_metrics.record_cas("put", len(data), time.perf_counter() - start)
+        return h
+
+    def _put_chunked(self, content_hash: str, view: memoryview) -> None:
+        """Store chunk blobs (skipping ones already present), then the manifest"""
+        from cas.chunking import ChunkManifest
+
+        chunks = self.chunker.split(view)
+        if len(chunks) <= 1:
+            self._write_atomic(self.path_for(content_hash), view)
+            return
+
+        manifest = ChunkManifest(content_hash=content_hash, size=len(view))
+        new_bytes = 0
+        for chunk in chunks:
+            chunk_hash = hashlib.sha256(chunk).hexdigest()
+            if not self.exists(chunk_hash):
+                self._write_atomic(self.path_for(chunk_hash), chunk)
+                self._cache.add(chunk_hash)
+                new_bytes += len(chunk)
+            manifest.chunks.append((chunk_hash, len(chunk)))
+
+        # Manifest last: once it is visible every chunk it names is present
+        self._write_atomic(self.manifest_path_for(content_hash), manifest.to_bytes())
+        logger.debug(
+            f"Stored chunked content: {content_hash} ({len(chunks)} chunks, "
+            f"{new_bytes}/{len(view)} bytes new)"
+        )
+
+    def put_stream(self, stream: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> str:
+        """
+        Store content read from a binary stream and return its hash.
+
+        The stream is hashed and spooled to a temp file chunk by chunk, so
+        artifacts larger than memory can be stored.
+
+        Args:
+            stream: Readable binary file-like object
+            chunk_size: Bytes read per iteration
+
+        Returns:
+            SHA-256 hex digest of the content
+        """
+        timed = obs_metrics is not None and obs_metrics.ENABLED
+        start = time.perf_counter() if timed else 0.0
+        hasher = hashlib.sha256()
+        size = 0
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.base_path, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+            h = hasher.hexdigest()
+
+            if self.exists(h):
+                os.unlink(tmp_name)
+            elif self.chunker is not None and size > self.chunker.min_size:
+                with open(tmp_name, "rb") as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        view = memoryview(mm)
+                        try:
+                            self._put_chunked(h, view)
+                        finally:
+                            view.release()
+                os.unlink(tmp_name)
+            else:
+                path = self.path_for(h)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_name, path)
+                logger.debug(f"Stored streamed content: {h} ({size} bytes)")
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+        self._cache.add(h)
+        if timed:
+            obs_metrics.record_cas("put", size, time.perf_counter() - start)
         return h
 
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _resolve(self, content_hash: str):
+        """
+        Find how an artifact is stored.
+
+        Returns:
+            ``(path, None)`` for a whole blob, ``(None, manifest)`` for a
+            chunked artifact
+
+        Raises:
+            KeyError: If content not found
+        """
+        path = self._locate(content_hash)
+        if path is not None:
+            return path, None
+
+        manifest = self.get_manifest(content_hash)
+        if manifest is not None:
+            return None, manifest
+
+        raise KeyError(f"Content not found: {content_hash}")
+
+    def _chunk_paths(self, manifest) -> list:
+        paths = []
+        for chunk_hash, _size in manifest.chunks:
+            path = self._locate(chunk_hash)
+            if path is None:
+                raise KeyError(f"Chunk {chunk_hash} of {manifest.content_hash} missing")
+            paths.append(path)
+        return paths
+
+    def _reassemble(self, manifest) -> bytes:
+        return b"".join(path.read_bytes() for path in self._chunk_paths(manifest))
+
     def get(self, content_hash: str) -> bytes:
         """Retrieve data by hash"""
-        path = self.base_path / content_hash
-
-        if not path.exists():
-            raise KeyError(f"Content not found: {content_hash}")
+        timed = obs_metrics is not None and obs_metrics.ENABLED
+        start = time.perf_counter() if timed else 0.0
+        path, manifest = self._resolve(content_hash)
 
-        data = path.read_bytes()
+        data = path.read_bytes() if manifest is None else self._reassemble(manifest)
+        self._cache.add(content_hash)
         logger.debug(f"Retrieved content: {content_hash} ({len(data)} bytes)")
+        if timed:
+            obs_metrics.record_cas("get", len(data), time.perf_counter() - start)
         return data
 
+    def open(self, content_hash: str) -> BinaryIO:
+        """
+        Open a stored blob for streaming reads.
+
+        Chunked artifacts are read lazily, one stored chunk at a time.
+
+        Returns:
+            Binary file object; the caller is responsible for closing it
+
+        Raises:
+            KeyError: If content (or any chunk of it) not found
+        """
+        path, manifest = self._resolve(content_hash)
+
+        self._cache.add(content_hash)
+        if manifest is not None:
+            return io.BufferedReader(ChunkedReader(self._chunk_paths(manifest)))
+        return path.open("rb")
+
+    def get_view(self, content_hash: str) -> memoryview:
+        """
+        Zero-copy read of a stored blob.
+
+        Returns a read-only ``memoryview`` over a memory map of the blob, so
+        hashing, slicing and parsing large artifacts never materialize a
+        second copy in the Python heap. The mapping stays valid for as long
+        as the view (or any slice of it) is referenced.
+
+        Chunked artifacts span several files and cannot be mapped as one
+        view: they are reassembled into a single in-memory buffer. Use
+        ``open`` or ``iter_chunks`` to stream them instead.
+
+        Raises:
+            KeyError: If content not found
+        """
+        timed = obs_metrics is not None and obs_metrics.ENABLED
+        start = time.perf_counter() if timed else 0.0
+        path, manifest = self._resolve(content_hash)
+
+        if manifest is not None:
+            view = memoryview(self._reassemble(manifest))
+        else:
+            with path.open("rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    # mmap cannot map empty files
+                    return memoryview(b"")
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mm)
+
+        self._cache.add(content_hash)
+        if timed:
+            obs_metrics.record_cas("get", len(view), time.perf_counter() - start)
+        return view
+
+    def iter_chunks(
+        self, content_hash: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[memoryview]:
+        """
+        Iterate over a stored blob in ``memoryview`` chunks.
+
+        Chunks are slices of one memory map. Pages of chunks already consumed
+        are handed back to the kernel, so resident memory stays around one
+        chunk even for artifacts larger than RAM. Chunked artifacts are
+        streamed one stored chunk at a time.
+
+        Raises:
+            KeyError: If content not found
+        """
+        manifest = self.get_manifest(content_hash) if self._locate(content_hash) is None else None
+        if manifest is not None:
+            for chunk_hash, _size in manifest.chunks:
+                yield from self.iter_chunks(chunk_hash, chunk_size)
+            return
+
+        view = self.get_view(content_hash)
+        mm = view.obj if isinstance(view.obj, mmap.mmap) else None
+        can_release = (
+            mm is not None
+            and hasattr(mm, "madvise")
+            and hasattr(mmap, "MADV_DONTNEED")
+            and chunk_size % mmap.PAGESIZE == 0
+        )
+
+        for offset in range(0, len(view), chunk_size):
+            length = min(chunk_size, len(view) - offset)
+            yield view[offset : offset + length]
+            if can_release:
+                # Read-only file mapping: dropped pages are re-read on demand
+                mm.madvise(mmap.MADV_DONTNEED, offset, length)
+
+    def discard(self, content_hash: str) -> None:
+        """
+        Remove an artifact's blob (or manifest) from the store.
+
+        Content is otherwise never deleted; this exists for stores with a
+        single owner that bound their own size, such as local read caches.
+        Chunk blobs of a chunked artifact are left in place.
+        """
+        if not _HASH_RE.match(content_hash or ""):
+            return
+
+        self._cache.discard(content_hash)
+        self.path_for(content_hash).unlink(missing_ok=True)
+        self.manifest_path_for(content_hash).unlink(missing_ok=True)
+
     def exists(self, content_hash: str) -> bool:
         """Check if content exists"""
-        return (self.base_path / content_hash).exists()
+        if not _HASH_RE.match(content_hash or ""):
+            return False
+
+        if self._cache.contains(content_hash):
+            return True
+
+        if self.exclusive and not self._cache.might_contain(content_hash):
+            return False
+
+        if (
+            self._locate(content_hash) is None
+            and not self.manifest_path_for(content_hash).is_file()
+        ):
+            return False
+
+        self._cache.add(content_hash)
+        return True
 
 
 def get_cas_store(base_path: Optional[Path] = None):
@@ -55,7 +625,9 @@ def get_cas_store(base_path: Optional[Path] = None):
     Factory function to get appropriate CAS store.
 
     Uses feature flag to determine whether to use FileCAS or IPFS backend.
-    Set IPFS_CAS=true environment variable to use IPFS.
+    Set IPFS_CAS=true environment variable to use IPFS. When IPFS_CACHE_DIR
+    is also set, the IPFS store is wrapped in a CachedContentStore with its
+    disk tier there (bounded by IPFS_CACHE_MB, default 1024).
 
     Args:
         base_path: Base path for FileCAS (ignored for IPFS)
@@ -73,8 +645,19 @@ def get_cas_store(base_path: Optional[Path] = None):
         try:
             from cas.ipfs_store import IPFSContentStore
 
+            store = IPFSContentStore()
+            cache_dir = os.getenv("IPFS_CACHE_DIR")
+            if cache_dir:
+                from cas.cached_store import CachedContentStore
+
+                store = CachedContentStore(
+                    store,
+                    cache_dir=Path(cache_dir),
+                    disk_max_bytes=int(os.getenv("IPFS_CACHE_MB", "1024")) * 1024 * 1024,
+                )
+
             logger.info("Using IPFS-backed CAS")
-            return (IPFSContentStore(), True)
+            return (store, True)
         except Exception as e:
             logger.error(f"Failed to initialize IPFS CAS: {e}. Falling back to file-based CAS.")
             return (FileCAS(base_path), False)
@@ -106,5 +689,76 @@ def get_cas_health_status() -> dict:
         return {"backend": "unknown", "is_ipfs": False, "status": f"error: {str(e)}"}
 
 
+# Process-wide store used by the module-level helpers below
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store():
+    """Lazily create the process-wide CAS store selected by the feature flag"""
+    global _default_store
+
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store, _ = get_cas_store()
+    return _default_store
+
+
+def set_default_store(store) -> None:
+    """Override the process-wide CAS store (None resets to the feature flag)"""
+    global _default_store
+    _default_store = store
+
+
+def put_bytes(data: bytes) -> str:
+    """Store bytes in the default CAS and return the content address"""
+    return get_default_store().put(data)
+
+
+def get_bytes(content_hash: str) -> bytes:
+    """Fetch bytes from the default CAS"""
+    return get_default_store().get(content_hash)
+
+
+def get_view(content_hash: str) -> memoryview:
+    """
+    Zero-copy read from the default CAS.
+
+    File-backed stores return a view over a memory map; other backends
+    return a view over the fetched bytes.
+    """
+    store = get_default_store()
+    if hasattr(store, "get_view"):
+        return store.get_view(content_hash)
+    return memoryview(store.get(content_hash))
+
+
+def iter_chunks(content_hash: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[memoryview]:
+    """Stream a blob from the default CAS in ``memoryview`` chunks"""
+    store = get_default_store()
+    if hasattr(store, "iter_chunks"):
+        return store.iter_chunks(content_hash, chunk_size)
+    view = memoryview(store.get(content_hash))
+    return (view[i : i + chunk_size] for i in range(0, len(view), chunk_size))
+
+
+def has_blob(content_hash: str) -> bool:
+    """Check whether the default CAS holds a blob"""
+    if not content_hash:
+        return False
+    return get_default_store().exists(content_hash)
+
+
+def put_json(obj: Any) -> str:
+    """Store an object as canonical JSON in the default CAS"""
+    return put_bytes(json.dumps(obj, sort_keys=True, separators=(",", ":")).encode())
+
+
+def get_json(content_hash: str) -> Any:
+    """Fetch and decode a JSON blob from the default CAS"""
+    return json.loads(get_bytes(content_hash))
+
+
 # Backwards compatibility
 CAS = FileCAS
@@ -5,10 +5,15 @@ Implements deterministic verification rules for each proof type with gas meterin
 to prevent expensive verification attacks.
 """
 
-from typing import Optional, Dict, Any
+import hashlib
+import json
+from typing import Optional, Dict, Any, Iterable, Union
 from dataclasses import dataclass
 from challenges.proofs import ProofType, MAX_GAS_ESTIMATE
 
+# Artifacts may arrive as bytes or as zero-copy views from cas.get_view()
+Artifact = Union[bytes, bytearray, memoryview]
+
 
 @dataclass
 class VerificationResult:
@@ -45,6 +50,7 @@ class ChallengeVerifier:
     GAS_PER_FIELD = 100  # Cost per field checked
     GAS_PER_CITATION = 200  # Cost per citation verified
     GAS_CONTRADICTION_ANALYSIS = 5000  # Cost for semantic analysis
+    GAS_PER_MB_HASHED = 50  # Cost per MiB of artifact hashed
 
     def __init__(self):
         self.gas_limit = MAX_GAS_ESTIMATE
@@ -316,6 +322,50 @@ class ChallengeVerifier:
             evidence={"policy_rule": policy_rule, "details": violation_details},
         )
 
+    def verify_artifact_hash(
+        self, artifact: Union[Artifact, Iterable[Artifact]], expected_hash: str
+    ) -> VerificationResult:
+        """
+        Verify an artifact's SHA-256 against the hash it was committed under.
+
+        Accepts a single buffer or an iterable of chunks (``cas.iter_chunks``).
+        Buffers are fed to the hasher directly, so memory-mapped artifacts are
+        hashed without being copied.
+        """
+        hasher = hashlib.sha256()
+        size = 0
+
+        chunks = [artifact] if isinstance(artifact, (bytes, bytearray, memoryview)) else artifact
+        for chunk in chunks:
+            hasher.update(chunk)
+            size += len(chunk)
+
+        gas_used = self.GAS_BASE + self.GAS_PER_MB_HASHED * ((size >> 20) + 1)
+        actual_hash = hasher.hexdigest()
+        is_valid = actual_hash == expected_hash
+
+        return VerificationResult(
+            is_valid=is_valid,
+            gas_used=min(gas_used, self.gas_limit),
+            reason="Artifact hash matches" if is_valid else "Artifact hash mismatch",
+            evidence={"expected_hash": expected_hash, "actual_hash": actual_hash, "size": size},
+        )
+
+    @staticmethod
+    def artifact_slice(artifact: Artifact, start: int, end: Optional[int] = None) -> memoryview:
+        """Slice an artifact without copying the underlying bytes"""
+        return memoryview(artifact)[start:end]
+
+    @staticmethod
+    def load_artifact_json(artifact: Artifact) -> Any:
+        """
+        Decode a JSON artifact for schema checks.
+
+        Decodes straight from the buffer, skipping the intermediate ``bytes``
+        copy that ``json.loads(bytes(view))`` would make.
+        """
+        return json.loads(str(artifact, "utf-8"))
+
     def _check_type(self, value: Any, expected_type: str) -> bool:
         """Check if value matches expected type"""
         type_map = {
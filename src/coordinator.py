@@ -142,6 +142,30 @@ class Coordinator:
         # Dispatch to registered handler
         handled = await DISPATCHER.dispatch(envelope)
 
+        self._report(kind, handled)
+
+    def submit_envelope(self, envelope: dict):
+        """
+        Queue envelope on the dispatcher without waiting for its handler.
+
+        Envelopes in different threads are handled concurrently; within a
+        thread they are handled in the order submitted.
+
+        Returns:
+            Future that resolves once the envelope has been handled
+        """
+        kind = envelope.get("kind", "UNKNOWN")
+        thread_id = envelope.get("thread_id", "unknown")
+
+        print(f"[COORDINATOR] Received {kind} envelope in thread {thread_id}")
+
+        future = DISPATCHER.submit(envelope)
+        future.add_done_callback(
+            lambda f: None if f.cancelled() or f.exception() else self._report(kind, f.result())
+        )
+        return future
+
+    def _report(self, kind: str, handled: bool):
         if handled:
             print(f"[COORDINATOR] ✓ {kind} handled successfully")
         else:
@@ -150,14 +174,19 @@ class Coordinator:
     async def run(self, thread_pattern: str = "thread.*.*"):
         """
         Start coordinator - subscribe to NATS and route envelopes.
+
+        Handlers for different threads run concurrently unless the
+        dispatcher's max_concurrency (SWARM_DISPATCH_CONCURRENCY) is 1.
         """
         print(f"[COORDINATOR] Starting coordinator on subject pattern: {thread_pattern}")
         print("[COORDINATOR] Listening for envelopes...")
         print("-" * 60)
 
         # Subscribe to all threads and route to handler
+        concurrent = DISPATCHER.max_concurrency > 1
         await subscribe_envelopes(
             thread_id="coordinator",
             subject=thread_pattern,
-            handler=self.handle_envelope,
+            handler=self.submit_envelope if concurrent else self.handle_envelope,
+            concurrent=concurrent,
         )
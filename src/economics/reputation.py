@@ -4,12 +4,22 @@ Reputation Tracker: manage verifier reputation with decay and boost/penalty.
 Integrates with VerifierPool to update reputation scores based on attestations and challenges.
 """
 
+import math
 import time
-from typing import List
+import uuid
+from typing import Dict, Iterable, List, Tuple
 from dataclasses import dataclass
 
 from economics.pools import VerifierPool
 
+WEEK_NS = 7 * 24 * 3600 * 10**9
+
+# Reference time for log-space reputation scores (see ReputationTracker)
+DECAY_EPOCH_NS = 1_704_067_200 * 10**9  # 2024-01-01T00:00:00Z
+
+# SQLite's default limit on bound parameters is 999 before 3.32
+QUERY_CHUNK = 500
+
 
 @dataclass
 class ReputationEvent:
@@ -31,12 +41,23 @@ class ReputationTracker:
     - Successful challenge: +0.1 boost
     - Decay: 5% per week without activity
     - Bounds: 0.0-1.0 (clamped)
+
+    Decay is applied lazily. Last activity per DID is kept in a maintained
+    table rather than aggregated from events, and a reputation r last
+    active at t has the log-space score log(r) + λ × (t - DECAY_EPOCH_NS).
+    Scores are relative to a fixed epoch, so they rank verifiers by decayed
+    reputation without recomputation, and the decayed value at any time is
+    exp(score - λ × (now - DECAY_EPOCH_NS)).
     """
 
     # Reputation constants
     FAILED_ATTESTATION_PENALTY = -0.3
     SUCCESSFUL_CHALLENGE_BOOST = 0.1
     DECAY_RATE_PER_WEEK = 0.05
+    DECAY_GRACE_WEEKS = 0.01  # ~1.7 hours of inactivity before decay applies
+
+    # Log-space decay per nanosecond of inactivity
+    LOG_DECAY_PER_NS = -math.log(1.0 - DECAY_RATE_PER_WEEK) / WEEK_NS
 
     def __init__(self, pool: VerifierPool):
         """
@@ -51,7 +72,7 @@ class ReputationTracker:
         self._init_schema()
 
     def _init_schema(self):
-        """Initialize reputation events table"""
+        """Initialize reputation events and last-activity tables"""
         with self.conn:
             self.conn.execute(
                 """
@@ -73,6 +94,32 @@ class ReputationTracker:
                 "CREATE INDEX IF NOT EXISTS idx_rep_timestamp ON reputation_events(timestamp_ns)"
             )
 
+            exists = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reputation_activity'"
+            ).fetchone()
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS reputation_activity (
+                    did TEXT PRIMARY KEY,
+                    last_activity_ns INTEGER NOT NULL
+                )
+            """
+            )
+            if not exists:
+                # Backfill from events recorded before the table existed
+                self.conn.execute(
+                    """
+                    INSERT INTO reputation_activity (did, last_activity_ns)
+                    SELECT id, MAX(timestamp_ns) FROM (
+                        SELECT did AS id, timestamp_ns FROM reputation_events
+                        UNION ALL
+                        SELECT verifier_id, timestamp_ns FROM reputation_events
+                        WHERE verifier_id IS NOT NULL
+                    )
+                    GROUP BY id
+                """
+                )
+
     def record_attestation(self, did: str, task_id: str, verdict: bool) -> None:
         """
         Record an attestation result.
@@ -118,23 +165,91 @@ class ReputationTracker:
 
             current_rep = verifier.metadata.reputation
             new_rep = self._clamp(current_rep + delta)
+            now_ns = time.time_ns()
 
             with self.conn:
-                # Update pool
-                self.pool.update_reputation(did, new_rep)
+                self._store(did, new_rep, now_ns)
 
                 # Record event
-                import uuid
-
                 event_id = str(uuid.uuid4())
                 self.conn.execute(
                     """
                     INSERT INTO reputation_events (event_id, did, event_type, delta, timestamp_ns, verifier_id)
                     VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                    (event_id, did, event_type, delta, time.time_ns(), did),
+                    (event_id, did, event_type, delta, now_ns, did),
                 )
 
+    def _store(self, did: str, reputation: float, activity_ns: int) -> None:
+        """
+        Write a reputation and the time it is current as of.
+
+        Written directly rather than through VerifierPool.update_reputation,
+        which takes the (non-reentrant) pool lock the caller already holds.
+        Must be called with self.lock held, inside a transaction.
+        """
+        self.conn.execute(
+            "UPDATE verifiers SET reputation = ? WHERE verifier_id = ?",
+            (reputation, did),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO reputation_activity (did, last_activity_ns) VALUES (?, ?)",
+            (did, activity_ns),
+        )
+
+    def _load(self, dids: Iterable[str]) -> Dict[str, Tuple[float, int]]:
+        """
+        Stored reputation and last activity for each registered DID.
+
+        Last activity falls back to the registration time. Queries in
+        chunks of QUERY_CHUNK DIDs.
+
+        Returns:
+            Dict of did -> (stored reputation, last activity ns)
+        """
+        dids = list(dict.fromkeys(dids))
+        rows = {}
+        for start in range(0, len(dids), QUERY_CHUNK):
+            chunk = dids[start : start + QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self.conn.execute(
+                f"""
+                SELECT v.verifier_id, v.reputation, COALESCE(a.last_activity_ns, v.registered_at)
+                FROM verifiers v
+                LEFT JOIN reputation_activity a ON a.did = v.verifier_id
+                WHERE v.verifier_id IN ({placeholders})
+            """,
+                chunk,
+            )
+            for did, reputation, last_activity in cursor:
+                rows[did] = (reputation, last_activity)
+        return rows
+
+    def log_score(self, reputation: float, last_activity_ns: int) -> float:
+        """
+        Log-space score of a reputation last active at last_activity_ns.
+
+        Higher scores mean higher decayed reputation at any later time.
+
+        Args:
+            reputation: Stored reputation (0.0-1.0)
+            last_activity_ns: When the reputation was last current
+
+        Returns:
+            log(reputation) + λ × (last_activity_ns - DECAY_EPOCH_NS)
+        """
+        if reputation <= 0.0:
+            return -math.inf
+        return math.log(reputation) + self.LOG_DECAY_PER_NS * (last_activity_ns - DECAY_EPOCH_NS)
+
+    def _decayed(self, reputation: float, last_activity_ns: int, now_ns: int) -> float:
+        """Reputation at now_ns given its value at last_activity_ns"""
+        if (now_ns - last_activity_ns) / WEEK_NS <= self.DECAY_GRACE_WEEKS:
+            return reputation
+
+        score = self.log_score(reputation, last_activity_ns)
+        return self._clamp(math.exp(score - self.LOG_DECAY_PER_NS * (now_ns - DECAY_EPOCH_NS)))
+
     def get_reputation(self, did: str) -> float:
         """
         Get current reputation with decay applied.
@@ -145,52 +260,73 @@ class ReputationTracker:
         Returns:
             Current reputation (0.0-1.0)
         """
-        verifier = self.pool.get_verifier(did)
-        if not verifier:
-            return 0.0
+        return self.get_reputations([did]).get(did, 0.0)
 
-        # Get last activity (check both did and verifier_id for compatibility)
-        cursor = self.conn.execute(
-            """
-            SELECT MAX(timestamp_ns) FROM reputation_events 
-            WHERE did = ? OR verifier_id = ?
-        """,
-            (did, did),
-        )
-        row = cursor.fetchone()
-        last_activity = row[0] if row[0] else verifier.registered_at
+    def get_reputations(self, dids: Iterable[str]) -> Dict[str, float]:
+        """
+        Get current reputations for many DIDs at once.
 
-        # Calculate weeks inactive
-        weeks_inactive = (time.time_ns() - last_activity) / (7 * 24 * 3600 * 1e9)
+        Issues one query per QUERY_CHUNK DIDs instead of two per DID, for
+        committee selection over large pools.
 
-        if weeks_inactive > 0.01:  # Only apply decay if more than ~1.5 hours inactive
-            # Apply decay
-            decay_factor = (1.0 - self.DECAY_RATE_PER_WEEK) ** weeks_inactive
-            decayed_rep = verifier.metadata.reputation * decay_factor
-            return self._clamp(decayed_rep)
+        Args:
+            dids: DIDs to query reputation for
+
+        Returns:
+            Dict of did -> current reputation (0.0-1.0); unregistered DIDs
+            are omitted
+        """
+        now_ns = time.time_ns()
+        return {
+            did: self._decayed(reputation, last_activity, now_ns)
+            for did, (reputation, last_activity) in self._load(dids).items()
+        }
 
-        return verifier.metadata.reputation
+    def get_log_scores(self, dids: Iterable[str]) -> Dict[str, float]:
+        """
+        Get log-space reputation scores for many DIDs at once.
+
+        Scores order DIDs by decayed reputation (outside the decay grace
+        period) and stay valid until the next reputation event, so they
+        can be cached and compared without recomputing decay.
+
+        Args:
+            dids: DIDs to score
+
+        Returns:
+            Dict of did -> log-space score; unregistered DIDs are omitted
+        """
+        return {
+            did: self.log_score(reputation, last_activity)
+            for did, (reputation, last_activity) in self._load(dids).items()
+        }
 
     def apply_decay(self, did: str) -> float:
         """
         Explicitly apply decay and update stored reputation.
 
+        The decayed value is stored as current as of now, so it is not
+        decayed a second time for the same period.
+
         Args:
             did: DID to apply decay to
 
         Returns:
             New reputation after decay
         """
-        current_rep = self.get_reputation(did)
-
-        # Get stored reputation
-        verifier = self.pool.get_verifier(did)
-        if not verifier:
-            return 0.0
-
-        # If different, update
-        if abs(current_rep - verifier.metadata.reputation) > 0.001:
-            self.pool.update_reputation(did, current_rep)
+        with self.lock:
+            stored = self._load([did]).get(did)
+            if stored is None:
+                return 0.0
+
+            reputation, last_activity = stored
+            now_ns = time.time_ns()
+            current_rep = self._decayed(reputation, last_activity, now_ns)
+
+            # If different, update
+            if abs(current_rep - reputation) > 0.001:
+                with self.conn:
+                    self._store(did, current_rep, now_ns)
 
         return current_rep
 
@@ -42,7 +42,9 @@ class VerifierSelector:
         self.pool = pool
         self.reputation_tracker = reputation_tracker
 
-    def calculate_weight(self, verifier: VerifierRecord) -> float:
+    def calculate_weight(
+        self, verifier: VerifierRecord, reputation: Optional[float] = None
+    ) -> float:
         """
         Calculate selection weight for a verifier.
 
@@ -52,6 +54,7 @@ class VerifierSelector:
 
         Args:
             verifier: VerifierRecord to calculate weight for
+            reputation: Decayed reputation, if already fetched in bulk
 
         Returns:
             Selection weight (higher = more likely to be selected)
@@ -60,7 +63,8 @@ class VerifierSelector:
         stake_weight = math.sqrt(verifier.stake)
 
         # Reputation component (with decay)
-        reputation = self.reputation_tracker.get_reputation(verifier.verifier_id)
+        if reputation is None:
+            reputation = self.reputation_tracker.get_reputation(verifier.verifier_id)
 
         # Recency component (newer verifiers weighted slightly higher)
         age_ns = time.time_ns() - verifier.registered_at
@@ -103,8 +107,11 @@ class VerifierSelector:
         if len(candidates) < k:
             raise ValueError(f"Insufficient qualified verifiers: need {k}, have {len(candidates)}")
 
-        # Calculate weights
-        weights = [self.calculate_weight(v) for v in candidates]
+        # Calculate weights (reputations fetched in bulk)
+        reputations = self.reputation_tracker.get_reputations(v.verifier_id for v in candidates)
+        weights = [
+            self.calculate_weight(v, reputations.get(v.verifier_id, 0.0)) for v in candidates
+        ]
 
         # Try weighted random selection with diversity enforcement
         max_attempts = 1000
@@ -68,13 +68,15 @@ def sign_envelope(env: Dict[str, Any]) -> Dict[str, Any]:
     return sign_record(to_sign)
 
 
-def verify_envelope(env: Dict[str, Any]) -> bool:
+def verify_envelope(env: Dict[str, Any], payload_bytes: Optional[bytes] = None) -> bool:
     # lamport sanity: must be positive int
     if not isinstance(env.get("lamport"), int) or env["lamport"] <= 0:
         return False
-    # payload hash must match
+    # payload hash must match (callers that already serialized the payload pass it in)
     ph = env.get("payload_hash")
-    if ph != _hash_payload(env.get("payload", {})):
+    if payload_bytes is None:
+        payload_bytes = _cjson(env.get("payload", {}))
+    if ph != sha256(payload_bytes).hexdigest():
         return False
     return verify_record(env)
 
@@ -8,6 +8,8 @@ import logging
 from typing import List, Optional, Dict
 from collections import defaultdict
 
+from vocabulary import Vocabulary, get_vocabulary, is_subset
+
 from .manifest import AgentManifest
 
 logger = logging.getLogger(__name__)
@@ -23,11 +25,26 @@ class ManifestRegistry:
     - Agent lookup by DID
     """
 
-    def __init__(self):
-        """Initialize manifest registry."""
+    def __init__(self, vocabulary: Optional[Vocabulary] = None):
+        """
+        Initialize manifest registry.
+
+        Args:
+            vocabulary: Label vocabulary for bitsets (defaults to the global one)
+        """
+        self.vocabulary = vocabulary or get_vocabulary()
+
         # Map agent_id -> manifest
         self.manifests: Dict[str, AgentManifest] = {}
 
+        # Map agent_id -> capability / tag bitsets
+        self.capability_bits: Dict[str, int] = {}
+        self.tag_bits: Dict[str, int] = {}
+
+        # Map agent_id -> registration position, for result ordering
+        self._position: Dict[str, int] = {}
+        self._next_position = 0
+
         # Index: capability -> [agent_ids]
         self.capability_index: Dict[str, List[str]] = defaultdict(list)
 
@@ -54,6 +71,11 @@ class ManifestRegistry:
 
         # Store manifest
         self.manifests[agent_id] = manifest
+        if agent_id not in self._position:
+            self._position[agent_id] = self._next_position
+            self._next_position += 1
+        self.capability_bits[agent_id] = self.vocabulary.encode(manifest.capabilities)
+        self.tag_bits[agent_id] = self.vocabulary.encode(manifest.tags)
 
         # Index by capabilities
         for capability in manifest.capabilities:
@@ -160,6 +182,9 @@ class ManifestRegistry:
 
         # Remove manifest
         del self.manifests[agent_id]
+        del self.capability_bits[agent_id]
+        del self.tag_bits[agent_id]
+        del self._position[agent_id]
 
         logger.info(f"Unregistered agent {agent_id[:30]}...")
 
@@ -202,15 +227,26 @@ class ManifestRegistry:
         Returns:
             List of matching manifests
         """
-        results = list(self.manifests.values())
-
-        # Filter by capabilities
-        if capabilities:
-            results = [m for m in results if all(cap in m.capabilities for cap in capabilities)]
-
-        # Filter by tags
-        if tags:
-            results = [m for m in results if all(tag in m.tags for tag in tags)]
+        if capabilities or tags:
+            # Walk the rarest required label's agents, then check every
+            # required label with one bitset test per index
+            wanted_caps, unknown_caps = self.vocabulary.encode_known(capabilities or [])
+            wanted_tags, unknown_tags = self.vocabulary.encode_known(tags or [])
+            if unknown_caps or unknown_tags:
+                results = []
+            else:
+                postings = [self.capability_index.get(c, []) for c in capabilities or []]
+                postings += [self.tag_index.get(t, []) for t in tags or []]
+                agent_ids = [
+                    aid
+                    for aid in min(postings, key=len)
+                    if is_subset(wanted_caps, self.capability_bits[aid])
+                    and is_subset(wanted_tags, self.tag_bits[aid])
+                ]
+                agent_ids.sort(key=self._position.__getitem__)
+                results = [self.manifests[aid] for aid in agent_ids]
+        else:
+            results = list(self.manifests.values())
 
         # Filter by price
         if max_price is not None:
@@ -12,6 +12,8 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from vocabulary import Vocabulary, from_bytes, is_subset, to_bytes
+
 
 class TaskStatus(Enum):
     """Task status in marketplace"""
@@ -105,6 +107,7 @@ class TaskMarketplace:
                 task_id TEXT PRIMARY KEY,
                 description TEXT NOT NULL,
                 capabilities_required JSON NOT NULL,
+                capabilities_mask BLOB,
                 budget REAL NOT NULL,
                 deadline REAL,
                 status TEXT NOT NULL,
@@ -158,6 +161,16 @@ class TaskMarketplace:
         """
         )
 
+        # Capability vocabulary: bit positions for capabilities_mask
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS capability_vocab (
+                capability TEXT PRIMARY KEY,
+                bit INTEGER NOT NULL UNIQUE
+            )
+        """
+        )
+
         # Indexes
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_status ON tasks(status)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_bid_task ON bids(task_id)")
@@ -167,8 +180,40 @@ class TaskMarketplace:
             "CREATE INDEX IF NOT EXISTS idx_price_capability ON price_history(capability)"
         )
 
+        # Databases created before capabilities_mask existed
+        columns = {row["name"] for row in cursor.execute("PRAGMA table_info(tasks)")}
+        if "capabilities_mask" not in columns:
+            cursor.execute("ALTER TABLE tasks ADD COLUMN capabilities_mask BLOB")
+
+        self.vocabulary = Vocabulary(
+            row["capability"]
+            for row in cursor.execute("SELECT capability FROM capability_vocab ORDER BY bit")
+        )
+
+        # Backfill masks for tasks posted before the column existed
+        rows = cursor.execute(
+            "SELECT task_id, capabilities_required FROM tasks WHERE capabilities_mask IS NULL"
+        ).fetchall()
+        for row in rows:
+            mask = self._encode_capabilities(cursor, json.loads(row["capabilities_required"]))
+            cursor.execute(
+                "UPDATE tasks SET capabilities_mask = ? WHERE task_id = ?",
+                (to_bytes(mask), row["task_id"]),
+            )
+
         self.conn.commit()
 
+    def _encode_capabilities(self, cursor: sqlite3.Cursor, capabilities: List[str]) -> int:
+        """Bitset of capabilities, persisting any newly interned ones"""
+        known = len(self.vocabulary)
+        mask = self.vocabulary.encode(capabilities)
+        for bit in range(known, len(self.vocabulary)):
+            cursor.execute(
+                "INSERT INTO capability_vocab (capability, bit) VALUES (?, ?)",
+                (self.vocabulary.labels[bit], bit),
+            )
+        return mask
+
     def post_task(
         self,
         task_id: str,
@@ -194,17 +239,20 @@ class TaskMarketplace:
         """
         cursor = self.conn.cursor()
 
+        mask = self._encode_capabilities(cursor, capabilities_required)
+
         cursor.execute(
             """
             INSERT INTO tasks 
-            (task_id, description, capabilities_required, budget, deadline, 
+            (task_id, description, capabilities_required, capabilities_mask, budget, deadline, 
              status, poster_id, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
             (
                 task_id,
                 description,
                 json.dumps(capabilities_required),
+                to_bytes(mask),
                 budget,
                 deadline,
                 TaskStatus.OPEN.value,
@@ -246,6 +294,13 @@ class TaskMarketplace:
         """
         cursor = self.conn.cursor()
 
+        # Required capabilities as a bitset; one nobody has posted matches nothing
+        wanted = 0
+        if capabilities:
+            wanted, unknown = self.vocabulary.encode_known(capabilities)
+            if unknown:
+                return []
+
         query = "SELECT * FROM tasks WHERE 1=1"
         params = []
 
@@ -268,12 +323,11 @@ class TaskMarketplace:
 
         tasks = []
         for row in rows:
-            task_caps = json.loads(row["capabilities_required"])
+            # Filter by capabilities before decoding the row's JSON
+            if wanted and not is_subset(wanted, from_bytes(row["capabilities_mask"])):
+                continue
 
-            # Filter by capabilities if specified
-            if capabilities:
-                if not all(cap in task_caps for cap in capabilities):
-                    continue
+            task_caps = json.loads(row["capabilities_required"])
 
             tasks.append(
                 {
@@ -1,18 +1,11 @@
 """
 Observability module for distributed tracing and monitoring.
 
-Provides OpenTelemetry integration for the agent swarm.
+Provides OpenTelemetry integration for the agent swarm. Tracing helpers are
+imported on first use, so importing ``observability.metrics`` from hot-path
+modules does not pull in the OpenTelemetry SDK.
 """
 
-from .tracing import (
-    setup_tracing,
-    create_span,
-    get_current_span,
-    propagate_context,
-    extract_context,
-    get_tracer,
-)
-
 __all__ = [
     "setup_tracing",
     "create_span",
@@ -21,3 +14,11 @@ __all__ = [
     "extract_context",
     "get_tracer",
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import tracing
+
+        return getattr(tracing, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -12,8 +12,161 @@ from prometheus_client import (
     generate_latest,
     REGISTRY,
 )
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+from prometheus_client.utils import INF, floatToGoString
+import os
+import threading
 import time
-from functools import wraps
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from functools import lru_cache, wraps
+from typing import Any, Dict, Iterable, Sequence, Tuple
+
+# Global switch for hot-path instrumentation (bus, gates, dispatcher, stores).
+# Set SWARM_METRICS=0 to disable, or call set_enabled() at runtime.
+ENABLED = os.getenv("SWARM_METRICS", "1").lower() not in ("0", "false", "no", "off")
+
+
+# ============================================================================
+# HOT-PATH METRIC TYPES
+# ============================================================================
+#
+# prometheus_client takes a lock per bucket, per sum and per counter, which
+# costs 1-2us per observation. Metrics recorded once or more per envelope use
+# these types instead: one lock per child, a bisect for the bucket, and
+# cumulative bucket counts are only built at scrape time. They are exported
+# through REGISTRY under the same names and in the same format.
+
+
+class _HotHistogramChild:
+    __slots__ = ("_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, amount: float) -> None:
+        i = bisect_left(self._bounds, amount)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += amount
+
+    def observe_many(self, amount: float, count: int) -> None:
+        """Observe the same value ``count`` times"""
+        i = bisect_left(self._bounds, amount)
+        with self._lock:
+            self._counts[i] += count
+            self._sum += amount * count
+
+    def _snapshot(self) -> Tuple[list, float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class _HotCounterChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts.")
+        with self._lock:
+            self._value += amount
+
+    def _snapshot(self) -> float:
+        with self._lock:
+            return self._value
+
+
+class _HotMetric(ABC):
+    """Labelled parent shared by HotHistogram and HotCounter"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self._name = name
+        self._documentation = documentation
+        self._labelnames = tuple(labelnames)
+        self._metrics: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if not self._labelnames:
+            # Unlabelled metrics export zero samples before their first observation
+            self._metrics[()] = self._new_child()
+        REGISTRY.register(self)
+
+    @abstractmethod
+    def _new_child(self):
+        """Create the child holding values for one set of label values"""
+
+    def labels(self, *labelvalues: str, **labelkwargs: str):
+        """Get the child for a set of label values (positional or by name)"""
+        if labelkwargs:
+            labelvalues = tuple(labelkwargs[name] for name in self._labelnames)
+        child = self._metrics.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self._labelnames):
+                raise ValueError(f"Incorrect label count for {self._name}")
+            with self._lock:
+                child = self._metrics.setdefault(labelvalues, self._new_child())
+        return child
+
+    def _items(self) -> Iterable[Tuple[list, Any]]:
+        with self._lock:
+            items = list(self._metrics.items())
+        return [([str(v) for v in values], child) for values, child in items]
+
+
+class HotHistogram(_HotMetric):
+    """Histogram for per-envelope hot paths"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    ):
+        self._bounds = tuple(sorted(float(b) for b in buckets if b != INF))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HotHistogramChild:
+        return _HotHistogramChild(self._bounds)
+
+    def observe(self, amount: float) -> None:
+        """Observe on an unlabelled histogram"""
+        self.labels().observe(amount)
+
+    def collect(self):
+        family = HistogramMetricFamily(self._name, self._documentation, labels=self._labelnames)
+        for labelvalues, child in self._items():
+            counts, total = child._snapshot()
+            buckets = []
+            cumulative = 0
+            for bound, count in zip(self._bounds + (INF,), counts):
+                cumulative += count
+                buckets.append((floatToGoString(bound), cumulative))
+            family.add_metric(labelvalues, buckets, total)
+        yield family
+
+
+class HotCounter(_HotMetric):
+    """Counter for per-envelope hot paths"""
+
+    def _new_child(self) -> _HotCounterChild:
+        return _HotCounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        """Increment an unlabelled counter"""
+        self.labels().inc(amount)
+
+    def collect(self):
+        family = CounterMetricFamily(self._name, self._documentation, labels=self._labelnames)
+        for labelvalues, child in self._items():
+            family.add_metric(labelvalues, child._snapshot())
+        yield family
 
 
 # ============================================================================
@@ -21,43 +174,103 @@ from functools import wraps
 # ============================================================================
 
 # Message counters
-messages_published_total = Counter(
+messages_published_total = HotCounter(
     "agent_swarm_messages_published_total",
     "Total number of messages published to the bus",
     ["kind", "subject"],
 )
 
-messages_received_total = Counter(
+messages_received_total = HotCounter(
     "agent_swarm_messages_received_total",
     "Total number of messages received from the bus",
     ["kind", "subject"],
 )
 
-messages_failed_total = Counter(
+messages_failed_total = HotCounter(
     "agent_swarm_messages_failed_total",
     "Total number of failed message operations",
     ["kind", "operation", "error_type"],
 )
 
 # Latency histograms
-bus_publish_latency = Histogram(
+bus_publish_latency = HotHistogram(
     "agent_swarm_bus_publish_latency_seconds",
     "Time to publish a message to the bus",
     buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0],
 )
 
+bus_publish_kind_latency = HotHistogram(
+    "agent_swarm_bus_publish_kind_latency_seconds",
+    "Time to publish a message to the bus, by envelope kind",
+    ["kind"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0],
+)
+
+bus_deliver_latency = HotHistogram(
+    "agent_swarm_bus_deliver_latency_seconds",
+    "Time from receipt of an envelope to its handler returning",
+    ["kind"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0],
+)
+
 decide_latency = Histogram(
     "agent_swarm_decide_latency_seconds",
     "Time to process a DECIDE message",
     buckets=[0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0],
 )
 
-policy_eval_latency = Histogram(
+policy_eval_latency = HotHistogram(
     "agent_swarm_policy_eval_latency_seconds",
     "Time to evaluate a policy",
     buckets=[0.001, 0.005, 0.01, 0.020, 0.050, 0.1, 0.25],
 )
 
+policy_gate_latency = HotHistogram(
+    "agent_swarm_policy_gate_latency_seconds",
+    "Time to evaluate a policy, by gate",
+    ["gate"],
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.020, 0.050, 0.1, 0.25],
+)
+
+policy_gas_used = HotHistogram(
+    "agent_swarm_policy_gas_used",
+    "Gas consumed per policy gate decision",
+    ["gate"],
+    buckets=[0, 10, 50, 100, 500, 1000, 5000, 10000, 100000],
+)
+
+policy_decisions_total = HotCounter(
+    "agent_swarm_policy_decisions_total",
+    "Total policy gate decisions",
+    ["gate", "decision"],  # decision: 'allow' or 'deny'
+)
+
+verb_handler_latency = HotHistogram(
+    "agent_swarm_verb_handler_latency_seconds",
+    "Time spent in a verb handler",
+    ["verb"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0],
+)
+
+plan_store_append_latency = HotHistogram(
+    "agent_swarm_plan_store_append_latency_seconds",
+    "Time to append an op to the plan store",
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1],
+)
+
+cas_latency = HotHistogram(
+    "agent_swarm_cas_latency_seconds",
+    "Time for a content-addressed storage operation",
+    ["operation"],  # 'get' or 'put'
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0],
+)
+
+cas_bytes_total = HotCounter(
+    "agent_swarm_cas_bytes_total",
+    "Total bytes read from or written to content-addressed storage",
+    ["operation"],
+)
+
 verification_latency = Histogram(
     "agent_swarm_verification_latency_seconds",
     "Time to verify a result",
@@ -204,6 +417,103 @@ class MetricsContext:
         self.labels.update(labels)
 
 
+# ============================================================================
+# HOT-PATH RECORDING
+# ============================================================================
+#
+# Callers check ``ENABLED`` before timing anything, so a disabled build only
+# pays for one attribute lookup per call site.
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn hot-path instrumentation on or off"""
+    global ENABLED
+    ENABLED = enabled
+
+
+def is_enabled() -> bool:
+    """Whether hot-path instrumentation is on"""
+    return ENABLED
+
+
+@lru_cache(maxsize=4096)
+def subject_label(subject: str) -> str:
+    """
+    Collapse per-thread subjects to keep label cardinality bounded.
+
+    ``thread.<thread_id>.<role>`` becomes ``thread.*.<role>``.
+    """
+    parts = subject.split(".")
+    if len(parts) == 3 and parts[0] == "thread":
+        return f"thread.*.{parts[2]}"
+    return subject
+
+
+def record_publish(kind: str, subject: str, seconds: float) -> None:
+    """Record a message published to the bus"""
+    messages_published_total.labels(kind, subject_label(subject)).inc()
+    bus_publish_latency.observe(seconds)
+    bus_publish_kind_latency.labels(kind).observe(seconds)
+
+
+def record_delivery(kind: str, subject: str, seconds: float) -> None:
+    """Record an envelope delivered to a subscriber handler"""
+    messages_received_total.labels(kind, subject_label(subject)).inc()
+    bus_deliver_latency.labels(kind).observe(seconds)
+
+
+def record_rejected(kind: str, operation: str, error_type: str) -> None:
+    """Record a message dropped by validation or a gate"""
+    messages_failed_total.labels(kind, operation, error_type).inc()
+
+
+def record_gate_decision(gate: str, allowed: bool, seconds: float, gas_used: int) -> None:
+    """Record a policy gate decision"""
+    policy_decisions_total.labels(gate, "allow" if allowed else "deny").inc()
+    policy_eval_latency.observe(seconds)
+    policy_gate_latency.labels(gate).observe(seconds)
+    policy_gas_used.labels(gate).observe(gas_used)
+
+
+def record_gate_batch(gate: str, outcomes: Sequence[Tuple[bool, int]], seconds: float) -> None:
+    """
+    Record decisions from one batch evaluation at a gate.
+
+    Args:
+        gate: Gate name
+        outcomes: (allowed, gas_used) per decision
+        seconds: Latency to attribute to each decision (batch time / size)
+    """
+    allowed = sum(1 for ok, _ in outcomes if ok)
+    if allowed:
+        policy_decisions_total.labels(gate, "allow").inc(allowed)
+    if allowed < len(outcomes):
+        policy_decisions_total.labels(gate, "deny").inc(len(outcomes) - allowed)
+    policy_eval_latency.labels().observe_many(seconds, len(outcomes))
+    policy_gate_latency.labels(gate).observe_many(seconds, len(outcomes))
+    gas = policy_gas_used.labels(gate)
+    for _, gas_used in outcomes:
+        gas.observe(gas_used)
+
+
+def record_verb(verb: str, seconds: float) -> None:
+    """Record a verb handler invocation"""
+    verb_handler_latency.labels(verb).observe(seconds)
+    if verb == "DECIDE":
+        decide_latency.observe(seconds)
+
+
+def record_plan_append(seconds: float) -> None:
+    """Record a plan store append"""
+    plan_store_append_latency.observe(seconds)
+
+
+def record_cas(operation: str, num_bytes: int, seconds: float) -> None:
+    """Record a CAS get or put"""
+    cas_latency.labels(operation).observe(seconds)
+    cas_bytes_total.labels(operation).inc(num_bytes)
+
+
 # ============================================================================
 # METRICS COLLECTOR
 # ============================================================================
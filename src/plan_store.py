@@ -10,11 +10,17 @@ Tables:
 import sqlite3
 import json
 import asyncio
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from observability import metrics as obs_metrics
+except ImportError:
+    obs_metrics = None
+
 
 class OpType(Enum):
     ADD_TASK = "ADD_TASK"
@@ -100,6 +106,8 @@ class PlanStore:
 
     async def append_op(self, op: PlanOp) -> None:
         """Append operation and update derived views"""
+        timed = obs_metrics is not None and obs_metrics.ENABLED
+        start = time.perf_counter() if timed else 0.0
         async with self.lock:
             with self.conn:
                 # Insert op
@@ -124,6 +132,9 @@ class PlanStore:
                 # Update derived views
                 self._apply_op(op)
 
+        if timed:
+            obs_metrics.record_plan_append(time.perf_counter() - start)
+
     def _apply_op(self, op: PlanOp):
         """Update derived tables based on op type"""
         if op.op_type == OpType.ADD_TASK:
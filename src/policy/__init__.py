@@ -3,7 +3,7 @@ Policy management and backward-compatible validation API.
 """
 
 import hashlib
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from policy.opa_engine import OPAEngine, PolicyResult, BasePolicyEngine
 
@@ -17,23 +17,21 @@ _MAX_PAYLOAD_BYTES = 64 * 1024  # 64KB
 _LEGACY_ALLOWED_KINDS = {"PLAN", "FINAL"}
 
 
-def _canonical_payload_size(payload: Dict[str, Any]) -> int:
-    """Return canonical JSON payload byte size."""
+def _canonical_payload_bytes(payload: Dict[str, Any]) -> bytes:
+    """Return canonical JSON payload bytes (sized and hashed as one)."""
     import json
 
-    return len(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode())
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
 
 
-def current_policy_hash() -> str:
-    """
-    Return deterministic hash of the active envelope policy contract.
-
-    This keeps legacy callers stable while policy internals evolve.
-    """
+def _contract_hash() -> str:
+    """Return deterministic hash of the built-in envelope policy contract."""
     contract = {
         "allowed_kinds": sorted(BasePolicyEngine.ALLOWED_KINDS),
         "max_payload_bytes": _MAX_PAYLOAD_BYTES,
-        "required_fields": sorted(["kind", "thread_id", "lamport", "payload", "policy_engine_hash"]),
+        "required_fields": sorted(
+            ["kind", "thread_id", "lamport", "payload", "policy_engine_hash"]
+        ),
         "version": "legacy-v0-compat",
     }
     import json
@@ -43,32 +41,89 @@ def current_policy_hash() -> str:
     ).hexdigest()
 
 
+_BUILTIN_POLICY_HASH = _contract_hash()
+_policy_hash = _BUILTIN_POLICY_HASH
+
+
+def current_policy_hash() -> str:
+    """
+    Return hash of the active envelope policy.
+
+    This is the built-in contract hash (stable for legacy callers) until a
+    capsule is activated on the global CapsuleManager. The hash is computed
+    once per policy and swapped as a single reference, so calling this on
+    every envelope costs nothing.
+    """
+    return _policy_hash
+
+
+def set_current_policy_hash(policy_hash: Optional[str]) -> None:
+    """
+    Swap the active envelope policy hash.
+
+    Args:
+        policy_hash: Hash of the newly active policy, or None to restore the
+            built-in contract hash
+    """
+    global _policy_hash
+    _policy_hash = policy_hash or _BUILTIN_POLICY_HASH
+
+
 def validate_envelope(envelope: Dict[str, Any]) -> bool:
     """
     Validate signed envelope and enforce baseline policy checks.
 
+    The checks are those of validate_envelopes, so single and batch ingest
+    enforce one contract.
+
     Raises:
         PolicyError: If validation fails.
     """
+    error = validate_envelopes([envelope])[0]
+    if error is not None:
+        raise error
+    return True
+
+
+def validate_envelopes(envelopes: List[Dict[str, Any]]) -> List[Optional[PolicyError]]:
+    """
+    Validate a batch of envelopes against the baseline ingress contract.
+
+    Checks, in order: allowed kind, canonical payload size, policy hash, then
+    signature and payload hash. validate_envelope delegates here.
+
+    The allowed kinds and policy hash are resolved once per batch, and each
+    payload is serialized once for both the size limit and the payload hash.
+
+    Args:
+        envelopes: Envelopes to validate
+
+    Returns:
+        One entry per envelope: None if valid, otherwise the PolicyError that
+        validate_envelope would have raised
+    """
     from envelope import verify_envelope
 
     allowed_kinds = set(BasePolicyEngine.ALLOWED_KINDS) | _LEGACY_ALLOWED_KINDS
-    kind = envelope.get("kind")
-    if kind not in allowed_kinds:
-        raise PolicyError("kind not allowed")
-
-    payload = envelope.get("payload", {})
-    if _canonical_payload_size(payload) > _MAX_PAYLOAD_BYTES:
-        raise PolicyError("payload too large")
+    policy_hash = current_policy_hash()
 
-    policy_hash = envelope.get("policy_engine_hash")
-    if policy_hash != current_policy_hash():
-        raise PolicyError("policy_engine_hash mismatch")
+    results: List[Optional[PolicyError]] = []
+    for envelope in envelopes:
+        if envelope.get("kind") not in allowed_kinds:
+            results.append(PolicyError("kind not allowed"))
+            continue
 
-    if not verify_envelope(envelope):
-        raise PolicyError("signature or payload_hash invalid")
+        payload_bytes = _canonical_payload_bytes(envelope.get("payload", {}))
+        if len(payload_bytes) > _MAX_PAYLOAD_BYTES:
+            results.append(PolicyError("payload too large"))
+        elif envelope.get("policy_engine_hash") != policy_hash:
+            results.append(PolicyError("policy_engine_hash mismatch"))
+        elif not verify_envelope(envelope, payload_bytes):
+            results.append(PolicyError("signature or payload_hash invalid"))
+        else:
+            results.append(None)
 
-    return True
+    return results
 
 
 __all__ = [
@@ -77,5 +132,7 @@ __all__ = [
     "BasePolicyEngine",
     "PolicyError",
     "validate_envelope",
+    "validate_envelopes",
     "current_policy_hash",
+    "set_current_policy_hash",
 ]
@@ -4,15 +4,29 @@ Policy Capsules & Versioning
 Provides cryptographically signed policy distributions with conformance guarantees.
 Capsules contain the policy WASM hash, schema version, conformance test results,
 and a signature from the policy author.
+
+A capsule may also carry its Rego source, pinned by ``policy_engine_hash``.
+Activating such a capsule compiles it once and publishes an immutable
+ActivePolicy snapshot with a single reference swap (RCU-style): readers take
+``manager.active`` without locking, and only activations serialize.
 """
 
 import json
 import hashlib
 import logging
+import threading
+import weakref
 from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from pathlib import Path
 
+from policy.rego_compiler import (
+    CompiledPolicy,
+    RegoCompileError,
+    compile_policy,
+    policy_source_hash,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +41,8 @@ class PolicyCapsule:
     - conformance_vector: List of passed conformance test IDs
     - signature: Capsule signed by policy author
     - metadata: Additional metadata (author, timestamp, etc.)
+    - policy_source: Optional Rego source; its hash must equal
+      policy_engine_hash, so the signature covers it transitively
     """
 
     policy_engine_hash: str
@@ -34,6 +50,7 @@ class PolicyCapsule:
     conformance_vector: List[str]
     signature: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    policy_source: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert capsule to dictionary"""
@@ -66,6 +83,26 @@ class PolicyCapsule:
         }
         return json.dumps(unsigned_data, sort_keys=True).encode("utf-8")
 
+    def verify_artifact(self) -> bool:
+        """Check that the carried policy source (if any) matches the pinned hash"""
+        if self.policy_source is None:
+            return True
+        return policy_source_hash(self.policy_source) == self.policy_engine_hash
+
+
+@dataclass(frozen=True)
+class ActivePolicy:
+    """
+    Immutable snapshot of the active policy.
+
+    Replaced as a whole on activation, so a reader holding one always sees a
+    consistent hash, capsule and compiled policy.
+    """
+
+    policy_hash: Optional[str] = None
+    capsule: Optional[PolicyCapsule] = None
+    compiled: Optional[CompiledPolicy] = None  # Set for capsules carrying Rego source
+
 
 class CapsuleManager:
     """
@@ -81,6 +118,9 @@ class CapsuleManager:
         """
         self.nats_client = nats_client
         self.received_capsules: Dict[str, PolicyCapsule] = {}
+        self._active = ActivePolicy()
+        self._activation_lock = threading.Lock()  # Serializes writers only
+        self._activation_listeners: List[Callable[[], Optional[Callable]]] = []
         logger.info("CapsuleManager initialized")
 
     def create_capsule(
@@ -94,7 +134,8 @@ class CapsuleManager:
         Create a new policy capsule.
 
         Args:
-            wasm_path: Path to WASM policy file (None for Python-based policy)
+            wasm_path: Path to WASM policy file, or a .rego file whose source
+                travels with the capsule (None for Python-based policy)
             tests_passed: List of conformance test IDs that passed
             schema_version: Policy schema version
             metadata: Optional metadata
@@ -103,7 +144,11 @@ class CapsuleManager:
             Unsigned PolicyCapsule
         """
         # Calculate policy hash
-        if wasm_path and wasm_path.exists():
+        policy_source = None
+        if wasm_path and wasm_path.suffix == ".rego" and wasm_path.exists():
+            policy_source = wasm_path.read_text()
+            policy_hash = policy_source_hash(policy_source)
+        elif wasm_path and wasm_path.exists():
             with open(wasm_path, "rb") as f:
                 policy_hash = hashlib.sha256(f.read()).hexdigest()
         else:
@@ -127,6 +172,7 @@ class CapsuleManager:
             policy_schema_version=schema_version,
             conformance_vector=sorted(tests_passed),
             metadata=metadata or {},
+            policy_source=policy_source,
         )
 
         logger.info(
@@ -168,6 +214,7 @@ class CapsuleManager:
             conformance_vector=capsule.conformance_vector,
             signature=signature,
             metadata=capsule.metadata,
+            policy_source=capsule.policy_source,
         )
 
         logger.info(f"Signed capsule: signature={signature[:16]}...")
@@ -240,6 +287,7 @@ class CapsuleManager:
         capsule: PolicyCapsule,
         conformance_checker=None,
         signer_key: Optional[str] = None,
+        activate: bool = False,
     ) -> bool:
         """
         Receive and validate a policy capsule from peers.
@@ -248,9 +296,10 @@ class CapsuleManager:
             capsule: Received capsule
             conformance_checker: ConformanceChecker instance for validation
             signer_key: Expected signer's key for verification
+            activate: Also make the capsule the active policy
 
         Returns:
-            True if capsule was accepted and loaded
+            True if capsule was accepted and loaded (and activated, if requested)
         """
         try:
             # 1. Verify signature
@@ -258,6 +307,10 @@ class CapsuleManager:
                 logger.error("Capsule signature verification failed")
                 return False
 
+            if not capsule.verify_artifact():
+                logger.error("Capsule policy source does not match its policy hash")
+                return False
+
             # 2. Validate conformance if checker is provided
             if conformance_checker:
                 # Check if checker has validate_conformance method
@@ -275,6 +328,8 @@ class CapsuleManager:
                 f"version={capsule.policy_schema_version}"
             )
 
+            if activate:
+                return self.activate_capsule(capsule.policy_engine_hash)
             return True
 
         except Exception as e:
@@ -289,16 +344,151 @@ class CapsuleManager:
         """List all received capsules"""
         return list(self.received_capsules.values())
 
+    async def subscribe_capsules(
+        self,
+        subject: str = "policy.capsule.update",
+        conformance_checker=None,
+        signer_key: Optional[str] = None,
+        activate: bool = False,
+    ):
+        """
+        Receive (and optionally activate) capsules distributed to a subject.
+
+        Without a signer key, verification only checks an unkeyed hash that
+        anyone can produce, so activation requires one.
+
+        Args:
+            subject: NATS subject capsules are distributed on
+            conformance_checker: ConformanceChecker instance for validation
+            signer_key: Expected signer's key for verification
+            activate: Activate each accepted capsule (requires signer_key)
+
+        Returns:
+            The NATS subscription, or None without a NATS client
+
+        Raises:
+            ValueError: If activate is set without a signer_key
+        """
+        if activate and not signer_key:
+            raise ValueError("Activating distributed capsules requires a signer_key")
+
+        if not self.nats_client:
+            logger.warning("No NATS client configured, cannot subscribe to capsules")
+            return None
+
+        async def on_capsule(msg):
+            try:
+                capsule = PolicyCapsule.from_json(msg.data.decode("utf-8"))
+            except (ValueError, TypeError) as e:
+                logger.error(f"Discarding malformed capsule on {subject}: {e}")
+                return
+            await self.receive_capsule(capsule, conformance_checker, signer_key, activate)
+
+        return await self.nats_client.subscribe(subject, cb=on_capsule)
+
+    @property
+    def active(self) -> ActivePolicy:
+        """Snapshot of the active policy (lock-free; replaced on activation)"""
+        return self._active
+
+    @property
+    def active_policy_hash(self) -> Optional[str]:
+        """Policy hash of the active capsule, if any"""
+        return self._active.policy_hash
+
+    @property
+    def active_capsule(self) -> Optional[PolicyCapsule]:
+        """The currently active capsule, if any"""
+        return self._active.capsule
+
+    def activate_capsule(self, policy_hash: str) -> bool:
+        """
+        Make a received capsule the active policy.
+
+        A capsule carrying Rego source is compiled here, once, and must
+        compile to its pinned hash. The new ActivePolicy snapshot is then
+        published with one reference assignment and activation listeners are
+        notified with the capsule.
+
+        Args:
+            policy_hash: Policy hash of a previously received capsule
+
+        Returns:
+            True if the capsule is now active
+        """
+        capsule = self.received_capsules.get(policy_hash)
+        if capsule is None:
+            logger.warning(f"Cannot activate unknown capsule: {policy_hash[:16]}...")
+            return False
+
+        with self._activation_lock:
+            if policy_hash == self._active.policy_hash:
+                return True
+
+            compiled = None
+            if capsule.policy_source is not None:
+                try:
+                    compiled = compile_policy(capsule.policy_source)
+                except RegoCompileError as e:
+                    logger.error(f"Cannot activate capsule {policy_hash[:16]}...: {e}")
+                    return False
+                if compiled.policy_hash != policy_hash:
+                    logger.error(f"Capsule {policy_hash[:16]}... compiled to a different hash")
+                    return False
+
+            self._active = ActivePolicy(policy_hash, capsule, compiled)
+
+        logger.info(
+            f"Activated capsule: hash={policy_hash[:16]}..., "
+            f"version={capsule.policy_schema_version}"
+        )
+
+        for ref in list(self._activation_listeners):
+            callback = ref()
+            if callback is None:
+                self._activation_listeners.remove(ref)
+                continue
+            try:
+                callback(capsule)
+            except Exception as e:
+                logger.error(f"Capsule activation listener failed: {e}", exc_info=True)
+
+        return True
+
+    def add_activation_listener(self, callback: Callable[[PolicyCapsule], None]) -> None:
+        """
+        Register a callback invoked with the capsule on each activation.
+
+        Bound methods are held weakly so listeners do not keep their owners
+        alive.
+
+        Args:
+            callback: Callable taking the newly active PolicyCapsule
+        """
+        if hasattr(callback, "__self__"):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback  # noqa: E731
+        self._activation_listeners.append(ref)
+
 
 # Global capsule manager instance
 _capsule_manager: Optional[CapsuleManager] = None
 
 
+def _publish_policy_hash(capsule: PolicyCapsule) -> None:
+    """Make the global manager's active policy the one envelopes are stamped with"""
+    from policy import set_current_policy_hash
+
+    set_current_policy_hash(capsule.policy_engine_hash)
+
+
 def get_capsule_manager() -> CapsuleManager:
     """Get global capsule manager instance"""
     global _capsule_manager
     if _capsule_manager is None:
         _capsule_manager = CapsuleManager()
+        _capsule_manager.add_activation_listener(_publish_policy_hash)
     return _capsule_manager
 
 
@@ -312,6 +502,10 @@ def init_capsule_manager(nats_client=None) -> CapsuleManager:
     Returns:
         CapsuleManager instance
     """
+    from policy import set_current_policy_hash
+
     global _capsule_manager
     _capsule_manager = CapsuleManager(nats_client)
+    _capsule_manager.add_activation_listener(_publish_policy_hash)
+    set_current_policy_hash(None)
     return _capsule_manager
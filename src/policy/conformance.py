@@ -89,6 +89,29 @@ class ConformanceChecker:
 
         return passed_tests
 
+    def run_rego_tests(self) -> List[str]:
+        """
+        Run the ``test_*`` rules of ``conformance_tests.rego`` in-process.
+
+        The test rules refer to the policy's rules (e.g. ``allow``)
+        unqualified; they are resolved against the compiled policy under test.
+
+        Returns:
+            List of test IDs that passed (empty if the policy is not compiled)
+        """
+        from policy.opa_engine import OPAEngine
+        from policy.rego_compiler import load_policy
+
+        engine = OPAEngine(policy_path=self.policy_path)
+        tests_file = Path(engine.policy_path) / "conformance_tests.rego"
+        if engine.compiled is None or not tests_file.is_file():
+            logger.warning("Rego conformance tests need a compiled policy and test module")
+            return []
+
+        passed_tests = load_policy(tests_file, imports=[engine.compiled]).run_tests()
+        logger.info(f"Rego conformance tests: {len(passed_tests)} passed")
+        return passed_tests
+
     def _run_test(self, test_id: str, runtime) -> bool:
         """
         Run a single conformance test.
@@ -0,0 +1,146 @@
+"""
+Policy Decision Cache
+
+Bounded LRU cache of gate decisions keyed by content: the hash of the policy
+that produced the decision, the gate, and the digest of the extracted policy
+input. Policy evaluation is deterministic in those three values, so a
+re-delivered or fanned-out envelope can reuse an earlier decision.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .eval_digest import compute_input_digest
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str]
+
+
+class DecisionCache:
+    """
+    Thread-safe LRU cache of policy decisions with TTL.
+
+    Entries expire after ``ttl_seconds`` and the least recently used entry is
+    evicted once ``max_entries`` is reached. ``invalidate()`` drops everything,
+    e.g. when a new policy capsule is activated.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0):
+        """
+        Initialize decision cache.
+
+        Args:
+            max_entries: Maximum cached decisions
+            ttl_seconds: Time-to-live for cached decisions
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # OrderedDict for LRU: key -> (timestamp, decision)
+        self._entries: OrderedDict[CacheKey, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(policy_hash: Optional[str], gate: str, policy_input: Dict[str, Any]) -> CacheKey:
+        """
+        Build the cache key for a policy evaluation.
+
+        Args:
+            policy_hash: Hash of the policy that evaluates the input
+            gate: Gate name
+            policy_input: Extracted policy input
+
+        Returns:
+            (policy_hash, gate, input_digest) tuple
+        """
+        return (policy_hash or "", gate, compute_input_digest(policy_input))
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """
+        Look up a decision.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached decision, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            timestamp, decision = entry
+            if time.monotonic() - timestamp > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return decision
+
+    def put(self, key: CacheKey, decision: Any) -> None:
+        """
+        Store a decision.
+
+        Args:
+            key: Key from make_key()
+            decision: Decision to cache
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), decision)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> int:
+        """
+        Drop all cached decisions.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            self.invalidations += 1
+
+        if dropped:
+            logger.info(f"Invalidated {dropped} cached policy decisions")
+        return dropped
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -121,3 +121,20 @@ def create_eval_record(
         "policy_hash": policy_hash,
         "policy_eval_digest": digest,
     }
+
+
+def compute_input_digest(policy_input: Dict[str, Any]) -> str:
+    """
+    Compute a digest of a policy input alone.
+
+    Uses the same canonical form as compute_eval_digest, so two inputs that
+    differ only in key order share a digest.
+
+    Args:
+        policy_input: The input to be evaluated
+
+    Returns:
+        Hex-encoded SHA256 digest
+    """
+    serialized = json.dumps(_canonicalize(policy_input), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
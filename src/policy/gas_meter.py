@@ -47,6 +47,7 @@ class GasMeter:
     - Comparison: 2 gas
     - Set membership: 5 gas
     - Iteration: 10 gas per item
+    - Function call (builtin or rule evaluation): 20 gas
     """
 
     # Gas costs for different operations
@@ -118,6 +119,25 @@ class GasMeter:
         """Consume gas for function call"""
         self.consume(self.COST_FUNCTION_CALL, f"function:{function_name or 'unknown'}")
 
+    @property
+    def enforced_limit(self) -> float:
+        """Limit enforced by consume(), or infinity while metering is disabled"""
+        return self.limit if self._enabled else float("inf")
+
+    def add_usage(self, amount: int, operations: int) -> None:
+        """
+        Record gas charged outside consume().
+
+        Used by the metered policy interpreter, which charges instructions
+        inline and enforces ``enforced_limit`` itself.
+
+        Args:
+            amount: Gas consumed
+            operations: Number of operations performed
+        """
+        self.used += amount
+        self.operations += operations
+
     def get_metrics(self) -> GasMetrics:
         """
         Get current gas metrics.
@@ -5,16 +5,27 @@ Implements three enforcement points:
 1. PREFLIGHT: Client-side check before publishing (fast, cached)
 2. INGRESS: Every agent checks on receive (full WASM evaluation)
 3. COMMIT_GATE: Verifiers check actual execution (compare claimed vs actual resources)
+
+Decisions at all three gates are cached by (policy hash, gate, input digest).
+When a new policy capsule is activated its precompiled policy is swapped into
+the gate evaluators and the cache is dropped.
 """
 
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, replace
 
 from .opa_engine import OPAEngine
 from .wasm_runtime import WASMRuntime
 from .gas_meter import GasMeter
+from .decision_cache import DecisionCache
+
+try:
+    from observability import metrics as obs_metrics
+except ImportError:
+    obs_metrics = None
 
 logger = logging.getLogger(__name__)
 
@@ -52,12 +63,39 @@ class GateEnforcer:
         wasm_runtime: Optional[WASMRuntime] = None,
         gas_meter: Optional[GasMeter] = None,
         enable_cache: bool = True,
+        cache_max_entries: int = 10000,
+        cache_ttl_seconds: float = 300.0,
+        capsule_manager=None,
     ):
+        """
+        Initialize gate enforcer.
+
+        Args:
+            opa_engine: Engine for PREFLIGHT checks
+            wasm_runtime: Runtime for INGRESS and COMMIT_GATE checks
+            gas_meter: Gas meter whose limit applies to each metered
+                evaluation (every evaluation is charged to a fresh meter)
+            enable_cache: Cache decisions at all gates
+            cache_max_entries: Maximum cached decisions
+            cache_ttl_seconds: Time-to-live for cached decisions
+            capsule_manager: CapsuleManager whose activations swap the
+                evaluated policy and invalidate the cache (default: global
+                instance)
+        """
         self.opa_engine = opa_engine or OPAEngine()
         self.wasm_runtime = wasm_runtime or WASMRuntime()
         self.gas_meter = gas_meter or GasMeter()
         self.enable_cache = enable_cache
-        self._preflight_cache: Dict[str, PolicyDecision] = {}
+        self.decision_cache = DecisionCache(
+            max_entries=cache_max_entries, ttl_seconds=cache_ttl_seconds
+        )
+
+        if capsule_manager is None:
+            from .capsule import get_capsule_manager
+
+            capsule_manager = get_capsule_manager()
+        self._capsule_manager = capsule_manager
+        capsule_manager.add_activation_listener(self._on_capsule_activated)
 
     def preflight_validate(self, envelope: Dict[str, Any]) -> PolicyDecision:
         """
@@ -70,18 +108,16 @@ class GateEnforcer:
         Returns:
             PolicyDecision with validation result
         """
+        start = self._metrics_start()
         try:
-            # Create cache key from operation type and agent
-            cache_key = self._make_cache_key(envelope)
-
-            # Check cache if enabled
-            if self.enable_cache and cache_key in self._preflight_cache:
-                logger.debug(f"Preflight cache hit for {cache_key}")
-                return self._preflight_cache[cache_key]
-
             # Extract policy input from envelope
             policy_input = self._extract_policy_input(envelope, PolicyGate.PREFLIGHT)
 
+            cache_key = self._cache_lookup_key(PolicyGate.PREFLIGHT, policy_input)
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return self._observed(cached, start)
+
             # Use OPA for quick policy check
             result = self.opa_engine.evaluate(policy_input)
 
@@ -93,19 +129,20 @@ class GateEnforcer:
                 policy_hash=result.policy_version,  # Use policy version as hash
             )
 
-            # Cache the decision
-            if self.enable_cache:
-                self._preflight_cache[cache_key] = decision
+            self._put_cached(cache_key, decision)
 
             logger.info(f"Preflight validation: {decision.allowed} - {decision.reason}")
-            return decision
+            return self._observed(decision, start)
 
         except Exception as e:
             logger.error(f"Preflight validation error: {e}", exc_info=True)
-            return PolicyDecision(
-                allowed=False,
-                gate=PolicyGate.PREFLIGHT,
-                reason=f"Preflight error: {str(e)}",
+            return self._observed(
+                PolicyDecision(
+                    allowed=False,
+                    gate=PolicyGate.PREFLIGHT,
+                    reason=f"Preflight error: {str(e)}",
+                ),
+                start,
             )
 
     def ingress_validate(self, envelope: Dict[str, Any]) -> PolicyDecision:
@@ -119,16 +156,19 @@ class GateEnforcer:
         Returns:
             PolicyDecision with validation result
         """
+        start = self._metrics_start()
         try:
             # Extract policy input
             policy_input = self._extract_policy_input(envelope, PolicyGate.INGRESS)
 
-            # Start gas metering
-            self.gas_meter.reset()
+            cache_key = self._cache_lookup_key(PolicyGate.INGRESS, policy_input)
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return self._observed(cached, start)
 
-            # Full WASM evaluation
-            result = self.wasm_runtime.evaluate(policy_input)
-            gas_used = self.gas_meter.used  # Access used directly
+            # Full WASM evaluation, charged per instruction to its own meter
+            result = self.wasm_runtime.evaluate(policy_input, gas_meter=self._new_gas_meter())
+            gas_used = result.gas_used
 
             decision = PolicyDecision(
                 allowed=result.allowed,
@@ -137,20 +177,107 @@ class GateEnforcer:
                 gas_used=gas_used,
                 policy_hash=result.policy_version,  # Use policy version as hash
             )
+            self._put_cached(cache_key, decision)
 
             logger.info(
                 f"Ingress validation: {decision.allowed} - " f"{decision.reason} (gas: {gas_used})"
             )
-            return decision
+            return self._observed(decision, start)
 
         except Exception as e:
             logger.error(f"Ingress validation error: {e}", exc_info=True)
-            return PolicyDecision(
-                allowed=False,
-                gate=PolicyGate.INGRESS,
-                reason=f"Ingress error: {str(e)}",
+            return self._observed(
+                PolicyDecision(
+                    allowed=False,
+                    gate=PolicyGate.INGRESS,
+                    reason=f"Ingress error: {str(e)}",
+                ),
+                start,
             )
 
+    def ingress_validate_batch(self, envelopes: List[Dict[str, Any]]) -> List[PolicyDecision]:
+        """
+        INGRESS check for a batch of received envelopes.
+
+        Decisions match ingress_validate per envelope. Cached decisions are
+        reused, identical inputs within the batch are evaluated once, and the
+        remaining inputs go through a single WASM batch evaluation.
+
+        Args:
+            envelopes: Message envelopes to validate
+
+        Returns:
+            One PolicyDecision per envelope, in order
+        """
+        start = self._metrics_start()
+        decisions: List[Optional[PolicyDecision]] = [None] * len(envelopes)
+        pending: Dict[Any, List[int]] = {}
+        inputs: List[Dict[str, Any]] = []
+        keys: List[Any] = []
+
+        for i, envelope in enumerate(envelopes):
+            try:
+                policy_input = self._extract_policy_input(envelope, PolicyGate.INGRESS)
+                cache_key = self._cache_lookup_key(PolicyGate.INGRESS, policy_input)
+            except Exception as e:
+                logger.error(f"Ingress validation error: {e}", exc_info=True)
+                decisions[i] = PolicyDecision(
+                    allowed=False,
+                    gate=PolicyGate.INGRESS,
+                    reason=f"Ingress error: {str(e)}",
+                )
+                continue
+
+            if cache_key is not None and cache_key in pending:
+                pending[cache_key].append(i)
+                continue
+
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                decisions[i] = cached
+                continue
+
+            pending[cache_key if cache_key is not None else ("uncached", i)] = [i]
+            inputs.append(policy_input)
+            keys.append(cache_key)
+
+        if inputs:
+            try:
+                results = self.wasm_runtime.evaluate_batch(inputs)
+            except Exception as e:
+                # Evaluate individually so one bad input only fails itself
+                logger.warning(f"Ingress batch evaluation failed, retrying singly: {e}")
+                retried = set()
+                for indexes in pending.values():
+                    for i in indexes:
+                        decisions[i] = self.ingress_validate(envelopes[i])
+                        retried.add(i)
+                # Retried decisions were recorded by ingress_validate
+                self._observed_batch(
+                    [d for i, d in enumerate(decisions) if i not in retried], start
+                )
+                return decisions
+
+            for indexes, cache_key, result in zip(pending.values(), keys, results):
+                decision = PolicyDecision(
+                    allowed=result.allowed,
+                    gate=PolicyGate.INGRESS,
+                    reason=result.reasons[0] if result.reasons else None,
+                    gas_used=result.gas_used,
+                    policy_hash=result.policy_version,  # Use policy version as hash
+                )
+                self._put_cached(cache_key, decision)
+                decisions[indexes[0]] = decision
+                for i in indexes[1:]:
+                    decisions[i] = replace(decision)
+
+        logger.info(
+            f"Ingress batch validation: {sum(d.allowed for d in decisions)}/{len(decisions)} "
+            f"allowed ({len(inputs)} evaluated)"
+        )
+        self._observed_batch(decisions, start)
+        return decisions
+
     def commit_gate_validate(
         self, envelope: Dict[str, Any], telemetry: Dict[str, Any]
     ) -> PolicyDecision:
@@ -165,17 +292,21 @@ class GateEnforcer:
         Returns:
             PolicyDecision with validation result
         """
+        start = self._metrics_start()
         try:
             # Extract policy input including both claimed and actual
             policy_input = self._extract_policy_input(envelope, PolicyGate.COMMIT_GATE)
             policy_input["telemetry"] = telemetry
 
-            # Start gas metering
-            self.gas_meter.reset()
+            # Telemetry is part of the input, so it is part of the key
+            cache_key = self._cache_lookup_key(PolicyGate.COMMIT_GATE, policy_input)
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return self._observed(cached, start)
 
             # Full WASM evaluation with telemetry comparison
-            result = self.wasm_runtime.evaluate(policy_input)
-            gas_used = self.gas_meter.used  # Access used directly
+            result = self.wasm_runtime.evaluate(policy_input, gas_meter=self._new_gas_meter())
+            gas_used = result.gas_used
 
             # Check for resource violations
             violations = self._check_resource_violations(envelope, telemetry)
@@ -196,26 +327,104 @@ class GateEnforcer:
                 gas_used=gas_used,
                 policy_hash=result.policy_version,  # Use policy version as hash
             )
+            self._put_cached(cache_key, decision)
 
             logger.info(
                 f"Commit gate validation: {decision.allowed} - "
                 f"{decision.reason} (gas: {gas_used})"
             )
-            return decision
+            return self._observed(decision, start)
 
         except Exception as e:
             logger.error(f"Commit gate validation error: {e}", exc_info=True)
-            return PolicyDecision(
-                allowed=False,
-                gate=PolicyGate.COMMIT_GATE,
-                reason=f"Commit gate error: {str(e)}",
+            return self._observed(
+                PolicyDecision(
+                    allowed=False,
+                    gate=PolicyGate.COMMIT_GATE,
+                    reason=f"Commit gate error: {str(e)}",
+                ),
+                start,
             )
 
-    def _make_cache_key(self, envelope: Dict[str, Any]) -> str:
+    def _new_gas_meter(self) -> GasMeter:
+        """
+        Meter for one evaluation.
+
+        Gates are called from several threads at once, so evaluations never
+        share a meter.
+        """
+        return GasMeter(gas_limit=self.gas_meter.limit)
+
+    @staticmethod
+    def _metrics_start() -> Optional[float]:
+        """Start time for decision metrics, or None if metrics are off"""
+        if obs_metrics is not None and obs_metrics.ENABLED:
+            return time.perf_counter()
+        return None
+
+    @staticmethod
+    def _observed(decision: PolicyDecision, start: Optional[float]) -> PolicyDecision:
+        """Record latency, gas and outcome of a decision, then return it"""
+        if start is not None:
+            obs_metrics.record_gate_decision(
+                decision.gate.value,
+                decision.allowed,
+                time.perf_counter() - start,
+                decision.gas_used,
+            )
+        return decision
+
+    @staticmethod
+    def _observed_batch(decisions: List[PolicyDecision], start: Optional[float]) -> None:
+        """Record batch decisions, each with the batch's mean latency"""
+        if start is None or not decisions:
+            return
+        per_decision = (time.perf_counter() - start) / len(decisions)
+        obs_metrics.record_gate_batch(
+            decisions[0].gate.value,
+            [(decision.allowed, decision.gas_used) for decision in decisions],
+            per_decision,
+        )
+
+    def _make_cache_key(
+        self, envelope: Dict[str, Any], gate: PolicyGate = PolicyGate.PREFLIGHT
+    ) -> Tuple[str, str, str]:
         """Create cache key from envelope"""
-        op_type = envelope.get("operation", "unknown")
-        agent_id = envelope.get("agent_id", "unknown")
-        return f"{op_type}:{agent_id}"
+        return self._cache_lookup_key(gate, self._extract_policy_input(envelope, gate))
+
+    def _cache_lookup_key(
+        self, gate: PolicyGate, policy_input: Dict[str, Any]
+    ) -> Optional[Tuple[str, str, str]]:
+        """Key of the evaluating policy, gate and input digest (None if caching is off)"""
+        if not self.enable_cache:
+            return None
+        if gate == PolicyGate.PREFLIGHT:
+            policy_hash = self.opa_engine.policy_hash or self.wasm_runtime.get_policy_hash()
+        else:
+            policy_hash = self.wasm_runtime.get_policy_hash()
+        return DecisionCache.make_key(policy_hash, gate.value, policy_input)
+
+    def _get_cached(self, cache_key) -> Optional[PolicyDecision]:
+        if cache_key is None:
+            return None
+        decision = self.decision_cache.get(cache_key)
+        if decision is None:
+            return None
+        logger.debug(f"{decision.gate.value} cache hit for {cache_key[2][:16]}...")
+        # Hand out a copy so callers cannot alter the cached decision
+        return replace(decision)
+
+    def _put_cached(self, cache_key, decision: PolicyDecision) -> None:
+        if cache_key is not None:
+            self.decision_cache.put(cache_key, replace(decision))
+
+    def _on_capsule_activated(self, capsule) -> None:
+        """Swap in the newly active policy and drop decisions made under the old one"""
+        compiled = self._capsule_manager.active.compiled
+        if compiled is not None:
+            self.opa_engine.swap_policy(compiled)
+            self.wasm_runtime.swap_policy(compiled)
+        self.decision_cache.invalidate()
 
     def _extract_policy_input(self, envelope: Dict[str, Any], gate: PolicyGate) -> Dict[str, Any]:
         """Extract policy input from envelope for given gate"""
@@ -270,6 +479,10 @@ class GateEnforcer:
         return "; ".join(violations) if violations else None
 
     def clear_cache(self):
-        """Clear the preflight cache"""
-        self._preflight_cache.clear()
-        logger.info("Preflight cache cleared")
+        """Clear the decision cache"""
+        self.decision_cache.invalidate()
+        logger.info("Decision cache cleared")
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get decision cache hit/miss statistics"""
+        return self.decision_cache.get_stats()
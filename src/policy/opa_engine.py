@@ -1,20 +1,28 @@
 """
 OPA-style Policy Engine
 
-Pure Python implementation of policy evaluation with Rego-like semantics.
-Provides policy validation without requiring OPA binary installation.
-
-Since OPA is not available, this implements a Python-based policy engine
-that can evaluate policies defined in Python with similar semantics.
+Evaluates the Rego policy in ``policies/base.rego`` in-process through the
+Rego subset compiler, so no OPA binary is needed and evaluation costs
+microseconds. Policies outside the subset run on a persistent OPA server
+when the binary is installed; the built-in Python rules remain as a last
+resort.
 """
 
 import logging
+import re
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from pathlib import Path
 
+from .gas_meter import GasMeter
+from .rego_compiler import CompiledPolicy, RegoCompileError, load_policy
+
 logger = logging.getLogger(__name__)
 
+# Repository policies directory (src/policy/ -> policies/)
+DEFAULT_POLICY_PATH = Path(__file__).resolve().parent.parent.parent / "policies"
+POLICY_FILE = "base.rego"
+
 
 @dataclass
 class PolicyResult:
@@ -22,7 +30,7 @@ class PolicyResult:
 
     allowed: bool
     reasons: List[str]
-    gas_used: int = 0  # For future metering
+    gas_used: int = 0
     policy_version: str = "1.0.0"
 
 
@@ -119,21 +127,58 @@ class BasePolicyEngine:
         """
         Evaluate multiple envelopes.
 
+        Each check runs column-wise over the batch (kinds, then sizes, then
+        required fields); results are identical to calling evaluate() per
+        envelope.
+
         Args:
             envelopes: List of envelopes to validate
 
         Returns:
             List of PolicyResults
         """
-        return [self.evaluate(env) for env in envelopes]
+        allowed_kinds = self.ALLOWED_KINDS
+        max_size = self.MAX_PAYLOAD_SIZE
+        required = self.REQUIRED_FIELDS
+
+        kinds = [env.get("kind") for env in envelopes]
+        sizes = [env.get("payload_size", 0) for env in envelopes]
+        missing = [required - set(env.keys()) for env in envelopes]
+
+        results = []
+        for env, kind, size, missing_fields in zip(envelopes, kinds, sizes, missing):
+            reasons = []
+            if kind not in allowed_kinds:
+                reasons.append(f"Invalid message kind: {kind}")
+            if size >= max_size:
+                reasons.append(f"Payload too large: {size} bytes (max: {max_size})")
+            if missing_fields:
+                reasons.append(f"Missing required fields: {', '.join(missing_fields)}")
+
+            allowed = not reasons
+            if allowed:
+                reasons.append("Envelope passes all policy checks")
+
+            results.append(
+                PolicyResult(
+                    allowed=allowed,
+                    reasons=reasons,
+                    gas_used=len(env),
+                    policy_version="1.0.0",
+                )
+            )
+        return results
 
 
 class OPAEngine(BasePolicyEngine):
     """
     OPA-compatible policy engine.
 
-    Uses subprocess to call OPA binary if available,
-    falls back to Python-based implementation if not.
+    Backends, in order of preference:
+    - ``compiled``: ``base.rego`` compiled in-process (cached by policy hash)
+    - ``opa_server``: a persistent ``opa run --server`` process, used when
+      ``use_opa_binary`` is set or the policy is outside the compiled subset
+    - ``python``: the built-in BasePolicyEngine rules
     """
 
     def __init__(self, policy_path: Optional[Path] = None, use_opa_binary: bool = False):
@@ -141,22 +186,60 @@ class OPAEngine(BasePolicyEngine):
         Initialize OPA engine.
 
         Args:
-            policy_path: Path to policy directory
-            use_opa_binary: If True, attempt to use OPA binary
+            policy_path: Path to policy directory (default: repository ``policies/``)
+            use_opa_binary: If True, evaluate on a persistent OPA server
         """
-        super().__init__(policy_path)
+        super().__init__(policy_path or DEFAULT_POLICY_PATH)
 
         self.use_opa_binary = use_opa_binary
         self.opa_available = False
+        self.compiled: Optional[CompiledPolicy] = None
+        self.package = "swarm.policy"
+        self._opa_server = None
+        self.backend = "python"
+
+        policy_file = Path(self.policy_path) / POLICY_FILE
+        if not policy_file.is_file():
+            logger.warning(f"No policy at {policy_file}, using built-in Python rules")
+            return
 
         if use_opa_binary:
             self.opa_available = self._check_opa_binary()
-
-        if self.use_opa_binary and not self.opa_available:
+            if self.opa_available:
+                self._start_opa_server(policy_file)
+                return
             logger.warning(
-                "OPA binary requested but not available, " "falling back to Python implementation"
+                "OPA binary requested but not available, falling back to compiled policy"
             )
 
+        try:
+            self.compiled = load_policy(policy_file)
+            self.package = self.compiled.package
+            self.backend = "compiled"
+            return
+        except RegoCompileError as e:
+            logger.warning(f"Policy {policy_file} is outside the compiled Rego subset: {e}")
+
+        if not self.opa_available and self._check_opa_binary():
+            self.opa_available = True
+            self._start_opa_server(policy_file)
+        else:
+            logger.warning("OPA binary not available, falling back to Python implementation")
+
+    def _start_opa_server(self, policy_file: Path) -> None:
+        from .opa_server import OPAServer
+
+        match = re.search(r"^\s*package\s+([\w.]+)", policy_file.read_text(), re.MULTILINE)
+        if match:
+            self.package = match.group(1)
+        self._opa_server = OPAServer([policy_file])
+        self.backend = "opa_server"
+
+    @property
+    def policy_hash(self) -> Optional[str]:
+        """Hash of the compiled policy source, if the compiled backend is active"""
+        return self.compiled.policy_hash if self.compiled else None
+
     def _check_opa_binary(self) -> bool:
         """Check if OPA binary is available"""
         import subprocess
@@ -171,26 +254,104 @@ class OPAEngine(BasePolicyEngine):
 
         return False
 
-    def evaluate(self, envelope: Dict[str, Any]) -> PolicyResult:
+    def swap_policy(self, compiled: CompiledPolicy) -> None:
         """
-        Evaluate envelope against policy.
+        Switch evaluation to another compiled policy.
 
-        Uses OPA binary if available, otherwise falls back to Python.
+        The policy is replaced by a single reference assignment, so readers
+        need no lock: evaluations already running finish on the policy they
+        started with and later ones see the new one.
+
+        Args:
+            compiled: Policy to evaluate from now on
+        """
+        self.compiled = compiled
+        self.package = compiled.package
+        self.backend = "compiled"
+        logger.info(f"Swapped to policy {compiled.package} ({compiled.policy_hash[:16]}...)")
+
+    @property
+    def supports_metering(self) -> bool:
+        """Whether evaluate() can charge gas per instruction (compiled backend)"""
+        return self.compiled is not None
+
+    def evaluate(
+        self, envelope: Dict[str, Any], gas_meter: Optional[GasMeter] = None
+    ) -> PolicyResult:
+        """
+        Evaluate envelope against policy.
 
         Args:
             envelope: Envelope to validate
+            gas_meter: Meter to charge per evaluated instruction; only the
+                compiled backend meters (see ``supports_metering``)
 
         Returns:
             PolicyResult
+
+        Raises:
+            GasExceededError: If metered evaluation exceeds the meter's limit
         """
-        if self.use_opa_binary and self.opa_available:
+        if self.compiled is not None:
+            return self._evaluate_compiled(envelope, gas_meter)
+        if self._opa_server is not None:
             return self._evaluate_with_opa(envelope)
+        return super().evaluate(envelope)
+
+    def evaluate_batch(self, envelopes: List[Dict]) -> List[PolicyResult]:
+        """
+        Evaluate multiple envelopes on the active backend.
+
+        Args:
+            envelopes: List of envelopes to validate
+
+        Returns:
+            List of PolicyResults
+        """
+        if self.compiled is not None:
+            evaluate = self._evaluate_compiled
+        elif self._opa_server is not None:
+            evaluate = self._evaluate_with_opa
         else:
-            return super().evaluate(envelope)
+            return super().evaluate_batch(envelopes)
+        return [evaluate(env) for env in envelopes]
+
+    def _evaluate_compiled(
+        self, envelope: Dict[str, Any], gas_meter: Optional[GasMeter] = None
+    ) -> PolicyResult:
+        """
+        Evaluate using the compiled policy.
+
+        Gas is the gas charged to ``gas_meter`` if one is given, otherwise
+        the number of rule and expression evaluations performed.
+        """
+        # Read the policy once so a concurrent swap_policy() cannot mix two
+        # policies within one decision
+        compiled = self.compiled
+        start_gas = gas_meter.used if gas_meter is not None else 0
+        values, steps = compiled.evaluate(envelope, ("allow", "policy_version"), gas_meter)
+        allowed = values["allow"][:1] == [True]
+        version = values["policy_version"][0] if values["policy_version"] else "1.0.0"
+
+        if allowed:
+            reasons = ["Envelope passes all policy checks"]
+        else:
+            deny, deny_steps = compiled.evaluate(envelope, ("deny_reason",), gas_meter)
+            steps += deny_steps
+            reasons = [str(r) for r in deny["deny_reason"]] or [
+                f"Denied by {compiled.package}.allow"
+            ]
+
+        return PolicyResult(
+            allowed=allowed,
+            reasons=reasons,
+            gas_used=gas_meter.used - start_gas if gas_meter is not None else steps,
+            policy_version=version,
+        )
 
     def _evaluate_with_opa(self, envelope: Dict) -> PolicyResult:
         """
-        Evaluate using OPA binary.
+        Evaluate on the persistent OPA server.
 
         Args:
             envelope: Envelope to validate
@@ -198,54 +359,25 @@ class OPAEngine(BasePolicyEngine):
         Returns:
             PolicyResult
         """
-        import subprocess
-        import json
-
         try:
-            # Prepare input
-            input_data = {"input": envelope}
-
-            # Call OPA eval
-            cmd = [
-                "opa",
-                "eval",
-                "--data",
-                str(self.policy_path / "base.rego"),
-                "--input",
-                "-",
-                "--format",
-                "json",
-                "data.swarm.policy.allow",
-            ]
+            allowed = self._opa_server.query(f"{self.package}.allow", envelope) is True
 
-            result = subprocess.run(
-                cmd,
-                input=json.dumps(input_data).encode(),
-                capture_output=True,
-                timeout=5,
+            return PolicyResult(
+                allowed=allowed,
+                reasons=[f"OPA evaluation: {'allowed' if allowed else 'denied'}"],
+                gas_used=len(envelope),
             )
 
-            if result.returncode == 0:
-                output = json.loads(result.stdout)
-                allowed = (
-                    output.get("result", [{}])[0].get("expressions", [{}])[0].get("value", False)
-                )
-
-                return PolicyResult(
-                    allowed=allowed,
-                    reasons=[f"OPA evaluation: {'allowed' if allowed else 'denied'}"],
-                    gas_used=len(envelope),
-                )
-            else:
-                logger.error(f"OPA evaluation failed: {result.stderr}")
-                # Fall back to Python
-                return super().evaluate(envelope)
-
         except Exception as e:
             logger.error(f"Error calling OPA: {e}")
             # Fall back to Python
             return super().evaluate(envelope)
 
+    def close(self) -> None:
+        """Stop the OPA server, if one was started"""
+        if self._opa_server is not None:
+            self._opa_server.close()
+
 
 # Singleton for easy access
 _policy_engine: Optional[OPAEngine] = None
@@ -0,0 +1,182 @@
+"""
+Persistent OPA Server Backend
+
+Runs one long-lived ``opa run --server`` process with the policy files
+loaded once, and queries it over a keep-alive HTTP connection. Used for
+policies outside the subset handled by the in-process Rego compiler, in
+place of spawning ``opa eval`` per envelope.
+"""
+
+import http.client
+import json
+import logging
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class OPAServer:
+    """
+    Long-lived local OPA server.
+
+    The process is started lazily on first query and restarted if it dies.
+    Queries are serialized over a single keep-alive connection.
+    """
+
+    def __init__(
+        self,
+        policy_files: List[Path],
+        opa_binary: str = "opa",
+        host: str = "127.0.0.1",
+        port: Optional[int] = None,
+        startup_timeout: float = 10.0,
+        request_timeout: float = 5.0,
+    ):
+        """
+        Initialize OPA server backend.
+
+        Args:
+            policy_files: Rego files (or bundle directories) to load
+            opa_binary: Path to the ``opa`` executable
+            host: Interface the server listens on
+            port: Listen port (default: a free ephemeral port)
+            startup_timeout: Seconds to wait for the server to become healthy
+            request_timeout: Per-query timeout in seconds
+        """
+        self.policy_files = [Path(p) for p in policy_files]
+        self.opa_binary = opa_binary
+        self.host = host
+        self.port = port
+        self.startup_timeout = startup_timeout
+        self.request_timeout = request_timeout
+
+        self._process: Optional[subprocess.Popen] = None
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """
+        Start the server process and wait until it is healthy.
+
+        Raises:
+            RuntimeError: If the server does not become healthy in time
+        """
+        with self._lock:
+            self._start_locked()
+
+    def _start_locked(self) -> None:
+        if self.running:
+            return
+
+        port = self.port or _free_port(self.host)
+        cmd = [
+            self.opa_binary,
+            "run",
+            "--server",
+            "--addr",
+            f"{self.host}:{port}",
+            *[str(p) for p in self.policy_files],
+        ]
+        self._process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        self.port = port
+        self._conn = None
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                stderr = self._process.stderr.read().decode("utf-8", "replace")
+                self._process = None
+                raise RuntimeError(f"OPA server exited during startup: {stderr.strip()}")
+            try:
+                status, _ = self._request("GET", "/health")
+                if status == 200:
+                    logger.info(f"OPA server started on {self.host}:{port}")
+                    return
+            except (OSError, http.client.HTTPException):
+                pass
+            time.sleep(0.05)
+
+        self._stop_locked()
+        raise RuntimeError(f"OPA server did not become healthy within {self.startup_timeout}s")
+
+    def _request(self, method: str, path: str, body: Optional[bytes] = None):
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(
+                self.host, self.port, timeout=self.request_timeout
+            )
+        try:
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            self._conn.request(method, path, body=body, headers=headers)
+            response = self._conn.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self._conn.close()
+            self._conn = None
+            raise
+
+    def query(self, path: str, input_data: Any) -> Any:
+        """
+        Evaluate a document in the data API.
+
+        Args:
+            path: Slash- or dot-separated document path, e.g. ``swarm/policy``
+            input_data: Input document
+
+        Returns:
+            The ``result`` value, or None if the document is undefined
+
+        Raises:
+            RuntimeError: If the server is unavailable or returns an error
+        """
+        url = "/v1/data/" + path.replace(".", "/").strip("/")
+        body = json.dumps({"input": input_data}).encode()
+
+        with self._lock:
+            self._start_locked()
+            try:
+                status, response = self._request("POST", url, body)
+            except (OSError, http.client.HTTPException):
+                # One retry on a fresh connection (server may have restarted)
+                self._start_locked()
+                try:
+                    status, response = self._request("POST", url, body)
+                except (OSError, http.client.HTTPException) as e:
+                    raise RuntimeError(f"OPA server unavailable: {e}")
+
+        if status != 200:
+            raise RuntimeError(
+                f"OPA query {url} failed: HTTP {status}: {response.decode('utf-8', 'replace')}"
+            )
+        return json.loads(response).get("result")
+
+    def _stop_locked(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+
+    def close(self) -> None:
+        """Stop the server process"""
+        with self._lock:
+            self._stop_locked()
@@ -0,0 +1,1196 @@
+"""
+Rego Subset Compiler
+
+Compiles the subset of Rego used by our policies (``policies/base.rego``,
+``policies/conformance_tests.rego``) into an in-process evaluation plan of
+Python closures, so evaluating a policy costs microseconds instead of an
+``opa eval`` process spawn.
+
+Supported:
+- ``package``, ``default`` rules, constants, boolean rules and value rules
+  (``name = value { body }``), multiple definitions of one rule
+- Expressions: refs into ``input``/``data``/rules, literals (scalars,
+  arrays, sets, objects), ``not``, ``:=``, ``=``, comparisons, ``in``,
+  arithmetic, builtin calls and ``with input as`` overrides
+
+Not supported (raises RegoCompileError; use the OPA server backend):
+iteration (``some``, ``_``, ``every``), comprehensions, functions, partial
+set/object rules and imports other than ``future.keywords`` / ``rego.v1``.
+
+Semantics follow OPA: an expression with an undefined operand is undefined,
+a body succeeds only if every expression is defined and not ``false``, and a
+rule is undefined unless some definition's body succeeds. Complete rules
+with several successful definitions (e.g. ``deny_reason``) keep every value;
+``query`` returns the first and ``query_all`` returns them all.
+
+Metering: every module is also compiled to a metered plan that charges gas
+(``GasMeter`` cost table) for each instruction it executes: rule
+evaluations, field accesses, comparisons, membership tests, builtin calls and
+per-item work on collections. ``evaluate(..., gas_meter=meter)`` runs that
+plan and raises ``GasExceededError`` at the instruction that crosses the
+meter's limit, so an expensive policy stops early instead of running to
+completion.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .gas_meter import GasExceededError, GasMeter
+
+logger = logging.getLogger(__name__)
+
+
+class RegoCompileError(ValueError):
+    """Raised when a policy cannot be parsed or is outside the supported subset"""
+
+
+class _Undefined:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "UNDEFINED"
+
+
+UNDEFINED = _Undefined()
+
+
+def _fails(value: Any) -> bool:
+    """Whether an expression statement fails: only undefined and false do"""
+    return value is UNDEFINED or value is False
+
+
+# ----------------------------------------------------------------------------
+# Lexer
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>[ \t\r]+)
+  | (?P<comment>\#[^\n]*)
+  | (?P<newline>\n)
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<rawstring>`[^`]*`)
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op>:=|==|!=|<=|>=|[<>=+\-*/%.,:;()\[\]{}|&])
+    """,
+    re.VERBOSE,
+)
+
+
+@dataclass
+class _Token:
+    kind: str
+    value: Any
+    line: int
+
+
+def _tokenize(source: str) -> List[_Token]:
+    tokens = []
+    line = 1
+    pos = 0
+    while pos < len(source):
+        match = _TOKEN_RE.match(source, pos)
+        if not match:
+            raise RegoCompileError(f"line {line}: unexpected character {source[pos]!r}")
+        kind = match.lastgroup
+        text = match.group()
+        pos = match.end()
+
+        if kind == "newline":
+            tokens.append(_Token("newline", text, line))
+            line += 1
+        elif kind == "number":
+            value = float(text) if any(c in text for c in ".eE") else int(text)
+            tokens.append(_Token("scalar", value, line))
+        elif kind == "string":
+            tokens.append(_Token("scalar", json.loads(text), line))
+        elif kind == "rawstring":
+            tokens.append(_Token("scalar", text[1:-1], line))
+        elif kind == "name":
+            if text in ("true", "false", "null"):
+                tokens.append(_Token("scalar", {"true": True, "false": False}.get(text), line))
+            else:
+                tokens.append(_Token("name", text, line))
+        elif kind == "op":
+            tokens.append(_Token("op", text, line))
+
+    tokens.append(_Token("eof", None, line))
+    return tokens
+
+
+# ----------------------------------------------------------------------------
+# Parser
+#
+# AST nodes are tuples tagged by their first element:
+#   ("scalar", v) ("ref", name, [path nodes]) ("array", [..]) ("set", [..])
+#   ("object", [(k, v)]) ("call", name, [args]) ("binop", op, l, r)
+#   ("neg", x)
+# Body statements:
+#   ("expr", node, withs) ("not", node, withs) ("assign", var, node)
+#   ("unify", l, r, withs)
+
+_UNSUPPORTED_KEYWORDS = {"some", "every", "import", "contains", "else"}
+_COMPARISON_OPS = {"==", "!=", "<", "<=", ">", ">="}
+
+
+@dataclass
+class _Rule:
+    name: str
+    value: Optional[tuple]  # None for boolean rules (value true)
+    body: List[tuple]
+    is_default: bool = False
+    line: int = 0
+
+
+class _Parser:
+    def __init__(self, tokens: List[_Token]):
+        self.tokens = tokens
+        self.pos = 0
+
+    # Token helpers
+
+    def peek(self, offset: int = 0) -> _Token:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def next(self) -> _Token:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def at(self, kind: str, value: Any = None) -> bool:
+        token = self.peek()
+        return token.kind == kind and (value is None or token.value == value)
+
+    def accept(self, kind: str, value: Any = None) -> Optional[_Token]:
+        if self.at(kind, value):
+            return self.next()
+        return None
+
+    def expect(self, kind: str, value: Any = None) -> _Token:
+        token = self.peek()
+        if not self.at(kind, value):
+            want = value if value is not None else kind
+            raise RegoCompileError(f"line {token.line}: expected {want!r}, got {token.value!r}")
+        return self.next()
+
+    def skip_newlines(self) -> None:
+        while self.accept("newline") or self.accept("op", ";"):
+            pass
+
+    def error(self, message: str) -> RegoCompileError:
+        return RegoCompileError(f"line {self.peek().line}: {message}")
+
+    # Module
+
+    def parse_module(self) -> Tuple[List[str], List[_Rule]]:
+        self.skip_newlines()
+        self.expect("name", "package")
+        package = [self.expect("name").value]
+        while self.accept("op", "."):
+            package.append(self.expect("name").value)
+
+        rules = []
+        while True:
+            self.skip_newlines()
+            if self.at("eof"):
+                return package, rules
+
+            if self.at("name", "import"):
+                self.parse_import()
+                continue
+
+            rules.append(self.parse_rule())
+
+    def parse_import(self) -> None:
+        self.expect("name", "import")
+        path = [self.expect("name").value]
+        while self.accept("op", "."):
+            path.append(self.expect("name").value)
+        if path[:2] not in (["future", "keywords"], ["rego", "v1"]):
+            raise self.error(f"unsupported import {'.'.join(path)}")
+
+    def parse_rule(self) -> _Rule:
+        line = self.peek().line
+        if self.accept("name", "default"):
+            name = self.expect("name").value
+            if not (self.accept("op", "=") or self.accept("op", ":=")):
+                raise self.error("expected '=' after default rule name")
+            return _Rule(name, self.parse_term_expr(), [], is_default=True, line=line)
+
+        name_token = self.expect("name")
+        name = name_token.value
+        if name in _UNSUPPORTED_KEYWORDS:
+            raise self.error(f"unsupported keyword {name!r}")
+        if self.at("op", "[") or self.at("op", "("):
+            raise self.error(f"partial rules and functions are not supported ({name})")
+
+        value = None
+        if self.accept("op", "=") or self.accept("op", ":="):
+            value = self.parse_term_expr()
+
+        self.accept("name", "if")
+        if self.accept("op", "{"):
+            body = self.parse_body()
+        elif value is None:
+            raise self.error(f"expected rule body for {name!r}")
+        else:
+            body = []
+
+        return _Rule(name, value, body, line=line)
+
+    def parse_body(self) -> List[tuple]:
+        statements = []
+        while True:
+            self.skip_newlines()
+            if self.accept("op", "}"):
+                return statements
+            statements.append(self.parse_statement())
+            if not (self.at("newline") or self.at("op", ";") or self.at("op", "}")):
+                raise self.error(f"unexpected {self.peek().value!r} in rule body")
+
+    def parse_statement(self) -> tuple:
+        if self.peek().kind == "name" and self.peek().value in _UNSUPPORTED_KEYWORDS:
+            raise self.error(f"unsupported keyword {self.peek().value!r}")
+
+        if self.accept("name", "not"):
+            node = self.parse_term_expr()
+            return ("not", node, self.parse_withs())
+
+        if self.at("name") and self.peek(1).kind == "op" and self.peek(1).value == ":=":
+            var = self.next().value
+            self.next()
+            return ("assign", var, self.parse_term_expr())
+
+        node = self.parse_term_expr()
+        if self.accept("op", "="):
+            return ("unify", node, self.parse_term_expr(), self.parse_withs())
+        return ("expr", node, self.parse_withs())
+
+    def parse_withs(self) -> List[Tuple[tuple, tuple]]:
+        withs = []
+        while self.accept("name", "with"):
+            target = self.parse_primary()
+            self.expect("name", "as")
+            withs.append((target, self.parse_term_expr()))
+        return withs
+
+    # Expressions (lowest to highest precedence)
+
+    def parse_term_expr(self) -> tuple:
+        left = self.parse_membership()
+        while self.at("op") and self.peek().value in _COMPARISON_OPS:
+            op = self.next().value
+            left = ("binop", op, left, self.parse_membership())
+        return left
+
+    def parse_membership(self) -> tuple:
+        left = self.parse_setop()
+        while self.accept("name", "in"):
+            left = ("binop", "in", left, self.parse_setop())
+        return left
+
+    def parse_setop(self) -> tuple:
+        left = self.parse_additive()
+        while self.at("op", "|") or self.at("op", "&"):
+            op = self.next().value
+            left = ("binop", op, left, self.parse_additive())
+        return left
+
+    def parse_additive(self) -> tuple:
+        left = self.parse_multiplicative()
+        while self.at("op", "+") or self.at("op", "-"):
+            op = self.next().value
+            left = ("binop", op, left, self.parse_multiplicative())
+        return left
+
+    def parse_multiplicative(self) -> tuple:
+        left = self.parse_unary()
+        while self.at("op", "*") or self.at("op", "/") or self.at("op", "%"):
+            op = self.next().value
+            left = ("binop", op, left, self.parse_unary())
+        return left
+
+    def parse_unary(self) -> tuple:
+        if self.accept("op", "-"):
+            return ("neg", self.parse_unary())
+        return self.parse_primary()
+
+    def parse_primary(self) -> tuple:
+        token = self.peek()
+
+        if token.kind == "scalar":
+            self.next()
+            return ("scalar", token.value)
+
+        if self.accept("op", "("):
+            self.skip_newlines()
+            node = self.parse_term_expr()
+            self.skip_newlines()
+            self.expect("op", ")")
+            return node
+
+        if self.accept("op", "["):
+            return ("array", self.parse_items("]"))
+
+        if self.accept("op", "{"):
+            return self.parse_brace_literal()
+
+        if token.kind == "name":
+            if token.value in _UNSUPPORTED_KEYWORDS:
+                raise self.error(f"unsupported keyword {token.value!r}")
+            self.next()
+            name = token.value
+
+            # Dotted builtin names, e.g. object.get(...)
+            if self.at("op", "("):
+                self.next()
+                return ("call", name, self.parse_items(")"))
+
+            path = []
+            while True:
+                if self.at("op", ".") and self.peek(1).kind == "name":
+                    self.next()
+                    attr = self.next().value
+                    if self.at("op", "(") and not path:
+                        self.next()
+                        return ("call", f"{name}.{attr}", self.parse_items(")"))
+                    path.append(("scalar", attr))
+                elif self.accept("op", "["):
+                    self.skip_newlines()
+                    if self.at("name", "_"):
+                        raise self.error("iteration with '_' is not supported")
+                    path.append(self.parse_term_expr())
+                    self.skip_newlines()
+                    self.expect("op", "]")
+                else:
+                    break
+            if name == "_":
+                raise self.error("iteration with '_' is not supported")
+            return ("ref", name, path)
+
+        raise self.error(f"unexpected {token.value!r}")
+
+    def parse_items(self, closer: str) -> List[tuple]:
+        items = []
+        self.skip_newlines()
+        while not self.accept("op", closer):
+            items.append(self.parse_term_expr())
+            self.skip_newlines()
+            if not self.accept("op", ","):
+                self.skip_newlines()
+                self.expect("op", closer)
+                break
+            self.skip_newlines()
+        return items
+
+    def parse_brace_literal(self) -> tuple:
+        self.skip_newlines()
+        if self.accept("op", "}"):
+            return ("object", [])
+
+        first = self.parse_term_expr()
+        self.skip_newlines()
+        if self.at("op", "|"):
+            raise self.error("comprehensions are not supported")
+
+        if not self.accept("op", ":"):
+            # Set literal
+            items = [first]
+            if self.accept("op", ","):
+                items.extend(self.parse_items("}"))
+            else:
+                self.expect("op", "}")
+            return ("set", items)
+
+        self.skip_newlines()
+        pairs = [(first, self.parse_term_expr())]
+        self.skip_newlines()
+        while self.accept("op", ","):
+            self.skip_newlines()
+            if self.accept("op", "}"):
+                return ("object", pairs)
+            key = self.parse_term_expr()
+            self.skip_newlines()
+            self.expect("op", ":")
+            self.skip_newlines()
+            pairs.append((key, self.parse_term_expr()))
+            self.skip_newlines()
+        self.expect("op", "}")
+        return ("object", pairs)
+
+
+# ----------------------------------------------------------------------------
+# Runtime helpers
+
+
+def _type_rank(value: Any) -> int:
+    # OPA's total order across types: null < bool < number < string <
+    # array < object < set
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, (list, tuple)):
+        return 4
+    if isinstance(value, dict):
+        return 5
+    return 6
+
+
+def _equal(a: Any, b: Any) -> bool:
+    return _type_rank(a) == _type_rank(b) and a == b
+
+
+def _compare(a: Any, b: Any) -> int:
+    ra, rb = _type_rank(a), _type_rank(b)
+    if ra != rb:
+        return -1 if ra < rb else 1
+    try:
+        return (a > b) - (a < b)
+    except TypeError:
+        sa, sb = _format_value(a), _format_value(b)
+        return (sa > sb) - (sa < sb)
+
+
+def _contains(collection: Any, item: Any) -> Any:
+    if isinstance(collection, dict):
+        values = collection.values()
+    elif isinstance(collection, (list, tuple, frozenset, set)):
+        values = collection
+    else:
+        return False
+
+    if isinstance(collection, (frozenset, set)) and _type_rank(item) in (0, 2, 3):
+        try:
+            return item in collection
+        except TypeError:
+            pass
+    return any(_equal(item, value) for value in values)
+
+
+def _format_value(value: Any) -> str:
+    """Render a value like OPA's ``%v``"""
+    if isinstance(value, str):
+        return value
+    return _to_json(value)
+
+
+def _to_json(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return json.dumps(value)
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{_to_json(k)}: {_to_json(v)}" for k, v in value.items()) + "}"
+    if isinstance(value, (frozenset, set)):
+        items = sorted(value, key=lambda v: (_type_rank(v), _format_value(v)))
+        return "{" + ", ".join(_to_json(v) for v in items) + "}"
+    return "[" + ", ".join(_to_json(v) for v in value) + "]"
+
+
+def _sprintf(fmt: str, args: Any) -> Any:
+    if not isinstance(fmt, str) or not isinstance(args, (list, tuple)):
+        return UNDEFINED
+    remaining = iter(args)
+
+    def substitute(match: re.Match) -> str:
+        verb = match.group(1)
+        if verb == "%":
+            return "%"
+        value = next(remaining, UNDEFINED)
+        if value is UNDEFINED:
+            return f"%!{verb}(MISSING)"
+        if verb == "q":
+            return json.dumps(value) if isinstance(value, str) else _format_value(value)
+        if verb == "d" and isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return _format_value(value)
+
+    return re.sub(r"%([%vsdqf])", substitute, fmt)
+
+
+def _arith(op: str, a: Any, b: Any) -> Any:
+    if op in ("|", "&", "-") and isinstance(a, frozenset) and isinstance(b, frozenset):
+        return {"|": a | b, "&": a & b, "-": a - b}[op]
+    if _type_rank(a) != 2 or _type_rank(b) != 2:
+        return UNDEFINED
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    if b == 0:
+        return UNDEFINED
+    if op == "/":
+        result = a / b
+        return int(result) if result.is_integer() else result
+    if op == "%":
+        return a % b
+    return UNDEFINED
+
+
+def _numeric(fn: Callable) -> Callable:
+    def wrapper(*args):
+        if any(_type_rank(a) != 2 for a in args):
+            return UNDEFINED
+        return fn(*args)
+
+    return wrapper
+
+
+def _collection(fn: Callable) -> Callable:
+    def wrapper(value):
+        if not isinstance(value, (list, tuple, frozenset, set, dict, str)):
+            return UNDEFINED
+        return fn(value)
+
+    return wrapper
+
+
+def _strings(fn: Callable) -> Callable:
+    def wrapper(*args):
+        if not all(isinstance(a, str) for a in args):
+            return UNDEFINED
+        return fn(*args)
+
+    return wrapper
+
+
+def _object_get(obj: Any, key: Any, default: Any) -> Any:
+    if not isinstance(obj, dict):
+        return UNDEFINED
+    return obj.get(key, default)
+
+
+_BUILTINS: Dict[str, Tuple[int, Callable]] = {
+    "sprintf": (2, _sprintf),
+    "count": (1, _collection(len)),
+    "sum": (1, _collection(lambda v: sum(v))),
+    "max": (1, _collection(lambda v: max(v) if v else UNDEFINED)),
+    "min": (1, _collection(lambda v: min(v) if v else UNDEFINED)),
+    "abs": (1, _numeric(abs)),
+    "concat": (2, lambda sep, items: sep.join(items) if isinstance(sep, str) else UNDEFINED),
+    "startswith": (2, _strings(str.startswith)),
+    "endswith": (2, _strings(str.endswith)),
+    "contains": (2, _strings(lambda s, sub: sub in s)),
+    "lower": (1, _strings(str.lower)),
+    "upper": (1, _strings(str.upper)),
+    "trim_space": (1, _strings(str.strip)),
+    "is_string": (1, lambda v: isinstance(v, str)),
+    "is_number": (1, lambda v: _type_rank(v) == 2),
+    "is_boolean": (1, lambda v: isinstance(v, bool)),
+    "is_null": (1, lambda v: v is None),
+    "is_array": (1, lambda v: isinstance(v, (list, tuple))),
+    "is_object": (1, lambda v: isinstance(v, dict)),
+    "is_set": (1, lambda v: isinstance(v, (frozenset, set))),
+    "object.get": (3, _object_get),
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Make a value usable as a set element"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _walk(base: Any, key: Any) -> Any:
+    if isinstance(base, dict):
+        return base.get(key, UNDEFINED)
+    if isinstance(base, (list, tuple)):
+        if _type_rank(key) == 2 and float(key).is_integer() and 0 <= key < len(base):
+            return base[int(key)]
+        return UNDEFINED
+    if isinstance(base, (frozenset, set)):
+        try:
+            return key if key in base else UNDEFINED
+        except TypeError:
+            return UNDEFINED
+    return UNDEFINED
+
+
+# ----------------------------------------------------------------------------
+# Gas
+
+_GAS_RULE = GasMeter.COST_FUNCTION_CALL
+_GAS_FIELD = GasMeter.COST_FIELD_ACCESS
+_GAS_COMPARE = GasMeter.COST_COMPARISON
+_GAS_MEMBERSHIP = GasMeter.COST_SET_MEMBERSHIP
+_GAS_CALL = GasMeter.COST_FUNCTION_CALL
+_GAS_PER_ITEM = GasMeter.COST_ITERATION_PER_ITEM
+
+_COLLECTIONS = (list, tuple, set, frozenset, dict)
+
+
+def _charge(ctx: "_EvalContext", amount: int) -> None:
+    # Hot closures inline this check and only call _out_of_gas
+    ctx.gas += amount
+    if ctx.gas > ctx.gas_limit:
+        _out_of_gas(ctx)
+
+
+def _out_of_gas(ctx: "_EvalContext") -> None:
+    raise GasExceededError(f"Gas limit exceeded: {ctx.gas} > {ctx.gas_limit}")
+
+
+def _membership_gas(values: list) -> int:
+    """``x in coll``: hashed lookup for sets/objects, a scan for arrays and strings"""
+    collection = values[1]
+    if isinstance(collection, (list, tuple, str)):
+        return _GAS_PER_ITEM * len(collection)
+    return _GAS_MEMBERSHIP
+
+
+def _call_gas(values: list) -> int:
+    """Builtin call plus one iteration per item of each collection argument"""
+    items = sum(len(v) for v in values if isinstance(v, _COLLECTIONS))
+    return _GAS_CALL + _GAS_PER_ITEM * items
+
+
+# ----------------------------------------------------------------------------
+# Compiler
+
+Evaluator = Callable[["_EvalContext", Dict[str, Any]], Any]
+Statement = Callable[["_EvalContext", Dict[str, Any]], bool]
+
+
+class _EvalContext:
+    """
+    Per-evaluation state: the input document, memoized rule values and, for
+    metered evaluations, gas charged so far against ``gas_limit``
+    """
+
+    __slots__ = ("input", "cache", "steps", "metered", "gas", "gas_limit")
+
+    def __init__(
+        self,
+        input_data: Any,
+        steps: int = 0,
+        metered: bool = False,
+        gas: int = 0,
+        gas_limit: float = float("inf"),
+    ):
+        self.input = input_data
+        self.cache: Dict[Tuple[int, str], List[Any]] = {}
+        self.steps = steps
+        self.metered = metered
+        self.gas = gas
+        self.gas_limit = gas_limit
+
+
+@dataclass
+class _CompiledRule:
+    name: str
+    definitions: List[Tuple[List[Statement], Evaluator]] = field(default_factory=list)
+    default: Any = UNDEFINED
+    constant: Any = UNDEFINED
+
+
+class CompiledPolicy:
+    """
+    A Rego module compiled to Python closures.
+
+    Instances are immutable and safe to share across threads; each
+    evaluation gets its own memo of rule values.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        policy_hash: str,
+        imports: Sequence["CompiledPolicy"] = (),
+    ):
+        self.source = source
+        self.policy_hash = policy_hash
+        self._imports = list(imports)
+
+        package, rules = _Parser(_tokenize(source)).parse_module()
+        self.package = ".".join(package)
+        self._package_path = package
+
+        by_name: Dict[str, List[_Rule]] = OrderedDict()
+        for rule in rules:
+            by_name.setdefault(rule.name, []).append(rule)
+
+        self._metered = False
+        self._rules: Dict[str, _CompiledRule] = {name: _CompiledRule(name) for name in by_name}
+        for name, definitions in by_name.items():
+            self._compile_rule(self._rules[name], definitions)
+
+        # The same plan with a gas charge on every instruction
+        self._metered = True
+        self._metered_rules: Dict[str, _CompiledRule] = {
+            name: _CompiledRule(name) for name in by_name
+        }
+        for name, definitions in by_name.items():
+            self._compile_rule(self._metered_rules[name], definitions)
+        self._metered = False
+
+    @property
+    def rule_names(self) -> List[str]:
+        return list(self._rules)
+
+    # Evaluation
+
+    def evaluate(
+        self,
+        input_data: Any,
+        rules: Iterable[str],
+        gas_meter: Optional[GasMeter] = None,
+    ) -> Tuple[Dict[str, List[Any]], int]:
+        """
+        Evaluate several rules against one input, sharing rule memoization.
+
+        Args:
+            input_data: Input document
+            rules: Rule names to evaluate
+            gas_meter: If given, run the metered plan and charge this meter
+
+        Returns:
+            Tuple of ({rule: [values]}, steps); undefined rules map to []
+
+        Raises:
+            GasExceededError: If an instruction takes ``gas_meter`` past its
+                limit; the meter still records the gas charged up to then
+        """
+        if gas_meter is None:
+            ctx = _EvalContext(input_data)
+        else:
+            ctx = _EvalContext(
+                input_data,
+                metered=True,
+                gas=gas_meter.used,
+                gas_limit=gas_meter.enforced_limit,
+            )
+
+        try:
+            values = {
+                name: self._rule_values(ctx, name) if name in self._rules else [] for name in rules
+            }
+        finally:
+            if gas_meter is not None:
+                gas_meter.add_usage(ctx.gas - gas_meter.used, ctx.steps)
+        return values, ctx.steps
+
+    def query(self, rule: str, input_data: Any = None, default: Any = None) -> Any:
+        """Value of a rule, or ``default`` if it is undefined"""
+        values = self.evaluate(input_data, [rule])[0][rule]
+        return values[0] if values else default
+
+    def query_all(self, rule: str, input_data: Any = None) -> List[Any]:
+        """Every distinct value produced by a rule's definitions"""
+        return self.evaluate(input_data, [rule])[0][rule]
+
+    def run_tests(self, prefix: str = "test_") -> List[str]:
+        """Names of ``test_*`` rules in this module that succeed"""
+        passed = []
+        for name in self._rules:
+            if name.startswith(prefix) and True in self.query_all(name):
+                passed.append(name)
+        return passed
+
+    def _rule_values(self, ctx: _EvalContext, name: str) -> List[Any]:
+        key = (id(self), name)
+        cached = ctx.cache.get(key)
+        if cached is not None:
+            return cached
+
+        ctx.steps += 1
+        if ctx.metered:
+            ctx.gas += _GAS_RULE
+            if ctx.gas > ctx.gas_limit:
+                _out_of_gas(ctx)
+            rule = self._metered_rules[name]
+        else:
+            rule = self._rules[name]
+        values: List[Any] = []
+        for body, value_fn in rule.definitions:
+            env: Dict[str, Any] = {}
+            for statement in body:
+                ctx.steps += 1
+                if not statement(ctx, env):
+                    break
+            else:
+                value = value_fn(ctx, env)
+                if value is not UNDEFINED and not any(_equal(value, v) for v in values):
+                    values.append(value)
+
+        if not values and rule.default is not UNDEFINED:
+            values.append(rule.default)
+
+        ctx.cache[key] = values
+        return values
+
+    # Compilation
+
+    def _compile_rule(self, compiled: _CompiledRule, definitions: List[_Rule]) -> None:
+        defaults = [d for d in definitions if d.is_default]
+        if len(defaults) > 1:
+            raise RegoCompileError(f"multiple default rules for {compiled.name}")
+        if defaults:
+            compiled.default = self._constant_value(defaults[0].value, compiled.name)
+
+        for rule in definitions:
+            if rule.is_default:
+                continue
+            scope: set = set()
+            body = [self._compile_statement(s, scope) for s in rule.body]
+            if rule.value is None:
+                value_fn = lambda ctx, env: True
+            else:
+                value_fn = self._compile_node(rule.value, scope)
+            compiled.definitions.append((body, value_fn))
+
+    def _constant_value(self, node: tuple, rule_name: str) -> Any:
+        fn = self._compile_node(node, set())
+        value = fn(_EvalContext(None), {})
+        if value is UNDEFINED:
+            raise RegoCompileError(f"default value for {rule_name} must be a constant")
+        return value
+
+    def _compile_statement(self, statement: tuple, scope: set) -> Statement:
+        kind = statement[0]
+
+        if kind == "assign":
+            _, var, node = statement
+            if var in scope:
+                raise RegoCompileError(f"var {var} assigned above")
+            fn = self._compile_node(node, scope)
+            scope.add(var)
+
+            def assign(ctx, env):
+                value = fn(ctx, env)
+                if value is UNDEFINED:
+                    return False
+                env[var] = value
+                return True
+
+            return assign
+
+        if kind == "unify":
+            _, left, right, withs = statement
+            for target, source in ((left, right), (right, left)):
+                if self._is_unbound_var(target, scope) and not withs:
+                    return self._compile_statement(("assign", target[1], source), scope)
+            return self._compile_statement(("expr", ("binop", "==", left, right), withs), scope)
+
+        _, node, withs = statement
+        fn = self._compile_node(node, scope)
+        if withs:
+            fn = self._compile_withs(fn, withs, scope)
+
+        if kind == "not":
+            return lambda ctx, env: _fails(fn(ctx, env))
+        return lambda ctx, env: not _fails(fn(ctx, env))
+
+    def _compile_withs(self, fn: Evaluator, withs: list, scope: set) -> Evaluator:
+        overrides = []
+        for target, source in withs:
+            if target[0] != "ref" or target[1] != "input" or target[2]:
+                raise RegoCompileError("only 'with input as' is supported")
+            overrides.append(self._compile_node(source, scope))
+        source_fn = overrides[-1]
+
+        def with_input(ctx, env):
+            value = source_fn(ctx, env)
+            if value is UNDEFINED:
+                return UNDEFINED
+            inner = _EvalContext(value, ctx.steps, ctx.metered, ctx.gas, ctx.gas_limit)
+            try:
+                return fn(inner, env)
+            finally:
+                ctx.steps = inner.steps
+                ctx.gas = inner.gas
+
+        return with_input
+
+    def _is_unbound_var(self, node: tuple, scope: set) -> bool:
+        return (
+            node[0] == "ref"
+            and not node[2]
+            and node[1] not in scope
+            and node[1] not in ("input", "data")
+            and self._resolve_rule(node[1]) is None
+        )
+
+    def _resolve_rule(self, name: str) -> Optional["CompiledPolicy"]:
+        if name in self._rules:
+            return self
+        for module in self._imports:
+            if name in module._rules:
+                return module
+        return None
+
+    def _compile_node(self, node: tuple, scope: set) -> Evaluator:
+        kind = node[0]
+
+        if kind == "scalar":
+            value = node[1]
+            return lambda ctx, env: value
+
+        if kind == "ref":
+            return self._compile_ref(node, scope)
+
+        if kind == "array":
+            items = [self._compile_node(n, scope) for n in node[1]]
+            return self._fold(items, lambda values: list(values), _GAS_PER_ITEM * len(items))
+
+        if kind == "set":
+            items = [self._compile_node(n, scope) for n in node[1]]
+            return self._fold(
+                items,
+                lambda values: frozenset(_freeze(v) for v in values),
+                _GAS_PER_ITEM * len(items),
+            )
+
+        if kind == "object":
+            keys = [self._compile_node(k, scope) for k, _ in node[1]]
+            vals = [self._compile_node(v, scope) for _, v in node[1]]
+            n = len(keys)
+            return self._fold(
+                keys + vals,
+                lambda values: {_freeze(values[i]): values[n + i] for i in range(n)},
+                _GAS_PER_ITEM * n,
+            )
+
+        if kind == "call":
+            _, name, args = node
+            if name not in _BUILTINS:
+                raise RegoCompileError(f"unsupported function {name}()")
+            arity, builtin = _BUILTINS[name]
+            if len(args) != arity:
+                raise RegoCompileError(f"{name}() takes {arity} arguments, got {len(args)}")
+            arg_fns = [self._compile_node(a, scope) for a in args]
+            return self._fold(arg_fns, lambda values: builtin(*values), _call_gas)
+
+        if kind == "neg":
+            operand = self._compile_node(node[1], scope)
+            return self._fold([operand], lambda values: _arith("-", 0, values[0]), _GAS_COMPARE)
+
+        if kind == "binop":
+            _, op, left, right = node
+            lf = self._compile_node(left, scope)
+            rf = self._compile_node(right, scope)
+            if op == "==":
+                combine = lambda v: _equal(v[0], v[1])
+            elif op == "!=":
+                combine = lambda v: not _equal(v[0], v[1])
+            elif op in ("<", "<=", ">", ">="):
+                test = {
+                    "<": lambda c: c < 0,
+                    "<=": lambda c: c <= 0,
+                    ">": lambda c: c > 0,
+                    ">=": lambda c: c >= 0,
+                }[op]
+                combine = lambda v: test(_compare(v[0], v[1]))
+            elif op == "in":
+                combine = lambda v: _contains(v[1], v[0])
+                return self._fold([lf, rf], combine, _membership_gas)
+            else:
+                combine = lambda v: _arith(op, v[0], v[1])
+            return self._fold([lf, rf], combine, _GAS_COMPARE)
+
+        raise RegoCompileError(f"unsupported expression {kind}")
+
+    def _fold(
+        self,
+        operands: List[Evaluator],
+        combine: Callable[[list], Any],
+        gas: Union[int, Callable[[list], int]] = 0,
+    ) -> Evaluator:
+        """
+        Combine operand values; undefined if any operand is undefined.
+
+        In the metered plan, ``gas`` (a cost, or a function of the operand
+        values) is charged before combining.
+        """
+        if not (self._metered and gas):
+
+            def evaluate(ctx, env):
+                values = []
+                for operand in operands:
+                    value = operand(ctx, env)
+                    if value is UNDEFINED:
+                        return UNDEFINED
+                    values.append(value)
+                return combine(values)
+
+            return evaluate
+
+        if callable(gas):
+
+            def evaluate_metered(ctx, env):
+                values = []
+                for operand in operands:
+                    value = operand(ctx, env)
+                    if value is UNDEFINED:
+                        return UNDEFINED
+                    values.append(value)
+                _charge(ctx, gas(values))
+                return combine(values)
+
+            return evaluate_metered
+
+        def evaluate_fixed_cost(ctx, env):
+            values = []
+            for operand in operands:
+                value = operand(ctx, env)
+                if value is UNDEFINED:
+                    return UNDEFINED
+                values.append(value)
+            ctx.gas += gas
+            if ctx.gas > ctx.gas_limit:
+                _out_of_gas(ctx)
+            return combine(values)
+
+        return evaluate_fixed_cost
+
+    def _compile_ref(self, node: tuple, scope: set) -> Evaluator:
+        _, name, path = node
+        path_fns = [self._compile_node(p, scope) for p in path]
+
+        if name in scope:
+            base = lambda ctx, env: env[name]
+        elif name == "input":
+            base = lambda ctx, env: ctx.input
+        elif name == "data":
+            return self._compile_data_ref(path, path_fns)
+        else:
+            module = self._resolve_rule(name)
+            if module is None:
+                raise RegoCompileError(f"var {name} is unsafe")
+            base = module._rule_ref(name)
+
+        return self._compile_ref_on(base, path_fns)
+
+    def _compile_data_ref(self, path: List[tuple], path_fns: List[Evaluator]) -> Evaluator:
+        names = [p[1] if p[0] == "scalar" else None for p in path]
+        for module in [self] + self._imports:
+            depth = len(module._package_path)
+            if names[:depth] == module._package_path and len(names) > depth:
+                rule = names[depth]
+                if rule in module._rules:
+                    return self._compile_ref_on(module._rule_ref(rule), path_fns[depth + 1 :])
+        raise RegoCompileError(f"unresolved reference data.{'.'.join(map(str, names))}")
+
+    def _compile_ref_on(self, base: Evaluator, path_fns: List[Evaluator]) -> Evaluator:
+        if not path_fns:
+            return base
+
+        def walk(ctx, env):
+            value = base(ctx, env)
+            for path_fn in path_fns:
+                if value is UNDEFINED:
+                    return UNDEFINED
+                key = path_fn(ctx, env)
+                if key is UNDEFINED:
+                    return UNDEFINED
+                value = _walk(value, key)
+            return value
+
+        if not self._metered:
+            return walk
+
+        def walk_metered(ctx, env):
+            value = base(ctx, env)
+            for path_fn in path_fns:
+                if value is UNDEFINED:
+                    return UNDEFINED
+                key = path_fn(ctx, env)
+                if key is UNDEFINED:
+                    return UNDEFINED
+                ctx.gas += _GAS_FIELD
+                if ctx.gas > ctx.gas_limit:
+                    _out_of_gas(ctx)
+                value = _walk(value, key)
+            return value
+
+        return walk_metered
+
+    def _rule_ref(self, name: str) -> Evaluator:
+        def rule_value(ctx, env):
+            values = self._rule_values(ctx, name)
+            return values[0] if values else UNDEFINED
+
+        return rule_value
+
+
+# ----------------------------------------------------------------------------
+# Compile cache
+
+_CACHE_SIZE = 32
+_compiled_policies: "OrderedDict[str, CompiledPolicy]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def policy_source_hash(source: str, imports: Sequence[CompiledPolicy] = ()) -> str:
+    """SHA-256 identifying a policy source together with its imports"""
+    h = hashlib.sha256(source.encode("utf-8"))
+    for module in imports:
+        h.update(module.policy_hash.encode())
+    return h.hexdigest()
+
+
+def compile_policy(source: str, imports: Sequence[CompiledPolicy] = ()) -> CompiledPolicy:
+    """
+    Compile a Rego module, reusing an earlier compilation of the same source.
+
+    Args:
+        source: Rego module text
+        imports: Compiled modules whose rules may be referenced unqualified
+            (used by test modules that exercise another policy's rules)
+
+    Returns:
+        CompiledPolicy
+
+    Raises:
+        RegoCompileError: If the module is outside the supported subset
+    """
+    policy_hash = policy_source_hash(source, imports)
+
+    with _cache_lock:
+        compiled = _compiled_policies.get(policy_hash)
+        if compiled is not None:
+            _compiled_policies.move_to_end(policy_hash)
+            return compiled
+
+    compiled = CompiledPolicy(source, policy_hash, imports)
+
+    with _cache_lock:
+        _compiled_policies[policy_hash] = compiled
+        while len(_compiled_policies) > _CACHE_SIZE:
+            _compiled_policies.popitem(last=False)
+
+    logger.info(f"Compiled policy {compiled.package} ({policy_hash[:16]}...)")
+    return compiled
+
+
+def load_policy(path: Path, imports: Sequence[CompiledPolicy] = ()) -> CompiledPolicy:
+    """Compile a Rego file (see compile_policy)"""
+    return compile_policy(Path(path).read_text(encoding="utf-8"), imports)
+
+
+def clear_policy_cache() -> None:
+    """Drop all cached compilations"""
+    with _cache_lock:
+        _compiled_policies.clear()
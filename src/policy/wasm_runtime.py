@@ -15,6 +15,7 @@ from typing import Dict, Any, Optional
 from pathlib import Path
 
 from policy.opa_engine import OPAEngine, PolicyResult
+from policy.rego_compiler import CompiledPolicy
 from policy.gas_meter import GasMeter, GasExceededError
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,9 @@ class WASMRuntime:
     - Future upgrade path to real WASM
     """
 
+    # Input fields charged a field access when present
+    METERED_FIELDS = ("kind", "thread_id", "lamport", "actor_id", "payload_size")
+
     def __init__(self, policy_path: Optional[Path] = None, gas_limit: int = 100000):
         """
         Initialize WASM runtime.
@@ -84,21 +88,36 @@ class WASMRuntime:
         """
         return self._policy_hash
 
-    def evaluate(self, input_data: Dict[str, Any]) -> PolicyResult:
+    def swap_policy(self, compiled: CompiledPolicy) -> None:
+        """
+        Switch the runtime to another compiled policy.
+
+        Args:
+            compiled: Policy to evaluate from now on; its source hash becomes
+                the runtime's policy hash
+        """
+        self.engine.swap_policy(compiled)
+        self._policy_hash = compiled.policy_hash
+
+    def evaluate(
+        self, input_data: Dict[str, Any], gas_meter: Optional[GasMeter] = None
+    ) -> PolicyResult:
         """
         Evaluate policy with gas metering.
 
         Args:
             input_data: Input envelope for policy
+            gas_meter: Meter to charge (default: a fresh meter with this
+                runtime's gas limit)
 
         Returns:
-            PolicyResult with gas tracking
-
-        Raises:
-            GasExceededError: If gas limit exceeded
+            PolicyResult with the gas this evaluation used; a denial if the
+            gas limit was exceeded
         """
         # Create gas meter for this evaluation
-        gas_meter = GasMeter(gas_limit=self.gas_limit)
+        if gas_meter is None:
+            gas_meter = GasMeter(gas_limit=self.gas_limit)
+        start_gas = gas_meter.used
 
         try:
             # Metered evaluation
@@ -106,7 +125,7 @@ class WASMRuntime:
 
             # Update gas usage in result
             metrics = gas_meter.get_metrics()
-            result.gas_used = metrics.used
+            result.gas_used = metrics.used - start_gas
 
             logger.debug(
                 f"Policy evaluation complete: allowed={result.allowed}, "
@@ -122,7 +141,7 @@ class WASMRuntime:
             return PolicyResult(
                 allowed=False,
                 reasons=[str(e)],
-                gas_used=gas_meter.used,
+                gas_used=gas_meter.used - start_gas,
                 policy_version="1.0.0",
             )
 
@@ -130,6 +149,10 @@ class WASMRuntime:
         """
         Evaluate policy with gas metering.
 
+        The compiled policy charges gas per evaluated instruction and stops at
+        the limit. Other backends cannot be metered, so they are charged a
+        fixed estimate around the evaluation.
+
         Args:
             input_data: Input envelope
             gas_meter: Gas meter instance
@@ -137,8 +160,11 @@ class WASMRuntime:
         Returns:
             PolicyResult
         """
+        if self.engine.supports_metering:
+            return self.engine.evaluate(input_data, gas_meter)
+
         # Meter field accesses
-        for field in ["kind", "thread_id", "lamport", "actor_id", "payload_size"]:
+        for field in self.METERED_FIELDS:
             if field in input_data:
                 gas_meter.consume_field_access(field)
 
@@ -165,7 +191,12 @@ class WASMRuntime:
         """
         Evaluate multiple inputs.
 
-        Each evaluation has its own gas limit.
+        Each evaluation has its own gas limit. With the compiled policy every
+        input is evaluated metered. Other backends evaluate the whole batch in
+        one call and gas is charged from the same fixed estimate as
+        _evaluate_with_metering without a GasMeter per input; inputs whose gas
+        would exceed the limit are re-run through evaluate() so they report
+        the same error.
 
         Args:
             inputs: List of input envelopes
@@ -173,11 +204,28 @@ class WASMRuntime:
         Returns:
             List of PolicyResults
         """
-        results = []
-
-        for input_data in inputs:
-            result = self.evaluate(input_data)
-            results.append(result)
+        if self.engine.supports_metering:
+            return [self.evaluate(input_data) for input_data in inputs]
+
+        # Cost of the checks every evaluation performs, independent of input
+        fixed_gas = (
+            GasMeter.COST_SET_MEMBERSHIP
+            + 2 * GasMeter.COST_COMPARISON
+            + GasMeter.COST_FUNCTION_CALL
+        )
+        metered_fields = self.METERED_FIELDS
+
+        results = self.engine.evaluate_batch(inputs)
+        for i, (input_data, result) in enumerate(zip(inputs, results)):
+            gas_used = (
+                fixed_gas
+                + GasMeter.COST_FIELD_ACCESS * sum(1 for f in metered_fields if f in input_data)
+                + GasMeter.COST_ITERATION_PER_ITEM * len(result.reasons)
+            )
+            if gas_used > self.gas_limit:
+                results[i] = self.evaluate(input_data)
+            else:
+                result.gas_used = gas_used
 
         return results
 
@@ -195,6 +243,7 @@ class WASMRuntime:
             "policy_version": "1.0.0",
             "wasm_enabled": False,  # Future: detect real WASM
             "backend": "python_opa_engine",
+            "metering": "per_instruction" if self.engine.supports_metering else "estimated",
         }
 
     def verify_policy_integrity(self, expected_hash: str) -> bool:
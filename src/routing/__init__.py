@@ -6,6 +6,7 @@ of tasks to the most suitable agents.
 """
 
 from .manifests import AgentManifest, ManifestRegistry
+from .agent_table import AgentTable
 from .filters import CapabilityFilter
 from .scoring import AgentScorer, ScoredAgent
 from .domain_fit import DomainFitCalculator
@@ -16,11 +17,13 @@ from .bandit import ContextualBandit, ArmStats
 from .features import FeatureExtractor
 from .feedback import collect_feedback, FeedbackCollector
 from .metrics import MetricsCollector, RoutingMetrics
+from .cache import RoutingCache, fingerprint_need
 from .router import IntelligentRouter
 
 __all__ = [
     "AgentManifest",
     "ManifestRegistry",
+    "AgentTable",
     "CapabilityFilter",
     "AgentScorer",
     "ScoredAgent",
@@ -37,5 +40,7 @@ __all__ = [
     "FeedbackCollector",
     "MetricsCollector",
     "RoutingMetrics",
+    "RoutingCache",
+    "fingerprint_need",
     "IntelligentRouter",
 ]
@@ -0,0 +1,197 @@
+"""
+Columnar Agent Table
+
+Keeps the per-agent scoring inputs as NumPy columns (price, latency,
+reputation, zone) and tag/capability sets as packed bitsets, so a whole
+candidate list can be scored in a handful of array operations.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+import numpy as np
+
+from vocabulary import Vocabulary, get_vocabulary
+
+logger = logging.getLogger(__name__)
+
+WORD_BITS = 64
+
+if hasattr(np, "bitwise_count"):
+
+    def popcount(words: np.ndarray) -> np.ndarray:
+        """Set bits per row of a (rows, words) uint64 array"""
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+
+else:
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(words: np.ndarray) -> np.ndarray:
+        """Set bits per row of a (rows, words) uint64 array"""
+        as_bytes = np.ascontiguousarray(words).view(np.uint8)
+        return _BYTE_COUNTS[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+class BitsetColumn:
+    """
+    Per-row label sets packed into uint64 words.
+
+    Bit positions come from a shared Vocabulary; the column widens by a
+    word whenever a label's position falls past its last word.
+    """
+
+    def __init__(self, capacity: int, vocabulary: Vocabulary):
+        self.vocabulary = vocabulary
+        self.bits = np.zeros((capacity, 1), dtype=np.uint64)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+
+    def grow(self, capacity: int) -> None:
+        """Extend to at least capacity rows"""
+        extra = capacity - len(self.counts)
+        if extra > 0:
+            self.bits = np.vstack([self.bits, np.zeros((extra, self.bits.shape[1]), np.uint64)])
+            self.counts = np.concatenate([self.counts, np.zeros(extra, np.int64)])
+
+    def _bit(self, label: str) -> int:
+        bit = self.vocabulary.intern(label)
+        words = bit // WORD_BITS + 1
+        if words > self.bits.shape[1]:
+            pad = np.zeros((self.bits.shape[0], words - self.bits.shape[1]), dtype=np.uint64)
+            self.bits = np.hstack([self.bits, pad])
+        return bit
+
+    def set_row(self, row: int, labels: Iterable[str]) -> None:
+        """Replace the label set stored at row"""
+        labels = set(labels)
+        bits = [self._bit(label) for label in labels]
+        self.bits[row] = 0
+        for bit in bits:
+            self.bits[row, bit // WORD_BITS] |= np.uint64(1 << (bit % WORD_BITS))
+        self.counts[row] = len(labels)
+
+    def mask(self, labels: Iterable[str]) -> Optional[np.ndarray]:
+        """Bitset of the known labels, or None if none are known"""
+        mask = np.zeros(self.bits.shape[1], dtype=np.uint64)
+        known = False
+        for label in labels:
+            bit = self.vocabulary.id(label)
+            if bit is not None and bit < self.bits.shape[1] * WORD_BITS:
+                mask[bit // WORD_BITS] |= np.uint64(1 << (bit % WORD_BITS))
+                known = True
+        return mask if known else None
+
+    def overlap(self, rows: np.ndarray, labels: Iterable[str]) -> np.ndarray:
+        """Size of each row's intersection with labels"""
+        mask = self.mask(labels)
+        if mask is None:
+            return np.zeros(len(rows), dtype=np.int64)
+        return popcount(self.bits[rows] & mask)
+
+
+class AgentTable:
+    """
+    Columnar store of agent scoring inputs.
+
+    Rows are keyed by agent_id and filled from manifests on first use. A
+    manifest object is read once: an agent's row is rewritten only when a
+    different manifest object is seen for it (e.g. after re-registration).
+    """
+
+    def __init__(self, capacity: int = 1024, vocabulary: Optional[Vocabulary] = None):
+        vocabulary = vocabulary or get_vocabulary()
+        self.agent_ids: List[str] = []
+        self.manifests: List[Any] = []
+        self.rows: Dict[str, int] = {}  # agent_id -> row
+
+        self.price = np.zeros(capacity)
+        self.latency = np.zeros(capacity)
+        self.reputation = np.zeros(capacity)
+        self.zone = np.zeros(capacity, dtype=np.int64)
+        self.zone_codes: Dict[str, int] = {}
+
+        self.tags = BitsetColumn(capacity, vocabulary)
+        self.capabilities = BitsetColumn(capacity, vocabulary)
+
+    def __len__(self) -> int:
+        return len(self.agent_ids)
+
+    def _grow(self) -> None:
+        capacity = len(self.price) * 2
+        for name in ("price", "latency", "reputation", "zone"):
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column, np.zeros_like(column)]))
+        self.tags.grow(capacity)
+        self.capabilities.grow(capacity)
+
+    def _write(self, row: int, manifest: Any) -> None:
+        # Same fallbacks as AgentScorer.score_agent
+        reputation = getattr(manifest, "reputation", None)
+        if reputation is None:
+            reputation = getattr(manifest, "success_rate", 0.8)
+        zone = getattr(manifest, "zone", None) or "unknown"
+
+        self.manifests[row] = manifest
+        self.price[row] = manifest.price_per_task
+        self.latency[row] = manifest.avg_latency_ms
+        self.reputation[row] = reputation
+        self.zone[row] = self.zone_codes.setdefault(zone, len(self.zone_codes))
+        self.tags.set_row(row, manifest.tags)
+        self.capabilities.set_row(row, manifest.capabilities)
+
+    def rows_for(self, manifests: List[Any]) -> np.ndarray:
+        """
+        Row index of each manifest, adding or refreshing rows as needed.
+
+        Args:
+            manifests: Agent manifests (routing or identity)
+
+        Returns:
+            Array of row indexes, aligned with manifests
+        """
+        rows = np.empty(len(manifests), dtype=np.intp)
+        for i, manifest in enumerate(manifests):
+            row = self.rows.get(manifest.agent_id)
+            if row is None:
+                row = len(self.agent_ids)
+                if row == len(self.price):
+                    self._grow()
+                self.agent_ids.append(manifest.agent_id)
+                self.manifests.append(None)
+                self.rows[manifest.agent_id] = row
+                self._write(row, manifest)
+            elif self.manifests[row] is not manifest:
+                self._write(row, manifest)
+            rows[i] = row
+        return rows
+
+    def gather(self, mapping: Dict[str, float], rows: np.ndarray, default: float) -> np.ndarray:
+        """
+        Look up mapping[agent_id] for each row.
+
+        Iterates whichever of the mapping and the rows is smaller.
+
+        Args:
+            mapping: agent_id -> value
+            rows: Row indexes
+            default: Value for agents missing from mapping
+
+        Returns:
+            Float array aligned with rows
+        """
+        if not mapping:
+            return np.full(len(rows), default, dtype=float)
+
+        if len(mapping) < len(rows):
+            column = np.full(len(self.agent_ids), default, dtype=float)
+            for agent_id, value in mapping.items():
+                row = self.rows.get(agent_id)
+                if row is not None:
+                    column[row] = value
+            return column[rows]
+
+        agent_ids = self.agent_ids
+        return np.fromiter(
+            (mapping.get(agent_ids[row], default) for row in rows.tolist()),
+            dtype=float,
+            count=len(rows),
+        )
@@ -1,11 +1,12 @@
 """
 Contextual Bandit Learning
 
-Implements Thompson Sampling and UCB1 for agent selection with contextual learning.
+Implements Thompson Sampling, UCB1, LinUCB and linear Thompson Sampling for
+agent selection with contextual learning.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import random
 import math
 import logging
@@ -61,6 +62,13 @@ class ArmStats:
         }
 
 
+# Reward at or above which a pull counts as a success for Thompson Sampling
+SUCCESS_THRESHOLD = 0.7
+
+# Selection policies accepted by ContextualBandit.select
+POLICIES = ("thompson", "ucb1", "linucb", "linear_thompson")
+
+
 class ContextualBandit:
     """
     Contextual multi-armed bandit for agent selection.
@@ -68,23 +76,74 @@ class ContextualBandit:
     Implements:
     - Thompson Sampling (Bayesian approach)
     - UCB1 (Upper Confidence Bound)
+    - LinUCB and linear Thompson Sampling over context vectors
+
+    Arm parameters are kept in arrays indexed by arm row, so a selection
+    scores every candidate arm in one vectorized call. The linear models
+    keep a ridge-regression inverse design matrix per arm, updated
+    incrementally with Sherman-Morrison.
     """
 
-    def __init__(self, arms: Optional[List[str]] = None, exploration_bonus: float = 2.0):
+    def __init__(
+        self,
+        arms: Optional[List[str]] = None,
+        exploration_bonus: float = 2.0,
+        context_dim: int = 10,
+        ridge: float = 1.0,
+        linucb_alpha: float = 1.0,
+        linear_ts_scale: float = 0.25,
+    ):
         """
         Initialize contextual bandit.
 
         Args:
             arms: List of arm IDs (agent IDs)
             exploration_bonus: Exploration parameter for UCB1
+            context_dim: Length of context vectors (FeatureExtractor.feature_dim)
+            ridge: Ridge regularization of the linear models
+            linucb_alpha: Width of the LinUCB confidence bound
+            linear_ts_scale: Posterior scale for linear Thompson Sampling
         """
         self.arms: Dict[str, ArmStats] = {}
         self.exploration_bonus = exploration_bonus
+        self.context_dim = context_dim
+        self.ridge = ridge
+        self.linucb_alpha = linucb_alpha
+        self.linear_ts_scale = linear_ts_scale
         self.total_pulls = 0
 
+        self.arm_ids: List[str] = []  # row -> arm ID
+        self.rows: Dict[str, int] = {}  # arm ID -> row
+
+        if HAS_NUMPY:
+            capacity = max(16, len(arms or ()))
+            self._successes = np.zeros(capacity)
+            self._failures = np.zeros(capacity)
+            self._pulls = np.zeros(capacity)
+            self._rewards = np.zeros(capacity)
+            self._a_inv = np.zeros((capacity, context_dim, context_dim))  # (X^T X + ridge I)^-1
+            self._b = np.zeros((capacity, context_dim))  # X^T r
+
         if arms:
             for arm in arms:
-                self.arms[arm] = ArmStats()
+                self._add_row(arm)
+
+    def _add_row(self, arm_id: str) -> int:
+        row = len(self.arm_ids)
+        self.arm_ids.append(arm_id)
+        self.rows[arm_id] = row
+        self.arms[arm_id] = ArmStats()
+
+        if HAS_NUMPY:
+            if row == len(self._pulls):
+                self._grow()
+            self._a_inv[row] = np.eye(self.context_dim) / self.ridge
+        return row
+
+    def _grow(self) -> None:
+        for name in ("_successes", "_failures", "_pulls", "_rewards", "_a_inv", "_b"):
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column, np.zeros_like(column)]))
 
     def add_arm(self, arm_id: str) -> None:
         """
@@ -94,44 +153,91 @@ class ContextualBandit:
             arm_id: Arm ID to add
         """
         if arm_id not in self.arms:
-            self.arms[arm_id] = ArmStats()
+            self._add_row(arm_id)
             logger.info(f"Added arm: {arm_id}")
 
-    def thompson_sampling(self, context: Optional[List[float]] = None) -> Optional[str]:
+    def _candidates(self, candidates: Optional[List[str]]) -> List[str]:
+        """Arm IDs to choose from, adding any unknown candidates as arms"""
+        if candidates is None:
+            return list(self.arm_ids)
+
+        arm_ids = list(dict.fromkeys(candidates))
+        for arm_id in arm_ids:
+            self.add_arm(arm_id)
+        return arm_ids
+
+    def _rows_of(self, arm_ids: List[str]) -> "np.ndarray":
+        return np.fromiter((self.rows[a] for a in arm_ids), dtype=np.intp, count=len(arm_ids))
+
+    def _context_vector(self, context: List[float]) -> "np.ndarray":
+        x = np.asarray(context, dtype=float)
+        if x.shape != (self.context_dim,):
+            raise ValueError(f"Expected a {self.context_dim}-dim context, got {len(context)}")
+        return x
+
+    def select(
+        self,
+        context: Optional[List[float]] = None,
+        candidates: Optional[List[str]] = None,
+        policy: str = "thompson",
+    ) -> Optional[str]:
+        """
+        Select an arm with the named policy.
+
+        Args:
+            context: Contextual features
+            candidates: Arms to choose from (default: all arms)
+            policy: One of POLICIES
+
+        Returns:
+            Selected arm ID or None if no arms
+        """
+        if policy == "thompson":
+            return self.thompson_sampling(context, candidates=candidates)
+        if policy == "ucb1":
+            return self.ucb1(context, candidates=candidates)
+        if policy == "linucb":
+            return self.linucb(context, candidates=candidates)
+        if policy == "linear_thompson":
+            return self.linear_thompson_sampling(context, candidates=candidates)
+        raise ValueError(f"Unknown bandit policy: {policy}")
+
+    def thompson_sampling(
+        self, context: Optional[List[float]] = None, candidates: Optional[List[str]] = None
+    ) -> Optional[str]:
         """
         Select arm using Thompson Sampling.
 
-        Samples from Beta(α, β) for each arm and selects highest sample.
+        Samples from Beta(α, β) for every candidate arm in one call and
+        selects the highest sample.
 
         Args:
             context: Contextual features (not used in basic Thompson Sampling)
+            candidates: Arms to choose from (default: all arms)
 
         Returns:
             Selected arm ID or None if no arms
         """
-        if not self.arms:
+        arm_ids = self._candidates(candidates)
+        if not arm_ids:
             logger.warning("No arms available for selection")
             return None
 
-        # Sample from Beta distribution for each arm
-        samples = {}
-
-        for arm_id, stats in self.arms.items():
-            # Beta distribution sampling
-            if HAS_NUMPY:
-                sample = np.random.beta(stats.alpha, stats.beta)
-            else:
-                # Fallback: use mean with random noise
+        if HAS_NUMPY:
+            rows = self._rows_of(arm_ids)
+            samples = np.random.beta(self._successes[rows] + 1, self._failures[rows] + 1)
+            selected = arm_ids[int(np.argmax(samples))]
+        else:
+            # Fallback: use mean with random noise
+            samples = {}
+            for arm_id in arm_ids:
+                stats = self.arms[arm_id]
                 mean = stats.alpha / (stats.alpha + stats.beta)
                 noise = random.gauss(0, 0.1)
-                sample = max(0.0, min(1.0, mean + noise))
-
-            samples[arm_id] = sample
-
-        # Select arm with highest sample
-        selected = max(samples.items(), key=lambda x: x[1])[0]
+                samples[arm_id] = max(0.0, min(1.0, mean + noise))
+            selected = max(samples.items(), key=lambda x: x[1])[0]
 
-        logger.debug(f"Thompson Sampling selected: {selected} (samples: {samples})")
+        logger.debug(f"Thompson Sampling selected: {selected} from {len(arm_ids)} arms")
 
         return selected
 
@@ -139,6 +245,7 @@ class ContextualBandit:
         self,
         context: Optional[List[float]] = None,
         exploration_bonus: Optional[float] = None,
+        candidates: Optional[List[str]] = None,
     ) -> Optional[str]:
         """
         Select arm using UCB1 algorithm.
@@ -149,11 +256,13 @@ class ContextualBandit:
         Args:
             context: Contextual features (not used in basic UCB1)
             exploration_bonus: Override exploration parameter (default: use self.exploration_bonus)
+            candidates: Arms to choose from (default: all arms)
 
         Returns:
             Selected arm ID or None if no arms
         """
-        if not self.arms:
+        arm_ids = self._candidates(candidates)
+        if not arm_ids:
             logger.warning("No arms available for selection")
             return None
 
@@ -161,41 +270,123 @@ class ContextualBandit:
             exploration_bonus = self.exploration_bonus
 
         # Select unpulled arms first
-        unpulled = [arm_id for arm_id, stats in self.arms.items() if stats.pulls == 0]
+        unpulled = [arm_id for arm_id in arm_ids if self.arms[arm_id].pulls == 0]
         if unpulled:
             selected = random.choice(unpulled)
             logger.debug(f"UCB1 selected unpulled arm: {selected}")
             return selected
 
-        # Calculate UCB for each arm
-        ucb_values = {}
+        log_total = math.log(self.total_pulls)
+
+        if HAS_NUMPY:
+            rows = self._rows_of(arm_ids)
+            pulls = self._pulls[rows]
+            ucb_values = self._rewards[rows] / pulls + exploration_bonus * np.sqrt(
+                log_total / pulls
+            )
+            selected = arm_ids[int(np.argmax(ucb_values))]
+        else:
+            ucb_values = {}
+            for arm_id in arm_ids:
+                stats = self.arms[arm_id]
+                bonus = exploration_bonus * math.sqrt(log_total / stats.pulls)
+                ucb_values[arm_id] = stats.mean_reward + bonus
+            selected = max(ucb_values.items(), key=lambda x: x[1])[0]
 
-        for arm_id, stats in self.arms.items():
-            mean_reward = stats.mean_reward
+        logger.debug(f"UCB1 selected: {selected} from {len(arm_ids)} arms")
 
-            # Exploration bonus
-            bonus = exploration_bonus * math.sqrt(math.log(self.total_pulls) / stats.pulls)
+        return selected
 
-            ucb = mean_reward + bonus
-            ucb_values[arm_id] = ucb
+    def _linear_estimates(
+        self, rows: "np.ndarray", x: "np.ndarray"
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Predicted reward x·θ and its variance factor x^T A^-1 x per row"""
+        a_inv_x = np.einsum("nij,j->ni", self._a_inv[rows], x)
+        mean = np.einsum("ni,ni->n", self._b[rows], a_inv_x)  # A^-1 is symmetric
+        variance = np.maximum(a_inv_x @ x, 0.0)
+        return mean, variance
 
-        # Select arm with highest UCB
-        selected = max(ucb_values.items(), key=lambda x: x[1])[0]
+    def linucb(
+        self,
+        context: Optional[List[float]],
+        candidates: Optional[List[str]] = None,
+        alpha: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Select arm using LinUCB.
+
+        Each arm fits a ridge regression of reward on context; the arm with
+        the highest upper bound x·θ + α·sqrt(x^T A^-1 x) is selected. Falls
+        back to UCB1 without a context (or without NumPy).
+
+        Args:
+            context: Contextual features, context_dim long
+            candidates: Arms to choose from (default: all arms)
+            alpha: Override confidence width (default: self.linucb_alpha)
+
+        Returns:
+            Selected arm ID or None if no arms
+        """
+        if context is None or not HAS_NUMPY:
+            return self.ucb1(context, candidates=candidates)
+
+        arm_ids = self._candidates(candidates)
+        if not arm_ids:
+            logger.warning("No arms available for selection")
+            return None
 
-        logger.debug(f"UCB1 selected: {selected} (UCB values: {ucb_values})")
+        if alpha is None:
+            alpha = self.linucb_alpha
+
+        mean, variance = self._linear_estimates(
+            self._rows_of(arm_ids), self._context_vector(context)
+        )
+        selected = arm_ids[int(np.argmax(mean + alpha * np.sqrt(variance)))]
+
+        logger.debug(f"LinUCB selected: {selected} from {len(arm_ids)} arms")
 
         return selected
 
-    def update(self, agent_id: str, reward: float, context: Optional[List[float]] = None) -> None:
+    def linear_thompson_sampling(
+        self, context: Optional[List[float]], candidates: Optional[List[str]] = None
+    ) -> Optional[str]:
         """
-        Update arm statistics with observed reward.
+        Select arm using linear Thompson Sampling.
+
+        Samples θ ~ N(θ_hat, v² A^-1) per arm and selects the highest x·θ.
+        Only x·θ is needed, which is N(x·θ_hat, v² x^T A^-1 x), so one
+        normal draw per arm replaces the d-dimensional sample. Falls back
+        to Thompson Sampling without a context (or without NumPy).
 
         Args:
-            agent_id: Arm that was pulled
-            reward: Observed reward (0.0 - 1.0)
-            context: Contextual features used for selection
+            context: Contextual features, context_dim long
+            candidates: Arms to choose from (default: all arms)
+
+        Returns:
+            Selected arm ID or None if no arms
         """
-        # Ensure arm exists
+        if context is None or not HAS_NUMPY:
+            return self.thompson_sampling(context, candidates=candidates)
+
+        arm_ids = self._candidates(candidates)
+        if not arm_ids:
+            logger.warning("No arms available for selection")
+            return None
+
+        mean, variance = self._linear_estimates(
+            self._rows_of(arm_ids), self._context_vector(context)
+        )
+        samples = mean + self.linear_ts_scale * np.sqrt(variance) * np.random.standard_normal(
+            len(arm_ids)
+        )
+        selected = arm_ids[int(np.argmax(samples))]
+
+        logger.debug(f"Linear Thompson Sampling selected: {selected} from {len(arm_ids)} arms")
+
+        return selected
+
+    def _record(self, agent_id: str, reward: float, context: Optional[List[float]]) -> ArmStats:
+        """Update an arm's counters (not its linear model)"""
         if agent_id not in self.arms:
             self.add_arm(agent_id)
 
@@ -210,11 +401,18 @@ class ContextualBandit:
 
         # Update success/failure (for Thompson Sampling)
         # Treat reward as success probability
-        if reward >= 0.7:  # Threshold for "success"
+        if reward >= SUCCESS_THRESHOLD:
             stats.successes += 1
         else:
             stats.failures += 1
 
+        if HAS_NUMPY:
+            row = self.rows[agent_id]
+            self._successes[row] = stats.successes
+            self._failures[row] = stats.failures
+            self._pulls[row] = stats.pulls
+            self._rewards[row] = stats.total_reward
+
         # Store context
         if context is not None:
             stats.contexts_seen.append(context)
@@ -222,12 +420,85 @@ class ContextualBandit:
             if len(stats.contexts_seen) > 100:
                 stats.contexts_seen = stats.contexts_seen[-100:]
 
+        return stats
+
+    def _update_linear(self, row: int, contexts: "np.ndarray", rewards: "np.ndarray") -> None:
+        """Fold observations into an arm's model with Sherman-Morrison updates"""
+        a_inv = self._a_inv[row]
+        for x in contexts:
+            a_inv_x = a_inv @ x
+            a_inv -= np.outer(a_inv_x, a_inv_x) / (1.0 + x @ a_inv_x)
+        self._b[row] += rewards @ contexts
+
+    def update(self, agent_id: str, reward: float, context: Optional[List[float]] = None) -> None:
+        """
+        Update arm statistics with observed reward.
+
+        Args:
+            agent_id: Arm that was pulled
+            reward: Observed reward (0.0 - 1.0)
+            context: Contextual features used for selection
+        """
+        x = self._context_vector(context) if context is not None and HAS_NUMPY else None
+
+        stats = self._record(agent_id, reward, context)
+
+        if x is not None:
+            self._update_linear(self.rows[agent_id], x[None, :], np.array([reward]))
+
         logger.info(
             f"Updated {agent_id}: pulls={stats.pulls}, "
             f"mean_reward={stats.mean_reward:.3f}, "
             f"alpha={stats.alpha}, beta={stats.beta}"
         )
 
+    def update_batch(
+        self,
+        agent_ids: List[str],
+        rewards: List[float],
+        contexts: Optional[List[Optional[List[float]]]] = None,
+    ) -> None:
+        """
+        Update arm statistics with a batch of observed rewards.
+
+        Equivalent to calling update for each observation in order, but the
+        linear models are updated once per arm.
+
+        Args:
+            agent_ids: Arm pulled for each observation
+            rewards: Observed rewards (0.0 - 1.0)
+            contexts: Contextual features per observation (entries may be None)
+        """
+        if len(rewards) != len(agent_ids) or (
+            contexts is not None and len(contexts) != len(agent_ids)
+        ):
+            raise ValueError("agent_ids, rewards and contexts must have the same length")
+
+        if contexts is None:
+            contexts = [None] * len(agent_ids)
+
+        # Validate every context before recording anything
+        vectors = {}
+        if HAS_NUMPY:
+            for i, context in enumerate(contexts):
+                if context is not None:
+                    vectors[i] = self._context_vector(context)
+
+        for agent_id, reward, context in zip(agent_ids, rewards, contexts):
+            self._record(agent_id, reward, context)
+
+        by_row: Dict[int, List[int]] = {}
+        for i in vectors:
+            by_row.setdefault(self.rows[agent_ids[i]], []).append(i)
+        for row, indexes in by_row.items():
+            self._update_linear(
+                row,
+                np.array([vectors[i] for i in indexes]),
+                np.array([rewards[i] for i in indexes], dtype=float),
+            )
+
+        logger.info(f"Updated {len(set(agent_ids))} arms from {len(agent_ids)} rewards")
+
     def get_stats(self) -> Dict[str, any]:
         """Get bandit statistics"""
         return {
@@ -259,6 +530,11 @@ class ContextualBandit:
             stats.pulls = 0
             stats.contexts_seen.clear()
 
+        if HAS_NUMPY:
+            for name in ("_successes", "_failures", "_pulls", "_rewards", "_b"):
+                getattr(self, name)[:] = 0.0
+            self._a_inv[: len(self.arm_ids)] = np.eye(self.context_dim) / self.ridge
+
         self.total_pulls = 0
 
         logger.info("Reset bandit statistics")
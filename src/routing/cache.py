@@ -0,0 +1,246 @@
+"""
+Routing Decision Cache
+
+Caches the ranked shortlist (Stages 1-2) per NEED shape, so repeated
+workloads skip filtering and scoring. The final pick is not cached: canary
+and bandit selection still run on every NEED, so exploration continues.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from .manifests import AgentManifest
+from .scoring import ScoredAgent
+
+logger = logging.getLogger(__name__)
+
+# NEED fields that decide which agents qualify and how they rank
+ROUTING_FIELDS = (
+    "capabilities",
+    "tags",
+    "input_schema",
+    "output_schema",
+    "constraints",
+    "zone",
+    "max_price",
+    "max_latency_ms",
+)
+
+# The subset of ROUTING_FIELDS read by CapabilityFilter (Stage 1)
+FILTER_FIELDS = (
+    "capabilities",
+    "input_schema",
+    "output_schema",
+    "constraints",
+    "zone",
+    "max_price",
+)
+
+# Fields compared as sets by the filters and scorer
+UNORDERED_FIELDS = ("capabilities", "tags")
+
+
+def fingerprint_need(
+    need: Dict[str, Any],
+    context: Optional[Dict[str, Any]] = None,
+    fields: Tuple[str, ...] = ROUTING_FIELDS,
+) -> str:
+    """
+    Canonical fingerprint of a NEED's routing-relevant fields.
+
+    NEEDs that differ only in other fields (need_id, description, examples)
+    or in the order of their capabilities/tags share a fingerprint.
+
+    Args:
+        need: Task NEED payload
+        context: Additional scoring context (stake amounts, etc.)
+        fields: NEED fields to fingerprint (FILTER_FIELDS keys Stage 1 only)
+
+    Returns:
+        Hex-encoded SHA256 digest
+    """
+    canonical = {}
+    for key in fields:
+        value = need.get(key)
+        if value is None:
+            continue
+        if key in UNORDERED_FIELDS:
+            value = sorted(set(value))
+        canonical[key] = value
+    if context:
+        canonical["context"] = context
+
+    serialized = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """Cached shortlist for one NEED fingerprint"""
+
+    shortlist: List[ScoredAgent]
+    capabilities: FrozenSet[str]  # Capabilities the NEED requires
+    expires_at: float
+
+
+class RoutingCache:
+    """
+    TTL + LRU cache of ranked shortlists keyed by NEED fingerprint.
+
+    Invalidation is incremental: when an agent is registered, re-registered
+    or unregistered, only entries whose required capabilities that agent
+    has (or had) are dropped, since no other NEED could have qualified it:
+    the router draws candidates from CapabilityFilter.filter_indexed, which
+    requires every capability.
+    The TTL bounds staleness from inputs the registry does not see
+    (reputation, recency, domain history).
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 1024):
+        """
+        Initialize routing cache.
+
+        Args:
+            ttl_seconds: Lifetime of a cached shortlist
+            max_entries: Entries kept before evicting the least recently used
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # Each entry is indexed under one of its capabilities; an agent
+        # matching the entry must have all of them, so one is enough
+        self.capability_index: Dict[str, Set[str]] = {}  # capability -> fingerprints
+        self._unconstrained: Set[str] = set()  # NEEDs with no required capability
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> Optional[List[ScoredAgent]]:
+        """
+        Look up a cached shortlist.
+
+        Args:
+            key: NEED fingerprint
+
+        Returns:
+            Copy of the ranked shortlist, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires_at <= time.time():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return list(entry.shortlist)
+
+    def put(self, key: str, need: Dict[str, Any], shortlist: List[ScoredAgent]) -> None:
+        """
+        Cache a ranked shortlist.
+
+        Args:
+            key: NEED fingerprint
+            need: NEED the shortlist was computed for
+            shortlist: Scored agents, best first
+        """
+        capabilities = frozenset(need.get("capabilities", []))
+
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+
+            self.entries[key] = CacheEntry(
+                shortlist=list(shortlist),
+                capabilities=capabilities,
+                expires_at=time.time() + self.ttl_seconds,
+            )
+            if capabilities:
+                self.capability_index.setdefault(min(capabilities), set()).add(key)
+            else:
+                self._unconstrained.add(key)
+
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+
+    def invalidate_manifest(
+        self, previous: Optional[AgentManifest], current: Optional[AgentManifest]
+    ) -> None:
+        """
+        Drop entries an agent change could affect.
+
+        Matches the ManifestRegistry change listener signature.
+
+        Args:
+            previous: Manifest before the change (None for a new agent)
+            current: Manifest after the change (None if unregistered)
+        """
+        with self._lock:
+            stale = set(self._unconstrained)
+            for manifest in (previous, current):
+                if manifest is None:
+                    continue
+                provided = set(manifest.capabilities)
+                for capability in provided:
+                    for key in self.capability_index.get(capability, ()):
+                        if self.entries[key].capabilities <= provided:
+                            stale.add(key)
+
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+
+        if stale:
+            agent_id = (current or previous).agent_id
+            logger.debug(f"Routing cache: {agent_id} changed, dropped {len(stale)} entries")
+
+    def _remove(self, key: str) -> None:
+        entry = self.entries.pop(key)
+        if entry.capabilities:
+            capability = min(entry.capabilities)
+            keys = self.capability_index[capability]
+            keys.discard(key)
+            if not keys:
+                del self.capability_index[capability]
+        else:
+            self._unconstrained.discard(key)
+
+    def get_hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self.entries.clear()
+            self.capability_index.clear()
+            self._unconstrained.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.get_hit_rate(),
+            "invalidations": self.invalidations,
+        }
@@ -5,8 +5,9 @@ Tests agents with small micro-tasks before assigning full work.
 Validates agent capability and measures actual performance.
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Tuple
 import asyncio
 import time
 import logging
@@ -62,23 +63,111 @@ class CanaryResult:
         }
 
 
+class CanaryResultCache:
+    """
+    Recent passing canary results keyed by (agent_id, NEED fingerprint).
+
+    A cached result's quality decays with age, halving every half_life_s.
+    It is reused only while the decayed quality still passes, so strong
+    results are trusted for longer than marginal ones. Reused results keep
+    their measured scores, so a reused decision matches the original one.
+    """
+
+    def __init__(self, half_life_s: float = 300.0, max_entries: int = 4096):
+        """
+        Initialize canary result cache.
+
+        Args:
+            half_life_s: Age at which a cached quality score counts half
+            max_entries: Results kept before evicting the least recently used
+        """
+        self.half_life_s = half_life_s
+        self.max_entries = max_entries
+        # (agent_id, need_key) -> (result, recorded_at)
+        self.entries: "OrderedDict[Tuple[str, str], Tuple[CanaryResult, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, agent_id: str, need_key: str, min_quality: float) -> Optional[CanaryResult]:
+        """
+        Look up a still-fresh result.
+
+        Args:
+            agent_id: Agent the canary ran on
+            need_key: Fingerprint of the NEED the canary was made from
+            min_quality: Quality the decayed score must still reach
+
+        Returns:
+            The cached result, or None if missing or decayed below min_quality
+        """
+        key = (agent_id, need_key)
+        entry = self.entries.get(key)
+        if entry is not None:
+            result, recorded_at = entry
+            age = max(0.0, time.time() - recorded_at)
+            if result.quality_score * 0.5 ** (age / self.half_life_s) >= min_quality:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self.entries[key]
+
+        self.misses += 1
+        return None
+
+    def put(self, need_key: str, result: CanaryResult) -> None:
+        """
+        Cache a canary result.
+
+        Args:
+            need_key: Fingerprint of the NEED the canary was made from
+            result: Result to cache (only passing results are kept)
+        """
+        if not result.passed:
+            return
+
+        key = (result.agent_id, need_key)
+        self.entries[key] = (result, time.time())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every result"""
+        self.entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
 class CanaryRunner:
     """
     Executes canary tests on agents.
 
-    Sends micro-tasks, collects results, and scores quality.
+    Sends micro-tasks, collects results, and scores quality. Passing
+    results are cached per NEED fingerprint (see CanaryResultCache).
     """
 
-    def __init__(self, min_quality: float = 0.6, default_timeout_ms: int = 5000):
+    def __init__(
+        self,
+        min_quality: float = 0.6,
+        default_timeout_ms: int = 5000,
+        cache_half_life_s: float = 300.0,
+    ):
         """
         Initialize canary runner.
 
         Args:
             min_quality: Minimum quality score to pass (0.0 - 1.0)
             default_timeout_ms: Default timeout for tests
+            cache_half_life_s: Half-life of cached canary quality scores
         """
         self.min_quality = min_quality
         self.default_timeout_ms = default_timeout_ms
+        self.result_cache = CanaryResultCache(half_life_s=cache_half_life_s)
 
         # Agent communication handlers (to be set by caller)
         self.send_task_handler: Optional[Callable] = None
@@ -356,24 +445,102 @@ class CanaryRunner:
         # Other partial matches
         return 0.4
 
+    def cached_results(self, agent_ids: List[str], need_key: str) -> List[CanaryResult]:
+        """
+        Fresh cached results for any of the given agents.
+
+        Args:
+            agent_ids: Agents to look up
+            need_key: NEED fingerprint
+
+        Returns:
+            Cached results, in agent_ids order
+        """
+        results = []
+        for agent_id in agent_ids:
+            result = self.result_cache.get(agent_id, need_key, self.min_quality)
+            if result is not None:
+                results.append(result)
+        return results
+
     async def run_canaries(
-        self, agent_ids: List[str], canary_test: CanaryTest
+        self,
+        agent_ids: List[str],
+        canary_test: CanaryTest,
+        need_key: Optional[str] = None,
+        early_stop_quality: Optional[float] = None,
+        limiter: Optional[asyncio.Semaphore] = None,
     ) -> List[CanaryResult]:
         """
         Run canary test on multiple agents concurrently.
 
+        With need_key, fresh cached results are reused instead of testing
+        those agents again, and new passing results are cached. With
+        early_stop_quality, the remaining canaries are cancelled as soon as
+        one passes at or above that quality.
+
         Args:
             agent_ids: Agents to test
             canary_test: Test to run
+            need_key: NEED fingerprint to reuse and cache results under
+            early_stop_quality: Quality at which to stop waiting for others
+            limiter: Semaphore bounding canaries in flight, shared across
+                concurrent calls (None = no limit)
 
         Returns:
-            List of canary results
+            List of canary results (agents cancelled by an early stop are
+            left out)
         """
-        tasks = [self.run_canary(agent_id, canary_test) for agent_id in agent_ids]
-
-        results = await asyncio.gather(*tasks)
-
-        return list(results)
+        results = []
+        if need_key is not None:
+            results = self.cached_results(agent_ids, need_key)
+            cached_ids = {r.agent_id for r in results}
+            agent_ids = [a for a in agent_ids if a not in cached_ids]
+
+        if not agent_ids or self._stops_early(results, early_stop_quality):
+            return results
+
+        tasks = [
+            asyncio.ensure_future(self._run_limited(a, canary_test, limiter)) for a in agent_ids
+        ]
+
+        if early_stop_quality is None:
+            fresh = list(await asyncio.gather(*tasks))
+        else:
+            fresh = []
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    result = await next_done
+                    fresh.append(result)
+                    if self._stops_early([result], early_stop_quality):
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            if len(fresh) < len(tasks):
+                logger.info(f"Canary early stop: cancelled {len(tasks) - len(fresh)} canaries")
+
+        if need_key is not None:
+            for result in fresh:
+                self.result_cache.put(need_key, result)
+
+        return results + fresh
+
+    async def _run_limited(
+        self, agent_id: str, canary_test: CanaryTest, limiter: Optional[asyncio.Semaphore]
+    ) -> CanaryResult:
+        if limiter is None:
+            return await self.run_canary(agent_id, canary_test)
+        async with limiter:
+            return await self.run_canary(agent_id, canary_test)
+
+    @staticmethod
+    def _stops_early(results: List[CanaryResult], early_stop_quality: Optional[float]) -> bool:
+        if early_stop_quality is None:
+            return False
+        return any(r.passed and r.quality_score >= early_stop_quality for r in results)
 
 
 # Global runner instance
@@ -4,8 +4,16 @@ Feedback Collection System
 Collects and calculates reward signals for bandit learning.
 """
 
-from typing import Dict, Any, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Any, List, Optional, TYPE_CHECKING
 import logging
+import time
+
+from .streaming import DecayedCounter, QuantileSketch
+
+if TYPE_CHECKING:
+    from .bandit import ContextualBandit
 
 logger = logging.getLogger(__name__)
 
@@ -102,18 +110,52 @@ def calculate_quality_reward(task_result: Dict[str, Any]) -> float:
     return max(0.0, min(1.0, quality))
 
 
+@dataclass
+class AgentFeedback:
+    """Streaming feedback totals for one agent"""
+
+    count: int = 0
+    reward_sum: float = 0.0
+    quality_sum: float = 0.0
+    latency_sum: float = 0.0
+    decayed_count: DecayedCounter = field(default_factory=DecayedCounter)
+    decayed_reward: DecayedCounter = field(default_factory=DecayedCounter)
+    latency_ms: QuantileSketch = field(default_factory=QuantileSketch)
+
+
 class FeedbackCollector:
     """
     Collects and aggregates feedback over time.
 
-    Tracks feedback for analysis and debugging.
+    Keeps O(1)-updated totals per agent and the last history_size entries
+    for analysis and debugging, and feeds feedback to a bandit in batches
+    (see update_bandit).
     """
 
-    def __init__(self):
-        self.feedback_history: list[Dict[str, Any]] = []
+    def __init__(self, history_size: int = 1000, half_life_s: float = 3600.0):
+        """
+        Initialize feedback collector.
+
+        Args:
+            history_size: Recent feedback entries kept individually
+            half_life_s: Half-life of the decayed average reward
+        """
+        self.history_size = history_size
+        self.half_life_s = half_life_s
+
+        self.feedback_history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.agent_feedback: Dict[str, AgentFeedback] = {}
+
+        self._recorded = 0  # Feedback entries ever recorded
+        self._applied = 0  # The first _applied of them have been sent to a bandit
 
     def record_feedback(
-        self, task_id: str, agent_id: str, reward: float, task_result: Dict[str, Any]
+        self,
+        task_id: str,
+        agent_id: str,
+        reward: float,
+        task_result: Dict[str, Any],
+        context: Optional[List[float]] = None,
     ) -> None:
         """
         Record feedback for later analysis.
@@ -123,6 +165,7 @@ class FeedbackCollector:
             agent_id: Agent that executed task
             reward: Calculated reward
             task_result: Full task result
+            context: Contextual features the agent was selected with
         """
         feedback = {
             "task_id": task_id,
@@ -131,9 +174,29 @@ class FeedbackCollector:
             "quality": task_result.get("quality_score"),
             "latency_ms": task_result.get("latency_ms"),
             "price": task_result.get("price"),
+            "context": context,
         }
 
         self.feedback_history.append(feedback)
+        self._recorded += 1
+
+        now = time.time()
+        stats = self.agent_feedback.get(agent_id)
+        if stats is None:
+            stats = AgentFeedback(
+                decayed_count=DecayedCounter(self.half_life_s),
+                decayed_reward=DecayedCounter(self.half_life_s),
+            )
+            self.agent_feedback[agent_id] = stats
+        stats.count += 1
+        stats.reward_sum += reward
+        stats.decayed_count.add(1.0, now)
+        stats.decayed_reward.add(reward, now)
+        if feedback["quality"] is not None:
+            stats.quality_sum += feedback["quality"]
+        if feedback["latency_ms"] is not None:
+            stats.latency_sum += feedback["latency_ms"]
+            stats.latency_ms.add(feedback["latency_ms"])
 
         logger.info(f"Recorded feedback: task={task_id}, agent={agent_id}, reward={reward:.2f}")
 
@@ -147,30 +210,70 @@ class FeedbackCollector:
         Returns:
             Dictionary of statistics
         """
-        agent_feedback = [f for f in self.feedback_history if f["agent_id"] == agent_id]
+        stats = self.agent_feedback.get(agent_id)
 
-        if not agent_feedback:
+        if stats is None:
             return {
                 "count": 0,
                 "avg_reward": 0.0,
                 "avg_quality": 0.0,
                 "avg_latency_ms": 0.0,
+                "decayed_avg_reward": 0.0,
+                "latency_p50_ms": 0.0,
+                "latency_p95_ms": 0.0,
+                "latency_p99_ms": 0.0,
             }
 
+        decayed_count = stats.decayed_count.get()
         return {
-            "count": len(agent_feedback),
-            "avg_reward": sum(f["reward"] for f in agent_feedback) / len(agent_feedback),
-            "avg_quality": sum(f["quality"] for f in agent_feedback if f["quality"] is not None)
-            / len(agent_feedback),
-            "avg_latency_ms": sum(
-                f["latency_ms"] for f in agent_feedback if f["latency_ms"] is not None
-            )
-            / len(agent_feedback),
+            "count": stats.count,
+            "avg_reward": stats.reward_sum / stats.count,
+            "avg_quality": stats.quality_sum / stats.count,
+            "avg_latency_ms": stats.latency_sum / stats.count,
+            "decayed_avg_reward": (
+                stats.decayed_reward.get() / decayed_count if decayed_count > 0 else 0.0
+            ),
+            "latency_p50_ms": stats.latency_ms.quantile(0.5),
+            "latency_p95_ms": stats.latency_ms.quantile(0.95),
+            "latency_p99_ms": stats.latency_ms.quantile(0.99),
         }
 
+    def update_bandit(self, bandit: "ContextualBandit") -> int:
+        """
+        Apply feedback recorded since the last call to a bandit, in one batch.
+
+        Only the last history_size entries are kept, so call this at least
+        once every history_size records to avoid dropping feedback.
+
+        Args:
+            bandit: Bandit to update
+
+        Returns:
+            Number of feedback entries applied
+        """
+        unapplied = self._recorded - self._applied
+        kept = len(self.feedback_history)
+        if unapplied > kept:
+            logger.warning(
+                f"Feedback history overflowed: {unapplied - kept} entries "
+                f"dropped before reaching the bandit"
+            )
+        pending = list(self.feedback_history)[max(0, kept - unapplied) :]
+        if pending:
+            bandit.update_batch(
+                agent_ids=[f["agent_id"] for f in pending],
+                rewards=[f["reward"] for f in pending],
+                contexts=[f["context"] for f in pending],
+            )
+        self._applied = self._recorded
+        return len(pending)
+
     def clear(self) -> None:
         """Clear feedback history"""
         self.feedback_history.clear()
+        self.agent_feedback.clear()
+        self._recorded = 0
+        self._applied = 0
 
 
 # Global feedback collector
@@ -5,10 +5,10 @@ Filters agent manifests based on task requirements including I/O schema,
 constraints, zone, and budget.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
-from .manifests import AgentManifest
+from .manifests import AgentManifest, ManifestRegistry, schema_hash
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +22,19 @@ class CapabilityFilter:
     - Resource constraints
     - Geographic zone
     - Budget limits
+
+    Required capabilities are not part of the cascade, so agents covering
+    only some of them stay eligible and are ranked by domain fit. Only
+    filter_indexed, which generates candidates from the capability index,
+    requires every capability.
+
+    Schema compatibility is memoized by (required, provided) schema hash,
+    so each distinct pair of schemas is checked once.
     """
 
+    # Memoized schema pairs kept before the memo is cleared
+    MAX_SCHEMA_MEMO = 65536
+
     def __init__(self, strict_mode: bool = False):
         """
         Initialize capability filter.
@@ -33,6 +44,31 @@ class CapabilityFilter:
                         If False, use best-effort matching.
         """
         self.strict_mode = strict_mode
+        # (strict_mode, required hash, provided hash) -> compatible
+        self._schema_memo: Dict[Tuple[bool, str, str], bool] = {}
+
+    def filter_by_capabilities(
+        self, need: Dict[str, Any], manifests: List[AgentManifest]
+    ) -> List[AgentManifest]:
+        """
+        Filter agents by required capabilities.
+
+        Args:
+            need: Task NEED payload with a "capabilities" list
+            manifests: List of agent manifests to filter
+
+        Returns:
+            List of agents having every required capability
+        """
+        required = need.get("capabilities", [])
+
+        if not required:
+            return manifests
+
+        capable = [m for m in manifests if all(m.matches_capability(c) for c in required)]
+
+        logger.info(f"Capability filtering: {len(manifests)} → {len(capable)} agents")
+        return capable
 
     def filter_by_io(
         self, need: Dict[str, Any], manifests: List[AgentManifest]
@@ -57,28 +93,46 @@ class CapabilityFilter:
             # No schema requirements
             return manifests
 
+        required_input_hash = schema_hash(required_input) if required_input else None
+        required_output_hash = schema_hash(required_output) if required_output else None
+
+        # Agents sharing both schemas form a group; each group is checked once
+        groups: Dict[Tuple[str, str], bool] = {}
         compatible = []
 
         for manifest in manifests:
-            io_schema = manifest.io_schema
-
-            # Check input compatibility
-            if required_input:
-                agent_input = io_schema.get("input", {})
-                if not self._schemas_compatible(required_input, agent_input):
-                    logger.debug(f"Agent {manifest.agent_id} input schema incompatible")
-                    continue
-
-            # Check output compatibility
-            if required_output:
-                agent_output = io_schema.get("output", {})
-                if not self._schemas_compatible(required_output, agent_output):
-                    logger.debug(f"Agent {manifest.agent_id} output schema incompatible")
-                    continue
-
-            compatible.append(manifest)
+            group = manifest.schema_hashes
+            group_compatible = groups.get(group)
+
+            if group_compatible is None:
+                io_schema = manifest.io_schema
+                group_compatible = True
+
+                # Check input compatibility
+                if required_input_hash is not None:
+                    group_compatible = self._schemas_compatible_memo(
+                        required_input, required_input_hash, io_schema.get("input", {}), group[0]
+                    )
+                    if not group_compatible:
+                        logger.debug(f"Agent {manifest.agent_id} input schema incompatible")
+
+                # Check output compatibility
+                if group_compatible and required_output_hash is not None:
+                    group_compatible = self._schemas_compatible_memo(
+                        required_output, required_output_hash, io_schema.get("output", {}), group[1]
+                    )
+                    if not group_compatible:
+                        logger.debug(f"Agent {manifest.agent_id} output schema incompatible")
+
+                groups[group] = group_compatible
+
+            if group_compatible:
+                compatible.append(manifest)
 
-        logger.info(f"I/O filtering: {len(manifests)} → {len(compatible)} agents")
+        logger.info(
+            f"I/O filtering: {len(manifests)} → {len(compatible)} agents "
+            f"({len(groups)} schema groups)"
+        )
         return compatible
 
     def filter_by_constraints(
@@ -259,6 +313,70 @@ class CapabilityFilter:
         logger.info(f"Filter cascade complete: {len(candidates)} agents qualified")
         return candidates
 
+    def filter_indexed(
+        self, need: Dict[str, Any], registry: ManifestRegistry
+    ) -> List[AgentManifest]:
+        """
+        Apply all filters, generating candidates from the registry indexes.
+
+        Candidates must have every required capability. Capabilities, budget
+        and (in strict mode) numeric constraints are pushed down to
+        ManifestRegistry.find_candidates; the cascade then runs only on the
+        survivors. Returns the same agents, in the same order, as
+        filter_all(need, filter_by_capabilities(need, registry.get_all())).
+
+        Args:
+            need: Task NEED payload with all requirements
+            registry: Registry to draw candidates from
+
+        Returns:
+            List of agents passing all filters
+        """
+        required_constraints = []
+        ranges = {}
+
+        if self.strict_mode:
+            # Missing constraints disqualify, so every key is a posting list
+            for key, required_value in need.get("constraints", {}).items():
+                required_constraints.append(key)
+                if not isinstance(required_value, (int, float)) or isinstance(required_value, bool):
+                    continue
+                if key.startswith("min_"):
+                    ranges[key] = (required_value, None)
+                elif key.startswith("max_"):
+                    ranges[key] = (None, required_value)
+
+        # Zone preference is decided before the budget, so the budget can
+        # only be pushed down when there is no preferred zone
+        max_price = need.get("max_price")
+        if max_price is not None and not need.get("zone"):
+            ranges["price_per_task"] = (None, max_price)
+
+        candidates = registry.find_candidates(
+            capabilities=need.get("capabilities", []),
+            required_constraints=required_constraints,
+            ranges=ranges,
+        )
+        logger.info(f"Index candidates: {registry.count()} → {len(candidates)} agents")
+        return self.filter_all(need, candidates)
+
+    def _schemas_compatible_memo(
+        self,
+        required: Dict[str, Any],
+        required_hash: str,
+        provided: Dict[str, Any],
+        provided_hash: str,
+    ) -> bool:
+        """_schemas_compatible, memoized by schema hash"""
+        key = (self.strict_mode, required_hash, provided_hash)
+        result = self._schema_memo.get(key)
+        if result is None:
+            if len(self._schema_memo) >= self.MAX_SCHEMA_MEMO:
+                self._schema_memo.clear()
+            result = self._schemas_compatible(required, provided)
+            self._schema_memo[key] = result
+        return result
+
     def _schemas_compatible(self, required: Dict[str, Any], provided: Dict[str, Any]) -> bool:
         """
         Check if two schemas are compatible.
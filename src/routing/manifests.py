@@ -4,13 +4,54 @@ Agent Manifest System
 Defines agent capabilities, schemas, and metadata for intelligent routing.
 """
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Set
+from typing import Callable, List, Dict, Any, Iterable, Optional, Set, Tuple
+import hashlib
+import json
 import logging
+import weakref
+
+from vocabulary import Vocabulary, get_vocabulary, is_subset
 
 logger = logging.getLogger(__name__)
 
 
+def _canonical_schema(schema: Any) -> Any:
+    """Schema with "required" lists sorted; they are compared as sets"""
+    if isinstance(schema, dict):
+        return {
+            key: (
+                sorted(value, key=str)
+                if key == "required" and isinstance(value, list)
+                else _canonical_schema(value)
+            )
+            for key, value in schema.items()
+        }
+    if isinstance(schema, list):
+        return [_canonical_schema(item) for item in schema]
+    return schema
+
+
+def schema_hash(schema: Any) -> str:
+    """
+    Hash of a schema's canonical JSON form.
+
+    Key order and the order of "required" lists are ignored, so schemas
+    that only differ in layout share a hash.
+
+    Args:
+        schema: JSON schema
+
+    Returns:
+        Hex-encoded SHA256 digest
+    """
+    serialized = json.dumps(
+        _canonical_schema(schema), sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
 @dataclass
 class AgentManifest:
     """
@@ -47,6 +88,26 @@ class AgentManifest:
     # Versioning
     version: str = "1.0.0"
 
+    # (input, output) schema hashes, filled on first use
+    _schema_hashes: Optional[Tuple[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def schema_hashes(self) -> Tuple[str, str]:
+        """
+        Hashes of the input and output schemas.
+
+        Computed once per manifest object; like the rest of the routing
+        caches, this treats a manifest as immutable once it is registered.
+        """
+        if self._schema_hashes is None:
+            self._schema_hashes = (
+                schema_hash(self.io_schema.get("input", {})),
+                schema_hash(self.io_schema.get("output", {})),
+            )
+        return self._schema_hashes
+
     def matches_capability(self, capability: str) -> bool:
         """Check if agent has a specific capability"""
         return capability in self.capabilities
@@ -85,6 +146,59 @@ class AgentManifest:
         return cls(**data)
 
 
+# Manifest attributes kept in sorted indexes alongside numeric constraints
+NUMERIC_FIELDS = ("price_per_task", "avg_latency_ms")
+
+
+def _is_numeric(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class SortedIndex:
+    """
+    Sorted (value, agent_id) index for range lookups.
+
+    Counting the agents in a range costs two binary searches, so the
+    smallest of several ranges can be found without materializing any.
+    """
+
+    def __init__(self):
+        self.values: List[float] = []
+        self.agent_ids: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: float, agent_id: str) -> None:
+        pos = bisect_right(self.values, value)
+        self.values.insert(pos, value)
+        self.agent_ids.insert(pos, agent_id)
+
+    def remove(self, value: float, agent_id: str) -> None:
+        pos = bisect_left(self.values, value)
+        while pos < len(self.values) and self.values[pos] == value:
+            if self.agent_ids[pos] == agent_id:
+                del self.values[pos]
+                del self.agent_ids[pos]
+                return
+            pos += 1
+
+    def _bounds(self, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        start = 0 if low is None else bisect_left(self.values, low)
+        end = len(self.values) if high is None else bisect_right(self.values, high)
+        return start, max(start, end)
+
+    def count(self, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        """Number of agents with low <= value <= high (None = unbounded)"""
+        start, end = self._bounds(low, high)
+        return end - start
+
+    def find(self, low: Optional[float] = None, high: Optional[float] = None) -> List[str]:
+        """Agent IDs with low <= value <= high (None = unbounded)"""
+        start, end = self._bounds(low, high)
+        return self.agent_ids[start:end]
+
+
 class ManifestRegistry:
     """
     Registry of agent manifests for discovery and filtering.
@@ -93,23 +207,45 @@ class ManifestRegistry:
     capabilities, enabling fast lookups and filtering.
     """
 
-    def __init__(self):
+    def __init__(self, vocabulary: Optional[Vocabulary] = None):
+        self.vocabulary = vocabulary or get_vocabulary()
         self.manifests: Dict[str, AgentManifest] = {}
+        self.capability_bits: Dict[str, int] = {}  # agent_id -> capability bitset
+        self.tag_bits: Dict[str, int] = {}  # agent_id -> tag bitset
         self.capability_index: Dict[str, Set[str]] = {}  # capability -> agent_ids
         self.tag_index: Dict[str, Set[str]] = {}  # tag -> agent_ids
         self.zone_index: Dict[str, Set[str]] = {}  # zone -> agent_ids
+        self.constraint_index: Dict[str, Set[str]] = {}  # constraint key -> agent_ids
+        self.numeric_index: Dict[str, SortedIndex] = {}  # field/constraint -> sorted values
+        self.schema_groups: Dict[Tuple[str, str], Set[str]] = {}  # schema hashes -> agent_ids
+        self._non_numeric: Dict[str, Set[str]] = {}  # constraint key -> agents, non-numeric
+        self._order: Dict[str, int] = {}  # agent_id -> registration order
+        self._next_order = 0
+        self._change_listeners: List[Callable[[], Optional[Callable]]] = []
 
     def register(self, manifest: AgentManifest) -> None:
         """
         Register an agent manifest.
 
+        Re-registering an agent replaces its previous manifest and index
+        entries.
+
         Args:
             manifest: Agent manifest to register
         """
         agent_id = manifest.agent_id
 
+        previous = self.manifests.get(agent_id)
+        if previous is not None:
+            self._unindex(previous)
+        else:
+            self._order[agent_id] = self._next_order
+            self._next_order += 1
+
         # Store manifest
         self.manifests[agent_id] = manifest
+        self.capability_bits[agent_id] = self.vocabulary.encode(manifest.capabilities)
+        self.tag_bits[agent_id] = self.vocabulary.encode(manifest.tags)
 
         # Update capability index
         for capability in manifest.capabilities:
@@ -129,7 +265,21 @@ class ManifestRegistry:
                 self.zone_index[manifest.zone] = set()
             self.zone_index[manifest.zone].add(agent_id)
 
+        # Update schema groups (hashes the schemas once, at registration)
+        self.schema_groups.setdefault(manifest.schema_hashes, set()).add(agent_id)
+
+        # Update constraint and numeric indexes
+        for key in NUMERIC_FIELDS:
+            self.numeric_index.setdefault(key, SortedIndex()).add(getattr(manifest, key), agent_id)
+        for key, value in manifest.constraints.items():
+            self.constraint_index.setdefault(key, set()).add(agent_id)
+            if _is_numeric(value):
+                self.numeric_index.setdefault(key, SortedIndex()).add(value, agent_id)
+            else:
+                self._non_numeric.setdefault(key, set()).add(agent_id)
+
         logger.info(f"Registered agent {agent_id} with capabilities: {manifest.capabilities}")
+        self._notify(previous, manifest)
 
     def unregister(self, agent_id: str) -> None:
         """
@@ -142,7 +292,51 @@ class ManifestRegistry:
             logger.warning(f"Attempted to unregister unknown agent: {agent_id}")
             return
 
-        manifest = self.manifests[agent_id]
+        previous = self.manifests[agent_id]
+        self._unindex(previous)
+
+        # Remove manifest
+        del self.manifests[agent_id]
+        del self.capability_bits[agent_id]
+        del self.tag_bits[agent_id]
+        del self._order[agent_id]
+
+        logger.info(f"Unregistered agent {agent_id}")
+        self._notify(previous, None)
+
+    def add_change_listener(
+        self, callback: Callable[[Optional[AgentManifest], Optional[AgentManifest]], None]
+    ) -> None:
+        """
+        Register a callback invoked on every register/unregister.
+
+        The callback receives (previous, current) manifests: previous is None
+        for a new agent and current is None for an unregistered one. Bound
+        methods are held weakly so listeners do not keep their owners alive.
+
+        Args:
+            callback: Callable taking the previous and current manifest
+        """
+        if hasattr(callback, "__self__"):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback  # noqa: E731
+        self._change_listeners.append(ref)
+
+    def _notify(self, previous: Optional[AgentManifest], current: Optional[AgentManifest]) -> None:
+        for ref in list(self._change_listeners):
+            callback = ref()
+            if callback is None:
+                self._change_listeners.remove(ref)
+                continue
+            try:
+                callback(previous, current)
+            except Exception as e:
+                logger.error(f"Registry change listener failed: {e}", exc_info=True)
+
+    def _unindex(self, manifest: AgentManifest) -> None:
+        """Remove a manifest's entries from every index"""
+        agent_id = manifest.agent_id
 
         # Remove from capability index
         for capability in manifest.capabilities:
@@ -164,10 +358,28 @@ class ManifestRegistry:
             if not self.zone_index[manifest.zone]:
                 del self.zone_index[manifest.zone]
 
-        # Remove manifest
-        del self.manifests[agent_id]
-
-        logger.info(f"Unregistered agent {agent_id}")
+        # Remove from schema groups
+        self._discard(self.schema_groups, manifest.schema_hashes, agent_id)
+
+        # Remove from constraint and numeric indexes
+        for key in NUMERIC_FIELDS:
+            self.numeric_index[key].remove(getattr(manifest, key), agent_id)
+        for key, value in manifest.constraints.items():
+            self._discard(self.constraint_index, key, agent_id)
+            if _is_numeric(value):
+                self.numeric_index[key].remove(value, agent_id)
+                if not self.numeric_index[key]:
+                    del self.numeric_index[key]
+            else:
+                self._discard(self._non_numeric, key, agent_id)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[str]], key: Any, agent_id: str) -> None:
+        agent_ids = index.get(key)
+        if agent_ids is not None:
+            agent_ids.discard(agent_id)
+            if not agent_ids:
+                del index[key]
 
     def get(self, agent_id: str) -> Optional[AgentManifest]:
         """Get a specific agent manifest"""
@@ -201,12 +413,14 @@ class ManifestRegistry:
             return list(self.manifests.values())
 
         if match_all:
-            # Agent must have all tags
-            matching_agents = []
-            for manifest in self.manifests.values():
-                if manifest.matches_tags(tags):
-                    matching_agents.append(manifest)
-            return matching_agents
+            # Agent must have all tags: walk the rarest tag's agents and
+            # check the rest with one bitset test each
+            wanted, unknown = self.vocabulary.encode_known(tags)
+            if unknown:
+                return []
+            rarest = min((self.tag_index.get(tag, set()) for tag in tags), key=len)
+            agent_ids = [aid for aid in rarest if is_subset(wanted, self.tag_bits[aid])]
+            return [self.manifests[aid] for aid in sorted(agent_ids, key=self._order.__getitem__)]
         else:
             # Agent must have at least one tag
             agent_ids = set()
@@ -228,6 +442,115 @@ class ManifestRegistry:
         agent_ids = self.zone_index.get(zone, set())
         return [self.manifests[aid] for aid in agent_ids]
 
+    def find_by_range(
+        self, key: str, low: Optional[float] = None, high: Optional[float] = None
+    ) -> List[AgentManifest]:
+        """
+        Find agents whose numeric field or constraint lies in [low, high].
+
+        Args:
+            key: A NUMERIC_FIELDS attribute or constraint key
+            low: Inclusive lower bound (None = unbounded)
+            high: Inclusive upper bound (None = unbounded)
+
+        Returns:
+            Matching manifests, in ascending order of the value
+        """
+        index = self.numeric_index.get(key)
+        if index is None:
+            return []
+        return [self.manifests[aid] for aid in index.find(low, high)]
+
+    def find_candidates(
+        self,
+        capabilities: Iterable[str] = (),
+        required_constraints: Iterable[str] = (),
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+    ) -> List[AgentManifest]:
+        """
+        Find agents matching every given index predicate.
+
+        Postings are sized first (set lengths, and binary searches for
+        ranges); the smallest is materialized and the rest are checked per
+        survivor, so the cost follows the number of matching agents rather
+        than the registry size. Agents whose constraint value for a ranged
+        key is not numeric are kept for the caller's own checks.
+
+        Args:
+            capabilities: Capabilities the agent must all have
+            required_constraints: Constraint keys the agent must declare
+            ranges: key -> (low, high) inclusive bounds on a numeric field
+                or constraint (None = unbounded)
+
+        Returns:
+            Matching manifests, in registration order
+        """
+        ranges = ranges or {}
+
+        # (size, posting set or ranged key)
+        sized = []
+        capabilities = list(capabilities)
+        if capabilities:
+            # The rarest capability is a candidate posting; the rest are
+            # checked against each agent's capability bitset
+            wanted, unknown = self.vocabulary.encode_known(capabilities)
+            if unknown:
+                return []
+            rarest = min((self.capability_index.get(c, set()) for c in capabilities), key=len)
+            sized.append((len(rarest), rarest))
+        for key in required_constraints:
+            posting = self.constraint_index.get(key, set())
+            sized.append((len(posting), posting))
+        for key, (low, high) in ranges.items():
+            index = self.numeric_index.get(key)
+            count = index.count(low, high) if index is not None else 0
+            sized.append((count + len(self._non_numeric.get(key, ())), key))
+
+        if not sized:
+            return self.get_all()
+
+        sized.sort(key=lambda entry: entry[0])
+        _, smallest = sized[0]
+        if isinstance(smallest, str):
+            low, high = ranges[smallest]
+            index = self.numeric_index.get(smallest)
+            agent_ids = set(index.find(low, high)) if index is not None else set()
+            agent_ids |= self._non_numeric.get(smallest, set())
+        else:
+            agent_ids = set(smallest)
+
+        if capabilities:
+            capability_bits = self.capability_bits
+            agent_ids = {aid for aid in agent_ids if is_subset(wanted, capability_bits[aid])}
+
+        for _, posting in sized[1:]:
+            if not agent_ids:
+                break
+            if capabilities and posting is rarest:
+                continue  # covered by the bitset check
+            if isinstance(posting, str):
+                agent_ids = {
+                    aid for aid in agent_ids if self._in_range(aid, posting, *ranges[posting])
+                }
+            else:
+                agent_ids &= posting
+
+        return [self.manifests[aid] for aid in sorted(agent_ids, key=self._order.__getitem__)]
+
+    def _in_range(
+        self, agent_id: str, key: str, low: Optional[float], high: Optional[float]
+    ) -> bool:
+        manifest = self.manifests[agent_id]
+        if key in NUMERIC_FIELDS:
+            value = getattr(manifest, key)
+        else:
+            value = manifest.constraints.get(key)
+            if value is None:
+                return False
+            if not _is_numeric(value):
+                return True
+        return (low is None or value >= low) and (high is None or value <= high)
+
     def get_all(self) -> List[AgentManifest]:
         """Get all registered agent manifests"""
         return list(self.manifests.values())
@@ -243,6 +566,7 @@ class ManifestRegistry:
             "capabilities": len(self.capability_index),
             "tags": len(self.tag_index),
             "zones": len(self.zone_index),
+            "schema_groups": len(self.schema_groups),
         }
 
 
@@ -4,10 +4,14 @@ Routing Metrics
 Tracks performance and accuracy of the intelligent routing system.
 """
 
-from typing import Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Deque, Dict, Optional
 import time
 import logging
-from dataclasses import dataclass
+
+from .streaming import DecayedCounter, QuantileSketch, TimeBuckets
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +27,7 @@ class RoutingMetrics:
     routing_method: str = "unknown"  # filter, score, canary, bandit, auction
     success: bool = False
     fallback_used: bool = False
+    cache_hit: bool = False  # Shortlist served from the routing cache
 
     @property
     def latency_ms(self) -> float:
@@ -40,6 +45,56 @@ class RoutingMetrics:
             "routing_method": self.routing_method,
             "success": self.success,
             "fallback_used": self.fallback_used,
+            "cache_hit": self.cache_hit,
+        }
+
+
+@dataclass
+class RoutingAggregate:
+    """Streaming totals over a set of routing decisions"""
+
+    routings: int = 0
+    successes: int = 0
+    fallbacks: int = 0
+    cache_hits: int = 0
+    methods: Dict[str, int] = field(default_factory=dict)
+    latency_ms: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add(self, metrics: RoutingMetrics) -> None:
+        """Count one completed routing"""
+        self.routings += 1
+        self.successes += metrics.success
+        self.fallbacks += metrics.fallback_used
+        self.cache_hits += metrics.cache_hit
+        self.methods[metrics.routing_method] = self.methods.get(metrics.routing_method, 0) + 1
+        self.latency_ms.add(metrics.latency_ms)
+
+    def merge(self, other: "RoutingAggregate") -> None:
+        """Add another aggregate's counts to this one"""
+        self.routings += other.routings
+        self.successes += other.successes
+        self.fallbacks += other.fallbacks
+        self.cache_hits += other.cache_hits
+        for method, count in other.methods.items():
+            self.methods[method] = self.methods.get(method, 0) + count
+        self.latency_ms.merge(other.latency_ms)
+
+    def rate(self, count: int) -> float:
+        """count as a fraction of routings (0.0 if there were none)"""
+        if self.routings == 0:
+            return 0.0
+        return count / self.routings
+
+    def to_dict(self) -> Dict:
+        """Serialize to dictionary"""
+        return {
+            "routings": self.routings,
+            "success_rate": self.rate(self.successes),
+            "avg_latency_ms": self.latency_ms.mean,
+            "latency_percentiles_ms": self.latency_ms.quantiles(),
+            "fallback_rate": self.rate(self.fallbacks),
+            "cache_hit_rate": self.rate(self.cache_hits),
+            "method_distribution": dict(self.methods),
         }
 
 
@@ -49,14 +104,47 @@ class MetricsCollector:
 
     Tracks:
     - Routing success rate
-    - Time-to-assignment
+    - Time-to-assignment (mean and p50/p95/p99)
     - Routing accuracy
     - Method usage
+    - Routing cache hit rate
+
+    Memory is fixed: lifetime totals and a ring of time buckets are updated
+    in O(1) per routing, and only the last history_size decisions are kept
+    individually (for recent_n queries and debugging).
     """
 
-    def __init__(self):
-        self.routing_history: List[RoutingMetrics] = []
-        self.outcome_history: List[Dict] = []  # Actual task outcomes
+    def __init__(
+        self,
+        history_size: int = 1000,
+        bucket_seconds: float = 60.0,
+        num_buckets: int = 60,
+        half_life_s: float = 3600.0,
+    ):
+        """
+        Initialize metrics collector.
+
+        Args:
+            history_size: Recent routings and outcomes kept individually
+            bucket_seconds: Width of a time bucket for windowed stats
+            num_buckets: Time buckets kept (default: one hour of minutes)
+            half_life_s: Half-life of the decayed success rate
+        """
+        self.history_size = history_size
+        self.half_life_s = half_life_s
+
+        self.routing_history: Deque[RoutingMetrics] = deque(maxlen=history_size)
+        self.outcome_history: Deque[Dict] = deque(maxlen=history_size)  # Actual task outcomes
+
+        self.totals = RoutingAggregate()
+        self.buckets: TimeBuckets[RoutingAggregate] = TimeBuckets(
+            RoutingAggregate, bucket_seconds=bucket_seconds, num_buckets=num_buckets
+        )
+        self._decayed_routings = DecayedCounter(half_life_s)
+        self._decayed_successes = DecayedCounter(half_life_s)
+
+        self.total_outcomes = 0
+        self.good_outcomes = 0  # actual_reward >= 0.7
 
     def start_routing(self, need_id: str) -> RoutingMetrics:
         """
@@ -97,6 +185,10 @@ class MetricsCollector:
         metrics.fallback_used = fallback_used
 
         self.routing_history.append(metrics)
+        self.totals.add(metrics)
+        self.buckets.bucket(metrics.end_time).add(metrics)
+        self._decayed_routings.add(1.0, metrics.end_time)
+        self._decayed_successes.add(float(success), metrics.end_time)
 
         logger.info(
             f"Routing completed: need={metrics.need_id}, "
@@ -128,66 +220,124 @@ class MetricsCollector:
         }
 
         self.outcome_history.append(outcome)
+        self.total_outcomes += 1
+        # Simple accuracy: proportion where actual_reward >= 0.7 (good performance)
+        if actual_reward >= 0.7:
+            self.good_outcomes += 1
+
+    def _recent_rate(self, recent_n: int, predicate: Callable[[RoutingMetrics], bool]) -> float:
+        recent = list(islice(reversed(self.routing_history), recent_n))
+        if not recent:
+            return 0.0
+        return sum(1 for m in recent if predicate(m)) / len(recent)
 
     def get_success_rate(self, recent_n: Optional[int] = None) -> float:
         """
         Get routing success rate.
 
         Args:
-            recent_n: Only consider recent N routings (None = all)
+            recent_n: Only consider recent N routings, up to history_size (None = all)
 
         Returns:
             Success rate from 0.0 to 1.0
         """
-        history = self.routing_history
         if recent_n is not None:
-            history = history[-recent_n:]
-
-        if not history:
-            return 0.0
-
-        successes = sum(1 for m in history if m.success)
-        return successes / len(history)
+            return self._recent_rate(recent_n, lambda m: m.success)
+        return self.totals.rate(self.totals.successes)
 
     def get_avg_latency_ms(self, recent_n: Optional[int] = None) -> float:
         """
         Get average time-to-assignment.
 
         Args:
-            recent_n: Only consider recent N routings
+            recent_n: Only consider recent N routings, up to history_size (None = all)
 
         Returns:
             Average latency in milliseconds
         """
-        history = self.routing_history
-        if recent_n is not None:
-            history = history[-recent_n:]
+        if recent_n is None:
+            return self.totals.latency_ms.mean
 
-        if not history:
+        recent = list(islice(reversed(self.routing_history), recent_n))
+        if not recent:
             return 0.0
+        return sum(m.latency_ms for m in recent) / len(recent)
 
-        total_latency = sum(m.latency_ms for m in history)
-        return total_latency / len(history)
+    def get_latency_percentiles(self, window_s: Optional[float] = None) -> Dict[str, float]:
+        """
+        Get time-to-assignment percentiles.
+
+        Args:
+            window_s: Only consider routings in the last window_s seconds,
+                at bucket granularity (None = all)
+
+        Returns:
+            Dictionary with p50, p95 and p99 latency in milliseconds
+        """
+        if window_s is None:
+            return self.totals.latency_ms.quantiles()
+        return self.get_window(window_s).latency_ms.quantiles()
+
+    def get_decayed_success_rate(self, now: Optional[float] = None) -> float:
+        """
+        Get success rate with older routings exponentially down-weighted.
+
+        Args:
+            now: Time to evaluate at (defaults to now)
+
+        Returns:
+            Success rate from 0.0 to 1.0
+        """
+        routings = self._decayed_routings.get(now)
+        if routings == 0:
+            return 0.0
+        return self._decayed_successes.get(now) / routings
+
+    def get_window(
+        self, window_s: Optional[float] = None, now: Optional[float] = None
+    ) -> RoutingAggregate:
+        """
+        Merge the time buckets covering the last window_s seconds.
+
+        Args:
+            window_s: Window length (None = every bucket kept)
+            now: End of the window (defaults to now)
+
+        Returns:
+            RoutingAggregate over the window
+        """
+        window = RoutingAggregate()
+        for bucket in self.buckets.window(window_s, now):
+            window.merge(bucket)
+        return window
 
     def get_fallback_rate(self, recent_n: Optional[int] = None) -> float:
         """
         Get rate of fallback to auction.
 
         Args:
-            recent_n: Only consider recent N routings
+            recent_n: Only consider recent N routings, up to history_size (None = all)
 
         Returns:
             Fallback rate from 0.0 to 1.0
         """
-        history = self.routing_history
         if recent_n is not None:
-            history = history[-recent_n:]
+            return self._recent_rate(recent_n, lambda m: m.fallback_used)
+        return self.totals.rate(self.totals.fallbacks)
 
-        if not history:
-            return 0.0
+    def get_cache_hit_rate(self, recent_n: Optional[int] = None) -> float:
+        """
+        Get rate of routings whose shortlist came from the routing cache.
 
-        fallbacks = sum(1 for m in history if m.fallback_used)
-        return fallbacks / len(history)
+        Args:
+            recent_n: Only consider recent N routings, up to history_size (None = all)
+
+        Returns:
+            Hit rate from 0.0 to 1.0
+        """
+        if recent_n is not None:
+            return self._recent_rate(recent_n, lambda m: m.cache_hit)
+        return self.totals.rate(self.totals.cache_hits)
 
     def get_method_distribution(self) -> Dict[str, int]:
         """
@@ -196,13 +346,7 @@ class MetricsCollector:
         Returns:
             Dictionary of method -> count
         """
-        distribution = {}
-
-        for metrics in self.routing_history:
-            method = metrics.routing_method
-            distribution[method] = distribution.get(method, 0) + 1
-
-        return distribution
+        return dict(self.totals.methods)
 
     def get_routing_accuracy(self) -> float:
         """
@@ -213,15 +357,10 @@ class MetricsCollector:
         Returns:
             Accuracy from 0.0 (worst) to 1.0 (perfect)
         """
-        if not self.outcome_history:
+        if self.total_outcomes == 0:
             return 0.0
 
-        # Simple accuracy: proportion where actual_reward >= 0.7 (good performance)
-        good_outcomes = sum(
-            1 for outcome in self.outcome_history if outcome["actual_reward"] >= 0.7
-        )
-
-        return good_outcomes / len(self.outcome_history)
+        return self.good_outcomes / self.total_outcomes
 
     def get_stats(self) -> Dict:
         """
@@ -231,19 +370,28 @@ class MetricsCollector:
             Dictionary of statistics
         """
         return {
-            "total_routings": len(self.routing_history),
+            "total_routings": self.totals.routings,
             "success_rate": self.get_success_rate(),
+            "decayed_success_rate": self.get_decayed_success_rate(),
             "avg_latency_ms": self.get_avg_latency_ms(),
+            "latency_percentiles_ms": self.get_latency_percentiles(),
             "fallback_rate": self.get_fallback_rate(),
+            "cache_hit_rate": self.get_cache_hit_rate(),
             "method_distribution": self.get_method_distribution(),
             "routing_accuracy": self.get_routing_accuracy(),
-            "total_outcomes": len(self.outcome_history),
+            "total_outcomes": self.total_outcomes,
         }
 
     def clear(self) -> None:
         """Clear all metrics"""
         self.routing_history.clear()
         self.outcome_history.clear()
+        self.totals = RoutingAggregate()
+        self.buckets.clear()
+        self._decayed_routings = DecayedCounter(self.half_life_s)
+        self._decayed_successes = DecayedCounter(self.half_life_s)
+        self.total_outcomes = 0
+        self.good_outcomes = 0
 
 
 # Global metrics collector
@@ -10,8 +10,14 @@ import time
 import logging
 import math
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Reference time for log-space weights. Any fixed instant works; a recent
+# one keeps the stored exponents small.
+DECAY_EPOCH = 1_704_067_200.0  # 2024-01-01T00:00:00Z
+
 
 class RecencyWeighter:
     """
@@ -19,6 +25,11 @@ class RecencyWeighter:
 
     Recently active agents get boosted scores.
     Inactive agents get decayed scores.
+
+    Each activity is stored once as a log-space weight relative to
+    DECAY_EPOCH, log(max_boost) + λ × (timestamp - DECAY_EPOCH), so agents
+    compare by their stored value and the weight at any time is a single
+    exp(log_weight - λ × (now - DECAY_EPOCH)).
     """
 
     def __init__(
@@ -41,6 +52,15 @@ class RecencyWeighter:
 
         # Track last activity: agent_id -> timestamp
         self.last_activity: Dict[str, float] = {}
+        # agent_id -> log-space weight at DECAY_EPOCH (see class docstring)
+        self.log_weights: Dict[str, float] = {}
+
+        self._decay_per_second = math.log(2) / (half_life_hours * 3600.0)
+        self._log_max_boost = math.log(max_boost)
+
+    def _log_offset(self, current_time: float) -> float:
+        """Decay accumulated between DECAY_EPOCH and current_time, in log space"""
+        return self._decay_per_second * (current_time - DECAY_EPOCH)
 
     def record_activity(self, agent_id: str, timestamp: Optional[float] = None) -> None:
         """
@@ -54,6 +74,7 @@ class RecencyWeighter:
             timestamp = time.time()
 
         self.last_activity[agent_id] = timestamp
+        self.log_weights[agent_id] = self._log_max_boost + self._log_offset(timestamp)
 
         logger.debug(f"Recorded activity for {agent_id} at {timestamp}")
 
@@ -76,20 +97,14 @@ class RecencyWeighter:
         if current_time is None:
             current_time = time.time()
 
-        # Get last activity time
-        last_time = self.last_activity.get(agent_id)
+        log_weight = self.log_weights.get(agent_id)
 
-        if last_time is None:
+        if log_weight is None:
             # No activity recorded, use minimum weight
             return self.min_weight
 
-        # Calculate age in hours
-        age_seconds = current_time - last_time
-        age_hours = age_seconds / 3600.0
-
-        # Exponential decay
-        decay_rate = math.log(2) / self.half_life_hours
-        weight = self.max_boost * math.exp(-decay_rate * age_hours)
+        # Exponential decay: max_boost * exp(-λ * age)
+        weight = math.exp(log_weight - self._log_offset(current_time))
 
         # Clamp to [min_weight, max_boost]
         weight = max(self.min_weight, min(self.max_boost, weight))
@@ -117,6 +132,45 @@ class RecencyWeighter:
 
         return normalized
 
+    def get_recency_scores(
+        self, last_times: np.ndarray, current_time: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Vectorized get_recency_score over last-activity timestamps.
+
+        Args:
+            last_times: Last activity per agent (NaN = no activity recorded)
+            current_time: Current timestamp (defaults to now)
+
+        Returns:
+            Normalized scores from 0.0 to 1.0, aligned with last_times
+        """
+        log_weights = self._log_max_boost + self._decay_per_second * (last_times - DECAY_EPOCH)
+        return self.get_recency_scores_from_log(
+            np.where(np.isnan(last_times), -np.inf, log_weights), current_time
+        )
+
+    def get_recency_scores_from_log(
+        self, log_weights: np.ndarray, current_time: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Vectorized get_recency_score over stored log-space weights.
+
+        Args:
+            log_weights: Values from self.log_weights (-inf = no activity recorded)
+            current_time: Current timestamp (defaults to now)
+
+        Returns:
+            Normalized scores from 0.0 to 1.0, aligned with log_weights
+        """
+        if current_time is None:
+            current_time = time.time()
+
+        weights = np.exp(log_weights - self._log_offset(current_time))
+        weights = np.maximum(self.min_weight, np.minimum(self.max_boost, weights))
+
+        return (weights - self.min_weight) / (self.max_boost - self.min_weight)
+
     def cleanup_old_entries(
         self,
         max_age_hours: float = 168.0,  # 1 week default
@@ -145,6 +199,7 @@ class RecencyWeighter:
 
         for agent_id in old_agents:
             del self.last_activity[agent_id]
+            del self.log_weights[agent_id]
 
         if old_agents:
             logger.info(f"Cleaned up {len(old_agents)} old activity entries")
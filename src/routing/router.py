@@ -3,17 +3,23 @@ Intelligent Router
 
 Combines all routing stages into a complete pipeline:
 Filter → Score → Canary → Bandit → Fallback to Auction
+
+The Filter and Score shortlist is cached per NEED shape (see RoutingCache).
+route_needs routes a batch, sharing shortlists and canaries across it.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
+import asyncio
 import logging
+import math
 
+from .cache import FILTER_FIELDS, RoutingCache, fingerprint_need
 from .manifests import ManifestRegistry, get_registry
 from .filters import CapabilityFilter, get_filter
-from .scoring import AgentScorer, get_scorer
-from .canary import CanaryRunner, get_canary_runner
+from .scoring import AgentScorer, ScoredAgent, get_scorer
+from .canary import CanaryResult, CanaryRunner, CanaryTest, get_canary_runner
 from .winner_selection import WinnerSelector, get_winner_selector
-from .bandit import ContextualBandit, get_bandit
+from .bandit import POLICIES, ContextualBandit, get_bandit
 from .features import FeatureExtractor, get_feature_extractor
 from .feedback import collect_feedback
 from .metrics import MetricsCollector, get_metrics_collector
@@ -43,8 +49,13 @@ class IntelligentRouter:
         bandit: Optional[ContextualBandit] = None,
         feature_extractor: Optional[FeatureExtractor] = None,
         metrics_collector: Optional[MetricsCollector] = None,
+        routing_cache: Optional[RoutingCache] = None,
         enable_canary: bool = True,
         enable_bandit: bool = True,
+        enable_cache: bool = True,
+        bandit_policy: str = "thompson",
+        canary_early_stop: Optional[float] = 0.9,
+        speculative_canary: bool = False,
     ):
         """
         Initialize intelligent router.
@@ -58,9 +69,21 @@ class IntelligentRouter:
             bandit: Contextual bandit
             feature_extractor: Feature extractor
             metrics_collector: Metrics collector
+            routing_cache: Shortlist cache (invalidated by registry changes)
             enable_canary: Whether to run canary tests
             enable_bandit: Whether to use bandit selection
+            enable_cache: Whether to cache shortlists per NEED fingerprint
+            bandit_policy: Bandit selection policy (see bandit.POLICIES), e.g.
+                "linear_thompson" to use the NEED's context features
+            canary_early_stop: Stop waiting for canaries once one passes at
+                this quality (None waits for all of them)
+            speculative_canary: Return the top scored agent without waiting
+                for canaries, which run in the background and feed the
+                canary cache and the bandit
         """
+        if bandit_policy not in POLICIES:
+            raise ValueError(f"Unknown bandit policy: {bandit_policy}")
+
         self.registry = registry or get_registry()
         self.filter = filter or get_filter()
         self.scorer = scorer or get_scorer()
@@ -72,6 +95,18 @@ class IntelligentRouter:
 
         self.enable_canary = enable_canary
         self.enable_bandit = enable_bandit
+        self.bandit_policy = bandit_policy
+        self.canary_early_stop = canary_early_stop
+        self.speculative_canary = speculative_canary
+
+        # Background canaries started in speculative mode
+        self._canary_tasks: Set[asyncio.Task] = set()
+        self._canaries_in_flight: Set[Tuple[str, str]] = set()  # (agent_id, need_key)
+
+        self.cache: Optional[RoutingCache] = None
+        if enable_cache:
+            self.cache = routing_cache or RoutingCache()
+            self.registry.add_change_listener(self.cache.invalidate_manifest)
 
     async def route_need(
         self, need: Dict[str, Any], context: Optional[Dict[str, Any]] = None
@@ -81,7 +116,7 @@ class IntelligentRouter:
 
         Pipeline:
         1. Filter by capabilities
-        2. Score and shortlist top K
+        2. Score and shortlist top K (1-2 skipped on a routing cache hit)
         3. Run canary tests (optional)
         4. Use bandit to select from winners (optional)
         5. Return selected agent or None
@@ -101,121 +136,415 @@ class IntelligentRouter:
         try:
             logger.info(f"Starting intelligent routing for {need_id}")
 
-            # Stage 1: Filter by capabilities
-            all_agents = self.registry.get_all()
-            logger.info(f"Stage 1 - Filtering {len(all_agents)} agents")
+            cache_key = None
+            scored = None
+            if self.cache is not None:
+                cache_key = fingerprint_need(need, context)
+                scored = self.cache.get(cache_key)
+
+            if scored is not None:
+                metrics.cache_hit = True
+                logger.info(f"Stages 1-2 - Cached shortlist of {len(scored)} agents")
+            else:
+                # Stage 1: Filter by capabilities, starting from the registry indexes
+                logger.info(f"Stage 1 - Filtering {self.registry.count()} agents")
+
+                qualified = self.filter.filter_indexed(need, self.registry)
+
+                if not qualified:
+                    logger.warning("No agents passed filtering")
+                    self.metrics.complete_routing(
+                        metrics, None, "filter", success=False, fallback_used=True
+                    )
+                    return None
+
+                logger.info(f"Stage 1 - {len(qualified)} agents qualified")
+
+                # Stage 2: Score and shortlist
+                logger.info(f"Stage 2 - Scoring agents")
+
+                top_k = min(10, len(qualified))
+                scored = self.scorer.score_and_select(
+                    manifests=qualified,
+                    need=need,
+                    k=top_k,
+                    context=context,
+                    diversity_bonus=0.1,
+                )
+
+                if not scored:
+                    logger.warning("No agents after scoring")
+                    self.metrics.complete_routing(
+                        metrics, None, "score", success=False, fallback_used=True
+                    )
+                    return None
+
+                logger.info(f"Stage 2 - Top {len(scored)} agents selected")
 
-            qualified = self.filter.filter_all(need, all_agents)
+                if cache_key is not None:
+                    self.cache.put(cache_key, need, scored)
 
-            if not qualified:
-                logger.warning("No agents passed filtering")
+            # Stage 3: Canary tests (optional)
+            canary_results = None
+            if self.enable_canary and len(scored) >= 2:
+                logger.info(f"Stage 3 - Running canary tests")
+                canary_results = await self._run_stage_canaries(need, scored)
+
+            # Stages 4-5: Bandit or top scored agent
+            selected, routing_method = self._decide(need, scored, canary_results)
+
+            if selected is None:
+                logger.warning("No agent selected through routing pipeline")
                 self.metrics.complete_routing(
-                    metrics, None, "filter", success=False, fallback_used=True
+                    metrics, None, routing_method, success=False, fallback_used=True
                 )
                 return None
 
-            logger.info(f"Stage 1 - {len(qualified)} agents qualified")
+            self.metrics.complete_routing(metrics, selected, routing_method, success=True)
+            return selected
+
+        except Exception as e:
+            logger.error(f"Routing error: {e}")
+            self.metrics.complete_routing(metrics, None, "error", success=False, fallback_used=True)
+            return None
+
+    async def route_needs(
+        self,
+        needs: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None,
+        max_concurrent_canaries: int = 16,
+        load_aware: bool = False,
+        max_per_agent: Optional[int] = None,
+    ) -> List[Optional[str]]:
+        """
+        Route a batch of NEEDs.
+
+        NEEDs with the same fingerprint share one shortlist, NEEDs that
+        differ only in scoring fields (tags, max_latency_ms) share one filter
+        pass, and the shortlists of all uncached shapes are scored together
+        (see AgentScorer.score_and_select_many). Canaries run once per shape,
+        with every shape's canaries in flight at the same time under a
+        global cap. Stages 4-5 then decide per NEED as in route_need.
+
+        With load_aware, picks are reassigned greedily, in batch order, so
+        that no agent gets more than max_per_agent NEEDs: a NEED whose pick
+        is full goes to the next shortlisted agent with room (or the least
+        loaded one if all are full), and is recorded as "load_balanced".
+
+        Args:
+            needs: Task NEED payloads
+            context: Additional context (stake amounts, etc.), shared by all
+            max_concurrent_canaries: Canaries in flight across the batch
+            load_aware: Whether to spread picks across shortlisted agents
+            max_per_agent: NEEDs per agent under load_aware (default:
+                batch size over distinct shortlisted agents, rounded up)
+
+        Returns:
+            Selected agent ID (or None) per NEED, in order
+        """
+        if not needs:
+            return []
 
-            # Stage 2: Score and shortlist
-            logger.info(f"Stage 2 - Scoring agents")
+        all_metrics = [self.metrics.start_routing(n.get("need_id", "unknown")) for n in needs]
+        selected: List[Optional[str]] = [None] * len(needs)
+        methods: List[Optional[str]] = [None] * len(needs)
 
-            top_k = min(10, len(qualified))
-            scored = self.scorer.score_and_select(
-                manifests=qualified,
-                need=need,
-                k=top_k,
-                context=context,
-                diversity_bonus=0.1,
+        try:
+            logger.info(f"Starting batch routing for {len(needs)} NEEDs")
+
+            # Group NEEDs by shape
+            groups: Dict[str, List[int]] = {}
+            for i, need in enumerate(needs):
+                groups.setdefault(fingerprint_need(need, context), []).append(i)
+
+            # Stages 1-2: one shortlist per shape, uncached shapes scored
+            # together; shapes that differ only in scoring fields share Stage 1
+            shortlists: Dict[str, List[ScoredAgent]] = {}
+            pending: List[str] = []
+            qualified_lists: List[list] = []
+            filtered: Dict[str, list] = {}
+            for key, members in groups.items():
+                scored = self.cache.get(key) if self.cache is not None else None
+                if scored is not None:
+                    shortlists[key] = scored
+                    for i in members:
+                        all_metrics[i].cache_hit = True
+                    continue
+
+                need = needs[members[0]]
+                filter_key = fingerprint_need(need, fields=FILTER_FIELDS)
+                qualified = filtered.get(filter_key)
+                if qualified is None:
+                    qualified = self.filter.filter_indexed(need, self.registry)
+                    filtered[filter_key] = qualified
+                if not qualified:
+                    for i in members:
+                        methods[i] = "filter"
+                    continue
+
+                pending.append(key)
+                qualified_lists.append(qualified)
+
+            logger.info(
+                f"Stages 1-2 - {len(groups)} NEED shapes, {len(filtered)} filter passes, "
+                f"{len(pending)} to score"
             )
 
-            if not scored:
-                logger.warning("No agents after scoring")
-                self.metrics.complete_routing(
-                    metrics, None, "score", success=False, fallback_used=True
+            if pending:
+                shortlisted = self.scorer.score_and_select_many(
+                    candidate_lists=qualified_lists,
+                    needs=[needs[groups[key][0]] for key in pending],
+                    k=10,
+                    context=context,
+                    diversity_bonus=0.1,
                 )
-                return None
+                for key, scored in zip(pending, shortlisted):
+                    if not scored:
+                        for i in groups[key]:
+                            methods[i] = "score"
+                        continue
+                    shortlists[key] = scored
+                    if self.cache is not None:
+                        self.cache.put(key, needs[groups[key][0]], scored)
+
+            # Stage 3: canaries per shape, all shapes at once under a global cap
+            canary_results: Dict[str, Optional[List[CanaryResult]]] = {}
+            if self.enable_canary:
+                tested = [key for key, scored in shortlists.items() if len(scored) >= 2]
+                limiter = asyncio.Semaphore(max_concurrent_canaries)
+                logger.info(f"Stage 3 - Running canary tests for {len(tested)} NEED shapes")
+
+                outcomes = await asyncio.gather(
+                    *[
+                        self._run_stage_canaries(needs[groups[key][0]], shortlists[key], limiter)
+                        for key in tested
+                    ],
+                    return_exceptions=True,
+                )
+                for key, outcome in zip(tested, outcomes):
+                    if isinstance(outcome, BaseException):
+                        logger.error(f"Canaries failed for NEED shape {key[:12]}: {outcome}")
+                        outcome = []
+                    canary_results[key] = outcome
+
+            # Stages 4-5: decide per NEED
+            for key, scored in shortlists.items():
+                for i in groups[key]:
+                    selected[i], methods[i] = self._decide(
+                        needs[i], scored, canary_results.get(key)
+                    )
+
+            if load_aware:
+                self._assign_load_aware(groups, shortlists, selected, methods, max_per_agent)
+
+            for i, metrics in enumerate(all_metrics):
+                if selected[i] is not None:
+                    self.metrics.complete_routing(metrics, selected[i], methods[i], success=True)
+                else:
+                    self.metrics.complete_routing(
+                        metrics, None, methods[i] or "none", success=False, fallback_used=True
+                    )
 
-            logger.info(f"Stage 2 - Top {len(scored)} agents selected")
+            logger.info(
+                f"Batch routing - {sum(s is not None for s in selected)}/{len(needs)} "
+                f"NEEDs routed"
+            )
+            return selected
 
-            # Stage 3: Canary tests (optional)
-            if self.enable_canary and len(scored) >= 2:
-                logger.info(f"Stage 3 - Running canary tests")
+        except Exception as e:
+            logger.error(f"Batch routing error: {e}")
+            for metrics in all_metrics:
+                if metrics.end_time is None:
+                    self.metrics.complete_routing(
+                        metrics, None, "error", success=False, fallback_used=True
+                    )
+            return [None] * len(needs)
+
+    def _assign_load_aware(
+        self,
+        groups: Dict[str, List[int]],
+        shortlists: Dict[str, List[ScoredAgent]],
+        selected: List[Optional[str]],
+        methods: List[Optional[str]],
+        max_per_agent: Optional[int],
+    ) -> None:
+        """Greedily move picks off agents that already have max_per_agent NEEDs"""
+        shortlist_of = {i: shortlists[key] for key in shortlists for i in groups[key]}
+        if not shortlist_of:
+            return
+
+        if max_per_agent is None:
+            agents = {s.manifest.agent_id for scored in shortlists.values() for s in scored}
+            max_per_agent = math.ceil(len(shortlist_of) / len(agents))
+
+        load: Dict[str, int] = {}
+        for i in sorted(shortlist_of):
+            preference = [selected[i]] + [s.manifest.agent_id for s in shortlist_of[i]]
+            agent_id = next(
+                (a for a in preference if load.get(a, 0) < max_per_agent),
+                None,
+            )
+            if agent_id is None:
+                agent_id = min(preference, key=lambda a: load.get(a, 0))
 
-                # Select top 2-3 for canary testing
-                canary_count = min(3, len(scored))
-                canary_candidates = [s.manifest.agent_id for s in scored[:canary_count]]
+            if agent_id != selected[i]:
+                selected[i] = agent_id
+                methods[i] = "load_balanced"
+            load[agent_id] = load.get(agent_id, 0) + 1
 
-                # Create micro-task
-                canary_test = self.canary_runner.create_micro_task(need)
+    async def _run_stage_canaries(
+        self,
+        need: Dict[str, Any],
+        scored: List[ScoredAgent],
+        limiter: Optional[asyncio.Semaphore] = None,
+    ) -> List[CanaryResult]:
+        """Stage 3: canary the top 2-3 shortlisted agents"""
+        # Select top 2-3 for canary testing
+        canary_count = min(3, len(scored))
+        canary_candidates = [s.manifest.agent_id for s in scored[:canary_count]]
+
+        # Create micro-task
+        canary_test = self.canary_runner.create_micro_task(need)
+        need_key = fingerprint_need(need)
+
+        if self.speculative_canary:
+            # Decide from fresh cached canaries only, and test the rest off
+            # the critical path
+            canary_results = self.canary_runner.cached_results(canary_candidates, need_key)
+            tested = {r.agent_id for r in canary_results}
+            untested = [a for a in canary_candidates if a not in tested]
+            if untested:
+                self._spawn_canaries(untested, canary_test, need_key, need, limiter)
+            return canary_results
+
+        # Run canaries, reusing fresh results for this NEED shape
+        return await self.canary_runner.run_canaries(
+            canary_candidates,
+            canary_test,
+            need_key=need_key,
+            early_stop_quality=self.canary_early_stop,
+            limiter=limiter,
+        )
 
-                # Run canaries
-                canary_results = await self.canary_runner.run_canaries(
-                    canary_candidates, canary_test
-                )
+    def _decide(
+        self,
+        need: Dict[str, Any],
+        scored: List[ScoredAgent],
+        canary_results: Optional[List[CanaryResult]],
+    ) -> Tuple[Optional[str], str]:
+        """
+        Stages 3-5 decision for one NEED.
 
-                # Select winner from canary results
-                canary_winner = self.winner_selector.select_winner(canary_results)
+        Args:
+            need: Task NEED payload
+            scored: Ranked shortlist
+            canary_results: Stage 3 results (None if canaries were skipped)
 
-                if canary_winner:
-                    logger.info(f"Stage 3 - Canary winner: {canary_winner}")
+        Returns:
+            (selected agent ID or None, routing method)
+        """
+        if canary_results is not None:
+            # Select winner from canary results
+            canary_winner = self.winner_selector.select_winner(canary_results)
 
-                    # Stage 4: Bandit selection (optional)
-                    if self.enable_bandit:
-                        # Extract context and use bandit to confirm or override
-                        features = self.feature_extractor.extract_context(need)
+            if canary_winner:
+                logger.info(f"Stage 3 - Canary winner: {canary_winner}")
 
-                        # Ensure canary winner is in bandit
-                        self.bandit.add_arm(canary_winner)
+                # Stage 4: Bandit selection (optional)
+                if self.enable_bandit:
+                    # Ensure canary winner is in bandit
+                    self.bandit.add_arm(canary_winner)
 
-                        # Use bandit for final selection among canary winners
-                        # For now, trust canary result (could use bandit to choose among top
-                        # canaries)
-                        selected = canary_winner
-                        routing_method = "bandit"
-                    else:
-                        selected = canary_winner
-                        routing_method = "canary"
+                    # For now, trust canary result (could use bandit to choose among top
+                    # canaries)
+                    return canary_winner, "bandit"
+                return canary_winner, "canary"
 
-                    self.metrics.complete_routing(metrics, selected, routing_method, success=True)
-                    return selected
-                else:
-                    logger.warning("No canary winner found")
+            if self.speculative_canary:
+                selected = scored[0].manifest.agent_id
+                logger.info(f"Stage 3 - Speculative pick: {selected}")
+                return selected, "speculative"
 
-            # Stage 4: Bandit selection (if canary skipped or failed)
-            if self.enable_bandit:
-                logger.info("Stage 4 - Using bandit selection")
+            logger.warning("No canary winner found")
 
-                # Extract context
-                features = self.feature_extractor.extract_context(need)
+        # Stage 4: Bandit selection (if canary skipped or failed)
+        if self.enable_bandit:
+            logger.info("Stage 4 - Using bandit selection")
 
-                # Ensure top agents are in bandit
-                for scored_agent in scored:
-                    self.bandit.add_arm(scored_agent.manifest.agent_id)
+            # Extract context
+            features = self.feature_extractor.extract_context(need)
 
-                # Use Thompson Sampling to select
-                selected = self.bandit.thompson_sampling(context=features)
+            # Select among the shortlisted agents only
+            selected = self.bandit.select(
+                context=features,
+                candidates=[s.manifest.agent_id for s in scored],
+                policy=self.bandit_policy,
+            )
 
-                if selected:
-                    logger.info(f"Stage 4 - Bandit selected: {selected}")
-                    self.metrics.complete_routing(metrics, selected, "bandit", success=True)
-                    return selected
+            if selected:
+                logger.info(f"Stage 4 - Bandit selected: {selected}")
+                return selected, "bandit"
 
-            # Fallback: Select top scored agent
-            if scored:
-                selected = scored[0].manifest.agent_id
-                logger.info(f"Fallback - Using top scored agent: {selected}")
-                self.metrics.complete_routing(metrics, selected, "score", success=True)
-                return selected
+        # Fallback: Select top scored agent
+        if scored:
+            selected = scored[0].manifest.agent_id
+            logger.info(f"Fallback - Using top scored agent: {selected}")
+            return selected, "score"
 
-            # No agent found
-            logger.warning("No agent selected through routing pipeline")
-            self.metrics.complete_routing(metrics, None, "none", success=False, fallback_used=True)
-            return None
+        return None, "none"
 
+    def _spawn_canaries(
+        self,
+        agent_ids: List[str],
+        canary_test: CanaryTest,
+        need_key: str,
+        need: Dict[str, Any],
+        limiter: Optional[asyncio.Semaphore] = None,
+    ) -> None:
+        """Start speculative canaries for agents not already being tested"""
+        agent_ids = [a for a in agent_ids if (a, need_key) not in self._canaries_in_flight]
+        if not agent_ids:
+            return
+
+        features = self.feature_extractor.extract_context(need)
+        self._canaries_in_flight.update((a, need_key) for a in agent_ids)
+
+        task = asyncio.ensure_future(
+            self._background_canaries(agent_ids, canary_test, need_key, features, limiter)
+        )
+        self._canary_tasks.add(task)
+        task.add_done_callback(self._canary_tasks.discard)
+
+    async def _background_canaries(
+        self,
+        agent_ids: List[str],
+        canary_test: CanaryTest,
+        need_key: str,
+        features: List[float],
+        limiter: Optional[asyncio.Semaphore] = None,
+    ) -> None:
+        """Run speculative canaries; results feed the canary cache and the bandit"""
+        try:
+            results = await self.canary_runner.run_canaries(agent_ids, canary_test, limiter=limiter)
+
+            for result in results:
+                self.canary_runner.result_cache.put(need_key, result)
+
+            if self.enable_bandit and results:
+                self.bandit.update_batch(
+                    agent_ids=[r.agent_id for r in results],
+                    rewards=[r.quality_score if r.passed else 0.0 for r in results],
+                    contexts=[features] * len(results),
+                )
         except Exception as e:
-            logger.error(f"Routing error: {e}")
-            self.metrics.complete_routing(metrics, None, "error", success=False, fallback_used=True)
-            return None
+            logger.error(f"Speculative canaries failed: {e}", exc_info=True)
+        finally:
+            self._canaries_in_flight.difference_update((a, need_key) for a in agent_ids)
+
+    async def drain_canaries(self) -> None:
+        """Wait for speculative canaries still running in the background"""
+        if self._canary_tasks:
+            await asyncio.gather(*list(self._canary_tasks), return_exceptions=True)
 
     def record_outcome(
         self,
@@ -262,6 +591,8 @@ class IntelligentRouter:
             "routing_metrics": self.metrics.get_stats(),
             "bandit_stats": self.bandit.get_stats() if self.enable_bandit else {},
             "registry_stats": self.registry.get_stats(),
+            "cache_stats": self.cache.get_stats() if self.cache is not None else {},
+            "canary_cache_stats": self.canary_runner.result_cache.get_stats(),
         }
 
 
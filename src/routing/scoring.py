@@ -9,12 +9,19 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 import logging
 
+import numpy as np
+
+from .agent_table import AgentTable
 from .manifests import AgentManifest
 from .domain_fit import DomainFitCalculator, get_domain_fit_calculator
 from .recency import RecencyWeighter, get_recency_weighter
 
 logger = logging.getLogger(__name__)
 
+# NEEDs scored per block in score_and_select_many, bounding the size of the
+# NEEDs × candidates score matrices
+NEED_BLOCK = 64
+
 
 @dataclass
 class ScoredAgent:
@@ -40,6 +47,9 @@ class AgentScorer:
     - Domain fit (semantic similarity)
     - Stake (economic commitment)
     - Recency (recent activity)
+
+    score_and_select scores candidates column-wise over an AgentTable;
+    score_agent is the per-agent reference and gives the same scores.
     """
 
     def __init__(
@@ -47,6 +57,7 @@ class AgentScorer:
         weights: Optional[Dict[str, float]] = None,
         domain_fit_calculator: Optional[DomainFitCalculator] = None,
         recency_weighter: Optional[RecencyWeighter] = None,
+        vectorized: bool = True,
     ):
         """
         Initialize agent scorer.
@@ -55,6 +66,7 @@ class AgentScorer:
             weights: Factor weights (defaults to equal weighting)
             domain_fit_calculator: Domain fit calculator instance
             recency_weighter: Recency weighter instance
+            vectorized: Score with NumPy columns in score_and_select
         """
         # Default weights (sum to 1.0)
         self.weights = weights or {
@@ -75,6 +87,9 @@ class AgentScorer:
         self.domain_fit_calc = domain_fit_calculator or get_domain_fit_calculator()
         self.recency_weighter = recency_weighter or get_recency_weighter()
 
+        self.vectorized = vectorized
+        self.table = AgentTable()
+
     def score_agent(
         self,
         agent_manifest: AgentManifest,
@@ -173,6 +188,77 @@ class AgentScorer:
         """
         return [self.score_agent(manifest, need, context) for manifest in manifests]
 
+    def score_columns(
+        self,
+        manifests: List[AgentManifest],
+        need: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score multiple agents column-wise.
+
+        Args:
+            manifests: Agents to score
+            need: Task requirements
+            context: Additional context
+
+        Returns:
+            Component score arrays plus "total", aligned with manifests
+        """
+        return self._score_rows(self.table.rows_for(manifests), need, context)
+
+    def _score_rows(
+        self, rows: np.ndarray, need: Dict[str, Any], context: Optional[Dict[str, Any]]
+    ) -> Dict[str, np.ndarray]:
+        context = context or {}
+        table = self.table
+        scores = {}
+
+        # 1. Reputation
+        scores["reputation"] = table.reputation[rows]
+
+        # 2. Price
+        max_price = need.get("max_price", 100.0)
+        if max_price > 0:
+            scores["price"] = 1.0 - np.minimum(table.price[rows] / max_price, 1.0)
+        else:
+            scores["price"] = np.full(len(rows), 0.5)
+
+        # 3. Latency
+        max_latency = need.get("max_latency_ms", 5000.0)
+        if max_latency > 0:
+            scores["latency"] = 1.0 - np.minimum(table.latency[rows] / max_latency, 1.0)
+        else:
+            scores["latency"] = np.full(len(rows), 0.5)
+
+        # 4. Domain fit
+        scores["domain_fit"] = self.domain_fit_calc.compute_fits(
+            task_tags=need.get("tags", []),
+            task_capabilities=need.get("capabilities", []),
+            table=table,
+            rows=rows,
+        )
+
+        # 5. Stake
+        agent_stakes = table.gather(context.get("agent_stakes", {}), rows, 0.0)
+        max_stake = context.get("max_stake", 1000.0)
+        if max_stake > 0:
+            scores["stake"] = np.minimum(agent_stakes / max_stake, 1.0)
+        else:
+            scores["stake"] = np.full(len(rows), 0.5)
+
+        # 6. Recency
+        log_weights = table.gather(self.recency_weighter.log_weights, rows, -np.inf)
+        scores["recency"] = self.recency_weighter.get_recency_scores_from_log(log_weights)
+
+        # Weighted total, summed in the same order as score_agent
+        total = np.zeros(len(rows))
+        for factor, column in scores.items():
+            total = total + self.weights.get(factor, 0.0) * column
+        scores["total"] = total
+
+        return scores
+
     def adjust_for_diversity(
         self, scored_agents: List[ScoredAgent], diversity_bonus: float = 0.1
     ) -> List[ScoredAgent]:
@@ -267,6 +353,11 @@ class AgentScorer:
         """
         logger.info(f"Scoring {len(manifests)} agents for selection")
 
+        if self.vectorized:
+            top_k = self._score_and_select_columns(manifests, need, k, context, diversity_bonus)
+            logger.info(f"Selected top {len(top_k)} agents")
+            return top_k
+
         # Score all agents
         scored = self.score_agents(manifests, need, context)
 
@@ -281,6 +372,208 @@ class AgentScorer:
 
         return top_k
 
+    def _score_and_select_columns(
+        self,
+        manifests: List[AgentManifest],
+        need: Dict[str, Any],
+        k: int,
+        context: Optional[Dict[str, Any]],
+        diversity_bonus: float,
+    ) -> List[ScoredAgent]:
+        """score_and_select over score_columns, with argpartition for top K"""
+        if not manifests or k <= 0:
+            return []
+
+        rows = self.table.rows_for(manifests)
+        scores = self._score_rows(rows, need, context)
+        total = scores.pop("total")
+
+        # Diversity bonus, inversely proportional to zone frequency
+        if diversity_bonus > 0:
+            zones = self.table.zone[rows]
+            zone_counts = np.bincount(zones)[zones]
+            bonus = diversity_bonus / zone_counts
+            total = total * (1.0 + bonus)
+            scores["diversity_bonus"] = (1.0 + bonus) - 1.0
+
+        return self._select_top_columns(manifests, total, scores, k)
+
+    def _select_top_columns(
+        self,
+        manifests: List[AgentManifest],
+        total: np.ndarray,
+        scores: Dict[str, np.ndarray],
+        k: int,
+    ) -> List[ScoredAgent]:
+        """Top K of column-wise totals, ties broken by agent_id"""
+        # Keep everything tied with the Kth best, then break ties by agent_id
+        n = len(manifests)
+        if k < n:
+            top = np.argpartition(total, n - k)[n - k :]
+            candidates = np.flatnonzero(total >= total[top].min()).tolist()
+        else:
+            candidates = range(n)
+        selected = sorted(candidates, key=lambda i: (-total[i], manifests[i].agent_id))[:k]
+
+        return [
+            ScoredAgent(
+                manifest=manifests[i],
+                total_score=float(total[i]),
+                score_breakdown={factor: float(column[i]) for factor, column in scores.items()},
+            )
+            for i in selected
+        ]
+
+    def score_and_select_many(
+        self,
+        candidate_lists: List[List[AgentManifest]],
+        needs: List[Dict[str, Any]],
+        k: int = 10,
+        context: Optional[Dict[str, Any]] = None,
+        diversity_bonus: float = 0.1,
+    ) -> List[List[ScoredAgent]]:
+        """
+        score_and_select for many NEEDs at once.
+
+        The union of all candidates is mapped to table rows once, and the
+        NEED-independent factors (reputation, stake, recency) are computed
+        once over it. The remaining factors are scored as a NEEDs ×
+        candidates matrix, NEED_BLOCK NEEDs at a time, with candidates a
+        NEED did not qualify masked out. Shortlists match calling
+        score_and_select per NEED.
+
+        Args:
+            candidate_lists: Qualified agents per NEED
+            needs: Task requirements, aligned with candidate_lists
+            k: Number of top agents to select per NEED
+            context: Additional context, shared by all NEEDs
+            diversity_bonus: Diversity adjustment bonus
+
+        Returns:
+            Top K agents with scores, per NEED
+        """
+        if not self.vectorized:
+            return [
+                self.score_and_select(manifests, need, k, context, diversity_bonus)
+                for manifests, need in zip(candidate_lists, needs)
+            ]
+
+        # Union of candidates, each mapped to a column once; NEEDs often share
+        # one candidate list object, which is then indexed once
+        columns: Dict[str, int] = {}
+        manifests: List[AgentManifest] = []
+        indexed: Dict[int, np.ndarray] = {}  # id(candidate list) -> columns
+        candidate_cols: List[np.ndarray] = []
+        for candidates in candidate_lists:
+            cols = indexed.get(id(candidates))
+            if cols is None:
+                for manifest in candidates:
+                    if manifest.agent_id not in columns:
+                        columns[manifest.agent_id] = len(manifests)
+                        manifests.append(manifest)
+                cols = np.fromiter(
+                    (columns[m.agent_id] for m in candidates), dtype=np.intp, count=len(candidates)
+                )
+                indexed[id(candidates)] = cols
+            candidate_cols.append(cols)
+
+        if not manifests or k <= 0:
+            return [[] for _ in needs]
+
+        context = context or {}
+        table = self.table
+        rows = table.rows_for(manifests)
+
+        # NEED-independent factors
+        reputation = table.reputation[rows]
+        agent_stakes = table.gather(context.get("agent_stakes", {}), rows, 0.0)
+        max_stake = context.get("max_stake", 1000.0)
+        if max_stake > 0:
+            stake = np.minimum(agent_stakes / max_stake, 1.0)
+        else:
+            stake = np.full(len(rows), 0.5)
+        log_weights = table.gather(self.recency_weighter.log_weights, rows, -np.inf)
+        recency = self.recency_weighter.get_recency_scores_from_log(log_weights)
+
+        zones = table.zone[rows]
+        zone_onehot = np.zeros((len(rows), int(zones.max()) + 1), dtype=np.int64)
+        zone_onehot[np.arange(len(rows)), zones] = 1
+
+        results: List[List[ScoredAgent]] = []
+        for start in range(0, len(needs), NEED_BLOCK):
+            block = needs[start : start + NEED_BLOCK]
+            block_lists = candidate_lists[start : start + NEED_BLOCK]
+            block_cols = candidate_cols[start : start + NEED_BLOCK]
+
+            mask = np.zeros((len(block), len(rows)), dtype=bool)
+            for i, cols in enumerate(block_cols):
+                mask[i, cols] = True
+
+            # Per-NEED factors, one row per NEED
+            max_price = np.array([need.get("max_price", 100.0) for need in block], float)[:, None]
+            price = np.where(
+                max_price > 0,
+                1.0 - np.minimum(table.price[rows] / np.where(max_price > 0, max_price, 1.0), 1.0),
+                0.5,
+            )
+            max_latency = np.array([need.get("max_latency_ms", 5000.0) for need in block], float)[
+                :, None
+            ]
+            latency = np.where(
+                max_latency > 0,
+                1.0
+                - np.minimum(
+                    table.latency[rows] / np.where(max_latency > 0, max_latency, 1.0), 1.0
+                ),
+                0.5,
+            )
+            domain_fit = np.stack(
+                [
+                    self.domain_fit_calc.compute_fits(
+                        task_tags=need.get("tags", []),
+                        task_capabilities=need.get("capabilities", []),
+                        table=table,
+                        rows=rows,
+                    )
+                    for need in block
+                ]
+            )
+
+            factors = {
+                "reputation": reputation[None, :],
+                "price": price,
+                "latency": latency,
+                "domain_fit": domain_fit,
+                "stake": stake[None, :],
+                "recency": recency[None, :],
+            }
+
+            # Weighted total, summed in the same order as score_agent
+            total = np.zeros(mask.shape)
+            for factor, column in factors.items():
+                total = total + self.weights.get(factor, 0.0) * column
+
+            # Diversity bonus over each NEED's own candidates
+            if diversity_bonus > 0:
+                zone_counts = (mask.astype(np.int64) @ zone_onehot)[:, zones]
+                bonus = diversity_bonus / np.maximum(zone_counts, 1)
+                total = total * (1.0 + bonus)
+                factors["diversity_bonus"] = (1.0 + bonus) - 1.0
+
+            for i, candidates in enumerate(block_lists):
+                if not candidates:
+                    results.append([])
+                    continue
+                cols = block_cols[i]
+                scores = {
+                    factor: np.broadcast_to(column, mask.shape)[i, cols]
+                    for factor, column in factors.items()
+                }
+                results.append(self._select_top_columns(candidates, total[i, cols], scores, k))
+
+        logger.info(f"Scored {len(manifests)} agents for {len(needs)} NEEDs")
+        return results
+
 
 # Global scorer instance
 _global_scorer: Optional[AgentScorer] = None
@@ -0,0 +1,273 @@
+"""
+Streaming Aggregates
+
+Fixed-memory building blocks for long-running routing statistics:
+exponentially decayed counters, a ring buffer of time buckets and a
+mergeable quantile sketch. Updates are O(1); queries cost O(buckets) or
+O(sketch bins), independent of how many events have been recorded.
+"""
+
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+import math
+import time
+
+T = TypeVar("T")
+
+
+class DecayedCounter:
+    """
+    Counter whose contributions halve every half_life_s seconds.
+
+    Stores one value and the time it was last brought up to date, so
+    memory and update cost do not depend on the number of events.
+    """
+
+    __slots__ = ("half_life_s", "value", "updated_at")
+
+    def __init__(self, half_life_s: float = 3600.0):
+        """
+        Initialize decayed counter.
+
+        Args:
+            half_life_s: Seconds after which a contribution counts half
+        """
+        self.half_life_s = half_life_s
+        self.value = 0.0
+        self.updated_at: Optional[float] = None
+
+    def _decay(self, now: float) -> None:
+        # Late events are added undecayed rather than moving the clock back
+        if self.updated_at is None:
+            self.updated_at = now
+        elif now > self.updated_at:
+            self.value *= 0.5 ** ((now - self.updated_at) / self.half_life_s)
+            self.updated_at = now
+
+    def add(self, amount: float = 1.0, now: Optional[float] = None) -> None:
+        """
+        Add to the counter.
+
+        Args:
+            amount: Contribution at time now
+            now: Event timestamp (defaults to now)
+        """
+        self._decay(time.time() if now is None else now)
+        self.value += amount
+
+    def get(self, now: Optional[float] = None) -> float:
+        """Decayed value at time now"""
+        if self.updated_at is None:
+            return 0.0
+        now = time.time() if now is None else now
+        if now <= self.updated_at:
+            return self.value
+        return self.value * 0.5 ** ((now - self.updated_at) / self.half_life_s)
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch with bounded relative error.
+
+    A positive value v is counted in bin ceil(log_gamma(v)), with
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy), so any
+    reported quantile is within relative_accuracy of a recorded value.
+    Sketches with the same accuracy merge by adding bin counts, which is
+    what lets time buckets be combined into a window. Past max_bins the
+    lowest bins are collapsed, trading accuracy on the smallest values
+    for bounded memory.
+    """
+
+    # Values at or below this are counted as zero
+    MIN_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        """
+        Initialize quantile sketch.
+
+        Args:
+            relative_accuracy: Relative error bound on reported quantiles
+            max_bins: Bins kept before collapsing the lowest ones
+        """
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float, count: int = 1) -> None:
+        """
+        Record a value.
+
+        Args:
+            value: Non-negative observation (e.g. latency in ms)
+            count: Number of times it was observed
+        """
+        if value <= self.MIN_VALUE:
+            self.zero_count += count
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Add another sketch's observations to this one.
+
+        Raises:
+            ValueError: If the sketches were built with different accuracies
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.bins[target] += self.bins.pop(key)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile.
+
+        Args:
+            q: Quantile from 0.0 to 1.0 (e.g. 0.95 for p95)
+
+        Returns:
+            Estimated value, or 0.0 if nothing has been recorded
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(0.0, self.min)
+
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2.0 * self.gamma**key / (self.gamma + 1.0)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99)) -> Dict[str, float]:
+        """Estimates keyed "p50", "p95", ... for each quantile in qs"""
+        return {f"p{q * 100:g}": self.quantile(q) for q in qs}
+
+    @property
+    def mean(self) -> float:
+        """Mean of recorded values (exact)"""
+        if self.count == 0:
+            return 0.0
+        return self.sum / self.count
+
+
+class TimeBuckets(Generic[T]):
+    """
+    Ring buffer of fixed-width time buckets.
+
+    Bucket i covers [i * bucket_seconds, (i + 1) * bucket_seconds). Only the
+    last num_buckets buckets are kept; a slot is reset when time moves on to
+    a bucket that maps onto it, so memory is bounded by num_buckets.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        bucket_seconds: float = 60.0,
+        num_buckets: int = 60,
+    ):
+        """
+        Initialize time buckets.
+
+        Args:
+            factory: Creates an empty per-bucket aggregate
+            bucket_seconds: Width of one bucket
+            num_buckets: Buckets kept (window = bucket_seconds * num_buckets)
+        """
+        self.factory = factory
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+
+        self._slots: List[Optional[T]] = [None] * num_buckets
+        self._epochs: List[Optional[int]] = [None] * num_buckets
+
+    @property
+    def span_seconds(self) -> float:
+        """Longest window the buckets can answer for"""
+        return self.bucket_seconds * self.num_buckets
+
+    def _epoch(self, now: Optional[float]) -> int:
+        return int((time.time() if now is None else now) // self.bucket_seconds)
+
+    def bucket(self, now: Optional[float] = None) -> T:
+        """
+        Aggregate for the bucket containing time now, created if needed.
+
+        Args:
+            now: Event timestamp (defaults to now)
+        """
+        epoch = self._epoch(now)
+        slot = epoch % self.num_buckets
+        if self._epochs[slot] != epoch:
+            self._slots[slot] = self.factory()
+            self._epochs[slot] = epoch
+        return self._slots[slot]
+
+    def window(self, window_s: Optional[float] = None, now: Optional[float] = None) -> List[T]:
+        """
+        Aggregates of the buckets overlapping the last window_s seconds.
+
+        Args:
+            window_s: Window length (None or longer than the ring = whole ring)
+            now: End of the window (defaults to now)
+
+        Returns:
+            Bucket aggregates, oldest first
+        """
+        current = self._epoch(now)
+        span = self.num_buckets
+        if window_s is not None:
+            span = min(span, max(1, math.ceil(window_s / self.bucket_seconds)))
+
+        buckets = []
+        for epoch in range(current - span + 1, current + 1):
+            slot = epoch % self.num_buckets
+            if self._epochs[slot] == epoch:
+                buckets.append(self._slots[slot])
+        return buckets
+
+    def clear(self) -> None:
+        """Drop every bucket"""
+        self._slots = [None] * self.num_buckets
+        self._epochs = [None] * self.num_buckets
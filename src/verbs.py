@@ -1,15 +1,44 @@
 """
 Verb Dispatcher: routes envelopes to handlers based on kind.
+
+``dispatch`` runs one handler and returns when it completes. ``submit``
+queues the envelope and returns a future instead, so handlers for different
+threads run concurrently (up to ``max_concurrency`` at once) while each
+thread's envelopes are still handled one at a time, in submission order.
+Threads with queued work take turns, one envelope per turn, so a busy
+thread cannot starve the others.
 """
 
-from typing import Dict, Callable, Awaitable, Any
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Callable, Awaitable, Any, Set, Tuple
+
+try:
+    from observability import metrics as obs_metrics
+except ImportError:
+    obs_metrics = None
+
+logger = logging.getLogger(__name__)
 
 VerbHandler = Callable[[Dict[str, Any]], Awaitable[None]]
 
+# Handlers running at once in submit() mode
+DISPATCH_CONCURRENCY = int(os.getenv("SWARM_DISPATCH_CONCURRENCY", "64"))
+
 
 class VerbDispatcher:
-    def __init__(self):
+    def __init__(self, max_concurrency: int = DISPATCH_CONCURRENCY):
         self.handlers: Dict[str, VerbHandler] = {}
+        self.max_concurrency = max(1, max_concurrency)
+
+        # submit() state: a FIFO per thread with queued or running work, and
+        # the threads whose next envelope is ready to run, in turn order
+        self._queues: Dict[Any, Deque[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._ready: Deque[Any] = deque()
+        self._workers: Set[asyncio.Task] = set()
 
     def register(self, kind: str, handler: VerbHandler):
         """Register a handler for a verb kind"""
@@ -26,9 +55,87 @@ class VerbDispatcher:
         if handler is None:
             return False
 
-        await handler(envelope)
+        if obs_metrics is None or not obs_metrics.ENABLED:
+            await handler(envelope)
+            return True
+
+        start = time.perf_counter()
+        try:
+            await handler(envelope)
+        except Exception as e:
+            obs_metrics.record_rejected(kind, "dispatch", type(e).__name__)
+            raise
+        finally:
+            obs_metrics.record_verb(kind, time.perf_counter() - start)
         return True
 
+    def submit(self, envelope: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queue envelope for its thread and return without waiting.
+
+        Must be called from the event loop.
+
+        Returns:
+            Future resolving to dispatch()'s result (True if handled, False if
+            no handler) once the handler completes, or to its exception
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = envelope.get("thread_id")
+
+        queue = self._queues.get(key)
+        if queue is not None:
+            # Thread already queued or running: keep its order
+            queue.append((envelope, future))
+        else:
+            self._queues[key] = deque([(envelope, future)])
+            self._ready.append(key)
+
+        # Also picks up threads left ready by a cancelled worker
+        if self._ready and len(self._workers) < self.max_concurrency:
+            worker = loop.create_task(self._work())
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+        return future
+
+    async def _work(self):
+        """Run ready threads' next envelopes until none are ready"""
+        while self._ready:
+            key = self._ready.popleft()
+            queue = self._queues[key]
+            envelope, future = queue.popleft()
+            try:
+                handled = await self.dispatch(envelope)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            except BaseException:
+                # Cancelled mid-handler: the thread's later envelopes cannot
+                # run in order any more, so they are cancelled with it
+                future.cancel()
+                for _, pending in queue:
+                    pending.cancel()
+                del self._queues[key]
+                raise
+            else:
+                if not future.done():
+                    future.set_result(handled)
+
+            # Back of the line, so other threads get a turn first
+            if queue:
+                self._ready.append(key)
+            else:
+                del self._queues[key]
+
+    def pending(self) -> int:
+        """Number of submitted envelopes waiting for their handler to start"""
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def join(self):
+        """Wait until every submitted envelope has been handled"""
+        while self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+
     def list_verbs(self) -> list:
         """List all registered verbs"""
         return list(self.handlers.keys())
@@ -0,0 +1,150 @@
+"""
+Label vocabulary interning.
+
+Assigns each capability/tag label a stable integer and encodes label sets as
+packed bitsets (Python ints, one bit per label). Subset, overlap and Jaccard
+then cost a few AND/OR/popcount word operations instead of walking lists
+and building sets.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+if hasattr(int, "bit_count"):
+
+    def popcount(mask: int) -> int:
+        """Number of labels in a bitset"""
+        return mask.bit_count()
+
+else:  # Python < 3.10
+
+    def popcount(mask: int) -> int:
+        """Number of labels in a bitset"""
+        return bin(mask).count("1")
+
+
+def is_subset(required: int, provided: int) -> bool:
+    """True if every label in required is also in provided"""
+    return required & provided == required
+
+
+def overlap(mask1: int, mask2: int) -> int:
+    """Number of labels in both bitsets"""
+    return popcount(mask1 & mask2)
+
+
+def jaccard(mask1: int, mask2: int) -> float:
+    """|intersection| / |union| of two bitsets (0.0 if both are empty)"""
+    union = popcount(mask1 | mask2)
+    if union == 0:
+        return 0.0
+    return popcount(mask1 & mask2) / union
+
+
+def to_bytes(mask: int) -> bytes:
+    """Little-endian encoding of a bitset, for storage"""
+    return mask.to_bytes(max(1, (mask.bit_length() + 7) // 8), "little")
+
+
+def from_bytes(data: bytes) -> int:
+    """Inverse of to_bytes"""
+    return int.from_bytes(data, "little")
+
+
+class Vocabulary:
+    """
+    Interns labels to bit positions.
+
+    Positions are assigned in first-seen order and never reused, so a
+    bitset stays valid for the lifetime of its vocabulary.
+    """
+
+    def __init__(self, labels: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self._labels: List[str] = []
+        self._lock = threading.Lock()
+        for label in labels:
+            self.intern(label)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._ids
+
+    @property
+    def labels(self) -> List[str]:
+        """Labels in bit order"""
+        return list(self._labels)
+
+    def intern(self, label: str) -> int:
+        """Bit position of label, assigning the next free one if new"""
+        bit = self._ids.get(label)
+        if bit is None:
+            with self._lock:
+                bit = self._ids.get(label)
+                if bit is None:
+                    bit = len(self._labels)
+                    self._labels.append(label)
+                    self._ids[label] = bit
+        return bit
+
+    def id(self, label: str) -> Optional[int]:
+        """Bit position of label, or None if never interned"""
+        return self._ids.get(label)
+
+    def encode(self, labels: Iterable[str]) -> int:
+        """Bitset of labels, interning any new ones"""
+        mask = 0
+        for label in labels:
+            mask |= 1 << self.intern(label)
+        return mask
+
+    def encode_known(self, labels: Iterable[str]) -> Tuple[int, int]:
+        """
+        Bitset of already-interned labels, without interning.
+
+        For queries: a label nobody has registered can never match, and
+        leaving it out keeps ad-hoc queries from growing the vocabulary.
+
+        Returns:
+            (bitset of known labels, number of distinct unknown labels)
+        """
+        mask = 0
+        unknown = set()
+        for label in labels:
+            bit = self._ids.get(label)
+            if bit is None:
+                unknown.add(label)
+            else:
+                mask |= 1 << bit
+        return mask, len(unknown)
+
+    def decode(self, mask: int) -> List[str]:
+        """Labels in a bitset, in bit order"""
+        labels = []
+        bit = 0
+        while mask:
+            if mask & 1:
+                labels.append(self._labels[bit])
+            mask >>= 1
+            bit += 1
+        return labels
+
+
+# Global vocabulary shared by in-process registries
+_global_vocabulary: Optional[Vocabulary] = None
+
+
+def get_vocabulary() -> Vocabulary:
+    """Get or create the global vocabulary"""
+    global _global_vocabulary
+    if _global_vocabulary is None:
+        _global_vocabulary = Vocabulary()
+    return _global_vocabulary
+
+
+def reset_vocabulary() -> None:
+    """Reset the global vocabulary (for testing)"""
+    global _global_vocabulary
+    _global_vocabulary = None
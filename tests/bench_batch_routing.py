@@ -0,0 +1,155 @@
+"""
+Benchmark for batch routing.
+
+Routes 500 NEEDs against 5k registered agents, once by awaiting
+IntelligentRouter.route_need per NEED and once with a single route_needs
+call. The NEEDs come in a few dozen shapes, and canaries are answered by a
+simulated agent after a fixed delay. Both routers start cold (empty routing
+and canary caches).
+"""
+
+import sys
+from pathlib import Path
+import asyncio
+import logging
+import random
+import time
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from routing.bandit import ContextualBandit
+from routing.canary import CanaryRunner
+from routing.domain_fit import DomainFitCalculator
+from routing.manifests import AgentManifest, ManifestRegistry
+from routing.metrics import MetricsCollector
+from routing.recency import RecencyWeighter
+from routing.router import IntelligentRouter
+from routing.scoring import AgentScorer
+
+AGENT_COUNT = 5_000
+NEED_COUNT = 500
+CANARY_DELAY_S = 0.005
+
+CAPABILITIES = ["code_gen", "review", "data", "vision"]
+TAGS = ["python", "ml", "web", "nlp", "sql", "rust", "go", "java"]
+
+
+def _make_agents(count: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    return [
+        AgentManifest(
+            agent_id=f"agent-{i}",
+            capabilities=rng.sample(CAPABILITIES, 2),
+            io_schema={},
+            tags=rng.sample(TAGS, 3),
+            success_rate=rng.random(),
+            price_per_task=float(rng.randint(1, 80)),
+            avg_latency_ms=float(rng.randint(100, 6000)),
+            zone=rng.choice(["us-west-2", "us-east-1", "eu-west-1"]),
+        )
+        for i in range(count)
+    ]
+
+
+def _make_needs(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "need_id": f"need-{i}",
+            "capabilities": [rng.choice(CAPABILITIES)],
+            "tags": rng.sample(TAGS, 2),
+            "max_price": float(rng.choice([30, 50, 80])),
+        }
+        for i in range(count)
+    ]
+
+
+def _make_router(agents: list) -> IntelligentRouter:
+    registry = ManifestRegistry()
+    for agent in agents:
+        registry.register(agent)
+
+    canary_runner = CanaryRunner()
+
+    async def send(agent_id, micro_task):
+        pass
+
+    async def receive(agent_id):
+        await asyncio.sleep(CANARY_DELAY_S)
+        return {"status": "success", "result": "simulated"}
+
+    canary_runner.send_task_handler = send
+    canary_runner.receive_result_handler = receive
+
+    return IntelligentRouter(
+        registry=registry,
+        scorer=AgentScorer(
+            domain_fit_calculator=DomainFitCalculator(), recency_weighter=RecencyWeighter()
+        ),
+        canary_runner=canary_runner,
+        bandit=ContextualBandit(),
+        metrics_collector=MetricsCollector(),
+    )
+
+
+async def bench_batch_routing(agent_count=AGENT_COUNT, need_count=NEED_COUNT) -> dict:
+    """
+    Time serial route_need calls against one route_needs call.
+
+    Args:
+        agent_count: Registered agents
+        need_count: NEEDs routed
+
+    Returns:
+        Dict with "serial_ms", "batch_ms" and "balanced_ms" (load-aware batch)
+    """
+    agents = _make_agents(agent_count)
+    needs = _make_needs(need_count)
+    results = {}
+
+    logging.disable(logging.WARNING)
+    router = _make_router(agents)
+    start = time.perf_counter()
+    for need in needs:
+        await router.route_need(need)
+    results["serial_ms"] = (time.perf_counter() - start) * 1000
+
+    router = _make_router(agents)
+    start = time.perf_counter()
+    await router.route_needs(needs)
+    results["batch_ms"] = (time.perf_counter() - start) * 1000
+
+    router = _make_router(agents)
+    start = time.perf_counter()
+    await router.route_needs(needs, load_aware=True)
+    results["balanced_ms"] = (time.perf_counter() - start) * 1000
+    logging.disable(logging.NOTSET)
+
+    return results
+
+
+def _report(results: dict) -> None:
+    print(f"{NEED_COUNT} NEEDs x {AGENT_COUNT} agents:")
+    print(f"  route_need loop        {results['serial_ms']:9.1f} ms")
+    print(f"  route_needs            {results['batch_ms']:9.1f} ms")
+    print(f"  route_needs load-aware {results['balanced_ms']:9.1f} ms")
+
+
+def test_batch_routing():
+    """
+    Report batch routing latency.
+
+    Sharing shortlists across NEEDs of one shape and running every shape's
+    canaries concurrently should make the batch several times faster.
+    """
+    results = asyncio.run(bench_batch_routing())
+
+    print()
+    _report(results)
+
+    assert results["batch_ms"] * 3 < results["serial_ms"]
+
+
+if __name__ == "__main__":
+    _report(asyncio.run(bench_batch_routing()))
@@ -0,0 +1,104 @@
+"""
+Benchmark for large-artifact CAS reads.
+
+Compares FileCAS.get (read whole file into bytes) against get_view/iter_chunks
+(memory-mapped, zero-copy) for hashing a large artifact. Each variant runs in a
+fresh process so peak RSS is measured in isolation. Note that pages of a
+mapped file count toward RSS once touched, so get_view alone wins on latency
+(no heap allocation or copy) while iter_chunks also bounds resident memory.
+"""
+
+import sys
+from pathlib import Path
+import hashlib
+import multiprocessing
+import resource
+import tempfile
+import time
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cas_core import FileCAS
+
+ARTIFACT_MB = 256
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _hash_variant(args):
+    base_path, content_hash, variant = args
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from cas_core import FileCAS
+
+    store = FileCAS(Path(base_path))
+    baseline_rss = _rss_mb()
+
+    start = time.perf_counter()
+    if variant == "get":
+        digest = hashlib.sha256(store.get(content_hash)).hexdigest()
+    elif variant == "get_view":
+        digest = hashlib.sha256(store.get_view(content_hash)).hexdigest()
+    else:
+        hasher = hashlib.sha256()
+        for chunk in store.iter_chunks(content_hash):
+            hasher.update(chunk)
+        digest = hasher.hexdigest()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    assert digest == content_hash
+    return elapsed_ms, _rss_mb() - baseline_rss
+
+
+def bench_large_artifact_read(size_mb: int = ARTIFACT_MB) -> dict:
+    """
+    Hash a large artifact through each read API.
+
+    Args:
+        size_mb: Artifact size in MiB
+
+    Returns:
+        Dict of variant -> (latency_ms, peak_rss_growth_mb)
+    """
+    ctx = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = FileCAS(Path(tmpdir))
+        block = bytes(range(256)) * 4096  # 1 MiB
+        with tempfile.TemporaryFile() as src:
+            for _ in range(size_mb):
+                src.write(block)
+            src.seek(0)
+            content_hash = store.put_stream(src)
+
+        results = {}
+        for variant in ("get", "get_view", "iter_chunks"):
+            with ctx.Pool(1) as pool:
+                results[variant] = pool.apply(_hash_variant, ((tmpdir, content_hash, variant),))
+
+    return results
+
+
+def test_mmap_read_benchmark():
+    """
+    Report latency and peak RSS for each read API.
+
+    get() allocates the full artifact; iter_chunks() releases mapped pages as
+    it goes and should stay near one chunk of resident memory.
+    """
+    results = bench_large_artifact_read(64)
+
+    print()
+    for variant, (latency_ms, rss_mb) in results.items():
+        print(f"{variant:>12}: {latency_ms:8.1f} ms, peak RSS +{rss_mb:7.1f} MiB")
+
+    assert results["iter_chunks"][1] < results["get"][1]
+
+
+if __name__ == "__main__":
+    for variant, (latency_ms, rss_mb) in bench_large_artifact_read().items():
+        print(f"{variant:>12}: {latency_ms:8.1f} ms, peak RSS +{rss_mb:7.1f} MiB")
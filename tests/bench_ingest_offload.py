@@ -0,0 +1,180 @@
+"""
+Benchmark for offloading ingest checks from the event loop.
+
+Runs the subscriber loop (decode, validate_envelope, INGRESS gate, delivery)
+with the checks inline on the loop, on a thread pool and on a process pool,
+and reports throughput alongside the worst event-loop stall seen by a 1ms
+ticker running next to the subscriber. Process pools scale throughput with
+cores; on any core count they keep the loop responsive. The audit log is
+stubbed out so only validation and policy evaluation are measured.
+"""
+
+import sys
+from pathlib import Path
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from nacl.signing import SigningKey
+
+MODES = (("inline", 1), ("thread", 4), ("process", os.cpu_count() or 1))
+BATCH_SIZE = 128
+
+
+class _Msg:
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def ack(self):
+        pass
+
+    async def term(self):
+        pass
+
+
+class _Sub:
+    """Serves the given messages, then reports the connection closed"""
+
+    def __init__(self, msgs):
+        self.msgs = list(reversed(msgs))
+
+    async def next_msg(self, timeout=None):
+        from nats.errors import ConnectionClosedError, TimeoutError as NATSTimeoutError
+
+        await asyncio.sleep(0)  # let other tasks run, as a network read would
+        if self.msgs:
+            return self.msgs.pop()
+        if timeout is None:
+            raise ConnectionClosedError
+        raise NATSTimeoutError
+
+
+def _make_payloads(count: int) -> list:
+    sk = SigningKey.generate()
+    os.environ["SWARM_SIGNING_SK_B64"] = base64.b64encode(bytes(sk)).decode()
+    os.environ["SWARM_VERIFY_PK_B64"] = base64.b64encode(bytes(sk.verify_key)).decode()
+
+    from envelope import make_envelope, sign_envelope
+
+    return [
+        json.dumps(
+            sign_envelope(
+                make_envelope(
+                    kind="NEED",
+                    thread_id="bench",
+                    sender_pk_b64="pk",
+                    payload={"task_type": "classify", "n": i},
+                )
+            )
+        ).encode()
+        for i in range(count)
+    ]
+
+
+async def _ingest(mode: str, workers: int, payloads: list) -> tuple[float, float]:
+    """Ingest payloads in one mode; returns (elapsed seconds, max loop stall seconds)"""
+    import bus
+    from nats.errors import ConnectionClosedError
+
+    async def handler(env):
+        pass
+
+    executor = bus.get_ingest_executor(mode, workers)
+    if executor is not None:
+        # Start the workers before timing
+        await asyncio.get_running_loop().run_in_executor(executor, bus._check_batch, payloads[:1])
+
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        loop = asyncio.get_running_loop()
+        while not done:
+            before = loop.time()
+            await asyncio.sleep(0.001)
+            stall = max(stall, loop.time() - before - 0.001)
+
+    sub = _Sub([_Msg(p) for p in payloads])
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    if executor is None:
+        while True:
+            try:
+                msgs = await bus._next_batch(sub, BATCH_SIZE, 0.001)
+            except ConnectionClosedError:
+                break
+            await bus._ingest_batch("bench", "thread.bench.need", msgs, handler)
+    else:
+        await bus._offloaded_ingest(
+            "bench", "thread.bench.need", sub, handler, executor, BATCH_SIZE, 0.001, 4
+        )
+    elapsed = time.perf_counter() - start
+    done = True
+    await tick
+
+    return elapsed, stall
+
+
+def bench_offload(num_messages: int = 2048) -> dict:
+    """
+    Ingest the same messages in each execution mode.
+
+    Args:
+        num_messages: Messages per run
+
+    Returns:
+        Dict of mode label -> (messages per second, max loop stall in ms)
+    """
+    import bus
+    from policy.capsule import CapsuleManager
+    from policy.gates import GateEnforcer
+
+    payloads = _make_payloads(num_messages)
+
+    results = {}
+    logging.disable(logging.WARNING)  # per-message rejection warnings
+    with patch.object(bus, "log_event"):
+        for mode, workers in MODES:
+            # Fresh enforcer per run so no decisions carry over
+            bus._gate_enforcer = GateEnforcer(capsule_manager=CapsuleManager())
+            elapsed, stall = asyncio.run(_ingest(mode, workers, payloads))
+            results[f"{mode}x{workers}"] = (num_messages / elapsed, stall * 1000)
+    bus.shutdown_ingest_executors()
+    bus._gate_enforcer = None
+    logging.disable(logging.NOTSET)
+
+    return results
+
+
+def test_ingest_offload():
+    """
+    Report throughput and loop stalls per execution mode.
+
+    Inline checks hold the loop for a whole batch; a process pool keeps
+    the worst stall well below that.
+    """
+    results = bench_offload(512)
+
+    print()
+    for label, (rate, stall_ms) in results.items():
+        print(f"{label:>10}: {rate:10.0f} msg/sec, max loop stall {stall_ms:6.2f} ms")
+
+    inline_stall = results["inlinex1"][1]
+    process_stall = results[f"processx{MODES[2][1]}"][1]
+    assert process_stall < inline_stall
+
+
+if __name__ == "__main__":
+    for label, (rate, stall_ms) in bench_offload().items():
+        print(f"{label:>10}: {rate:10.0f} msg/sec, max loop stall {stall_ms:6.2f} ms")
@@ -0,0 +1,123 @@
+"""
+Benchmark for metered policy evaluation.
+
+Measures the compiled base.rego unmetered against the metered plan (gas
+charged per instruction), and how quickly a policy that would scan a large
+input stops once it runs out of gas.
+"""
+
+import sys
+from pathlib import Path
+import time
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from policy.gas_meter import GasExceededError, GasMeter
+from policy.opa_engine import DEFAULT_POLICY_PATH
+from policy.rego_compiler import compile_policy, load_policy
+
+ENVELOPES = [
+    {"kind": "NEED", "thread_id": "t", "lamport": 1, "actor_id": "a", "payload_size": 100},
+    {"kind": "DECIDE", "thread_id": "t", "lamport": 2, "actor_id": "b", "payload_size": 0},
+    {"kind": "BOGUS", "thread_id": "t", "lamport": 3, "actor_id": "c", "payload_size": 100},
+    {"kind": "NEED", "thread_id": "t", "lamport": 4, "payload_size": 5_000_000},
+]
+
+RULES = ("allow", "deny_reason", "policy_version")
+
+SCAN_POLICY = """
+package bench
+
+allow {
+    input.needle in input.haystack
+}
+"""
+
+
+def bench_overhead(iterations: int = 20000) -> dict:
+    """
+    Time base.rego evaluation with and without metering.
+
+    Args:
+        iterations: Evaluations per mode (spread over ENVELOPES)
+
+    Returns:
+        Dict with microseconds per evaluation and metering overhead in percent
+    """
+    policy = load_policy(DEFAULT_POLICY_PATH / "base.rego")
+    inputs = [ENVELOPES[i % len(ENVELOPES)] for i in range(iterations)]
+
+    def run(metered: bool) -> float:
+        start = time.perf_counter()
+        for envelope in inputs:
+            policy.evaluate(envelope, RULES, GasMeter() if metered else None)
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    # Keep the best of several rounds to damp noise
+    unmetered = min(run(False) for _ in range(3))
+    metered = min(run(True) for _ in range(3))
+
+    return {
+        "unmetered_us": unmetered,
+        "metered_us": metered,
+        "overhead_pct": (metered / unmetered - 1) * 100,
+    }
+
+
+def bench_fail_fast(haystack_size: int = 1_000_000, gas_limit: int = 100000) -> dict:
+    """
+    Time a policy that scans a large input, unmetered vs. over budget.
+
+    Args:
+        haystack_size: Items the policy would scan
+        gas_limit: Budget for the metered run
+
+    Returns:
+        Dict with milliseconds for the full scan and for the aborted run
+    """
+    policy = compile_policy(SCAN_POLICY)
+    doc = {"needle": -1, "haystack": list(range(haystack_size))}
+
+    start = time.perf_counter()
+    policy.evaluate(doc, ["allow"])
+    full = time.perf_counter() - start
+
+    meter = GasMeter(gas_limit=gas_limit)
+    start = time.perf_counter()
+    try:
+        policy.evaluate(doc, ["allow"], meter)
+    except GasExceededError:
+        pass
+    aborted = time.perf_counter() - start
+
+    return {"full_ms": full * 1000, "aborted_ms": aborted * 1000, "gas_charged": meter.used}
+
+
+def test_metering_overhead():
+    """
+    Report metering overhead and fail-fast timing.
+
+    The metered plan adds an inline counter and limit check per
+    instruction (about 15% on base.rego, whose instructions are cheap), and
+    a scan that cannot fit its budget should stop long before completing.
+    """
+    overhead = bench_overhead(8000)
+    fail_fast = bench_fail_fast()
+
+    print()
+    print(f"  unmetered: {overhead['unmetered_us']:8.1f} us/eval")
+    print(f"    metered: {overhead['metered_us']:8.1f} us/eval")
+    print(f"   overhead: {overhead['overhead_pct']:8.1f} %")
+    print(f"  full scan: {fail_fast['full_ms']:8.2f} ms")
+    print(f"    aborted: {fail_fast['aborted_ms']:8.3f} ms")
+
+    assert overhead["overhead_pct"] < 50
+    assert fail_fast["aborted_ms"] * 10 < fail_fast["full_ms"]
+
+
+if __name__ == "__main__":
+    for key, value in bench_overhead().items():
+        print(f"{key:>14}: {value:10.2f}")
+    for key, value in bench_fail_fast().items():
+        print(f"{key:>14}: {value:10.2f}")
@@ -0,0 +1,88 @@
+"""
+Benchmark for pipelined publishing.
+
+Publishes the same messages one round trip at a time through publish_raw and
+as pipelined batches through publish_raw_many, against a local nats-server.
+The audit log is stubbed out so only the bus is measured. Skipped if
+nats-server is not installed.
+"""
+
+import sys
+from pathlib import Path
+import asyncio
+import time
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+BATCH_SIZES = (16, 128)
+
+
+async def _publish(num_messages: int, batch_size: int) -> float:
+    """Publish num_messages; returns elapsed seconds"""
+    import bus
+
+    messages = [("thread.bench.propose", {"kind": "PROPOSE", "n": i}) for i in range(num_messages)]
+
+    # Connect and create the stream before timing
+    await bus.publish_raw("bench", "thread.bench.warmup", {"kind": "NEED"})
+
+    start = time.perf_counter()
+    if batch_size is None:
+        for subject, message in messages:
+            await bus.publish_raw("bench", subject, message)
+    else:
+        for i in range(0, num_messages, batch_size):
+            await bus.publish_raw_many("bench", messages[i : i + batch_size])
+    elapsed = time.perf_counter() - start
+
+    await bus._connection_pool.close_all()
+    return elapsed
+
+
+def bench_publish(nats_url: str, num_messages: int = 2048) -> dict:
+    """
+    Publish the same messages sequentially and at each batch size.
+
+    Args:
+        nats_url: Server to publish to
+        num_messages: Messages per run
+
+    Returns:
+        Dict of label -> messages per second
+    """
+    import bus
+
+    results = {}
+    with patch.object(bus, "NATS_URL", nats_url), patch.object(bus, "log_event"):
+        for batch_size in (None,) + BATCH_SIZES:
+            with patch.object(bus, "_connection_pool", bus.ConnectionPool()):
+                elapsed = asyncio.run(_publish(num_messages, batch_size))
+            label = "sequential" if batch_size is None else f"batch={batch_size}"
+            results[label] = num_messages / elapsed
+
+    return results
+
+
+def test_publish_throughput(nats_server):
+    """
+    Report publish throughput per batch size.
+
+    Pipelining pays one round trip per batch instead of one per message,
+    so batch=128 should be several times faster than sequential publishes.
+    """
+    results = bench_publish(nats_server, 1024)
+
+    print()
+    for label, rate in results.items():
+        print(f"{label:>12}: {rate:10.0f} msg/sec")
+
+    assert results["batch=128"] > results["sequential"] * 2
+
+
+if __name__ == "__main__":
+    for label, rate in bench_publish(
+        sys.argv[1] if len(sys.argv) > 1 else "nats://127.0.0.1:4222"
+    ).items():
+        print(f"{label:>12}: {rate:10.0f} msg/sec")
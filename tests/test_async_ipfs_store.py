@@ -0,0 +1,333 @@
+"""
+Tests for the async, connection-pooled IPFS content store.
+
+Runs against a local stub HTTP server standing in for the IPFS daemon API.
+
+Tests:
+- put/get roundtrip and missing-CID handling
+- Concurrent get_many/put_many over a bounded keep-alive pool
+- Per-request timeouts and the circuit breaker
+- Migration tool built on the async store
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Add src and tools to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+import pytest
+from cas.async_ipfs_store import AsyncIPFSContentStore
+from cas.chunking import ContentDefinedChunker
+from cas_core import FileCAS, sha256_hash
+from migrate_to_ipfs import IPFSMigration
+
+SLOW_CID = "bafkslow"
+SLOW_PAYLOAD = b"slow to add"
+
+
+class _StubIPFSHandler(BaseHTTPRequestHandler):
+    """Minimal subset of the IPFS HTTP API (id, add, cat, block/stat, pin/add)"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, message: str):
+        self._reply(500, json.dumps({"Message": message, "Code": 0}).encode())
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        args = parse_qs(url.query)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        blobs = self.server.blobs
+
+        if url.path == "/api/v0/id":
+            self._reply(200, b'{"ID": "12D3KooWStub"}')
+        elif url.path == "/api/v0/add":
+            boundary = self.headers["Content-Type"].split("boundary=")[1].encode()
+            part = body.split(b"--" + boundary)[1]
+            data = part.split(b"\r\n\r\n", 1)[1][: -len(b"\r\n")]
+            if data == SLOW_PAYLOAD:
+                time.sleep(1.0)
+            cid = "bafk" + hashlib.sha256(data).hexdigest()
+            blobs[cid] = data
+            self.server.add_params.append(args)
+            self._reply(200, json.dumps({"Name": "file", "Hash": cid}).encode() + b"\n")
+        elif url.path == "/api/v0/cat":
+            cid = args["arg"][0]
+            if cid == SLOW_CID:
+                time.sleep(1.0)
+            if cid in blobs:
+                self._reply(200, blobs[cid])
+            else:
+                self._error(f"block was not found locally (offline): {cid}")
+        elif url.path == "/api/v0/block/stat":
+            cid = args["arg"][0]
+            if cid in blobs:
+                self._reply(200, json.dumps({"Key": cid, "Size": len(blobs[cid])}).encode())
+            else:
+                self._error("block not found")
+        elif url.path == "/api/v0/pin/add":
+            self._reply(200, json.dumps({"Pins": args["arg"]}).encode())
+        else:
+            self._error(f"unknown endpoint {url.path}")
+
+
+@pytest.fixture
+def stub_daemon():
+    """Run the stub IPFS API on an ephemeral local port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubIPFSHandler)
+    server.daemon_threads = True
+    server.blobs = {}
+    server.add_params = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _store(server, **kwargs) -> AsyncIPFSContentStore:
+    host, port = server.server_address
+    return AsyncIPFSContentStore(host, port, **kwargs)
+
+
+class TestAsyncIPFSContentStore:
+    """Test single-request operations"""
+
+    @pytest.mark.asyncio
+    async def test_put_get_roundtrip(self, stub_daemon):
+        """Content put through the store comes back byte-for-byte"""
+        store = _store(stub_daemon)
+        assert await store.connect() == "12D3KooWStub"
+
+        data = b"\x00binary\r\n--payload\xff" * 100
+        cid = await store.put(data)
+
+        assert await store.get(cid) == data
+        assert await store.exists(cid)
+        assert stub_daemon.add_params[0]["pin"] == ["true"]
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_chunker_forwarded(self, stub_daemon):
+        """Configured chunker is passed to the daemon on add"""
+        store = _store(stub_daemon, chunker="buzhash")
+        await store.put(b"chunk me")
+
+        assert stub_daemon.add_params[0]["chunker"] == ["buzhash"]
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_missing_cid_raises_keyerror(self, stub_daemon):
+        """Unresolvable CIDs raise KeyError and do not trip the breaker"""
+        store = _store(stub_daemon)
+
+        for _ in range(5):
+            with pytest.raises(KeyError):
+                await store.get("bafkmissing")
+        assert not await store.exists("bafkmissing")
+        assert not store._circuit_breaker_open
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_connect_fails_without_daemon(self):
+        """connect() raises ConnectionError when nothing is listening"""
+        store = AsyncIPFSContentStore("127.0.0.1", 1, timeout=1.0)
+        with pytest.raises(ConnectionError):
+            await store.connect()
+
+    @pytest.mark.asyncio
+    async def test_timeout_opens_circuit(self, stub_daemon):
+        """Per-request timeouts count toward the circuit breaker"""
+        stub_daemon.blobs[SLOW_CID] = b"eventually"
+        store = _store(stub_daemon)
+
+        for _ in range(3):
+            with pytest.raises(RuntimeError, match="timeout"):
+                await store.get(SLOW_CID, timeout=0.1)
+
+        assert store._circuit_breaker_open
+        with pytest.raises(RuntimeError, match="Circuit breaker open"):
+            await store.get(SLOW_CID)
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_put_timeout(self, stub_daemon):
+        """A timed-out put is reported as a RuntimeError and counted as a failure"""
+        store = _store(stub_daemon, timeout=0.1)
+
+        with pytest.raises(RuntimeError, match="timeout"):
+            await store.put(SLOW_PAYLOAD)
+        assert store._failure_count == 1
+
+        results = await store.put_many([b"fast", SLOW_PAYLOAD], return_exceptions=True)
+        assert results[0].startswith("bafk")
+        assert isinstance(results[1], RuntimeError)
+        await store.close()
+
+
+class TestBatchOperations:
+    """Test concurrent batch APIs over the connection pool"""
+
+    @pytest.mark.asyncio
+    async def test_put_many_get_many(self, stub_daemon):
+        """Batches preserve order and map every CID to its content"""
+        store = _store(stub_daemon, max_connections=4)
+        blobs = [f"blob {i}".encode() for i in range(50)]
+
+        cids = await store.put_many(blobs)
+        fetched = await store.get_many(cids)
+
+        assert len(cids) == 50
+        assert [fetched[cid] for cid in cids] == blobs
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_connections_reused(self, stub_daemon):
+        """Keep-alive pool never opens more than max_connections sockets"""
+        store = _store(stub_daemon, max_connections=4)
+
+        cids = await store.put_many([f"blob {i}".encode() for i in range(40)])
+        await store.get_many(cids)
+
+        assert store.connections_opened <= 4
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_get_many_return_exceptions(self, stub_daemon):
+        """Per-CID failures are returned instead of failing the batch"""
+        store = _store(stub_daemon)
+        cid = await store.put(b"present")
+
+        results = await store.get_many([cid, "bafkmissing"], return_exceptions=True)
+
+        assert results[cid] == b"present"
+        assert isinstance(results["bafkmissing"], KeyError)
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_requests_run_concurrently(self, stub_daemon):
+        """Slow requests overlap rather than running back to back"""
+        stub_daemon.blobs[SLOW_CID] = b"slow"
+        store = _store(stub_daemon, max_connections=4)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(store.get(SLOW_CID) for _ in range(4)))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 2.5
+        await store.close()
+
+    def test_store_built_outside_loop(self, stub_daemon):
+        """A store built before its loop runs handles contended requests on it"""
+        store = _store(stub_daemon, max_connections=4)
+        assert store._pool._semaphore is None
+
+        async def roundtrip():
+            blobs = [f"blob {i}".encode() for i in range(40)]
+            cids = await store.put_many(blobs)
+            fetched = await store.get_many(cids)
+            await store.close()
+            return [fetched[cid] for cid in cids] == blobs
+
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(roundtrip())
+        finally:
+            loop.close()
+
+
+class TestMigrationOnAsyncStore:
+    """Test the migration tool against the stub daemon"""
+
+    def test_migrate_and_verify(self, stub_daemon, tmp_path):
+        """All FileCAS artifacts are uploaded, mapped and verified"""
+        cas_dir = tmp_path / ".cas"
+        file_cas = FileCAS(cas_dir)
+        hashes = [file_cas.put(f"artifact {i}".encode()) for i in range(20)]
+
+        host, port = stub_daemon.server_address
+        tool = IPFSMigration(host, port, max_concurrency=4, batch_size=8)
+        try:
+            mappings = tool.migrate_to_ipfs(cas_dir)
+            assert set(mappings) == set(hashes)
+
+            mapping_file = tmp_path / "mapping.json"
+            tool.create_mapping_file(mappings, mapping_file)
+            assert tool.verify_migration(mapping_file, cas_dir) == (20, 0)
+
+            assert tool.ipfs_store.get(mappings[hashes[0]]) == b"artifact 0"
+        finally:
+            tool.close()
+
+    def test_chunked_artifacts_migrated_whole(self, stub_daemon, tmp_path):
+        """Chunked artifacts are uploaded reassembled, alongside their chunk blobs"""
+        cas_dir = tmp_path / ".cas"
+        chunker = ContentDefinedChunker(min_size=1024, avg_size=4096, max_size=16384)
+        data = random.Random(1).randbytes(50_000)
+        content_hash = FileCAS(cas_dir, chunker=chunker).put(data)
+
+        host, port = stub_daemon.server_address
+        tool = IPFSMigration(host, port)
+        try:
+            mappings = tool.migrate_to_ipfs(cas_dir)
+            assert tool.ipfs_store.get(mappings[content_hash]) == data
+        finally:
+            tool.close()
+
+    def test_standalone_blob_matching_a_chunk(self, stub_daemon, tmp_path):
+        """A put whose bytes equal a chunk of another artifact is still migrated"""
+        cas_dir = tmp_path / ".cas"
+        chunker = ContentDefinedChunker(min_size=1024, avg_size=4096, max_size=16384)
+        file_cas = FileCAS(cas_dir, chunker=chunker)
+        data = random.Random(2).randbytes(50_000)
+        big_hash = file_cas.put(data)
+        first_chunk = chunker.split(memoryview(data))[0]
+        small_hash = FileCAS(cas_dir).put(bytes(first_chunk))
+        assert file_cas.exists(small_hash)
+
+        host, port = stub_daemon.server_address
+        tool = IPFSMigration(host, port)
+        try:
+            assert small_hash in {h for h, _ in tool.scan_file_cas(cas_dir)}
+
+            mappings = tool.migrate_to_ipfs(cas_dir)
+            assert tool.ipfs_store.get(mappings[small_hash]) == bytes(first_chunk)
+            assert tool.ipfs_store.get(mappings[big_hash]) == data
+        finally:
+            tool.close()
+
+    def test_verify_reports_missing_content(self, stub_daemon, tmp_path):
+        """Mappings to unknown CIDs are counted as errors"""
+        host, port = stub_daemon.server_address
+        tool = IPFSMigration(host, port)
+        try:
+            mapping_file = tmp_path / "mapping.json"
+            tool.create_mapping_file({sha256_hash(b"lost"): "bafkmissing"}, mapping_file)
+            assert tool.verify_migration(mapping_file) == (0, 1)
+        finally:
+            tool.close()
+
+    def test_unreachable_daemon(self):
+        """Tool construction fails fast when the daemon is down"""
+        with pytest.raises(ConnectionError):
+            IPFSMigration("127.0.0.1", 1, timeout=1.0)
@@ -8,10 +8,12 @@ import pytest
 import sys
 from pathlib import Path
 
+import numpy as np
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from routing.bandit import get_bandit, reset_bandit
+from routing.bandit import ContextualBandit, get_bandit, reset_bandit
 from routing.features import (
     get_feature_extractor,
     reset_feature_extractor,
@@ -24,7 +26,6 @@ from routing.feedback import (
     reset_feedback_collector,
 )
 
-
 # Test Fixtures
 
 
@@ -390,5 +391,158 @@ class TestBanditIntegration:
         assert best == "agent-a"
 
 
+# Vectorized and Linear Model Tests
+
+
+def one_hot(i, dim=10):
+    context = [0.0] * dim
+    context[i] = 1.0
+    return context
+
+
+class TestVectorizedSelection:
+    """Tests for array-backed arm selection"""
+
+    def test_candidates_restrict_selection(self, bandit):
+        """Only candidate arms are selected"""
+        for _ in range(10):
+            bandit.update("agent-a", reward=0.9)
+
+        for policy in ("thompson", "ucb1", "linucb", "linear_thompson"):
+            for _ in range(20):
+                selected = bandit.select(one_hot(0), ["agent-b", "agent-c"], policy=policy)
+                assert selected in ("agent-b", "agent-c")
+
+    def test_unknown_candidates_added(self, bandit):
+        """Unknown candidates become arms"""
+        assert bandit.thompson_sampling(candidates=["agent-new"]) == "agent-new"
+        assert "agent-new" in bandit.arms
+
+    def test_unknown_policy(self, bandit):
+        """Unknown policies are rejected"""
+        with pytest.raises(ValueError):
+            bandit.select(policy="epsilon_greedy")
+
+    def test_arrays_grow_with_arms(self):
+        """Arm arrays grow past their initial capacity"""
+        bandit = ContextualBandit()
+        for i in range(100):
+            bandit.update(f"agent-{i}", reward=0.9 if i == 42 else 0.1, context=one_hot(i % 10))
+
+        assert len(bandit.arm_ids) == 100
+        assert bandit.ucb1(exploration_bonus=0.0) == "agent-42"
+
+    def test_empty_bandit(self):
+        """Every policy returns None without arms"""
+        bandit = ContextualBandit()
+        for policy in ("thompson", "ucb1", "linucb", "linear_thompson"):
+            assert bandit.select(one_hot(0), policy=policy) is None
+
+
+class TestLinearModels:
+    """Tests for LinUCB and linear Thompson Sampling"""
+
+    def test_sherman_morrison_matches_inverse(self):
+        """Incremental inverse equals the directly computed one"""
+        rng = np.random.default_rng(0)
+        bandit = ContextualBandit(arms=["a"], ridge=0.5)
+        contexts = rng.random((30, 10))
+        rewards = rng.random(30)
+
+        for x, r in zip(contexts, rewards):
+            bandit.update("a", reward=float(r), context=list(x))
+
+        expected = np.linalg.inv(0.5 * np.eye(10) + contexts.T @ contexts)
+        np.testing.assert_allclose(bandit._a_inv[0], expected, atol=1e-8)
+        np.testing.assert_allclose(bandit._b[0], rewards @ contexts)
+
+    def test_linucb_uses_context(self):
+        """LinUCB learns which arm is best for each context"""
+        bandit = ContextualBandit(arms=["a", "b"])
+        for _ in range(30):
+            bandit.update("a", reward=0.9, context=one_hot(0))
+            bandit.update("a", reward=0.1, context=one_hot(1))
+            bandit.update("b", reward=0.2, context=one_hot(0))
+            bandit.update("b", reward=0.8, context=one_hot(1))
+
+        assert bandit.linucb(one_hot(0)) == "a"
+        assert bandit.linucb(one_hot(1)) == "b"
+
+    def test_linear_thompson_uses_context(self):
+        """Linear Thompson Sampling favours the best arm per context"""
+        np.random.seed(1)
+        bandit = ContextualBandit(arms=["a", "b"])
+        for _ in range(30):
+            bandit.update("a", reward=0.9, context=one_hot(0))
+            bandit.update("b", reward=0.8, context=one_hot(1))
+
+        picks = [bandit.linear_thompson_sampling(one_hot(1)) for _ in range(100)]
+        assert picks.count("b") > 90
+
+    def test_no_context_falls_back(self, bandit):
+        """Without a context the linear policies use the Beta/UCB1 models"""
+        assert bandit.linucb(None) in bandit.arms
+        assert bandit.linear_thompson_sampling(None) in bandit.arms
+
+    def test_context_dimension_checked(self, bandit):
+        """A wrongly sized context is rejected before any update"""
+        with pytest.raises(ValueError):
+            bandit.update("agent-a", reward=0.9, context=[1.0, 2.0])
+
+        assert bandit.total_pulls == 0
+        assert bandit.arms["agent-a"].pulls == 0
+
+
+class TestBatchedUpdates:
+    """Tests for batched bandit updates"""
+
+    def test_batch_matches_sequential(self):
+        """update_batch gives the same state as per-observation updates"""
+        rng = np.random.default_rng(2)
+        agent_ids = [f"agent-{i}" for i in rng.integers(0, 5, 50)]
+        rewards = [float(r) for r in rng.random(50)]
+        contexts = [list(x) if i % 3 else None for i, x in enumerate(rng.random((50, 10)))]
+
+        sequential = ContextualBandit()
+        for agent_id, reward, context in zip(agent_ids, rewards, contexts):
+            sequential.update(agent_id, reward=reward, context=context)
+
+        batched = ContextualBandit()
+        batched.update_batch(agent_ids, rewards, contexts)
+
+        assert batched.get_stats() == sequential.get_stats()
+        for agent_id in sequential.arms:
+            row_s, row_b = sequential.rows[agent_id], batched.rows[agent_id]
+            np.testing.assert_allclose(batched._a_inv[row_b], sequential._a_inv[row_s])
+            np.testing.assert_allclose(batched._b[row_b], sequential._b[row_s])
+
+    def test_batch_length_mismatch(self, bandit):
+        """Mismatched batch lengths are rejected"""
+        with pytest.raises(ValueError):
+            bandit.update_batch(["agent-a"], [0.5, 0.6])
+
+    def test_feedback_collector_updates_bandit(self, bandit, feedback_collector):
+        """FeedbackCollector sends only new feedback, in one batch"""
+        for i in range(4):
+            feedback_collector.record_feedback(
+                task_id=f"task-{i}",
+                agent_id="agent-a" if i % 2 else "agent-b",
+                reward=0.9,
+                task_result={"quality_score": 0.9},
+                context=one_hot(i),
+            )
+
+        assert feedback_collector.update_bandit(bandit) == 4
+        assert feedback_collector.update_bandit(bandit) == 0
+        assert bandit.total_pulls == 4
+        assert bandit.arms["agent-a"].successes == 2
+
+        feedback_collector.record_feedback(
+            task_id="task-4", agent_id="agent-c", reward=0.1, task_result={}
+        )
+        assert feedback_collector.update_bandit(bandit) == 1
+        assert bandit.arms["agent-c"].failures == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
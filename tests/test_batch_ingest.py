@@ -0,0 +1,478 @@
+"""
+Tests for batched envelope ingest.
+
+Tests:
+- validate_envelopes agrees with validate_envelope
+- Batch policy evaluation agrees with per-envelope evaluation
+- GateEnforcer.ingress_validate_batch caching and in-batch dedup
+- Subscriber micro-batching: ack/term per message, handler order
+- Offloaded ingest: thread/process pools, per-subscription delivery order
+- Concurrent delivery: ack after each handler completes
+"""
+
+import sys
+import os
+import asyncio
+import base64
+import json
+import threading
+import time
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from nacl.signing import SigningKey
+
+
+@pytest.fixture(scope="module", autouse=True)
+def signing_keys():
+    """Generate signing keys for envelopes in this module"""
+    sk = SigningKey.generate()
+    saved = {k: os.environ.get(k) for k in ("SWARM_SIGNING_SK_B64", "SWARM_VERIFY_PK_B64")}
+    os.environ["SWARM_SIGNING_SK_B64"] = base64.b64encode(bytes(sk)).decode()
+    os.environ["SWARM_VERIFY_PK_B64"] = base64.b64encode(bytes(sk.verify_key)).decode()
+    yield
+    for key, value in saved.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+
+import bus
+from envelope import make_envelope, sign_envelope
+from policy import PolicyError, validate_envelope, validate_envelopes
+from policy.capsule import CapsuleManager, init_capsule_manager
+from policy.gates import GateEnforcer
+from policy.opa_engine import BasePolicyEngine, OPAEngine
+from policy.wasm_runtime import WASMRuntime
+from verbs import VerbDispatcher
+
+
+def _signed(kind="NEED", **payload):
+    return sign_envelope(
+        make_envelope(kind=kind, thread_id="t1", sender_pk_b64="pk", payload=payload or {"n": 0})
+    )
+
+
+def _mixed_envelopes():
+    good = [_signed(n=i) for i in range(3)]
+
+    tampered = _signed(n=99)
+    tampered["payload"] = {"n": 100}
+
+    wrong_hash = _signed(n=5)
+    wrong_hash["policy_engine_hash"] = "0" * 64
+
+    return good + [
+        _signed(kind="BOGUS"),
+        _signed(blob="x" * 70_000),
+        tampered,
+        wrong_hash,
+        {"kind": "NEED"},
+    ]
+
+
+OPEN_POLICY = """
+package swarm.open
+
+default allow = true
+"""
+
+POLICY_INPUTS = [
+    {"kind": "NEED", "thread_id": "t", "lamport": 1, "actor_id": "a", "payload_size": 10},
+    {"kind": "BOGUS", "thread_id": "t", "lamport": 1, "actor_id": "a", "payload_size": 10},
+    {"kind": "NEED", "thread_id": "t", "lamport": 1, "actor_id": "a", "payload_size": 2_000_000},
+    {"kind": "NEED"},
+    {"operation": "NEED", "payload": {}},
+]
+
+
+class TestBatchValidation:
+    """Test batch rule-book and policy evaluation"""
+
+    def test_validate_envelopes_matches_single(self):
+        envelopes = _mixed_envelopes()
+
+        expected = []
+        for env in envelopes:
+            try:
+                validate_envelope(env)
+                expected.append(None)
+            except PolicyError as e:
+                expected.append(str(e))
+
+        results = validate_envelopes(envelopes)
+        assert [None if r is None else str(r) for r in results] == expected
+        assert results[:3] == [None, None, None]
+
+    @pytest.mark.parametrize("engine_cls", [BasePolicyEngine, OPAEngine])
+    def test_engine_batch_matches_single(self, engine_cls):
+        engine = engine_cls()
+        assert engine.evaluate_batch(POLICY_INPUTS) == [engine.evaluate(i) for i in POLICY_INPUTS]
+
+    def test_wasm_batch_gas_matches_single(self):
+        runtime = WASMRuntime()
+        assert runtime.evaluate_batch(POLICY_INPUTS) == [runtime.evaluate(i) for i in POLICY_INPUTS]
+
+    def test_wasm_batch_gas_limit(self):
+        """Inputs over the gas limit report the same error as evaluate()"""
+        runtime = WASMRuntime(gas_limit=30)
+        batch = runtime.evaluate_batch(POLICY_INPUTS)
+
+        assert batch == [runtime.evaluate(i) for i in POLICY_INPUTS]
+        assert any("Gas limit exceeded" in r.reasons[0] for r in batch)
+
+
+class TestIngressBatch:
+    """Test GateEnforcer.ingress_validate_batch"""
+
+    @pytest.fixture
+    def enforcer(self):
+        return GateEnforcer(capsule_manager=CapsuleManager())
+
+    def test_matches_single(self, enforcer):
+        envelopes = _mixed_envelopes()
+        single = GateEnforcer(enable_cache=False, capsule_manager=CapsuleManager())
+
+        assert enforcer.ingress_validate_batch(envelopes) == [
+            single.ingress_validate(env) for env in envelopes
+        ]
+
+    def test_duplicates_evaluated_once(self, enforcer):
+        env = _signed(n=1)
+        other = _signed(n=2)
+
+        with patch.object(
+            enforcer.wasm_runtime,
+            "evaluate_batch",
+            wraps=enforcer.wasm_runtime.evaluate_batch,
+        ) as mock_batch:
+            decisions = enforcer.ingress_validate_batch([env, dict(env), other, env])
+            assert len(mock_batch.call_args[0][0]) == 2
+
+            # Second delivery is served entirely from the cache
+            enforcer.ingress_validate_batch([env, other])
+            assert mock_batch.call_count == 1
+
+        assert decisions[0] == decisions[1] == decisions[3]
+        assert decisions[0] is not decisions[1]
+
+    def test_batch_failure_falls_back_to_single(self, enforcer):
+        envelopes = [_signed(n=i) for i in range(3)]
+
+        with patch.object(enforcer.wasm_runtime, "evaluate_batch", side_effect=Exception("boom")):
+            decisions = enforcer.ingress_validate_batch(envelopes)
+
+        assert decisions == [enforcer.ingress_validate(env) for env in envelopes]
+
+
+class FakeMsg:
+    """Stand-in for a JetStream message"""
+
+    def __init__(self, data: bytes, outcomes: list):
+        self.data = data
+        self._outcomes = outcomes
+
+    async def ack(self):
+        self._outcomes.append(("ack", self.data))
+
+    async def term(self):
+        self._outcomes.append(("term", self.data))
+
+    async def nak(self):
+        self._outcomes.append(("nak", self.data))
+
+
+class FakeSub:
+    """Subscription whose next_msg serves queued messages, then times out"""
+
+    def __init__(self, msgs):
+        self.queue = asyncio.Queue()
+        for msg in msgs:
+            self.queue.put_nowait(msg)
+
+    async def next_msg(self, timeout=1.0):
+        from nats.errors import TimeoutError as NATSTimeoutError
+
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            raise NATSTimeoutError
+
+
+class TestSubscriberBatching:
+    """Test micro-batch collection and delivery"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_bus(self):
+        with patch.object(bus, "log_event"), patch.object(
+            bus, "_gate_enforcer", GateEnforcer(capsule_manager=CapsuleManager())
+        ):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_ack_and_term_per_message(self):
+        outcomes = []
+        envelopes = _mixed_envelopes()
+        msgs = [FakeMsg(json.dumps(env).encode(), outcomes) for env in envelopes]
+        msgs.insert(2, FakeMsg(b"not json", outcomes))
+
+        expected_allowed = [
+            env
+            for env, error in zip(envelopes, validate_envelopes(envelopes))
+            if error is None and bus.get_gate_enforcer().ingress_validate(env).allowed
+        ]
+
+        handled = []
+
+        async def handler(env):
+            handled.append(env)
+
+        await bus._ingest_batch("t1", "thread.t1.need", msgs, handler)
+
+        assert handled == expected_allowed
+        assert len(outcomes) == len(msgs)
+        acked = [json.loads(data) for action, data in outcomes if action == "ack"]
+        assert acked == expected_allowed
+        assert ("term", b"not json") in outcomes
+
+    @pytest.mark.asyncio
+    async def test_handler_failure_naks_one_message(self):
+        """A handler raising mid-batch naks that message and delivers the rest"""
+        outcomes = []
+        envelopes = [{"kind": "NEED", "thread_id": "t1", "lamport": i} for i in range(5)]
+        msgs = [FakeMsg(json.dumps(env).encode(), outcomes) for env in envelopes]
+        checked = [(env, None, None) for env in envelopes]
+        handled = []
+
+        async def handler(env):
+            if env["lamport"] == 2:
+                raise RuntimeError("boom")
+            handled.append(env["lamport"])
+
+        with patch.object(bus, "TRACING_ENABLED", False):
+            await bus._deliver_batch("t1", "thread.t1.need", msgs, checked, handler)
+
+        assert handled == [0, 1, 3, 4]
+        assert [(action, json.loads(data)["lamport"]) for action, data in outcomes] == [
+            ("ack", 0),
+            ("ack", 1),
+            ("nak", 2),
+            ("ack", 3),
+            ("ack", 4),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_next_batch_respects_size(self):
+        sub = FakeSub(range(40))
+        assert await bus._next_batch(sub, batch_size=16, batch_window=1.0) == list(range(16))
+
+    @pytest.mark.asyncio
+    async def test_next_batch_respects_window(self):
+        sub = FakeSub(range(3))
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        assert await bus._next_batch(sub, batch_size=16, batch_window=0.05) == [0, 1, 2]
+        assert loop.time() - start < 0.5
+
+
+class ClosingSub:
+    """Subscription that serves queued messages, then reports the connection closed"""
+
+    def __init__(self, msgs):
+        self.msgs = list(msgs)
+
+    async def next_msg(self, timeout=None):
+        from nats.errors import ConnectionClosedError, TimeoutError as NATSTimeoutError
+
+        if self.msgs:
+            return self.msgs.pop(0)
+        if timeout is None:
+            raise ConnectionClosedError
+        raise NATSTimeoutError
+
+
+class TestIngestOffload:
+    """Test ingest with the CPU-bound checks on an executor"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_bus(self):
+        with patch.object(bus, "log_event"), patch.object(
+            bus, "_gate_enforcer", GateEnforcer(capsule_manager=CapsuleManager())
+        ):
+            yield
+        bus.shutdown_ingest_executors()
+
+    async def _run(self, msgs, executor, batch_size=3):
+        handled = []
+
+        async def handler(env):
+            handled.append(env)
+
+        await bus._offloaded_ingest(
+            "t1",
+            "thread.t1.need",
+            ClosingSub(msgs),
+            handler,
+            executor,
+            batch_size=batch_size,
+            batch_window=0.01,
+            queue_depth=2,
+        )
+        return handled
+
+    async def _expected(self, envelopes):
+        outcomes = []
+        msgs = [FakeMsg(json.dumps(env).encode(), outcomes) for env in envelopes]
+        handled = []
+
+        async def handler(env):
+            handled.append(env)
+
+        await bus._ingest_batch("t1", "thread.t1.need", msgs, handler)
+        return handled, outcomes
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("kind", ["thread", "process"])
+    async def test_matches_inline(self, kind):
+        envelopes = _mixed_envelopes() + [_signed(n=i) for i in range(10, 20)]
+        expected_handled, expected_outcomes = await self._expected(envelopes)
+
+        outcomes = []
+        msgs = [FakeMsg(json.dumps(env).encode(), outcomes) for env in envelopes]
+        handled = await self._run(msgs, bus.get_ingest_executor(kind, 2))
+
+        assert handled == expected_handled
+        assert outcomes == expected_outcomes
+
+    @pytest.mark.asyncio
+    async def test_slow_batch_keeps_order(self):
+        """A slow batch delays, but is not overtaken by, later batches"""
+        envelopes = [_signed(n=i) for i in range(12)]
+        first = json.dumps(envelopes[0]).encode()
+        check_batch = bus._check_batch
+
+        def slow_first_batch(datas, policy=None):
+            if first in datas:
+                time.sleep(0.2)
+            return check_batch(datas, policy)
+
+        outcomes = []
+        msgs = [FakeMsg(json.dumps(env).encode(), outcomes) for env in envelopes]
+        with patch.object(bus, "_check_batch", slow_first_batch):
+            await self._run(msgs, bus.get_ingest_executor("thread", 4))
+
+        assert [json.loads(data) for _, data in outcomes] == envelopes
+
+    @pytest.mark.asyncio
+    async def test_failed_check_falls_back_inline(self):
+        envelopes = [_signed(n=i) for i in range(4)] + [_signed(kind="BOGUS")]
+        expected_handled, expected_outcomes = await self._expected(envelopes)
+
+        outcomes = []
+        msgs = [FakeMsg(json.dumps(env).encode(), outcomes) for env in envelopes]
+        check_batch = bus._check_batch
+
+        def broken_off_loop(datas, policy=None):
+            if threading.current_thread() is not threading.main_thread():
+                raise RuntimeError("pool broke")
+            return check_batch(datas, policy)
+
+        with patch.object(bus, "_check_batch", broken_off_loop):
+            handled = await self._run(msgs, bus.get_ingest_executor("thread", 1))
+
+        assert handled == expected_handled
+        assert outcomes == expected_outcomes
+
+    @pytest.mark.asyncio
+    async def test_process_workers_follow_activation(self, tmp_path):
+        """Worker processes enforce the capsule activated in the parent"""
+        rego_file = tmp_path / "open.rego"
+        rego_file.write_text(OPEN_POLICY)
+        executor = bus.get_ingest_executor("process", 1)
+        loop = asyncio.get_running_loop()
+
+        async def check(envelopes):
+            datas = [json.dumps(env).encode() for env in envelopes]
+            policy = bus._worker_policy(executor)
+            checked = await loop.run_in_executor(executor, bus._check_batch, datas, policy)
+            return [rejection for _, rejection, _ in checked]
+
+        # The built-in policy rejects both for a missing actor_id
+        builtin = await check([_signed(), _signed(kind="DECIDE")])
+        assert builtin == ["ingress", "ingress"]
+
+        manager = init_capsule_manager()
+        try:
+            capsule = manager.sign_capsule(
+                manager.create_capsule(wasm_path=rego_file, tests_passed=[])
+            )
+            assert await manager.receive_capsule(capsule, activate=True)
+            assert await check([_signed(), _signed(kind="DECIDE")]) == [None, None]
+        finally:
+            init_capsule_manager()
+
+        assert await check([_signed(), _signed(kind="DECIDE")]) == builtin
+
+    def test_executor_kinds(self):
+        assert bus.get_ingest_executor("inline") is None
+        assert bus.get_ingest_executor("thread", 2) is bus.get_ingest_executor("thread", 2)
+        with pytest.raises(ValueError):
+            bus.get_ingest_executor("gpu")
+
+
+class TestConcurrentDelivery:
+    """Test delivery to a handler that completes asynchronously"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_bus(self):
+        with patch.object(bus, "log_event"):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_ack_after_complete(self):
+        dispatcher = VerbDispatcher()
+        release = asyncio.Event()
+
+        async def slow(env):
+            await release.wait()
+
+        async def fast(env):
+            pass
+
+        async def broken(env):
+            raise RuntimeError("boom")
+
+        dispatcher.register("SLOW", slow)
+        dispatcher.register("FAST", fast)
+        dispatcher.register("BROKEN", broken)
+
+        envelopes = [
+            {"kind": "SLOW", "thread_id": "a", "lamport": 1},
+            {"kind": "FAST", "thread_id": "a", "lamport": 2},
+            {"kind": "FAST", "thread_id": "b", "lamport": 3},
+            {"kind": "BROKEN", "thread_id": "c", "lamport": 4},
+        ]
+        outcomes = []
+        msgs = [FakeMsg(json.dumps(env).encode(), outcomes) for env in envelopes]
+        checked = [(env, None, None) for env in envelopes]
+
+        await bus._deliver_batch(
+            "t1", "thread.*.need", msgs, checked, dispatcher.submit, concurrent=True
+        )
+        await asyncio.sleep(0.01)
+
+        # Thread b and c finished while thread a is still blocked on its first envelope
+        assert [(action, json.loads(data)["lamport"]) for action, data in outcomes] == [
+            ("ack", 3),
+            ("nak", 4),
+        ]
+
+        release.set()
+        await dispatcher.join()
+        await asyncio.sleep(0)
+        assert [json.loads(data)["lamport"] for action, data in outcomes[2:]] == [1, 2]
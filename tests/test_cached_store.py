@@ -0,0 +1,261 @@
+"""
+Tests for the read-through CAS cache.
+
+Tests:
+- Memory and disk tiers, including size-based eviction
+- Negative caching of misses
+- Prefetch and concurrent fetch coalescing
+- Thread DAG reconstruction served from cache
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from cas.cached_store import CachedContentStore
+from cas.ipld_format import ThreadIPLD
+from cas_core import sha256_hash
+
+
+class CountingBackend:
+    """In-memory stand-in for IPFSContentStore that counts daemon round-trips"""
+
+    def __init__(self, delay: float = 0.0):
+        self.blobs = {}
+        self.gets = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def put(self, data: bytes) -> str:
+        cid = "bafk" + sha256_hash(data)
+        self.blobs[cid] = data
+        return cid
+
+    def get(self, cid: str, timeout: int = 5) -> bytes:
+        with self._lock:
+            self.gets += 1
+        time.sleep(self.delay)
+        if cid not in self.blobs:
+            raise KeyError(f"Content not found: {cid}")
+        return self.blobs[cid]
+
+    def exists(self, cid: str) -> bool:
+        return cid in self.blobs
+
+    def list_pins(self) -> list:
+        return list(self.blobs)
+
+
+def _seed(backend, blobs):
+    """Store blobs directly in the backend, bypassing any cache"""
+    return [backend.put(data) for data in blobs]
+
+
+class TestCacheTiers:
+    """Test memory and disk tiers"""
+
+    def test_memory_hit_skips_backend(self):
+        """Repeated gets are served from memory"""
+        backend = CountingBackend()
+        (cid,) = _seed(backend, [b"hello"])
+        store = CachedContentStore(backend)
+
+        assert store.get(cid) == b"hello"
+        assert store.get(cid) == b"hello"
+
+        assert backend.gets == 1
+        assert store.stats.memory_hits == 1
+        assert store.stats.misses == 1
+        assert store.get_stats()["hit_rate"] == 0.5
+
+    def test_put_writes_through(self, tmp_path):
+        """Freshly stored content is served locally"""
+        backend = CountingBackend()
+        store = CachedContentStore(backend, cache_dir=tmp_path)
+
+        cid = store.put(b"written")
+
+        assert store.get(cid) == b"written"
+        assert store.exists(cid)
+        assert backend.gets == 0
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """A new store over the same cache_dir serves earlier fetches"""
+        backend = CountingBackend()
+        (cid,) = _seed(backend, [b"persisted"])
+
+        first = CachedContentStore(backend, cache_dir=tmp_path)
+        first.get(cid)
+        first.close()
+
+        second = CachedContentStore(backend, cache_dir=tmp_path)
+        assert second.get(cid) == b"persisted"
+        assert bytes(second.get_view(cid)) == b"persisted"
+        assert backend.gets == 1
+        assert second.stats.disk_hits == 1
+
+    def test_large_blobs_skip_memory(self, tmp_path):
+        """Blobs above memory_max_blob_size only live on disk"""
+        backend = CountingBackend()
+        (cid,) = _seed(backend, [b"x" * 1000])
+        store = CachedContentStore(backend, cache_dir=tmp_path, memory_max_blob_size=100)
+
+        store.get(cid)
+        store.get(cid)
+
+        assert store.get_stats()["memory_entries"] == 0
+        assert store.stats.disk_hits == 1
+
+    def test_memory_eviction(self):
+        """Memory tier stays within memory_max_bytes"""
+        backend = CountingBackend()
+        cids = _seed(backend, [bytes([i]) * 100 for i in range(10)])
+        store = CachedContentStore(backend, memory_max_bytes=350)
+
+        for cid in cids:
+            store.get(cid)
+
+        stats = store.get_stats()
+        assert stats["memory_bytes"] <= 350
+        assert stats["memory_evictions"] == 7
+
+    def test_disk_eviction_by_size(self, tmp_path):
+        """Least recently used entries are evicted from disk"""
+        backend = CountingBackend()
+        cids = _seed(backend, [bytes([i]) * 1000 for i in range(5)])
+        store = CachedContentStore(
+            backend, cache_dir=tmp_path, memory_max_bytes=0, disk_max_bytes=3000
+        )
+
+        for cid in cids[:3]:
+            store.get(cid)
+        store.get(cids[0])  # refresh
+        store.get(cids[3])  # evicts cids[1]
+
+        assert store.get_stats()["disk_bytes"] == 3000
+        assert store.stats.disk_evictions == 1
+
+        gets = backend.gets
+        store.get(cids[0])
+        assert backend.gets == gets
+        store.get(cids[1])
+        assert backend.gets == gets + 1
+
+        blobs = [p for p in (tmp_path / "blobs").rglob("*") if p.is_file()]
+        assert len(blobs) == 3
+
+    def test_delegates_other_methods(self):
+        """Backend-specific methods pass through"""
+        backend = CountingBackend()
+        _seed(backend, [b"pinned"])
+        assert CachedContentStore(backend).list_pins() == list(backend.blobs)
+
+
+class TestNegativeCache:
+    """Test caching of misses"""
+
+    def test_miss_is_cached(self):
+        """A missing CID is only looked up once within the TTL"""
+        backend = CountingBackend()
+        store = CachedContentStore(backend)
+
+        for _ in range(3):
+            with pytest.raises(KeyError):
+                store.get("bafkmissing")
+
+        assert backend.gets == 1
+        assert store.stats.negative_hits == 2
+        assert not store.exists("bafkmissing")
+
+    def test_miss_expires(self):
+        """Negative entries expire after negative_ttl"""
+        backend = CountingBackend()
+        store = CachedContentStore(backend, negative_ttl=0.05)
+
+        with pytest.raises(KeyError):
+            store.get("bafklate")
+        backend.blobs["bafklate"] = b"arrived"
+        time.sleep(0.1)
+
+        assert store.get("bafklate") == b"arrived"
+
+    def test_put_clears_miss(self):
+        """Storing content overrides a cached miss"""
+        backend = CountingBackend()
+        store = CachedContentStore(backend)
+        cid = "bafk" + sha256_hash(b"late")
+
+        assert not store.exists(cid)
+        assert store.put(b"late") == cid
+        assert store.get(cid) == b"late"
+
+
+class TestPrefetch:
+    """Test batch warming"""
+
+    def test_prefetch_runs_concurrently(self):
+        """Prefetching N slow CIDs takes far less than N round-trips"""
+        backend = CountingBackend(delay=0.1)
+        cids = _seed(backend, [f"blob {i}".encode() for i in range(16)])
+        store = CachedContentStore(backend, prefetch_workers=8)
+
+        start = time.perf_counter()
+        assert store.prefetch(cids + ["bafkmissing"]) == 16
+        assert time.perf_counter() - start < 1.0
+
+        for cid in cids:
+            store.get(cid)
+        assert store.stats.memory_hits == 16
+        assert store.stats.prefetched == 16
+
+    def test_concurrent_fetches_coalesce(self):
+        """Simultaneous gets of one CID make a single backend call"""
+        backend = CountingBackend(delay=0.1)
+        (cid,) = _seed(backend, [b"shared"])
+        store = CachedContentStore(backend)
+
+        threads = [threading.Thread(target=store.get, args=(cid,)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert backend.gets == 1
+
+    def test_thread_dag_prefetched(self):
+        """dag_to_envelopes resolves every link from the cache"""
+        backend = CountingBackend(delay=0.02)
+        envelopes = [
+            {"id": f"env-{i}", "thread_id": "t1", "kind": "NEED", "payload": {"n": i}}
+            for i in range(10)
+        ]
+        dag = ThreadIPLD(backend).envelopes_to_dag(envelopes, "t1")
+
+        store = CachedContentStore(backend)
+        restored = ThreadIPLD(store).dag_to_envelopes(dag)
+
+        assert [e["payload"]["n"] for e in restored] == list(range(10))
+        # 10 envelopes + 10 payloads, all fetched during prefetch
+        assert store.stats.prefetched == 20
+        assert store.stats.misses == 0
+        assert store.stats.hit_rate == 1.0
+
+    def test_thread_dag_skips_bad_envelopes(self):
+        """An undecodable or missing envelope is skipped, not fatal"""
+        backend = CountingBackend()
+        envelopes = [
+            {"id": f"env-{i}", "thread_id": "t1", "kind": "NEED", "payload": {"n": i}}
+            for i in range(4)
+        ]
+        dag = ThreadIPLD(backend).envelopes_to_dag(envelopes, "t1")
+        dag["envelopes"][1] = {"/": backend.put(b"[1, 2, 3]")}
+        dag["envelopes"][2] = {"/": "bafkmissing"}
+
+        restored = ThreadIPLD(CachedContentStore(backend)).dag_to_envelopes(dag)
+
+        assert [e["payload"]["n"] for e in restored] == [0, 3]
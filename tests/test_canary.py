@@ -15,6 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from routing.canary import (
     CanaryTest,
     CanaryResult,
+    CanaryResultCache,
     get_canary_runner,
     reset_canary_runner,
 )
@@ -23,7 +24,6 @@ from routing.winner_selection import (
     reset_winner_selector,
 )
 
-
 # Test Fixtures
 
 
@@ -429,5 +429,122 @@ class TestCanaryIntegration:
         assert winner == "agent-a"  # Should select perfect match
 
 
+# Result Reuse and Early Termination Tests
+
+
+class TestCanaryResultCache:
+    """Tests for cached canary results"""
+
+    def test_freshness_decays_with_age(self, monkeypatch):
+        """Results are reused until their decayed quality drops below threshold"""
+        now = [1000.0]
+        monkeypatch.setattr("routing.canary.time.time", lambda: now[0])
+        cache = CanaryResultCache(half_life_s=100.0)
+        cache.put("need", CanaryResult("agent-1", 50.0, 1.0, True))
+        cache.put("need", CanaryResult("agent-2", 50.0, 0.7, True))
+
+        # 50s: 1.0 decays to 0.71, 0.7 to 0.49
+        now[0] += 50.0
+        assert cache.get("agent-1", "need", 0.6).quality_score == 1.0
+        assert cache.get("agent-2", "need", 0.6) is None
+
+        # 100s: 1.0 decays to 0.5
+        now[0] += 50.0
+        assert cache.get("agent-1", "need", 0.6) is None
+        assert len(cache) == 0
+
+    def test_keyed_by_need(self):
+        """Results are reused only for the same agent and NEED fingerprint"""
+        cache = CanaryResultCache()
+        cache.put("need-a", CanaryResult("agent-1", 50.0, 0.9, True))
+
+        assert cache.get("agent-1", "need-b", 0.6) is None
+        assert cache.get("agent-2", "need-a", 0.6) is None
+        assert cache.get("agent-1", "need-a", 0.6) is not None
+
+    def test_failures_not_cached(self):
+        """Failed canaries are always re-run"""
+        cache = CanaryResultCache()
+        cache.put("need", CanaryResult("agent-1", 50.0, 0.0, False, error="Timeout"))
+
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_run_canaries_reuses_results(self, canary_runner):
+        """Agents with fresh results for the NEED are not tested again"""
+        sent = []
+
+        async def send(agent_id, micro_task):
+            sent.append(agent_id)
+
+        async def receive(agent_id):
+            return {"result": "ok"}
+
+        canary_runner.send_task_handler = send
+        canary_runner.receive_result_handler = receive
+        canary_test = CanaryTest(micro_task={}, expected_output={"result": "ok"})
+
+        await canary_runner.run_canaries(["agent-1", "agent-2"], canary_test, need_key="n")
+        results = await canary_runner.run_canaries(
+            ["agent-1", "agent-2", "agent-3"], canary_test, need_key="n"
+        )
+
+        assert sent == ["agent-1", "agent-2", "agent-3"]
+        assert {r.agent_id for r in results} == {"agent-1", "agent-2", "agent-3"}
+
+
+class TestEarlyTermination:
+    """Tests for stopping canaries once one passes"""
+
+    @pytest.mark.asyncio
+    async def test_early_stop_cancels_slow_canaries(self, canary_runner):
+        """A high-quality result ends the wait for slower agents"""
+        delays = {"fast": 0.01, "slow-1": 0.5, "slow-2": 0.5}
+
+        async def receive(agent_id):
+            await asyncio.sleep(delays[agent_id])
+            return {"result": "ok"}
+
+        canary_runner.receive_result_handler = receive
+        canary_test = CanaryTest(micro_task={}, expected_output={"result": "ok"})
+
+        start = asyncio.get_running_loop().time()
+        results = await canary_runner.run_canaries(
+            ["slow-1", "fast", "slow-2"], canary_test, early_stop_quality=0.9
+        )
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert [r.agent_id for r in results] == ["fast"]
+        assert elapsed < 0.4
+
+    @pytest.mark.asyncio
+    async def test_no_early_stop_below_quality(self, canary_runner):
+        """Results under the early-stop quality wait for every agent"""
+        canary_test = CanaryTest(micro_task={}, expected_output=None)  # Simulated: 0.8
+
+        results = await canary_runner.run_canaries(
+            ["agent-1", "agent-2"], canary_test, early_stop_quality=0.9
+        )
+
+        assert len(results) == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_result_stops_before_running(self, canary_runner):
+        """A fresh high-quality cached result means no canary is sent"""
+        canary_runner.result_cache.put("n", CanaryResult("agent-1", 50.0, 1.0, True))
+
+        async def send(agent_id, micro_task):
+            raise AssertionError("canary should not run")
+
+        canary_runner.send_task_handler = send
+        canary_test = CanaryTest(micro_task={}, expected_output=None)
+
+        results = await canary_runner.run_canaries(
+            ["agent-1", "agent-2"], canary_test, need_key="n", early_stop_quality=0.9
+        )
+
+        assert [r.agent_id for r in results] == ["agent-1"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
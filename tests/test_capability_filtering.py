@@ -5,6 +5,7 @@ Tests the agent manifest system and capability filtering logic.
 """
 
 import pytest
+import random
 import sys
 from pathlib import Path
 
@@ -15,10 +16,10 @@ from routing.manifests import (
     AgentManifest,
     get_registry,
     reset_registry,
+    schema_hash,
 )
 from routing.filters import CapabilityFilter
 
-
 # Test Fixtures
 
 
@@ -235,6 +236,18 @@ class TestManifestRegistry:
         assert len(python_ml_agents) == 1
         assert python_ml_agents[0].agent_id == "agent-python-ml"
 
+    def test_find_by_tags_match_all_order(self, registry, sample_manifests):
+        """Match-all results keep registration order and drop unknown tags"""
+        for manifest in sample_manifests:
+            registry.register(manifest)
+
+        python_agents = registry.find_by_tags(["python"], match_all=True)
+
+        assert [a.agent_id for a in python_agents] == [
+            m.agent_id for m in sample_manifests if "python" in m.tags
+        ]
+        assert registry.find_by_tags(["python", "never-seen"], match_all=True) == []
+
     def test_find_by_tags_match_any(self, registry, sample_manifests):
         """Can find agents by tags (match any)"""
         for manifest in sample_manifests:
@@ -537,5 +550,195 @@ class TestFilterCascade:
         assert len(result) == 0
 
 
+# Index-Driven Candidate Generation Tests
+
+
+def random_manifests(count, seed=7):
+    """Random manifests covering every filtered attribute"""
+    rng = random.Random(seed)
+    manifests = []
+    for i in range(count):
+        constraints = {}
+        if rng.random() < 0.7:
+            constraints["min_memory_gb"] = rng.choice([2, 4, 8, 16])
+        if rng.random() < 0.5:
+            constraints["max_batch"] = rng.randint(1, 100)
+        if rng.random() < 0.4:
+            constraints["requires_gpu"] = rng.random() < 0.5
+        if rng.random() < 0.3:
+            constraints["runtime"] = rng.choice(["python3.11", "node20"])
+        manifests.append(
+            AgentManifest(
+                agent_id=f"agent-{i}",
+                capabilities=rng.sample(
+                    ["code", "data", "web", "nlp", "vision"], rng.randint(1, 3)
+                ),
+                io_schema={"input": {"type": rng.choice(["object", "array"])}},
+                tags=rng.sample(["python", "js", "ml"], rng.randint(0, 2)),
+                constraints=constraints,
+                price_per_task=float(rng.randint(1, 50)),
+                avg_latency_ms=float(rng.randint(50, 2000)),
+                zone=rng.choice(["us-west-2", "us-east-1", None]),
+            )
+        )
+    return manifests
+
+
+class TestIndexedCandidates:
+    """Tests for index-driven candidate generation"""
+
+    NEEDS = [
+        {},
+        {"capabilities": ["code"]},
+        {"capabilities": ["code", "nlp"], "max_price": 20.0},
+        {"capabilities": ["web"], "zone": "us-east-1", "max_price": 10.0},
+        {"capabilities": ["vision"], "constraints": {"min_memory_gb": 8}},
+        {"constraints": {"min_memory_gb": 4, "max_batch": 50, "requires_gpu": True}},
+        {"input_schema": {"type": "array"}, "max_price": 5.0},
+        {"capabilities": ["data"], "constraints": {"runtime": "node20"}},
+        {"capabilities": ["code", "data", "web", "nlp"], "zone": "us-west-2"},
+        {"capabilities": ["unknown"]},
+    ]
+
+    @pytest.mark.parametrize("strict_mode", [False, True])
+    def test_matches_full_scan(self, registry, strict_mode):
+        """Indexed filtering returns exactly what the full cascade returns"""
+        for manifest in random_manifests(400):
+            registry.register(manifest)
+        filter = CapabilityFilter(strict_mode=strict_mode)
+
+        for need in self.NEEDS:
+            capable = filter.filter_by_capabilities(need, registry.get_all())
+            assert filter.filter_indexed(need, registry) == filter.filter_all(need, capable)
+
+    def test_capabilities_required_only_when_indexed(self, registry, sample_manifests):
+        """The cascade keeps partially capable agents; indexed candidates need all"""
+        for manifest in sample_manifests:
+            registry.register(manifest)
+        filter = CapabilityFilter()
+        need = {"capabilities": ["data_analysis"]}
+
+        assert filter.filter_all(need, sample_manifests) == sample_manifests
+        assert [m.agent_id for m in filter.filter_indexed(need, registry)] == ["agent-python-ml"]
+
+    def test_find_by_range(self, registry, sample_manifests):
+        """Sorted indexes answer numeric range queries"""
+        for manifest in sample_manifests:
+            registry.register(manifest)
+
+        cheap = registry.find_by_range("price_per_task", high=10.0)
+        assert [m.price_per_task for m in cheap] == sorted(m.price_per_task for m in cheap)
+        assert {m.agent_id for m in cheap} == {
+            m.agent_id for m in sample_manifests if m.price_per_task <= 10.0
+        }
+
+        big = registry.find_by_range("min_memory_gb", low=8)
+        assert {m.agent_id for m in big} == {
+            m.agent_id for m in sample_manifests if m.constraints.get("min_memory_gb", 0) >= 8
+        }
+        assert registry.find_by_range("unknown_key") == []
+
+    def test_reregister_replaces_index_entries(self, registry):
+        """Re-registering an agent drops its stale index entries"""
+        registry.register(
+            AgentManifest(
+                agent_id="a", capabilities=["old"], io_schema={}, constraints={"min_memory_gb": 4}
+            )
+        )
+        registry.register(
+            AgentManifest(
+                agent_id="a", capabilities=["new"], io_schema={}, constraints={"min_memory_gb": 16}
+            )
+        )
+
+        assert registry.find_candidates(capabilities=["old"]) == []
+        assert [m.agent_id for m in registry.find_candidates(capabilities=["new"])] == ["a"]
+        assert len(registry.numeric_index["min_memory_gb"]) == 1
+        assert registry.find_by_range("min_memory_gb", high=8) == []
+
+    def test_unregister_clears_indexes(self, registry, sample_manifests):
+        """Unregistering removes every index entry"""
+        for manifest in sample_manifests:
+            registry.register(manifest)
+        for manifest in sample_manifests:
+            registry.unregister(manifest.agent_id)
+
+        assert registry.constraint_index == {}
+        assert registry.schema_groups == {}
+        assert all(len(index) == 0 for index in registry.numeric_index.values())
+        assert registry.find_candidates(ranges={"price_per_task": (None, 100.0)}) == []
+
+
+class TestSchemaMemoization:
+    """Tests for hashed, memoized I/O schema checks"""
+
+    SCHEMAS = [
+        {"type": "object", "properties": {"code": {}, "lang": {}}, "required": ["code"]},
+        {"type": "object", "properties": {"code": {}}},
+        {"type": "array"},
+        {},
+    ]
+
+    def _manifests(self, count, seed=3):
+        rng = random.Random(seed)
+        return [
+            AgentManifest(
+                agent_id=f"agent-{i}",
+                capabilities=["code"],
+                io_schema={"input": rng.choice(self.SCHEMAS), "output": rng.choice(self.SCHEMAS)},
+            )
+            for i in range(count)
+        ]
+
+    def test_schema_hash_canonical(self):
+        """Key order and required-list order do not change the hash"""
+        assert schema_hash({"type": "object", "required": ["a", "b"]}) == schema_hash(
+            {"required": ["b", "a"], "type": "object"}
+        )
+        assert schema_hash({"type": "object"}) != schema_hash({"type": "array"})
+
+    def test_registration_groups_agents(self, registry):
+        """Agents sharing both schemas share a schema group"""
+        for manifest in self._manifests(200):
+            registry.register(manifest)
+
+        assert len(registry.schema_groups) <= len(self.SCHEMAS) ** 2
+        assert sum(len(ids) for ids in registry.schema_groups.values()) == 200
+        assert registry.get_stats()["schema_groups"] == len(registry.schema_groups)
+
+    @pytest.mark.parametrize("strict_mode", [False, True])
+    def test_checks_scale_with_distinct_schemas(self, strict_mode, monkeypatch):
+        """Each distinct schema pair is checked once, across NEEDs too"""
+        filter = CapabilityFilter(strict_mode=strict_mode)
+        manifests = self._manifests(500)
+        need = {"input_schema": self.SCHEMAS[0], "output_schema": {"type": "object"}}
+
+        # Reference result, checking every agent directly
+        expected = [
+            m
+            for m in manifests
+            if filter._schemas_compatible(need["input_schema"], m.io_schema["input"])
+            and filter._schemas_compatible(need["output_schema"], m.io_schema["output"])
+        ]
+
+        calls = []
+        check = filter._schemas_compatible
+        monkeypatch.setattr(
+            filter,
+            "_schemas_compatible",
+            lambda required, provided: calls.append(1) or check(required, provided),
+        )
+
+        assert filter.filter_by_io(need, manifests) == expected
+        assert 0 < len(calls) <= 2 * len(self.SCHEMAS)
+
+        # Same schemas in a new NEED: answered from the memo
+        calls.clear()
+        reordered = {"input_schema": dict(reversed(list(self.SCHEMAS[0].items())))}
+        reordered["output_schema"] = {"type": "object"}
+        assert filter.filter_by_io(reordered, manifests) == expected
+        assert calls == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,194 @@
+"""
+Tests for content-defined chunking in the CAS.
+
+Tests:
+- Chunk boundary properties (sizes, determinism, locality)
+- NumPy and pure-Python rolling hash agreement
+- Chunked FileCAS storage, dedup and transparent reassembly
+"""
+
+import io
+import os
+import random
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from cas.chunking import ContentDefinedChunker, ChunkManifest, HAS_NUMPY
+from cas_core import FileCAS, sha256_hash
+
+
+def _random_bytes(n: int, seed: int = 0) -> bytes:
+    return random.Random(seed).randbytes(n)
+
+
+class TestChunker:
+    """Test chunk boundary selection"""
+
+    def test_chunk_sizes_within_bounds(self):
+        """Every chunk but the last respects min/max size"""
+        chunker = ContentDefinedChunker(min_size=1024, avg_size=4096, max_size=16384)
+        data = _random_bytes(500_000)
+
+        chunks = chunker.split(data)
+        sizes = [len(c) for c in chunks]
+
+        assert b"".join(chunks) == data
+        assert all(1024 <= n <= 16384 for n in sizes[:-1])
+        assert 0 < sizes[-1] <= 16384
+        # Average lands in the right ballpark for random data
+        assert 2048 < sum(sizes) / len(sizes) < 12000
+
+    def test_boundaries_are_deterministic(self):
+        """Same content always splits the same way"""
+        chunker = ContentDefinedChunker()
+        data = _random_bytes(200_000, seed=1)
+        assert chunker.boundaries(data) == chunker.boundaries(bytes(data))
+
+    def test_insertion_only_changes_local_chunks(self):
+        """Inserting bytes near the start leaves later chunks intact"""
+        chunker = ContentDefinedChunker(min_size=1024, avg_size=4096, max_size=16384)
+        original = _random_bytes(300_000, seed=2)
+        edited = original[:5000] + b"INSERTED BYTES" + original[5000:]
+
+        a = {sha256_hash(bytes(c)) for c in chunker.split(original)}
+        b = {sha256_hash(bytes(c)) for c in chunker.split(edited)}
+
+        assert len(a & b) >= len(a) - 3
+
+    def test_empty_input(self):
+        """Empty data has no chunks"""
+        assert ContentDefinedChunker().split(b"") == []
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="NumPy not installed")
+    def test_numpy_matches_python(self):
+        """Vectorized and scalar rolling hashes agree across block edges"""
+        chunker = ContentDefinedChunker(min_size=64, avg_size=256, max_size=1024)
+        data = _random_bytes(50_000, seed=3)
+
+        assert chunker._candidates_numpy(data, block_size=4096) == chunker._candidates_python(
+            data
+        )
+
+    def test_rejects_bad_sizes(self):
+        """avg_size must be a power of two between min and max"""
+        with pytest.raises(ValueError):
+            ContentDefinedChunker(avg_size=5000)
+        with pytest.raises(ValueError):
+            ContentDefinedChunker(min_size=8192, avg_size=4096)
+
+
+class TestChunkManifest:
+    """Test manifest serialization"""
+
+    def test_roundtrip(self):
+        manifest = ChunkManifest("a" * 64, 30, [("b" * 64, 10), ("c" * 64, 20)])
+        assert ChunkManifest.from_bytes(manifest.to_bytes()) == manifest
+
+    def test_rejects_inconsistent_sizes(self):
+        manifest = ChunkManifest("a" * 64, 31, [("b" * 64, 10), ("c" * 64, 20)])
+        with pytest.raises(ValueError):
+            ChunkManifest.from_bytes(manifest.to_bytes())
+
+
+class TestChunkedFileCAS:
+    """Test chunked storage mode"""
+
+    def _store(self, path):
+        chunker = ContentDefinedChunker(min_size=1024, avg_size=4096, max_size=16384)
+        return FileCAS(path, chunker=chunker)
+
+    def test_roundtrip(self, tmp_path):
+        """Chunked artifacts reassemble on every read API"""
+        store = self._store(tmp_path)
+        data = _random_bytes(100_000)
+
+        h = store.put(data)
+
+        assert h == sha256_hash(data)
+        assert store.exists(h)
+        assert store.get_manifest(h) is not None
+        assert store.get(h) == data
+        assert store.get_view(h) == data
+        assert b"".join(store.iter_chunks(h)) == data
+        with store.open(h) as f:
+            assert f.read() == data
+
+    def test_small_artifacts_stored_whole(self, tmp_path):
+        """Artifacts below min_size skip chunking"""
+        store = self._store(tmp_path)
+        h = store.put(b"small")
+
+        assert store.get_manifest(h) is None
+        assert store.path_for(h).is_file()
+
+    def test_dedup_across_artifacts(self, tmp_path):
+        """Near-identical artifacts share most of their storage"""
+        store = self._store(tmp_path)
+        v1 = _random_bytes(200_000, seed=4)
+        v2 = v1[:150_000] + b"revised tail" + v1[150_000:]
+
+        store.put(v1)
+        size_after_v1 = sum(p.stat().st_size for _, p in store.iter_blobs())
+        h2 = store.put(v2)
+        size_after_v2 = sum(p.stat().st_size for _, p in store.iter_blobs())
+
+        assert store.get(h2) == v2
+        assert size_after_v2 - size_after_v1 < len(v2) // 4
+
+    def test_put_stream_chunks(self, tmp_path):
+        """Streamed puts are chunked too"""
+        store = self._store(tmp_path)
+        data = _random_bytes(80_000, seed=5)
+
+        h = store.put_stream(io.BytesIO(data), chunk_size=8192)
+
+        assert store.get_manifest(h) is not None
+        assert store.get(h) == data
+        assert list(tmp_path.glob(".tmp-*")) == []
+
+    def test_plain_store_reads_chunked_artifacts(self, tmp_path):
+        """A store opened without chunking still reads manifests"""
+        data = _random_bytes(50_000, seed=6)
+        h = self._store(tmp_path).put(data)
+
+        plain = FileCAS(tmp_path)
+        assert plain.exists(h)
+        assert plain.get(h) == data
+
+    def test_exclusive_scan_includes_manifests(self, tmp_path):
+        """Exclusive stores index manifests at startup"""
+        data = _random_bytes(50_000, seed=7)
+        h = self._store(tmp_path).put(data)
+
+        assert FileCAS(tmp_path, exclusive=True).exists(h)
+
+    def test_open_streams_chunks(self, tmp_path):
+        """open reads chunked artifacts lazily, in pieces"""
+        store = self._store(tmp_path)
+        data = _random_bytes(100_000, seed=8)
+        h = store.put(data)
+
+        with store.open(h) as f:
+            assert not isinstance(f, io.BytesIO)
+            pieces = []
+            while True:
+                piece = f.read(1000)
+                if not piece:
+                    break
+                pieces.append(piece)
+
+        assert len(pieces) == 100
+        assert b"".join(pieces) == data
+
+    def test_open_missing_chunk(self, tmp_path):
+        """A missing chunk is reported when the artifact is opened"""
+        store = self._store(tmp_path)
+        h = store.put(_random_bytes(50_000, seed=9))
+        chunk_hash = store.get_manifest(h).chunks[1][0]
+        store.path_for(chunk_hash).unlink()
+
+        with pytest.raises(KeyError):
+            store.open(h)
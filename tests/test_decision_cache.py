@@ -0,0 +1,189 @@
+"""
+Tests for the policy decision cache.
+
+Tests:
+- LRU eviction, TTL expiry and hit/miss statistics
+- Content-addressed keys (input digest, gate, policy hash)
+- Caching at PREFLIGHT, INGRESS and COMMIT_GATE
+- Invalidation on capsule activation
+"""
+
+import sys
+import os
+import time
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from policy.capsule import CapsuleManager
+from policy.decision_cache import DecisionCache
+from policy.gates import GateEnforcer, PolicyGate
+from policy.opa_engine import PolicyResult
+
+
+@pytest.fixture
+def capsule_manager():
+    return CapsuleManager()
+
+
+@pytest.fixture
+def enforcer(capsule_manager):
+    return GateEnforcer(capsule_manager=capsule_manager)
+
+
+@pytest.fixture
+def envelope():
+    return {
+        "operation": "NEED",
+        "agent_id": "agent-1",
+        "thread_id": "thread-1",
+        "lamport": 3,
+        "payload": {"task_type": "classify", "resources": {"cpu_ms": 100}},
+    }
+
+
+def _allow():
+    return PolicyResult(allowed=True, reasons=["ok"], policy_version="1.0.0")
+
+
+class TestDecisionCache:
+    """Test the cache in isolation"""
+
+    def test_key_ignores_dict_order(self):
+        key1 = DecisionCache.make_key("h", "ingress", {"a": 1, "b": {"x": 1, "y": 2}})
+        key2 = DecisionCache.make_key("h", "ingress", {"b": {"y": 2, "x": 1}, "a": 1})
+        assert key1 == key2
+
+    def test_key_separates_policy_and_gate(self):
+        policy_input = {"a": 1}
+        keys = {
+            DecisionCache.make_key("h1", "ingress", policy_input),
+            DecisionCache.make_key("h2", "ingress", policy_input),
+            DecisionCache.make_key("h1", "preflight", policy_input),
+        }
+        assert len(keys) == 3
+
+    def test_lru_eviction(self):
+        cache = DecisionCache(max_entries=2)
+        cache.put(("h", "g", "a"), "A")
+        cache.put(("h", "g", "b"), "B")
+        cache.get(("h", "g", "a"))  # refresh
+        cache.put(("h", "g", "c"), "C")
+
+        assert cache.get(("h", "g", "b")) is None
+        assert cache.get(("h", "g", "a")) == "A"
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        cache = DecisionCache(ttl_seconds=0.05)
+        cache.put(("h", "g", "a"), "A")
+        time.sleep(0.1)
+
+        assert cache.get(("h", "g", "a")) is None
+        assert cache.get_stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_stats(self):
+        cache = DecisionCache()
+        cache.put(("h", "g", "a"), "A")
+        cache.get(("h", "g", "a"))
+        cache.get(("h", "g", "b"))
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+
+class TestGateCaching:
+    """Test decision caching at each gate"""
+
+    def test_preflight_keyed_by_input(self, enforcer, envelope):
+        """Envelopes without operation/agent_id no longer share one entry"""
+        with patch.object(enforcer.opa_engine, "evaluate", return_value=_allow()) as mock_eval:
+            enforcer.preflight_validate({"thread_id": "t1"})
+            enforcer.preflight_validate({"thread_id": "t2"})
+            enforcer.preflight_validate({"thread_id": "t1"})
+
+        assert mock_eval.call_count == 2
+        assert enforcer.get_cache_stats()["hits"] == 1
+
+    def test_ingress_redelivery_skips_evaluation(self, enforcer, envelope):
+        with patch.object(enforcer.wasm_runtime, "evaluate", return_value=_allow()) as mock_eval:
+            first = enforcer.ingress_validate(envelope)
+            second = enforcer.ingress_validate(dict(envelope))
+
+        assert mock_eval.call_count == 1
+        assert first == second
+        assert second.gate == PolicyGate.INGRESS
+
+    def test_commit_gate_keyed_by_telemetry(self, enforcer, envelope):
+        """Different telemetry for the same envelope is evaluated separately"""
+        within = {"resources": {"cpu_ms": 100}}
+        over = {"resources": {"cpu_ms": 500}}
+
+        with patch.object(enforcer.wasm_runtime, "evaluate", return_value=_allow()) as mock_eval:
+            assert enforcer.commit_gate_validate(envelope, within).allowed
+            assert not enforcer.commit_gate_validate(envelope, over).allowed
+            assert enforcer.commit_gate_validate(envelope, within).allowed
+
+        assert mock_eval.call_count == 2
+
+    def test_gates_do_not_share_entries(self, enforcer, envelope):
+        with patch.object(enforcer.wasm_runtime, "evaluate", return_value=_allow()):
+            enforcer.ingress_validate(envelope)
+            enforcer.commit_gate_validate(envelope, {})
+
+        assert enforcer.get_cache_stats()["size"] == 2
+
+    def test_cached_decision_is_a_copy(self, enforcer, envelope):
+        with patch.object(enforcer.wasm_runtime, "evaluate", return_value=_allow()):
+            enforcer.ingress_validate(envelope).allowed = False
+            assert enforcer.ingress_validate(envelope).allowed is True
+
+    def test_errors_not_cached(self, enforcer, envelope):
+        with patch.object(enforcer.wasm_runtime, "evaluate", side_effect=Exception("boom")):
+            assert not enforcer.ingress_validate(envelope).allowed
+        with patch.object(enforcer.wasm_runtime, "evaluate", return_value=_allow()):
+            assert enforcer.ingress_validate(envelope).allowed
+
+    def test_cache_disabled(self, capsule_manager, envelope):
+        enforcer = GateEnforcer(enable_cache=False, capsule_manager=capsule_manager)
+        with patch.object(enforcer.wasm_runtime, "evaluate", return_value=_allow()) as mock_eval:
+            enforcer.ingress_validate(envelope)
+            enforcer.ingress_validate(envelope)
+
+        assert mock_eval.call_count == 2
+        assert len(enforcer.decision_cache) == 0
+
+
+class TestCapsuleInvalidation:
+    """Test invalidation when a new policy capsule is activated"""
+
+    @pytest.mark.asyncio
+    async def test_activation_invalidates(self, capsule_manager, enforcer, envelope):
+        with patch.object(enforcer.wasm_runtime, "evaluate", return_value=_allow()):
+            enforcer.ingress_validate(envelope)
+        assert len(enforcer.decision_cache) == 1
+
+        capsule = capsule_manager.sign_capsule(capsule_manager.create_capsule(None, ["test_1"]))
+        assert await capsule_manager.receive_capsule(capsule)
+        assert capsule_manager.activate_capsule(capsule.policy_engine_hash)
+
+        assert capsule_manager.active_capsule == capsule
+        assert len(enforcer.decision_cache) == 0
+        assert enforcer.get_cache_stats()["invalidations"] == 1
+
+    def test_unknown_capsule_not_activated(self, capsule_manager):
+        assert not capsule_manager.activate_capsule("0" * 64)
+        assert capsule_manager.active_capsule is None
+
+    def test_listener_does_not_keep_enforcer_alive(self, capsule_manager):
+        GateEnforcer(capsule_manager=capsule_manager)
+        capsule = capsule_manager.create_capsule(None, [])
+        capsule_manager.received_capsules[capsule.policy_engine_hash] = capsule
+
+        assert capsule_manager.activate_capsule(capsule.policy_engine_hash)
+        assert capsule_manager._activation_listeners == []
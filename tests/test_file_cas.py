@@ -0,0 +1,224 @@
+"""
+Tests for the sharded FileCAS layout.
+
+Tests:
+- Fan-out directory layout and atomic writes
+- Online migration from the legacy flat layout
+- Existence cache (LRU + Bloom filter)
+- Streaming put/open APIs
+- Memory-mapped views and chunked reads
+"""
+
+import io
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from cas_core import FileCAS, ExistenceCache, sha256_hash
+
+
+class TestShardedLayout:
+    """Test fan-out directory layout"""
+
+    def test_put_uses_fanout_directories(self, tmp_path):
+        """Blobs are stored under ab/cd/<hash>"""
+        store = FileCAS(tmp_path)
+        h = store.put(b"sharded content")
+
+        expected = tmp_path / h[0:2] / h[2:4] / h
+        assert expected.is_file()
+        assert not (tmp_path / h).exists()
+        assert store.get(h) == b"sharded content"
+
+    def test_put_is_idempotent(self, tmp_path):
+        """Storing the same bytes twice returns the same hash"""
+        store = FileCAS(tmp_path)
+        assert store.put(b"same") == store.put(b"same")
+        assert len(list(store.iter_blobs())) == 1
+
+    def test_no_temp_files_left_behind(self, tmp_path):
+        """Atomic writes clean up their temp files"""
+        store = FileCAS(tmp_path)
+        for i in range(5):
+            store.put(f"blob {i}".encode())
+
+        leftovers = [p for p in tmp_path.rglob(".tmp-*")]
+        assert leftovers == []
+
+    def test_rejects_non_bytes(self, tmp_path):
+        """put() only accepts bytes"""
+        store = FileCAS(tmp_path)
+        with pytest.raises(TypeError):
+            store.put("not bytes")
+
+    def test_missing_content_raises_keyerror(self, tmp_path):
+        """get() of an unknown hash raises KeyError"""
+        store = FileCAS(tmp_path)
+        with pytest.raises(KeyError):
+            store.get(sha256_hash(b"never stored"))
+        with pytest.raises(KeyError):
+            store.get("not-a-hash")
+
+
+class TestFlatLayoutMigration:
+    """Test online migration from the legacy flat layout"""
+
+    def _write_flat(self, base, data: bytes) -> str:
+        h = sha256_hash(data)
+        (base / h).write_bytes(data)
+        return h
+
+    def test_flat_blob_readable_and_migrated_on_access(self, tmp_path):
+        """Reading a flat blob moves it into its shard"""
+        h = self._write_flat(tmp_path, b"legacy blob")
+        store = FileCAS(tmp_path)
+
+        assert store.exists(h)
+        assert store.get(h) == b"legacy blob"
+        assert store.path_for(h).is_file()
+        assert not (tmp_path / h).exists()
+
+    def test_migrate_flat_layout(self, tmp_path):
+        """Batch migration moves every flat blob"""
+        hashes = [self._write_flat(tmp_path, f"legacy {i}".encode()) for i in range(10)]
+        store = FileCAS(tmp_path)
+
+        assert store.migrate_flat_layout() == 10
+        assert store.migrate_flat_layout() == 0
+
+        for h in hashes:
+            assert store.path_for(h).is_file()
+            assert not (tmp_path / h).exists()
+
+
+class TestExistenceCache:
+    """Test LRU + Bloom filter existence cache"""
+
+    def test_exists_served_from_cache(self, tmp_path):
+        """Second exists() is answered without touching disk"""
+        store = FileCAS(tmp_path)
+        h = store.put(b"cached")
+
+        # Remove the blob behind the store's back: immutable content is never
+        # deleted in practice, so the cache is allowed to keep answering True.
+        store.path_for(h).unlink()
+        assert store.exists(h)
+
+    def test_lru_eviction(self):
+        """LRU holds at most `capacity` hashes"""
+        cache = ExistenceCache(capacity=2, expected_items=100)
+        hashes = [sha256_hash(bytes([i])) for i in range(3)]
+        for h in hashes:
+            cache.add(h)
+
+        assert len(cache) == 2
+        assert not cache.contains(hashes[0])
+        assert cache.contains(hashes[2])
+        # Bloom filter still remembers evicted entries
+        assert cache.might_contain(hashes[0])
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """Every added hash is reported as possibly present"""
+        cache = ExistenceCache(capacity=10, expected_items=1000)
+        hashes = [sha256_hash(str(i).encode()) for i in range(1000)]
+        for h in hashes:
+            cache.add(h)
+
+        assert all(cache.might_contain(h) for h in hashes)
+
+    def test_exclusive_store_answers_misses_from_bloom(self, tmp_path):
+        """Exclusive mode loads existing blobs at startup"""
+        h = FileCAS(tmp_path).put(b"existing")
+
+        store = FileCAS(tmp_path, exclusive=True)
+        assert store.exists(h)
+        assert not store.exists(sha256_hash(b"absent"))
+
+    def test_shared_store_sees_other_writers(self, tmp_path):
+        """Non-exclusive stores fall back to disk on cache misses"""
+        reader = FileCAS(tmp_path)
+        writer = FileCAS(tmp_path)
+
+        h = sha256_hash(b"written elsewhere")
+        assert not reader.exists(h)
+
+        writer.put(b"written elsewhere")
+        assert reader.exists(h)
+
+
+class TestStreaming:
+    """Test streaming put/open APIs"""
+
+    def test_put_stream_matches_put(self, tmp_path):
+        """Streamed content hashes the same as in-memory content"""
+        data = os.urandom(3 * 1024 + 17)
+        store = FileCAS(tmp_path)
+
+        h = store.put_stream(io.BytesIO(data), chunk_size=1024)
+
+        assert h == sha256_hash(data)
+        assert store.get(h) == data
+        assert list(tmp_path.glob(".tmp-*")) == []
+
+    def test_put_stream_dedups(self, tmp_path):
+        """Streaming existing content does not rewrite it"""
+        store = FileCAS(tmp_path)
+        h1 = store.put(b"dup")
+        h2 = store.put_stream(io.BytesIO(b"dup"))
+
+        assert h1 == h2
+        assert list(tmp_path.glob(".tmp-*")) == []
+
+    def test_open_streams_content(self, tmp_path):
+        """open() returns a readable file object"""
+        store = FileCAS(tmp_path)
+        h = store.put(b"stream me")
+
+        with store.open(h) as f:
+            assert f.read(6) == b"stream"
+            assert f.read() == b" me"
+
+        with pytest.raises(KeyError):
+            store.open(sha256_hash(b"missing"))
+
+
+class TestZeroCopyReads:
+    """Test memory-mapped views and chunked reads"""
+
+    def test_get_view_matches_get(self, tmp_path):
+        """get_view() exposes the same bytes as get()"""
+        store = FileCAS(tmp_path)
+        data = os.urandom(64 * 1024)
+        h = store.put(data)
+
+        view = store.get_view(h)
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        assert view == data
+        assert view[100:200] == data[100:200]
+
+    def test_get_view_empty_blob(self, tmp_path):
+        """Empty blobs cannot be mapped but still return a view"""
+        store = FileCAS(tmp_path)
+        h = store.put(b"")
+
+        assert len(store.get_view(h)) == 0
+
+    def test_iter_chunks(self, tmp_path):
+        """Chunks reassemble to the original content"""
+        store = FileCAS(tmp_path)
+        data = os.urandom(5 * 4096 + 123)
+        h = store.put(data)
+
+        chunks = list(store.iter_chunks(h, chunk_size=4096))
+        assert [len(c) for c in chunks] == [4096] * 5 + [123]
+        assert b"".join(chunks) == data
+
+    def test_get_view_missing(self, tmp_path):
+        """Missing blobs raise KeyError"""
+        store = FileCAS(tmp_path)
+        with pytest.raises(KeyError):
+            store.get_view(sha256_hash(b"missing"))
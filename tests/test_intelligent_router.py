@@ -7,6 +7,7 @@ Tests complete routing pipeline, fallback mechanisms, metrics tracking, and perf
 import pytest
 import sys
 from pathlib import Path
+import asyncio
 import time
 
 # Add src to path
@@ -26,7 +27,6 @@ from routing.canary import reset_canary_runner
 from routing.scoring import reset_scorer
 from routing.features import reset_feature_extractor
 
-
 # Test Fixtures
 
 
@@ -427,6 +427,207 @@ class TestRouterIntegration:
         assert "bandit_stats" in stats
         assert "registry_stats" in stats
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("policy", ["thompson", "linear_thompson", "linucb"])
+    async def test_bandit_selects_from_shortlist(self, sample_agents, policy):
+        """The bandit only picks agents that passed filtering"""
+        reset_registry()
+        reset_bandit()
+        registry = get_registry()
+        for agent in sample_agents:
+            registry.register(agent)
+
+        router = IntelligentRouter(enable_canary=False, bandit_policy=policy)
+        # A strong arm from earlier routing that cannot do this NEED
+        for _ in range(20):
+            router.bandit.update("agent-js-expert", reward=1.0)
+
+        for i in range(10):
+            need = {"need_id": f"short-{i}", "capabilities": ["refactoring"]}
+            assert await router.route_need(need) == "agent-python-expert"
+
+    def test_unknown_bandit_policy(self):
+        """Unknown bandit policies are rejected"""
+        with pytest.raises(ValueError):
+            IntelligentRouter(bandit_policy="greedy")
+
+
+# Canary Reuse and Speculative Routing Tests
+
+
+class TestCanaryReuse:
+    """Tests for canary result reuse and speculative canaries"""
+
+    NEED = {"capabilities": ["code_gen"], "tags": ["python"], "max_price": 50.0}
+
+    @pytest.mark.asyncio
+    async def test_canaries_reused_for_same_need_shape(self, router):
+        """A repeated NEED shape reuses fresh canary results"""
+        sent = []
+
+        async def send(agent_id, micro_task):
+            sent.append(agent_id)
+
+        router.canary_runner.send_task_handler = send
+
+        first = await router.route_need({"need_id": "reuse-1", **self.NEED})
+        canaries_sent = len(sent)
+        second = await router.route_need({"need_id": "reuse-2", **self.NEED})
+
+        assert canaries_sent == 3
+        assert len(sent) == canaries_sent
+        assert second == first
+        assert router.get_stats()["canary_cache_stats"]["hits"] == 3
+
+    @pytest.mark.asyncio
+    async def test_speculative_returns_before_canaries(self, router):
+        """Speculative mode answers with the top scored agent immediately"""
+        speculative = IntelligentRouter(speculative_canary=True)
+
+        async def receive(agent_id):
+            await asyncio.sleep(0.3)
+            return {"status": "success"}
+
+        speculative.canary_runner.receive_result_handler = receive
+
+        start = time.time()
+        selected = await speculative.route_need({"need_id": "spec-1", **self.NEED})
+        elapsed = time.time() - start
+
+        assert selected in ("agent-python-expert", "agent-python-cheap")
+        assert elapsed < 0.3
+        assert speculative.metrics.routing_history[-1].routing_method == "speculative"
+
+        # Background canaries feed the bandit and the canary cache
+        await speculative.drain_canaries()
+        assert speculative.bandit.total_pulls == 3
+        assert len(speculative.canary_runner.result_cache) == 3
+
+        # The next NEED of this shape is decided from the cached canaries
+        selected = await speculative.route_need({"need_id": "spec-2", **self.NEED})
+        assert selected is not None
+        assert speculative.metrics.routing_history[-1].routing_method != "speculative"
+
+    @pytest.mark.asyncio
+    async def test_speculative_does_not_duplicate_canaries(self, router):
+        """Concurrent NEEDs of one shape share the background canaries"""
+        speculative = IntelligentRouter(speculative_canary=True, enable_cache=False)
+        sent = []
+
+        async def send(agent_id, micro_task):
+            sent.append(agent_id)
+
+        speculative.canary_runner.send_task_handler = send
+
+        for i in range(3):
+            await speculative.route_need({"need_id": f"dup-{i}", **self.NEED})
+        await speculative.drain_canaries()
+
+        assert sorted(sent) == sorted(set(sent))
+
+
+# Batch Routing Tests
+
+
+class TestBatchRouting:
+    """Tests for routing many NEEDs at once"""
+
+    NEED = {"capabilities": ["code_gen"], "tags": ["python"], "max_price": 50.0}
+
+    @pytest.mark.asyncio
+    async def test_results_in_order(self, router):
+        """One result per NEED, None where routing fails"""
+        router.enable_canary = False
+        router.enable_bandit = False
+        needs = [
+            {"need_id": "b-1", **self.NEED},
+            {"need_id": "b-2", "capabilities": ["quantum_computing"]},
+            {"need_id": "b-3", "capabilities": ["web"]},
+        ]
+        qualified = {m.agent_id for m in router.filter.filter_indexed(needs[0], router.registry)}
+
+        selected = await router.route_needs(needs)
+
+        assert selected[0] in qualified
+        assert selected[1] is None
+        assert selected[2] == "agent-js-expert"
+        assert await router.route_needs([]) == []
+
+        stats = router.metrics.get_stats()
+        assert stats["total_routings"] == 3
+        assert stats["method_distribution"]["filter"] == 1
+
+    @pytest.mark.asyncio
+    async def test_shapes_share_filtering(self, router, monkeypatch):
+        """NEEDs that differ only in scoring fields share one filter pass"""
+        router.enable_canary = False
+        calls = []
+        filter_indexed = router.filter.filter_indexed
+        monkeypatch.setattr(
+            router.filter,
+            "filter_indexed",
+            lambda need, registry: calls.append(need) or filter_indexed(need, registry),
+        )
+
+        needs = [
+            {
+                "need_id": f"s-{i}",
+                **self.NEED,
+                "max_price": 40.0 + i % 2,
+                "tags": [["python"], ["ml"]][i // 2 % 2],
+            }
+            for i in range(12)
+        ]
+        selected = await router.route_needs(needs)
+
+        assert len(calls) == 2
+        assert all(s is not None for s in selected)
+        assert router.get_stats()["cache_stats"]["entries"] == 4
+
+    @pytest.mark.asyncio
+    async def test_canary_concurrency_capped(self, router):
+        """Canaries of every NEED shape run together, under the global cap"""
+        batch = IntelligentRouter(canary_early_stop=None, enable_bandit=False)
+        in_flight = [0, 0]  # current, max
+
+        async def receive(agent_id):
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            return {"status": "success"}
+
+        batch.canary_runner.receive_result_handler = receive
+
+        needs = [{"need_id": f"c-{i}", **self.NEED, "max_price": 40.0 + i} for i in range(4)]
+        selected = await batch.route_needs(needs, max_concurrent_canaries=2)
+        assert all(s is not None for s in selected)
+        assert in_flight[1] == 2
+
+        # Past one shape's three canaries when the cap allows it
+        needs = [{"need_id": f"d-{i}", **self.NEED, "max_price": 60.0 + i} for i in range(4)]
+        await batch.route_needs(needs, max_concurrent_canaries=5)
+        assert in_flight[1] == 5
+
+    @pytest.mark.asyncio
+    async def test_load_aware_assignment(self, router):
+        """No agent gets more than max_per_agent NEEDs"""
+        router.enable_canary = False
+        router.enable_bandit = False
+        needs = [{"need_id": f"l-{i}", **self.NEED} for i in range(6)]
+
+        greedy = await router.route_needs(needs)
+        assert len(set(greedy)) == 1
+
+        balanced = await router.route_needs(needs, load_aware=True)
+        counts = {a: balanced.count(a) for a in set(balanced)}
+        assert counts == {"agent-python-expert": 2, "agent-python-cheap": 2, "agent-js-expert": 2}
+        assert balanced[:2] == greedy[:2]
+
+        capped = await router.route_needs(needs, load_aware=True, max_per_agent=4)
+        assert capped.count(greedy[0]) == 4
+        assert router.metrics.routing_history[-1].routing_method == "load_balanced"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -553,3 +553,35 @@ class TestManifestRegistry:
         assert "tag1" in all_tags
         assert "tag2" in all_tags
         assert "tag3" in all_tags
+
+    def test_search_requires_all_labels(self):
+        """Test search with several capabilities and tags."""
+        registry = ManifestRegistry()
+
+        labels = [
+            (["plan", "exec"], ["fast", "cheap"]),
+            (["plan"], ["fast", "cheap"]),
+            (["plan", "exec", "audit"], ["fast"]),
+            (["exec", "plan"], ["cheap", "fast", "gpu"]),
+        ]
+        for i, (capabilities, tags) in enumerate(labels):
+            registry.register(
+                AgentManifest(
+                    agent_id=f"did:key:agent{i}",
+                    capabilities=capabilities,
+                    io_schema={},
+                    price_per_task=float(i),
+                    avg_latency_ms=100,
+                    tags=tags,
+                    pubkey=f"key{i}",
+                )
+            )
+
+        results = registry.search(capabilities=["exec", "plan"], tags=["fast", "cheap"])
+
+        assert [m.agent_id for m in results] == ["did:key:agent0", "did:key:agent3"]
+        assert registry.search(capabilities=["plan"], tags=["never-seen"]) == []
+        assert [m.agent_id for m in registry.search(capabilities=["plan"], max_price=1.0)] == [
+            "did:key:agent0",
+            "did:key:agent1",
+        ]
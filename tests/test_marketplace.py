@@ -11,6 +11,9 @@ from pathlib import Path
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
+import json
+import sqlite3
+
 import pytest
 from marketplace.market import TaskMarketplace
 
@@ -296,5 +299,69 @@ class TestAgentRatings:
         assert leaderboard[2]["agent_id"] == "agent2"  # 3.5
 
 
+class TestCapabilityBitsets:
+    """Test bitset capability filtering"""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return tmp_path / "market.db"
+
+    def test_requires_every_capability(self, db_path):
+        """Tasks must require all of the listed capabilities"""
+        market = TaskMarketplace(db_path)
+        market.post_task("t1", "A", ["python", "ml", "gpu"], 10.0, "u")
+        market.post_task("t2", "B", ["python"], 10.0, "u")
+        market.post_task("t3", "C", ["ml", "python"], 10.0, "u")
+
+        tasks = market.list_available_tasks(capabilities=["python", "ml"])
+
+        assert sorted(t["task_id"] for t in tasks) == ["t1", "t3"]
+        assert market.list_available_tasks(capabilities=["rust"]) == []
+
+    def test_vocabulary_persists(self, db_path):
+        """Bit positions survive reopening the database"""
+        market = TaskMarketplace(db_path)
+        market.post_task("t1", "A", ["python", "ml"], 10.0, "u")
+        market.conn.close()
+
+        reopened = TaskMarketplace(db_path)
+        reopened.post_task("t2", "B", ["ml", "rust"], 10.0, "u")
+
+        assert reopened.vocabulary.labels == ["python", "ml", "rust"]
+        tasks = reopened.list_available_tasks(capabilities=["ml"])
+        assert sorted(t["task_id"] for t in tasks) == ["t1", "t2"]
+
+    def test_backfills_legacy_tasks(self, db_path):
+        """Tasks stored before the mask column existed still match"""
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(
+            """
+            CREATE TABLE tasks (
+                task_id TEXT PRIMARY KEY,
+                description TEXT NOT NULL,
+                capabilities_required JSON NOT NULL,
+                budget REAL NOT NULL,
+                deadline REAL,
+                status TEXT NOT NULL,
+                poster_id TEXT NOT NULL,
+                assigned_to TEXT,
+                created_at REAL NOT NULL
+            )
+        """
+        )
+        conn.execute(
+            "INSERT INTO tasks VALUES (?, ?, ?, ?, NULL, 'open', 'u', NULL, 0)",
+            ("legacy", "old", json.dumps(["audit", "python"]), 5.0),
+        )
+        conn.commit()
+        conn.close()
+
+        market = TaskMarketplace(db_path)
+
+        tasks = market.list_available_tasks(capabilities=["audit"])
+        assert [t["task_id"] for t in tasks] == ["legacy"]
+        assert tasks[0]["capabilities_required"] == ["audit", "python"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
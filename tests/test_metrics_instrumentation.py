@@ -0,0 +1,231 @@
+"""
+Tests for hot-path Prometheus instrumentation.
+
+Tests:
+- Bus publish counters/latency with bounded subject labels
+- Gate decision latency, gas and outcome per gate
+- Per-verb handler latency in VerbDispatcher
+- Plan store append and CAS get/put metrics
+- Hot-path histogram/counter exposition
+- The global off switch
+"""
+
+import sys
+import os
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from prometheus_client import REGISTRY
+
+from observability import metrics
+from cas_core import FileCAS
+from plan_store import OpType, PlanOp, PlanStore
+from policy.capsule import CapsuleManager
+from policy.gates import GateEnforcer
+from verbs import VerbDispatcher
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture(autouse=True)
+def metrics_on():
+    previous = metrics.is_enabled()
+    metrics.set_enabled(True)
+    yield
+    metrics.set_enabled(previous)
+
+
+class TestRecording:
+    """Test each instrumented component"""
+
+    def test_subject_label(self):
+        assert metrics.subject_label("thread.abc-123.worker") == "thread.*.worker"
+        assert metrics.subject_label("policy.capsule.update") == "policy.capsule.update"
+
+    @pytest.mark.asyncio
+    async def test_bus_publish(self):
+        import bus
+
+        mock_js = Mock()
+        mock_js.publish = AsyncMock()
+        before = _sample(
+            "agent_swarm_messages_published_total", kind="CLAIM", subject="thread.*.worker"
+        )
+
+        with patch.object(bus, "connect", AsyncMock(return_value=(AsyncMock(), mock_js))), patch(
+            "bus.log_event"
+        ), patch.object(bus, "_connection_pool", bus.ConnectionPool()):
+            await bus.publish_raw("t1", "thread.t1.worker", {"kind": "CLAIM"})
+
+        assert (
+            _sample("agent_swarm_messages_published_total", kind="CLAIM", subject="thread.*.worker")
+            == before + 1
+        )
+        assert _sample("agent_swarm_bus_publish_kind_latency_seconds_count", kind="CLAIM") >= 1
+        assert _sample("agent_swarm_bus_publish_latency_seconds_count") >= 1
+
+    def test_gate_decisions(self):
+        enforcer = GateEnforcer(capsule_manager=CapsuleManager())
+        before = _sample("agent_swarm_policy_decisions_total", gate="ingress", decision="deny")
+        latency_before = _sample("agent_swarm_policy_gate_latency_seconds_count", gate="ingress")
+        total_before = _sample("agent_swarm_policy_eval_latency_seconds_count")
+
+        enforcer.ingress_validate({"operation": "NEED", "payload": {"n": 1}})
+        enforcer.ingress_validate_batch(
+            [{"operation": "NEED", "payload": {"n": i}} for i in (2, 3)]
+        )
+
+        assert (
+            _sample("agent_swarm_policy_decisions_total", gate="ingress", decision="deny")
+            == before + 3
+        )
+        assert (
+            _sample("agent_swarm_policy_gate_latency_seconds_count", gate="ingress")
+            == latency_before + 3
+        )
+        assert _sample("agent_swarm_policy_eval_latency_seconds_count") == total_before + 3
+        assert _sample("agent_swarm_policy_gas_used_count", gate="ingress") >= 3
+
+    @pytest.mark.asyncio
+    async def test_verb_dispatch(self):
+        dispatcher = VerbDispatcher()
+
+        async def decide(env):
+            await asyncio.sleep(0.01)
+
+        async def broken(env):
+            raise RuntimeError("boom")
+
+        dispatcher.register("DECIDE", decide)
+        dispatcher.register("YIELD", broken)
+        decide_before = _sample("agent_swarm_decide_latency_seconds_count")
+        failed_before = _sample(
+            "agent_swarm_messages_failed_total",
+            kind="YIELD",
+            operation="dispatch",
+            error_type="RuntimeError",
+        )
+
+        assert await dispatcher.dispatch({"kind": "DECIDE"})
+        with pytest.raises(RuntimeError):
+            await dispatcher.dispatch({"kind": "YIELD"})
+
+        assert _sample("agent_swarm_verb_handler_latency_seconds_sum", verb="DECIDE") >= 0.01
+        assert _sample("agent_swarm_decide_latency_seconds_count") == decide_before + 1
+        assert _sample("agent_swarm_verb_handler_latency_seconds_count", verb="YIELD") >= 1
+        assert (
+            _sample(
+                "agent_swarm_messages_failed_total",
+                kind="YIELD",
+                operation="dispatch",
+                error_type="RuntimeError",
+            )
+            == failed_before + 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_plan_store_append(self, tmp_path):
+        store = PlanStore(tmp_path / "plan.db")
+        before = _sample("agent_swarm_plan_store_append_latency_seconds_count")
+
+        await store.append_op(
+            PlanOp(
+                op_id="op-1",
+                thread_id="t1",
+                lamport=1,
+                actor_id="a",
+                op_type=OpType.ADD_TASK,
+                task_id="task-1",
+                payload={"type": "x"},
+                timestamp_ns=time.time_ns(),
+            )
+        )
+
+        assert _sample("agent_swarm_plan_store_append_latency_seconds_count") == before + 1
+
+    def test_cas_bytes(self, tmp_path):
+        cas = FileCAS(tmp_path)
+        put_before = _sample("agent_swarm_cas_bytes_total", operation="put")
+        get_before = _sample("agent_swarm_cas_bytes_total", operation="get")
+
+        h = cas.put(b"x" * 100)
+        cas.get(h)
+        cas.get_view(h)
+
+        assert _sample("agent_swarm_cas_bytes_total", operation="put") == put_before + 100
+        assert _sample("agent_swarm_cas_bytes_total", operation="get") == get_before + 200
+
+
+class TestHotMetrics:
+    """Test the lock-light hot-path metric types"""
+
+    def test_histogram_exposition(self):
+        hist = metrics.HotHistogram("test_hot_seconds", "test", ["gate"], buckets=[0.1, 1.0])
+        try:
+            hist.labels("a").observe(0.05)
+            hist.labels(gate="a").observe(0.5)
+            hist.labels("a").observe_many(5.0, 2)
+
+            assert _sample("test_hot_seconds_bucket", gate="a", le="0.1") == 1
+            assert _sample("test_hot_seconds_bucket", gate="a", le="1.0") == 2
+            assert _sample("test_hot_seconds_bucket", gate="a", le="+Inf") == 4
+            assert _sample("test_hot_seconds_count", gate="a") == 4
+            assert _sample("test_hot_seconds_sum", gate="a") == pytest.approx(10.55)
+        finally:
+            REGISTRY.unregister(hist)
+
+    def test_counter(self):
+        counter = metrics.HotCounter("test_hot_total", "test", ["kind"])
+        try:
+            counter.labels("x").inc()
+            counter.labels(kind="x").inc(2)
+
+            assert _sample("test_hot_total", kind="x") == 3
+            with pytest.raises(ValueError):
+                counter.labels("x").inc(-1)
+            with pytest.raises(ValueError):
+                counter.labels("x", "y")
+        finally:
+            REGISTRY.unregister(counter)
+
+    def test_unlabelled_metrics_keep_their_api(self):
+        """Existing unlabelled metrics take a bare observe and export from the start"""
+        assert REGISTRY.get_sample_value("agent_swarm_bus_publish_latency_seconds_count") is not None
+
+        before = _sample("agent_swarm_bus_publish_latency_seconds_count")
+        metrics.bus_publish_latency.observe(0.002)
+        metrics.track_time(metrics.policy_eval_latency)(lambda: None)()
+
+        assert _sample("agent_swarm_bus_publish_latency_seconds_count") == before + 1
+        assert REGISTRY.get_sample_value("agent_swarm_policy_eval_latency_seconds_count") >= 1
+
+    def test_base_is_abstract(self):
+        with pytest.raises(TypeError):
+            metrics._HotMetric("test_abstract_total", "test")
+
+
+class TestOffSwitch:
+    """Test disabling instrumentation"""
+
+    def test_disabled_records_nothing(self, tmp_path):
+        metrics.set_enabled(False)
+        cas = FileCAS(tmp_path)
+        enforcer = GateEnforcer(capsule_manager=CapsuleManager())
+        cas_before = _sample("agent_swarm_cas_bytes_total", operation="put")
+        gate_before = _sample("agent_swarm_policy_decisions_total", gate="ingress", decision="deny")
+
+        cas.put(b"quiet")
+        enforcer.ingress_validate({"operation": "NEED"})
+
+        assert _sample("agent_swarm_cas_bytes_total", operation="put") == cas_before
+        assert (
+            _sample("agent_swarm_policy_decisions_total", gate="ingress", decision="deny")
+            == gate_before
+        )
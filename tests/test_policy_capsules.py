@@ -1,7 +1,8 @@
 """
 Tests for Policy Capsules & Versioning
 
-Tests capsule creation, signing, distribution, and conformance validation.
+Tests capsule creation, signing, distribution, conformance validation, and
+activation of hash-pinned Rego capsules (compile once, hot swap).
 """
 
 import pytest
@@ -12,8 +13,11 @@ from unittest.mock import Mock, AsyncMock
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from policy.capsule import PolicyCapsule, CapsuleManager
+import policy
+from policy.capsule import PolicyCapsule, CapsuleManager, init_capsule_manager
 from policy.conformance import ConformanceChecker
+from policy.gates import GateEnforcer
+from policy.opa_engine import DEFAULT_POLICY_PATH
 
 
 @pytest.fixture
@@ -304,5 +308,174 @@ class TestCapsuleManager:
         assert len(capsules) == 2
 
 
+STRICT_POLICY = """
+package swarm.strict
+
+default allow = false
+
+allow {
+    input.kind == "NEED"
+}
+
+deny_reason = "only NEED is allowed" {
+    not allow
+}
+"""
+
+
+@pytest.fixture
+def rego_file(tmp_path):
+    """A Rego policy file that denies everything but NEED"""
+    path = tmp_path / "strict.rego"
+    path.write_text(STRICT_POLICY)
+    return path
+
+
+class TestCapsuleActivation:
+    """Tests for activating hash-pinned Rego capsules"""
+
+    def test_rego_capsule_pins_source(self, capsule_manager, rego_file):
+        """A .rego capsule carries its source, pinned by the policy hash"""
+        capsule = capsule_manager.create_capsule(wasm_path=rego_file, tests_passed=[])
+
+        assert capsule.policy_source == STRICT_POLICY
+        assert capsule.verify_artifact()
+        assert PolicyCapsule.from_json(capsule.to_json()) == capsule
+        assert capsule_manager.sign_capsule(capsule).policy_source == STRICT_POLICY
+
+    @pytest.mark.asyncio
+    async def test_receive_rejects_swapped_source(self, capsule_manager, rego_file):
+        """Source that does not hash to the pinned hash is rejected"""
+        capsule = capsule_manager.create_capsule(wasm_path=rego_file, tests_passed=[])
+        capsule.policy_source = STRICT_POLICY.replace("NEED", "FINAL")
+        signed = capsule_manager.sign_capsule(capsule)
+
+        assert not await capsule_manager.receive_capsule(signed)
+        assert capsule_manager.get_capsule(signed.policy_engine_hash) is None
+
+    @pytest.mark.asyncio
+    async def test_activation_compiles_once(self, capsule_manager, rego_file):
+        capsule = capsule_manager.sign_capsule(
+            capsule_manager.create_capsule(wasm_path=rego_file, tests_passed=[])
+        )
+        assert await capsule_manager.receive_capsule(capsule, activate=True)
+
+        active = capsule_manager.active
+        assert active.policy_hash == capsule.policy_engine_hash
+        assert active.capsule == capsule
+        assert active.compiled.policy_hash == capsule.policy_engine_hash
+        assert capsule_manager.active_policy_hash == capsule.policy_engine_hash
+
+        # Re-activating keeps the same snapshot
+        assert capsule_manager.activate_capsule(capsule.policy_engine_hash)
+        assert capsule_manager.active is active
+
+    @pytest.mark.asyncio
+    async def test_uncompilable_capsule_not_activated(self, capsule_manager, tmp_path):
+        path = tmp_path / "broken.rego"
+        path.write_text("package broken\n\nallow {\n")
+        capsule = capsule_manager.sign_capsule(
+            capsule_manager.create_capsule(wasm_path=path, tests_passed=[])
+        )
+
+        assert await capsule_manager.receive_capsule(capsule)
+        assert not capsule_manager.activate_capsule(capsule.policy_engine_hash)
+        assert capsule_manager.active_capsule is None
+
+    @pytest.mark.asyncio
+    async def test_gates_hot_swap(self, capsule_manager, rego_file):
+        """Activation swaps the policy the gates evaluate"""
+        enforcer = GateEnforcer(capsule_manager=capsule_manager)
+        envelope = {
+            "kind": "DECIDE",
+            "thread_id": "t",
+            "lamport": 1,
+            "actor_id": "a",
+            "payload_size": 0,
+        }
+        before = enforcer.opa_engine.evaluate(envelope)
+
+        capsule = capsule_manager.sign_capsule(
+            capsule_manager.create_capsule(wasm_path=rego_file, tests_passed=[])
+        )
+        assert await capsule_manager.receive_capsule(capsule, activate=True)
+
+        after = enforcer.opa_engine.evaluate(envelope)
+        assert before.allowed
+        assert not after.allowed
+        assert after.reasons == ["only NEED is allowed"]
+        assert enforcer.wasm_runtime.get_policy_hash() == capsule.policy_engine_hash
+        assert enforcer.wasm_runtime.evaluate(dict(envelope, kind="NEED")).allowed
+
+    @pytest.mark.asyncio
+    async def test_subscribe_activates_distributed_capsules(self, rego_file):
+        nats_client = Mock()
+        nats_client.subscribe = AsyncMock()
+        manager = CapsuleManager(nats_client=nats_client)
+        await manager.subscribe_capsules(signer_key="issuer-key", activate=True)
+
+        on_capsule = nats_client.subscribe.call_args.kwargs["cb"]
+        capsule = manager.create_capsule(wasm_path=rego_file, tests_passed=[])
+        unkeyed = manager.sign_capsule(capsule)
+        signed = manager.sign_capsule(capsule, signer_key="issuer-key")
+        await on_capsule(Mock(data=unkeyed.to_json().encode("utf-8")))
+        assert manager.active_capsule is None
+
+        await on_capsule(Mock(data=signed.to_json().encode("utf-8")))
+        await on_capsule(Mock(data=b"not a capsule"))
+
+        assert manager.active_capsule == signed
+
+    @pytest.mark.asyncio
+    async def test_subscribe_only_stores_by_default(self, rego_file):
+        nats_client = Mock()
+        nats_client.subscribe = AsyncMock()
+        manager = CapsuleManager(nats_client=nats_client)
+        await manager.subscribe_capsules()
+
+        on_capsule = nats_client.subscribe.call_args.kwargs["cb"]
+        capsule = manager.sign_capsule(manager.create_capsule(wasm_path=rego_file, tests_passed=[]))
+        await on_capsule(Mock(data=capsule.to_json().encode("utf-8")))
+
+        assert manager.get_capsule(capsule.policy_engine_hash) == capsule
+        assert manager.active_capsule is None
+
+    @pytest.mark.asyncio
+    async def test_subscribe_refuses_unkeyed_activation(self):
+        nats_client = Mock()
+        nats_client.subscribe = AsyncMock()
+        manager = CapsuleManager(nats_client=nats_client)
+
+        with pytest.raises(ValueError):
+            await manager.subscribe_capsules(activate=True)
+        nats_client.subscribe.assert_not_called()
+
+
+class TestCurrentPolicyHash:
+    """Tests for the cached envelope policy hash"""
+
+    @pytest.fixture(autouse=True)
+    def restore_policy_hash(self):
+        yield
+        policy.set_current_policy_hash(None)
+
+    def test_hash_is_constant_between_swaps(self):
+        assert policy.current_policy_hash() is policy.current_policy_hash()
+
+    @pytest.mark.asyncio
+    async def test_global_activation_swaps_hash(self):
+        builtin_hash = policy.current_policy_hash()
+        manager = init_capsule_manager()
+        capsule = manager.sign_capsule(
+            manager.create_capsule(wasm_path=DEFAULT_POLICY_PATH / "base.rego", tests_passed=[])
+        )
+
+        assert await manager.receive_capsule(capsule, activate=True)
+        assert policy.current_policy_hash() == capsule.policy_engine_hash
+
+        init_capsule_manager()
+        assert policy.current_policy_hash() == builtin_hash
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
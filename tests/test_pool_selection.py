@@ -445,6 +445,106 @@ class TestReputationTracking:
         rep_after_4_weeks = 0.8 * (0.95**4)
         assert abs(rep_after_4_weeks - 0.653) < 0.01
 
+    def test_reputation_decay_from_last_activity(self):
+        """Decay runs from the maintained last-activity time"""
+        ledger = CreditLedger(Path(tempfile.mktemp()))
+        stake_mgr = StakeManager(ledger)
+        pool = VerifierPool(stake_mgr)
+        reputation = ReputationTracker(pool)
+
+        ledger.create_account("verifier1", 10000)
+        stake_mgr.stake("verifier1", 5000)
+        metadata = VerifierMetadata("org_a", "AS1", "us-west", 0.8)
+        pool.register("verifier1", 5000, ["code_review"], metadata)
+        reputation.record_challenge("verifier1", True)
+
+        # Simulate 4 weeks without activity
+        four_weeks_ago = time.time_ns() - 4 * 7 * 24 * 3600 * 10**9
+        with pool.conn:
+            pool.conn.execute(
+                "UPDATE reputation_activity SET last_activity_ns = ? WHERE did = ?",
+                (four_weeks_ago, "verifier1"),
+            )
+
+        rep = reputation.get_reputation("verifier1")
+        assert abs(rep - 0.9 * 0.95**4) < 0.001
+
+        # Applying decay stores the decayed value without decaying it twice
+        assert abs(reputation.apply_decay("verifier1") - rep) < 0.001
+        assert abs(reputation.get_reputation("verifier1") - rep) < 0.001
+
+    def test_bulk_reputations(self):
+        """get_reputations matches get_reputation per DID"""
+        ledger = CreditLedger(Path(tempfile.mktemp()))
+        stake_mgr = StakeManager(ledger)
+        pool = VerifierPool(stake_mgr)
+        reputation = ReputationTracker(pool)
+
+        for i in range(5):
+            ledger.create_account(f"verifier{i}", 10000)
+            stake_mgr.stake(f"verifier{i}", 5000)
+            metadata = VerifierMetadata("org_a", "AS1", "us-west", 0.5 + i * 0.1)
+            pool.register(f"verifier{i}", 5000, ["code_review"], metadata)
+        reputation.record_attestation("verifier1", "task-1", False)
+
+        dids = [f"verifier{i}" for i in range(5)] + ["unknown"]
+        reputations = reputation.get_reputations(dids)
+
+        assert set(reputations) == set(dids[:5])
+        for did in dids[:5]:
+            assert reputations[did] == reputation.get_reputation(did)
+        assert reputation.get_reputation("unknown") == 0.0
+
+    def test_log_scores_rank_decayed_reputation(self):
+        """Log-space scores order verifiers by decayed reputation"""
+        ledger = CreditLedger(Path(tempfile.mktemp()))
+        stake_mgr = StakeManager(ledger)
+        pool = VerifierPool(stake_mgr)
+        reputation = ReputationTracker(pool)
+
+        week_ns = 7 * 24 * 3600 * 10**9
+        now = time.time_ns()
+        # (stored reputation, weeks since last activity)
+        verifiers = {"stale_high": (0.9, 10), "fresh_mid": (0.7, 1), "fresh_low": (0.5, 0)}
+        for did, (rep, weeks) in verifiers.items():
+            ledger.create_account(did, 10000)
+            stake_mgr.stake(did, 5000)
+            pool.register(did, 5000, ["code_review"], VerifierMetadata("o", "AS", "r", rep))
+            with pool.conn:
+                pool.conn.execute(
+                    "INSERT INTO reputation_activity (did, last_activity_ns) VALUES (?, ?)",
+                    (did, now - weeks * week_ns),
+                )
+
+        scores = reputation.get_log_scores(verifiers)
+        reputations = reputation.get_reputations(verifiers)
+
+        by_score = sorted(verifiers, key=scores.get)
+        by_reputation = sorted(verifiers, key=reputations.get)
+        assert by_score == by_reputation == ["fresh_low", "stale_high", "fresh_mid"]
+
+    def test_last_activity_backfilled(self):
+        """Events recorded before the activity table existed are backfilled"""
+        ledger = CreditLedger(Path(tempfile.mktemp()))
+        stake_mgr = StakeManager(ledger)
+        pool = VerifierPool(stake_mgr)
+        reputation = ReputationTracker(pool)
+
+        ledger.create_account("verifier1", 10000)
+        stake_mgr.stake("verifier1", 5000)
+        metadata = VerifierMetadata("org_a", "AS1", "us-west", 0.8)
+        pool.register("verifier1", 5000, ["code_review"], metadata)
+        reputation.record_challenge("verifier1", True)
+
+        with pool.conn:
+            pool.conn.execute("DROP TABLE reputation_activity")
+        ReputationTracker(pool)
+
+        row = pool.conn.execute(
+            "SELECT last_activity_ns FROM reputation_activity WHERE did = ?", ("verifier1",)
+        ).fetchone()
+        assert row[0] == reputation.get_reputation_history("verifier1")[0].timestamp
+
     def test_reputation_history(self):
         """Test reputation event tracking"""
         ledger = CreditLedger(Path(tempfile.mktemp()))
@@ -471,6 +571,28 @@ class TestReputationTracking:
 class TestIntegration:
     """Integration tests for complete workflows"""
 
+    def test_selection_fetches_reputations_in_bulk(self, monkeypatch):
+        """Committee selection does not query reputation per verifier"""
+        ledger = CreditLedger(Path(tempfile.mktemp()))
+        stake_mgr = StakeManager(ledger)
+        pool = VerifierPool(stake_mgr)
+        reputation = ReputationTracker(pool)
+        selector = VerifierSelector(pool, reputation)
+
+        for i in range(10):
+            ledger.create_account(f"verifier{i}", 10000)
+            stake_mgr.stake(f"verifier{i}", 5000)
+            metadata = VerifierMetadata(f"org_{i}", f"AS{i}", f"region_{i % 3}", 0.8)
+            pool.register(f"verifier{i}", 5000, ["code_review"], metadata)
+
+        def per_verifier(did):
+            raise AssertionError("get_reputation called per verifier")
+
+        monkeypatch.setattr(reputation, "get_reputation", per_verifier)
+
+        committee = selector.select_committee(k=5)
+        assert len(committee) == 5
+
     def test_complete_selection_workflow(self):
         """Test complete workflow: register → reputation → select"""
         ledger = CreditLedger(Path(tempfile.mktemp()))
@@ -0,0 +1,228 @@
+"""
+Tests for batched, pipelined publishing.
+
+Tests:
+- ConnectionPool waits on its semaphore instead of polling
+- publish_raw_many writes the whole batch before awaiting acks
+- publish_many validates every envelope before publishing any
+- Batched publishes against a local nats-server (skipped if not installed)
+"""
+
+import sys
+import os
+import asyncio
+import base64
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+from nacl.signing import SigningKey
+
+import bus
+from bus import ConnectionPool
+from policy import PolicyError
+from policy.gates import PolicyDecision, PolicyGate
+
+
+@pytest.fixture
+def signing_keys():
+    sk = SigningKey.generate()
+    with patch.dict(
+        os.environ,
+        {
+            "SWARM_SIGNING_SK_B64": base64.b64encode(bytes(sk)).decode(),
+            "SWARM_VERIFY_PK_B64": base64.b64encode(bytes(sk.verify_key)).decode(),
+        },
+    ):
+        yield
+
+
+def _signed(n: int) -> dict:
+    from envelope import make_envelope, sign_envelope
+
+    return sign_envelope(
+        make_envelope(kind="PROPOSE", thread_id="t1", sender_pk_b64="pk", payload={"n": n})
+    )
+
+
+class FakeJetStream:
+    """Records publishes; acks resolve only when the test says so"""
+
+    def __init__(self):
+        self.published = []
+        self.futures = []
+
+    async def publish_async(self, subject, payload):
+        self.published.append((subject, json.loads(payload)))
+        future = asyncio.get_running_loop().create_future()
+        self.futures.append(future)
+        return future
+
+    def ack_all(self):
+        for seq, future in enumerate(self.futures, start=1):
+            future.set_result(seq)
+
+
+@pytest.fixture
+def fake_js():
+    js = FakeJetStream()
+    with patch.object(bus, "connect", AsyncMock(return_value=(AsyncMock(), js))), patch.object(
+        bus, "_connection_pool", ConnectionPool()
+    ), patch.object(bus, "log_event"):
+        yield js
+
+
+class TestConnectionPool:
+    """Test semaphore-bounded connection reuse"""
+
+    @pytest.mark.asyncio
+    async def test_waits_for_release(self):
+        conns = [(Mock(), Mock()), (Mock(), Mock())]
+        with patch.object(bus, "connect", AsyncMock(side_effect=conns)) as connect:
+            pool = ConnectionPool(max_size=1)
+            first = await pool.get()
+
+            waiting = asyncio.ensure_future(pool.get())
+            await asyncio.sleep(0.01)
+            assert not waiting.done()
+
+            await pool.release(first)
+            assert await waiting is first
+            assert connect.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_connect_frees_slot(self):
+        conn = (Mock(), Mock())
+        with patch.object(bus, "connect", AsyncMock(side_effect=[OSError("down"), conn])):
+            pool = ConnectionPool(max_size=1)
+            with pytest.raises(OSError):
+                await pool.get()
+
+            assert await asyncio.wait_for(pool.get(), 1.0) is conn
+
+    @pytest.mark.asyncio
+    async def test_connection_context_releases(self):
+        conn = (Mock(), Mock())
+        with patch.object(bus, "connect", AsyncMock(return_value=conn)):
+            pool = ConnectionPool(max_size=1)
+            with pytest.raises(RuntimeError):
+                async with pool.connection():
+                    raise RuntimeError("boom")
+
+            async with pool.connection() as reused:
+                assert reused is conn
+
+
+class TestPublishRawMany:
+    """Test pipelined publishing with grouped acks"""
+
+    @pytest.mark.asyncio
+    async def test_writes_all_before_acks(self, fake_js):
+        messages = [(f"thread.t1.s{i}", {"kind": "PROPOSE", "n": i}) for i in range(10)]
+        task = asyncio.ensure_future(bus.publish_raw_many("t1", messages))
+        await asyncio.sleep(0.01)
+
+        # Whole batch is on the wire while no ack has arrived
+        assert fake_js.published == messages
+        assert not task.done()
+
+        fake_js.ack_all()
+        assert await task == list(range(1, 11))
+        assert bus.log_event.call_count == 10
+
+    @pytest.mark.asyncio
+    async def test_ack_timeout(self, fake_js):
+        with pytest.raises(asyncio.TimeoutError):
+            await bus.publish_raw_many("t1", [("thread.t1.x", {"kind": "NEED"})], timeout=0.05)
+        bus.log_event.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, fake_js):
+        assert await bus.publish_raw_many("t1", []) == []
+        bus.connect.assert_not_awaited()
+
+
+class TestPublishMany:
+    """Test envelope validation ahead of a batch"""
+
+    @pytest.mark.asyncio
+    async def test_invalid_envelope_publishes_nothing(self, signing_keys, fake_js):
+        envelopes = [("thread.t1.propose", _signed(i)) for i in range(3)]
+        envelopes[1][1]["payload"]["n"] = 99  # breaks the signature
+
+        with pytest.raises(PolicyError):
+            await bus.publish_many("t1", envelopes)
+        assert fake_js.published == []
+
+    @pytest.mark.asyncio
+    async def test_preflight_denial_publishes_nothing(self, signing_keys, fake_js):
+        envelopes = [("thread.t1.propose", _signed(i)) for i in range(3)]
+
+        with pytest.raises(ValueError, match="Preflight"):
+            await bus.publish_many("t1", envelopes)
+        assert fake_js.published == []
+
+    @pytest.mark.asyncio
+    async def test_publishes_batch_in_order(self, signing_keys, fake_js):
+        envelopes = [("thread.t1.propose", _signed(i)) for i in range(5)]
+        allow = PolicyDecision(allowed=True, gate=PolicyGate.PREFLIGHT)
+
+        with patch.object(
+            bus.get_gate_enforcer(), "preflight_validate", return_value=allow
+        ), patch.object(bus, "TRACING_ENABLED", False):
+            task = asyncio.ensure_future(bus.publish_many("t1", envelopes))
+            await asyncio.sleep(0.01)
+            fake_js.ack_all()
+            acks = await task
+
+        assert acks == list(range(1, 6))
+        assert [env["payload"]["n"] for _, env in fake_js.published] == list(range(5))
+
+
+@pytest.fixture
+def nats_bus(nats_server):
+    """Point the bus at the local nats-server with a fresh pool"""
+    with patch.object(bus, "NATS_URL", nats_server), patch.object(
+        bus, "_connection_pool", ConnectionPool()
+    ), patch.object(bus, "log_event"):
+        yield nats_server
+
+
+class TestPublishAgainstServer:
+    """Test batched publishes against a real JetStream server"""
+
+    @pytest.mark.asyncio
+    async def test_batch_lands_in_order(self, nats_bus):
+        messages = [("thread.t3.propose", {"kind": "PROPOSE", "n": i}) for i in range(200)]
+        acks = await bus.publish_raw_many("t3", messages)
+        await bus._connection_pool.close_all()
+
+        assert [ack.seq for ack in acks] == list(range(1, 201))
+
+        nc, js = await bus.connect()
+        psub = await js.pull_subscribe("thread.t3.propose", durable="check")
+        received = []
+        while len(received) < 200:
+            for msg in await psub.fetch(100, timeout=5):
+                received.append(json.loads(msg.data)["n"])
+                await msg.ack()
+        await nc.close()
+
+        assert received == list(range(200))
+
+    @pytest.mark.asyncio
+    async def test_concurrent_batches_share_pool(self, nats_bus):
+        pool = ConnectionPool(max_size=2)
+        with patch.object(bus, "_connection_pool", pool):
+            batches = [
+                [(f"thread.t4.s{b}", {"kind": "NEED", "n": i}) for i in range(20)] for b in range(6)
+            ]
+            results = await asyncio.gather(*(bus.publish_raw_many("t4", b) for b in batches))
+            opened = len(pool._pool)
+            await pool.close_all()
+
+        assert all(len(acks) == 20 for acks in results)
+        assert opened <= 2
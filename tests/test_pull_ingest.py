@@ -0,0 +1,266 @@
+"""
+Tests for pull-consumer ingest.
+
+Tests:
+- PullConsumer fetch sizing and max_ack_pending flow control
+- Ack batching
+- Pull subscribers against a local nats-server (skipped if not installed)
+"""
+
+import sys
+import os
+import asyncio
+import json
+from unittest.mock import patch
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+
+import bus
+from bus import PullConsumer
+
+
+class FakeMsg:
+    """Stand-in for a fetched JetStream message"""
+
+    def __init__(self, data: bytes, outcomes: list):
+        self.data = data
+        self._outcomes = outcomes
+
+    async def ack(self):
+        self._outcomes.append(("ack", self.data))
+
+    async def nak(self):
+        self._outcomes.append(("nak", self.data))
+
+    async def term(self):
+        self._outcomes.append(("term", self.data))
+
+
+class FakePullSub:
+    """Pull subscription serving queued messages, then reporting the connection closed"""
+
+    def __init__(self, msgs):
+        self.msgs = list(msgs)
+        self.requests = []
+
+    async def fetch(self, batch=1, timeout=5):
+        from nats.errors import ConnectionClosedError
+
+        self.requests.append(batch)
+        if not self.msgs:
+            raise ConnectionClosedError
+        fetched, self.msgs = self.msgs[:batch], self.msgs[batch:]
+        return fetched
+
+
+class TestPullConsumer:
+    """Test batch fetch, flow control and ack batching"""
+
+    @pytest.mark.asyncio
+    async def test_fetch_limited_by_unsettled(self):
+        outcomes = []
+        sub = FakePullSub(FakeMsg(str(i).encode(), outcomes) for i in range(20))
+        consumer = PullConsumer(sub, batch_size=4, max_ack_pending=6, ack_batch=100)
+        batches = consumer.batches()
+
+        first = await batches.__anext__()
+        second = await batches.__anext__()
+        assert (len(first), len(second)) == (4, 2)
+        assert sub.requests == [4, 2]
+
+        # Six messages unsettled: no fetch until some are settled
+        waiting = asyncio.ensure_future(batches.__anext__())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+        await first[0].ack()
+        await first[1].term()
+        third = await waiting
+
+        assert len(third) == 2
+        assert sub.requests == [4, 2, 2]
+        assert consumer.in_flight == 6
+        # Buffered ack went out before the fetch
+        assert ("ack", b"0") in outcomes
+        await batches.aclose()
+
+    @pytest.mark.asyncio
+    async def test_acks_sent_in_batches(self):
+        outcomes = []
+        sub = FakePullSub(FakeMsg(str(i).encode(), outcomes) for i in range(5))
+        consumer = PullConsumer(sub, batch_size=5, ack_batch=3)
+        msgs = await consumer.batches().__anext__()
+
+        await msgs[0].ack()
+        await msgs[1].ack()
+        assert outcomes == []
+
+        await msgs[2].ack()
+        assert [action for action, _ in outcomes] == ["ack"] * 3
+        assert consumer.in_flight == 2
+
+        await msgs[3].ack()
+        await consumer.flush()
+        assert len(outcomes) == 4
+        assert consumer.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_handler_settles_batch(self):
+        """A handler raising mid-batch is nak'ed and nothing stays in flight"""
+        outcomes = []
+        envelopes = [{"kind": "NEED", "thread_id": "t1", "lamport": i} for i in range(4)]
+        sub = FakePullSub(FakeMsg(json.dumps(env).encode(), outcomes) for env in envelopes)
+        consumer = PullConsumer(sub, batch_size=4, max_ack_pending=4, ack_batch=100)
+
+        async def handler(env):
+            if env["lamport"] == 1:
+                raise RuntimeError("boom")
+
+        checked = [(env, None, None) for env in envelopes]
+        with patch.object(bus, "log_event"), patch.object(
+            bus, "_check_batch", return_value=checked
+        ), patch.object(bus, "TRACING_ENABLED", False):
+            await bus._pull_ingest("t1", "thread.t1.need", consumer, handler)
+        await consumer.flush()
+
+        assert consumer.in_flight == 0
+        assert sorted(action for action, _ in outcomes) == ["ack", "ack", "ack", "nak"]
+
+    @pytest.mark.asyncio
+    async def test_failed_delivery_releases_window(self):
+        """Messages left unsettled by a failed delivery free their slots"""
+        outcomes = []
+        sub = FakePullSub(FakeMsg(str(i).encode(), outcomes) for i in range(4))
+        consumer = PullConsumer(sub, batch_size=4, max_ack_pending=4, ack_batch=100)
+
+        with patch.object(bus, "_check_batch", return_value=[]), patch.object(
+            bus, "_deliver_batch", side_effect=ConnectionError("lost")
+        ):
+            with pytest.raises(ConnectionError):
+                await bus._pull_ingest("t1", "thread.t1.need", consumer, None)
+
+        assert consumer.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_ends_when_connection_closes(self):
+        outcomes = []
+        sub = FakePullSub(FakeMsg(b"x", outcomes) for _ in range(3))
+        consumer = PullConsumer(sub, batch_size=2)
+
+        seen = []
+        async for msgs in consumer.batches():
+            for msg in msgs:
+                seen.append(msg.data)
+                await msg.ack()
+
+        assert seen == [b"x"] * 3
+        assert len(outcomes) == 3
+
+
+@pytest.fixture
+def nats_bus(nats_server):
+    """Point the bus at the local nats-server"""
+    with patch.object(bus, "NATS_URL", nats_server), patch.object(
+        bus, "_shared_connection", None
+    ), patch.object(bus, "log_event"):
+        yield nats_server
+
+
+async def _wait_for(condition, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+class TestPullAgainstServer:
+    """Test pull subscribers against a real JetStream server"""
+
+    @pytest.mark.asyncio
+    async def test_shared_connection_reused(self, nats_bus):
+        nc, js = await bus.shared_connection()
+        assert (nc, js) == await bus.shared_connection()
+        await nc.close()
+
+        # Reconnects once closed
+        nc2, _ = await bus.shared_connection()
+        assert nc2 is not nc and nc2.is_connected
+        await nc2.close()
+
+    @pytest.mark.asyncio
+    async def test_subscribe_pull_delivers_in_order(self, nats_bus):
+        nc, js = await bus.shared_connection()
+        for i in range(50):
+            await js.publish("thread.t1.worker", json.dumps({"n": i}).encode())
+
+        received = []
+
+        async def handler(message):
+            received.append(message["n"])
+
+        task = asyncio.create_task(
+            bus.subscribe("t1", "thread.t1.worker", handler, pull=True, batch_size=8)
+        )
+        await _wait_for(lambda: len(received) == 50)
+        # Let the final batched acks go out ahead of the next fetch
+        await asyncio.sleep(0.1)
+
+        info = await js.consumer_info(bus.STREAM, "thread_t1_worker")
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await nc.close()
+
+        assert received == list(range(50))
+        assert info.num_ack_pending == 0
+        assert info.num_pending == 0
+
+    @pytest.mark.asyncio
+    async def test_max_ack_pending_backpressure(self, nats_bus):
+        """Concurrent handlers never hold more than max_ack_pending messages"""
+        nc, js = await bus.shared_connection()
+        for i in range(20):
+            await js.publish("thread.t2.need", json.dumps({"kind": "NEED", "n": i}).encode())
+
+        release = asyncio.Event()
+        started = []
+
+        async def complete(env):
+            await release.wait()
+
+        def handler(env):
+            started.append(env["n"])
+            return asyncio.ensure_future(complete(env))
+
+        def accept_all(datas, policy_hash=None):
+            return [(json.loads(data), None, None) for data in datas]
+
+        with patch.object(bus, "_check_batch", accept_all):
+            task = asyncio.create_task(
+                bus.subscribe_envelopes(
+                    "t2",
+                    "thread.t2.need",
+                    handler,
+                    pull=True,
+                    concurrent=True,
+                    batch_size=4,
+                    max_ack_pending=5,
+                )
+            )
+            await _wait_for(lambda: len(started) == 5)
+            await asyncio.sleep(0.2)
+            assert len(started) == 5
+
+            release.set()
+            await _wait_for(lambda: len(started) == 20)
+            await asyncio.sleep(0.1)
+
+            info = await js.consumer_info(bus.STREAM, "thread_t2_need")
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await nc.close()
+
+        assert started == list(range(20))
+        assert info.num_ack_pending == 0
@@ -0,0 +1,359 @@
+"""
+Tests for the in-process Rego subset compiler.
+
+Tests:
+- base.rego decisions and deny reasons
+- OPA undefined/default semantics
+- Conformance suite (Python checks and conformance_tests.rego)
+- Compile cache and unsupported constructs
+- Metered evaluation: per-instruction gas and mid-evaluation limits
+- OPAEngine backend selection
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from policy.conformance import ConformanceChecker
+from policy.gas_meter import GasExceededError, GasMeter
+from policy.opa_engine import DEFAULT_POLICY_PATH, BasePolicyEngine, OPAEngine
+from policy.rego_compiler import RegoCompileError, compile_policy, load_policy
+
+BASE_REGO = DEFAULT_POLICY_PATH / "base.rego"
+
+
+def _envelope(**overrides):
+    envelope = {
+        "kind": "NEED",
+        "thread_id": "thread-1",
+        "lamport": 1,
+        "actor_id": "agent-1",
+        "payload_size": 100,
+    }
+    envelope.update(overrides)
+    return {k: v for k, v in envelope.items() if v is not None}
+
+
+SAMPLE_ENVELOPES = [
+    _envelope(),
+    _envelope(kind="DECIDE", payload_size=0),
+    _envelope(kind="INVALID"),
+    _envelope(payload_size=1048575),
+    _envelope(payload_size=1048576),
+    _envelope(thread_id=None),
+    _envelope(kind=None, lamport=None),
+    _envelope(kind="bogus", actor_id=None, payload_size=5_000_000),
+]
+
+
+class TestBasePolicy:
+    """Test the compiled base.rego"""
+
+    def test_compiles(self):
+        policy = load_policy(BASE_REGO)
+        assert policy.package == "swarm.policy"
+        assert {"allow", "deny_reason", "allowed_kinds"} <= set(policy.rule_names)
+
+    @pytest.mark.parametrize("envelope", SAMPLE_ENVELOPES)
+    def test_matches_python_rules(self, envelope):
+        """Compiled Rego agrees with the built-in rules when payload_size is set"""
+        engine = OPAEngine()
+        assert engine.backend == "compiled"
+        assert engine.evaluate(envelope).allowed == BasePolicyEngine().evaluate(envelope).allowed
+
+    def test_deny_reasons(self):
+        """Every failing deny_reason definition contributes a reason"""
+        result = OPAEngine().evaluate(
+            _envelope(kind="bogus", thread_id=None, payload_size=2_000_000)
+        )
+
+        assert not result.allowed
+        assert result.reasons == [
+            "Invalid message kind: bogus",
+            "Payload too large: 2000000 bytes (max: 1048576)",
+            "Missing required fields (kind, thread_id, lamport, actor_id)",
+        ]
+        assert result.gas_used > 0
+
+    def test_missing_payload_size_is_undefined(self):
+        """As in OPA, comparing an undefined field denies without a reason"""
+        result = OPAEngine().evaluate(_envelope(payload_size=None))
+
+        assert not result.allowed
+        assert result.reasons == ["Denied by swarm.policy.allow"]
+
+    def test_lamport_zero_allowed(self):
+        """A falsy field value (lamport 0) is present, not missing"""
+        result = OPAEngine().evaluate(_envelope(lamport=0))
+
+        assert result.allowed
+        assert not any("Missing required fields" in r for r in result.reasons)
+
+    def test_policy_version_read_from_rego(self):
+        assert OPAEngine().evaluate(_envelope()).policy_version == "1.0.0"
+
+    def test_evaluation_is_fast(self):
+        """Evaluation costs microseconds, not a process spawn"""
+        engine = OPAEngine()
+        envelope = _envelope()
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            engine.evaluate(envelope)
+        per_eval = (time.perf_counter() - start) / 1000
+
+        assert per_eval < 1e-3
+
+
+class TestConformance:
+    """Test the conformance suites against the compiled policy"""
+
+    def test_python_conformance_suite(self):
+        checker = ConformanceChecker()
+        passed = checker.run_tests()
+        assert checker.get_test_coverage(passed)["is_conformant"]
+
+    def test_rego_conformance_suite(self):
+        """All test_* rules in conformance_tests.rego pass"""
+        passed = ConformanceChecker().run_rego_tests()
+        assert set(passed) == set(
+            ConformanceChecker.REQUIRED_TESTS + ConformanceChecker.OPTIONAL_TESTS
+        )
+
+    def test_failing_rego_test_detected(self):
+        """A test rule that asserts the wrong decision fails"""
+        policy = load_policy(BASE_REGO)
+        tests = compile_policy(
+            """
+            package swarm.conformance
+            test_wrong {
+                allow with input as {"kind": "INVALID", "thread_id": "t", "lamport": 1, "actor_id": "a", "payload_size": 1}
+            }
+            test_right {
+                not allow with input as {"kind": "INVALID"}
+            }
+            """,
+            imports=[policy],
+        )
+        assert tests.run_tests() == ["test_right"]
+
+
+class TestSemantics:
+    """Test expression semantics of the supported subset"""
+
+    def test_values_builtins_and_data_refs(self):
+        policy = compile_policy("""
+            package example.rules
+
+            import future.keywords.in
+
+            default tier = "none"
+
+            limit := 10
+
+            tier = "gold" if {
+                input.score * 2 >= limit + 4
+                count(input.tags) > 1
+                "vip" in input.tags
+            }
+
+            label = msg {
+                name := lower(input.name)
+                msg := sprintf("%v has %d tags", [name, count(input.tags)])
+            }
+
+            via_data {
+                data.example.rules.tier == "gold"
+                input.nested.items[1] == "b"
+            }
+            """)
+        doc = {"score": 7, "tags": ["vip", "x"], "name": "ADA", "nested": {"items": ["a", "b"]}}
+
+        assert policy.query("tier", doc) == "gold"
+        assert policy.query("tier", {"score": 1, "tags": []}) == "none"
+        assert policy.query("label", doc) == "ada has 2 tags"
+        assert policy.query("via_data", doc) is True
+        assert policy.query("via_data", {"score": 1}) is None
+
+    def test_type_aware_equality(self):
+        """true does not equal 1, unlike in Python"""
+        policy = compile_policy("package t\nis_one { input.x == 1 }")
+        assert policy.query("is_one", {"x": 1}) is True
+        assert policy.query("is_one", {"x": True}) is None
+
+    @pytest.mark.parametrize("value", [0, 0.0, "", [], {}])
+    def test_falsy_values_do_not_fail(self, value):
+        """Only undefined and false fail a statement, as in OPA"""
+        policy = compile_policy("package t\nholds { input.x }\nnegated { not input.x }")
+
+        assert policy.query("holds", {"x": value}) is True
+        assert policy.query("negated", {"x": value}) is None
+
+    def test_false_and_undefined_fail(self):
+        policy = compile_policy("package t\nholds { input.x }\nnegated { not input.x }")
+
+        for doc in ({"x": False}, {}):
+            assert policy.query("holds", doc) is None
+            assert policy.query("negated", doc) is True
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            "package t\nallow { some x in input.items }",
+            "package t\nallow { input.items[_] == 1 }",
+            "package t\ndeny[msg] { msg := 1 }",
+            "package t\nf(x) = x",
+            "package t\nallow { unknown_thing }",
+            "package t\nallow { glob.match(input.a, [], input.b) }",
+            "package t\nimport data.other",
+        ],
+    )
+    def test_unsupported_constructs(self, source):
+        with pytest.raises(RegoCompileError):
+            compile_policy(source)
+
+    def test_compile_cache(self):
+        """Identical sources share one compilation"""
+        source = BASE_REGO.read_text()
+        assert compile_policy(source) is compile_policy(source)
+        assert compile_policy(source).policy_hash == OPAEngine().policy_hash
+
+
+SCAN_POLICY = """
+package t
+
+allow {
+    input.ok
+    input.needle in input.haystack
+}
+"""
+
+
+class TestMetering:
+    """Test gas accounting in the metered plan"""
+
+    @pytest.mark.parametrize("envelope", SAMPLE_ENVELOPES)
+    def test_metered_matches_unmetered(self, envelope):
+        policy = load_policy(BASE_REGO)
+        rules = ("allow", "deny_reason")
+        meter = GasMeter()
+
+        assert policy.evaluate(envelope, rules, meter)[0] == policy.evaluate(envelope, rules)[0]
+        assert meter.used > 0
+
+    def test_gas_follows_work_done(self):
+        policy = compile_policy(SCAN_POLICY)
+
+        def gas(doc):
+            meter = GasMeter()
+            policy.evaluate(doc, ["allow"], meter)
+            return meter.used
+
+        short = gas({"ok": True, "needle": 1, "haystack": [1] * 10})
+        long = gas({"ok": True, "needle": 1, "haystack": [1] * 100})
+
+        assert long - short == 90 * GasMeter.COST_ITERATION_PER_ITEM
+        assert gas({"ok": False, "needle": 1, "haystack": [1] * 100}) < short
+
+    def test_limit_enforced_mid_evaluation(self):
+        """The scan is never run; the meter records gas up to the failing charge"""
+        policy = compile_policy(SCAN_POLICY)
+        meter = GasMeter(gas_limit=1000)
+        doc = {"ok": True, "needle": -1, "haystack": list(range(1_000_000))}
+
+        with patch("policy.rego_compiler._contains") as contains:
+            with pytest.raises(GasExceededError):
+                policy.evaluate(doc, ["allow"], meter)
+
+        contains.assert_not_called()
+        assert meter.used > meter.limit
+
+    def test_disabled_meter_counts_without_limit(self):
+        policy = compile_policy(SCAN_POLICY)
+        meter = GasMeter(gas_limit=10)
+        meter.disable()
+
+        values, _ = policy.evaluate(
+            {"ok": True, "needle": 3, "haystack": [1, 2, 3]}, ["allow"], meter
+        )
+
+        assert values["allow"] == [True]
+        assert meter.used > 10
+
+    def test_with_input_charges_outer_meter(self):
+        policy = compile_policy("""
+            package t
+
+            inner { input.a == 1 }
+
+            outer { inner with input as {"a": 1} }
+            """)
+        plain, with_override = GasMeter(), GasMeter()
+        policy.evaluate({"a": 1}, ["inner"], plain)
+        policy.evaluate({}, ["outer"], with_override)
+
+        assert with_override.used > plain.used
+
+
+class TestBackendSelection:
+    """Test OPAEngine backend fallbacks"""
+
+    def test_unsupported_policy_falls_back(self, tmp_path, monkeypatch):
+        """Policies outside the subset use OPA server or Python rules"""
+        (tmp_path / "base.rego").write_text("package swarm.policy\nallow { some k in input }\n")
+        monkeypatch.setattr(OPAEngine, "_check_opa_binary", lambda self: False)
+
+        engine = OPAEngine(policy_path=tmp_path)
+
+        assert engine.backend == "python"
+        assert engine.evaluate(_envelope()).allowed
+
+    def test_missing_policy_uses_python_rules(self, tmp_path):
+        engine = OPAEngine(policy_path=tmp_path)
+        assert engine.backend == "python"
+        assert not engine.evaluate(_envelope(kind="INVALID")).allowed
+
+
+@pytest.mark.skipif(shutil.which("opa") is None, reason="OPA binary not installed")
+class TestAgainstOPABinary:
+    """Cross-check decisions with the real OPA binary"""
+
+    @pytest.mark.parametrize("envelope", SAMPLE_ENVELOPES + [_envelope(payload_size=None)])
+    def test_allow_matches_opa_eval(self, envelope):
+        result = subprocess.run(
+            [
+                "opa",
+                "eval",
+                "--data",
+                str(BASE_REGO),
+                "--stdin-input",
+                "--format",
+                "json",
+                "data.swarm.policy.allow",
+            ],
+            input=json.dumps(envelope).encode(),
+            capture_output=True,
+            timeout=30,
+        )
+        output = json.loads(result.stdout)
+        expected = output["result"][0]["expressions"][0]["value"]
+
+        assert OPAEngine().evaluate(envelope).allowed is expected
+
+    def test_opa_server_backend(self):
+        engine = OPAEngine(use_opa_binary=True)
+        try:
+            assert engine.backend == "opa_server"
+            for envelope in SAMPLE_ENVELOPES:
+                expected = BasePolicyEngine().evaluate(envelope).allowed
+                assert engine.evaluate(envelope).allowed is expected
+        finally:
+            engine.close()
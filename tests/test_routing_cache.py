@@ -0,0 +1,249 @@
+"""
+Tests for the Routing Decision Cache
+
+Tests NEED fingerprinting, TTL expiry, incremental invalidation on registry
+changes and the router's use of cached shortlists.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from routing.cache import RoutingCache, fingerprint_need
+from routing.manifests import AgentManifest, ManifestRegistry
+from routing.metrics import MetricsCollector
+from routing.router import IntelligentRouter
+from routing.scoring import ScoredAgent
+
+
+def make_agent(agent_id, capabilities, **kwargs):
+    return AgentManifest(
+        agent_id=agent_id,
+        capabilities=capabilities,
+        io_schema={},
+        tags=kwargs.pop("tags", ["python"]),
+        price_per_task=kwargs.pop("price_per_task", 10.0),
+        avg_latency_ms=kwargs.pop("avg_latency_ms", 500.0),
+        **kwargs,
+    )
+
+
+def shortlist(*agents):
+    return [ScoredAgent(manifest=a, total_score=1.0, score_breakdown={}) for a in agents]
+
+
+@pytest.fixture
+def registry():
+    registry = ManifestRegistry()
+    registry.register(make_agent("coder", ["code_gen"]))
+    registry.register(make_agent("reviewer", ["code_gen", "review"]))
+    registry.register(make_agent("analyst", ["data"]))
+    return registry
+
+
+@pytest.fixture
+def router(registry):
+    return IntelligentRouter(
+        registry=registry,
+        metrics_collector=MetricsCollector(),
+        enable_canary=False,
+        enable_bandit=False,
+    )
+
+
+class TestFingerprint:
+    """Tests for NEED fingerprinting"""
+
+    def test_ignores_non_routing_fields(self):
+        """need_id and description do not change the fingerprint"""
+        need1 = {"need_id": "a", "description": "x", "capabilities": ["code_gen"]}
+        need2 = {"need_id": "b", "description": "y", "capabilities": ["code_gen"]}
+
+        assert fingerprint_need(need1) == fingerprint_need(need2)
+
+    def test_capability_and_tag_order_ignored(self):
+        """Capabilities and tags are compared as sets"""
+        need1 = {"capabilities": ["a", "b"], "tags": ["x", "y"]}
+        need2 = {"capabilities": ["b", "a", "a"], "tags": ["y", "x"]}
+
+        assert fingerprint_need(need1) == fingerprint_need(need2)
+
+    def test_routing_fields_distinguish(self):
+        """Changing a routing field changes the fingerprint"""
+        base = {"capabilities": ["code_gen"], "max_price": 50.0}
+
+        assert fingerprint_need(base) != fingerprint_need({**base, "max_price": 60.0})
+        assert fingerprint_need(base) != fingerprint_need({**base, "zone": "us-west-2"})
+        assert fingerprint_need(base) != fingerprint_need(
+            {**base, "constraints": {"min_memory_gb": 4}}
+        )
+        assert fingerprint_need(base) != fingerprint_need(base, {"max_stake": 10.0})
+
+    def test_nested_key_order_ignored(self):
+        """Schemas and constraints are canonicalized"""
+        need1 = {"input_schema": {"type": "object", "required": ["a"]}}
+        need2 = {"input_schema": {"required": ["a"], "type": "object"}}
+
+        assert fingerprint_need(need1) == fingerprint_need(need2)
+
+
+class TestRoutingCache:
+    """Tests for cache lookup, expiry and invalidation"""
+
+    def test_hit_and_miss_counts(self, registry):
+        """Lookups are counted"""
+        cache = RoutingCache()
+        need = {"capabilities": ["code_gen"]}
+        key = fingerprint_need(need)
+
+        assert cache.get(key) is None
+        cache.put(key, need, shortlist(registry.get("coder")))
+        assert [s.manifest.agent_id for s in cache.get(key)] == ["coder"]
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_ttl_expiry(self, registry, monkeypatch):
+        """Entries expire after the TTL"""
+        now = [1000.0]
+        monkeypatch.setattr("routing.cache.time.time", lambda: now[0])
+
+        cache = RoutingCache(ttl_seconds=10.0)
+        need = {"capabilities": ["code_gen"]}
+        key = fingerprint_need(need)
+        cache.put(key, need, shortlist(registry.get("coder")))
+
+        now[0] += 9.0
+        assert cache.get(key) is not None
+
+        now[0] += 2.0
+        assert cache.get(key) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self, registry):
+        """Least recently used entries are evicted past max_entries"""
+        cache = RoutingCache(max_entries=2)
+        needs = [{"capabilities": ["code_gen"], "max_price": float(i)} for i in range(3)]
+        keys = [fingerprint_need(need) for need in needs]
+
+        cache.put(keys[0], needs[0], [])
+        cache.put(keys[1], needs[1], [])
+        cache.get(keys[0])
+        cache.put(keys[2], needs[2], [])
+
+        assert set(cache.entries) == {keys[0], keys[2]}
+
+    def test_invalidates_only_matching_entries(self, registry):
+        """A change drops entries whose capabilities the agent has"""
+        cache = RoutingCache()
+        registry.add_change_listener(cache.invalidate_manifest)
+
+        needs = {
+            "code": {"capabilities": ["code_gen"]},
+            "review": {"capabilities": ["code_gen", "review"]},
+            "data": {"capabilities": ["data"]},
+        }
+        for need in needs.values():
+            cache.put(fingerprint_need(need), need, [])
+
+        # Has code_gen only: cannot qualify for the code_gen+review NEED
+        registry.register(make_agent("new-coder", ["code_gen", "web"]))
+
+        remaining = set(cache.entries)
+        assert fingerprint_need(needs["code"]) not in remaining
+        assert fingerprint_need(needs["review"]) in remaining
+        assert fingerprint_need(needs["data"]) in remaining
+        assert cache.invalidations == 1
+
+    def test_reregister_uses_previous_capabilities(self, registry):
+        """An agent losing a capability invalidates NEEDs it used to match"""
+        cache = RoutingCache()
+        registry.add_change_listener(cache.invalidate_manifest)
+
+        need = {"capabilities": ["code_gen", "review"]}
+        cache.put(fingerprint_need(need), need, [])
+
+        registry.register(make_agent("reviewer", ["review"]))
+
+        assert len(cache) == 0
+
+    def test_unregister_invalidates(self, registry):
+        """Unregistering an agent drops NEEDs it matched"""
+        cache = RoutingCache()
+        registry.add_change_listener(cache.invalidate_manifest)
+
+        need = {"capabilities": ["data"]}
+        cache.put(fingerprint_need(need), need, [])
+
+        registry.unregister("analyst")
+
+        assert len(cache) == 0
+
+    def test_unconstrained_need_always_invalidated(self, registry):
+        """A NEED with no capabilities can match any agent"""
+        cache = RoutingCache()
+        registry.add_change_listener(cache.invalidate_manifest)
+
+        need = {"tags": ["python"]}
+        cache.put(fingerprint_need(need), need, [])
+
+        registry.register(make_agent("anyone", ["other"]))
+
+        assert len(cache) == 0
+
+
+class TestRouterCaching:
+    """Tests for cached shortlists in the router"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_need_hits_cache(self, router, monkeypatch):
+        """The second NEED of the same shape skips filtering and scoring"""
+        calls = []
+        filter_indexed = router.filter.filter_indexed
+        monkeypatch.setattr(
+            router.filter,
+            "filter_indexed",
+            lambda need, registry: calls.append(need) or filter_indexed(need, registry),
+        )
+
+        first = await router.route_need({"need_id": "n1", "capabilities": ["code_gen"]})
+        second = await router.route_need({"need_id": "n2", "capabilities": ["code_gen"]})
+
+        assert first == second
+        assert len(calls) == 1
+        assert router.metrics.get_cache_hit_rate() == 0.5
+        assert router.get_stats()["cache_stats"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_registration_refreshes_shortlist(self, router, registry):
+        """A newly registered agent is seen by the next routing"""
+        need = {"capabilities": ["review"], "max_price": 50.0}
+        assert await router.route_need(need) == "reviewer"
+
+        registry.unregister("reviewer")
+        registry.register(make_agent("cheap-reviewer", ["review"], price_per_task=1.0))
+
+        assert await router.route_need(need) == "cheap-reviewer"
+        assert router.metrics.get_cache_hit_rate() == 0.0
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled(self, registry):
+        """enable_cache=False routes every NEED from scratch"""
+        router = IntelligentRouter(
+            registry=registry,
+            metrics_collector=MetricsCollector(),
+            enable_canary=False,
+            enable_bandit=False,
+            enable_cache=False,
+        )
+
+        for _ in range(3):
+            await router.route_need({"capabilities": ["code_gen"]})
+
+        assert router.cache is None
+        assert router.metrics.get_cache_hit_rate() == 0.0
@@ -0,0 +1,265 @@
+"""
+Tests for Streaming Routing Metrics
+
+Tests the fixed-memory aggregates (decayed counters, time buckets, quantile
+sketch) and their use in MetricsCollector and FeedbackCollector.
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from routing.feedback import FeedbackCollector
+from routing.metrics import MetricsCollector, RoutingAggregate
+from routing.streaming import DecayedCounter, QuantileSketch, TimeBuckets
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("routing.metrics.time.time", lambda: now[0])
+    return now
+
+
+def record_routing(collector, clock, need_id, latency_ms, success=True):
+    metrics = collector.start_routing(need_id)
+    clock[0] += latency_ms / 1000.0
+    collector.complete_routing(metrics, "agent-a", "score", success=success)
+    return metrics
+
+
+class TestQuantileSketch:
+    """Tests for the log-bucketed quantile sketch"""
+
+    @pytest.mark.parametrize("q", [0.5, 0.95, 0.99])
+    def test_relative_error_bound(self, q):
+        """Quantiles are within the relative accuracy of the exact value"""
+        rng = np.random.default_rng(3)
+        values = rng.lognormal(mean=5.0, sigma=1.0, size=20_000)
+
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(float(value))
+
+        exact = float(np.quantile(values, q, method="lower"))
+        assert abs(sketch.quantile(q) - exact) <= 0.011 * exact
+
+    def test_merge_matches_single_sketch(self):
+        """Merging two sketches equals sketching all the values at once"""
+        rng = random.Random(7)
+        values = [rng.expovariate(1 / 200.0) for _ in range(2000)]
+
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for value in values:
+            whole.add(value)
+        for value in values[:700]:
+            left.add(value)
+        for value in values[700:]:
+            right.add(value)
+        left.merge(right)
+
+        assert left.count == whole.count
+        assert left.bins == whole.bins
+        assert left.quantiles() == whole.quantiles()
+
+    def test_merge_requires_same_accuracy(self):
+        """Sketches with different bin widths cannot be merged"""
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+    def test_bins_bounded(self):
+        """Collapsing keeps the bin count at max_bins"""
+        sketch = QuantileSketch(relative_accuracy=0.01, max_bins=64)
+        for exponent in range(-3, 9):
+            for mantissa in range(1, 10):
+                sketch.add(mantissa * 10.0**exponent)
+
+        assert len(sketch.bins) <= 64
+        assert sketch.count == 12 * 9
+        # Collapsing only loses accuracy at the low end
+        assert sketch.quantile(1.0) == pytest.approx(9e8, rel=0.01)
+
+    def test_zero_and_empty(self):
+        """Zeros are counted and an empty sketch reports 0.0"""
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) == 0.0
+
+        for _ in range(3):
+            sketch.add(0.0)
+        sketch.add(100.0)
+
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == pytest.approx(100.0)
+
+
+class TestDecayedCounter:
+    """Tests for exponentially decayed counters"""
+
+    def test_half_life(self):
+        """A contribution halves every half-life"""
+        counter = DecayedCounter(half_life_s=10.0)
+        counter.add(8.0, now=100.0)
+
+        assert counter.get(now=100.0) == 8.0
+        assert counter.get(now=110.0) == pytest.approx(4.0)
+        assert counter.get(now=130.0) == pytest.approx(1.0)
+
+    def test_accumulates(self):
+        """Later contributions add to the decayed value"""
+        counter = DecayedCounter(half_life_s=10.0)
+        counter.add(4.0, now=0.0)
+        counter.add(1.0, now=10.0)
+
+        assert counter.get(now=10.0) == pytest.approx(3.0)
+
+
+class TestTimeBuckets:
+    """Tests for the ring of time buckets"""
+
+    def test_window_selects_recent_buckets(self):
+        """Only buckets inside the window are returned"""
+        buckets = TimeBuckets(list, bucket_seconds=10.0, num_buckets=6)
+        for t in (5.0, 15.0, 25.0, 35.0):
+            buckets.bucket(t).append(t)
+
+        assert buckets.window(20.0, now=35.0) == [[25.0], [35.0]]
+        assert buckets.window(None, now=35.0) == [[5.0], [15.0], [25.0], [35.0]]
+
+    def test_slots_reused(self):
+        """Old buckets are overwritten once the ring wraps"""
+        buckets = TimeBuckets(list, bucket_seconds=1.0, num_buckets=4)
+        for t in range(100):
+            buckets.bucket(float(t)).append(t)
+
+        assert buckets.window(now=99.0) == [[96], [97], [98], [99]]
+        assert len(buckets._slots) == 4
+
+
+class TestMetricsCollector:
+    """Tests for fixed-memory routing metrics"""
+
+    def test_history_bounded(self, clock):
+        """Only history_size routings are kept, totals cover all of them"""
+        collector = MetricsCollector(history_size=50)
+        for i in range(500):
+            record_routing(collector, clock, f"need-{i}", latency_ms=10.0, success=i % 4 != 0)
+
+        assert len(collector.routing_history) == 50
+        stats = collector.get_stats()
+        assert stats["total_routings"] == 500
+        assert stats["success_rate"] == 0.75
+        assert stats["method_distribution"] == {"score": 500}
+
+    def test_recent_n(self, clock):
+        """recent_n rates use the most recent routings"""
+        collector = MetricsCollector()
+        for i in range(10):
+            record_routing(collector, clock, f"need-{i}", latency_ms=10.0, success=i >= 5)
+
+        assert collector.get_success_rate() == 0.5
+        assert collector.get_success_rate(recent_n=5) == 1.0
+        assert collector.get_success_rate(recent_n=0) == 0.0
+
+    def test_latency_percentiles(self, clock):
+        """p50/p95/p99 are reported from the sketch"""
+        collector = MetricsCollector()
+        for i in range(1, 101):
+            record_routing(collector, clock, f"need-{i}", latency_ms=float(i))
+
+        percentiles = collector.get_stats()["latency_percentiles_ms"]
+        assert percentiles["p50"] == pytest.approx(50.0, rel=0.02)
+        assert percentiles["p95"] == pytest.approx(95.0, rel=0.02)
+        assert percentiles["p99"] == pytest.approx(99.0, rel=0.02)
+        assert collector.get_avg_latency_ms() == pytest.approx(50.5)
+
+    def test_window(self, clock):
+        """Windowed stats merge only the recent time buckets"""
+        collector = MetricsCollector(bucket_seconds=60.0, num_buckets=10)
+
+        for minute in range(5):
+            clock[0] = 1200.0 + minute * 60.0
+            metrics = collector.start_routing(f"need-{minute}")
+            collector.complete_routing(metrics, "agent-a", "score", success=minute >= 3)
+
+        window = collector.get_window(120.0, now=clock[0])
+        assert isinstance(window, RoutingAggregate)
+        assert window.routings == 2
+        assert window.rate(window.successes) == 1.0
+        assert collector.get_window(now=clock[0]).routings == 5
+
+    def test_decayed_success_rate(self, clock):
+        """Recent routings outweigh old ones"""
+        collector = MetricsCollector(half_life_s=60.0)
+
+        for i in range(10):
+            metrics = collector.start_routing(f"old-{i}")
+            collector.complete_routing(metrics, "agent-a", "score", success=False)
+        clock[0] += 600.0
+        for i in range(10):
+            metrics = collector.start_routing(f"new-{i}")
+            collector.complete_routing(metrics, "agent-a", "score", success=True)
+
+        assert collector.get_success_rate() == 0.5
+        assert collector.get_decayed_success_rate(now=clock[0]) > 0.99
+
+    def test_clear(self, clock):
+        """clear resets totals and buckets"""
+        collector = MetricsCollector()
+        record_routing(collector, clock, "need-1", latency_ms=10.0)
+        collector.record_outcome("need-1", "agent-a", 0.9)
+        collector.clear()
+
+        stats = collector.get_stats()
+        assert stats["total_routings"] == 0
+        assert stats["total_outcomes"] == 0
+        assert stats["latency_percentiles_ms"]["p99"] == 0.0
+        assert collector.get_window().routings == 0
+
+
+class TestFeedbackAggregates:
+    """Tests for fixed-memory feedback aggregates"""
+
+    def test_history_bounded(self):
+        """Per-agent stats cover every entry, history keeps the last few"""
+        collector = FeedbackCollector(history_size=10)
+        for i in range(100):
+            collector.record_feedback(
+                task_id=f"task-{i}",
+                agent_id="agent-a",
+                reward=0.5,
+                task_result={"quality_score": 0.8, "latency_ms": float(i + 1)},
+            )
+
+        stats = collector.get_agent_stats("agent-a")
+        assert len(collector.feedback_history) == 10
+        assert stats["count"] == 100
+        assert stats["avg_reward"] == pytest.approx(0.5)
+        assert stats["avg_quality"] == pytest.approx(0.8)
+        assert stats["avg_latency_ms"] == pytest.approx(50.5)
+        assert stats["latency_p95_ms"] == pytest.approx(95.0, rel=0.02)
+        assert stats["decayed_avg_reward"] == pytest.approx(0.5)
+
+    def test_update_bandit_after_overflow(self):
+        """Only the retained entries reach the bandit after an overflow"""
+        collector = FeedbackCollector(history_size=5)
+        applied = []
+
+        class Bandit:
+            def update_batch(self, agent_ids, rewards, contexts):
+                applied.extend(agent_ids)
+
+        for i in range(3):
+            collector.record_feedback(f"t{i}", f"agent-{i}", 1.0, {})
+        assert collector.update_bandit(Bandit()) == 3
+
+        for i in range(3, 11):
+            collector.record_feedback(f"t{i}", f"agent-{i}", 1.0, {})
+        assert collector.update_bandit(Bandit()) == 5
+        assert applied[3:] == [f"agent-{i}" for i in range(6, 11)]
+        assert collector.update_bandit(Bandit()) == 0
@@ -4,11 +4,15 @@ Tests for Agent Scoring System
 Tests multi-factor scoring, diversity bonuses, top-K selection, and tie-breaking.
 """
 
+import math
 import pytest
+import random
 import sys
 from pathlib import Path
 import time
 
+import numpy as np
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
@@ -17,7 +21,6 @@ from routing.scoring import AgentScorer, ScoredAgent
 from routing.domain_fit import reset_domain_fit_calculator
 from routing.recency import reset_recency_weighter
 
-
 # Test Fixtures
 
 
@@ -236,6 +239,33 @@ class TestRecency:
         assert removed == 1
         assert "new-agent" in recency_weighter.last_activity
         assert "old-agent" not in recency_weighter.last_activity
+        assert "old-agent" not in recency_weighter.log_weights
+
+    def test_log_weights_match_exponential_decay(self, recency_weighter):
+        """Stored log-space weights give max_boost * exp(-λ * age)"""
+        current_time = time.time()
+        ages_hours = [0.5, 12.0, 30.0]
+        for i, age in enumerate(ages_hours):
+            recency_weighter.record_activity(f"agent-{i}", current_time - age * 3600)
+
+        decay_rate = math.log(2) / recency_weighter.half_life_hours
+        for i, age in enumerate(ages_hours):
+            expected = max(0.5, 1.5 * math.exp(-decay_rate * age))
+            weight = recency_weighter.get_recency_weight(f"agent-{i}", current_time)
+            assert weight == pytest.approx(expected)
+
+        # Stored weights rank agents by recency without the current time
+        log_weights = recency_weighter.log_weights
+        assert log_weights["agent-0"] > log_weights["agent-1"] > log_weights["agent-2"]
+
+        # The vectorized path agrees with the scalar one
+        scores = recency_weighter.get_recency_scores_from_log(
+            np.array([log_weights["agent-1"], -np.inf]), current_time
+        )
+        assert scores[0] == pytest.approx(
+            recency_weighter.get_recency_score("agent-1", current_time)
+        )
+        assert scores[1] == 0.0
 
 
 # Scoring Tests
@@ -499,5 +529,143 @@ class TestCompleteScoring:
         assert len(result) == 0
 
 
+# Vectorized Scoring Tests
+
+
+def random_agents(count, seed=3):
+    """Random manifests with overlapping tags, capabilities and zones"""
+    rng = random.Random(seed)
+    tags = ["python", "ml", "web", "nlp", "sql", "rust"]
+    capabilities = ["code_gen", "review", "data", "vision"]
+    return [
+        AgentManifest(
+            agent_id=f"agent-{i:04d}",
+            capabilities=rng.sample(capabilities, rng.randint(0, 3)),
+            io_schema={},
+            tags=rng.sample(tags, rng.randint(0, 4)),
+            success_rate=rng.choice([0.7, 0.8, 0.9]),
+            price_per_task=float(rng.randint(1, 80)),
+            avg_latency_ms=float(rng.randint(100, 6000)),
+            zone=rng.choice(["us-west-2", "us-east-1", "eu-west-1", None]),
+        )
+        for i in range(count)
+    ]
+
+
+class TestVectorizedScoring:
+    """Column-wise scoring matches the per-agent reference"""
+
+    NEEDS = [
+        {},
+        {"tags": ["python", "ml"], "capabilities": ["code_gen"], "max_price": 50.0},
+        {"tags": ["go"], "capabilities": ["code_gen", "vision", "unknown"]},
+        {"tags": ["sql"], "max_price": 0, "max_latency_ms": 1000.0},
+    ]
+
+    @pytest.fixture
+    def history(self, domain_fit_calc, recency_weighter, monkeypatch):
+        """Domain performance and activity for a subset of agents, at a fixed time"""
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+        for i in range(0, 300, 7):
+            domain_fit_calc.record_performance("ml", f"agent-{i:04d}", i % 2 == 0)
+            domain_fit_calc.record_performance("sql", f"agent-{i:04d}", True)
+            recency_weighter.record_activity(f"agent-{i:04d}", now - i * 600)
+
+    @pytest.mark.parametrize("need_index", range(len(NEEDS)))
+    def test_columns_match_score_agent(self, scorer, history, need_index):
+        """Every component and total equals score_agent"""
+        agents = random_agents(300)
+        need = self.NEEDS[need_index]
+        context = {"agent_stakes": {"agent-0001": 500.0, "agent-0002": 5000.0}}
+
+        columns = scorer.score_columns(agents, need, context)
+        for i, agent in enumerate(agents):
+            reference = scorer.score_agent(agent, need, context)
+            for factor, score in reference.score_breakdown.items():
+                assert columns[factor][i] == pytest.approx(score, abs=1e-12)
+            assert columns["total"][i] == pytest.approx(reference.total_score, abs=1e-12)
+
+    @pytest.mark.parametrize("k", [1, 5, 10, 300, 400])
+    def test_selection_matches_scalar(self, domain_fit_calc, recency_weighter, history, k):
+        """Vectorized score_and_select picks the same agents in the same order"""
+        agents = random_agents(300)
+        need = self.NEEDS[1]
+        vector = AgentScorer(
+            domain_fit_calculator=domain_fit_calc, recency_weighter=recency_weighter
+        )
+        scalar = AgentScorer(
+            domain_fit_calculator=domain_fit_calc,
+            recency_weighter=recency_weighter,
+            vectorized=False,
+        )
+
+        expected = scalar.score_and_select(agents, need, k=k, diversity_bonus=0.1)
+        result = vector.score_and_select(agents, need, k=k, diversity_bonus=0.1)
+
+        assert [s.manifest.agent_id for s in result] == [s.manifest.agent_id for s in expected]
+        for got, want in zip(result, expected):
+            assert got.total_score == pytest.approx(want.total_score, abs=1e-12)
+            assert got.score_breakdown.keys() == want.score_breakdown.keys()
+
+    def test_many_matches_score_and_select(self, scorer, history, monkeypatch):
+        """Batch scoring gives each NEED the shortlist score_and_select would"""
+        monkeypatch.setattr("routing.scoring.NEED_BLOCK", 3)
+        agents = random_agents(300)
+        rng = random.Random(11)
+        needs = self.NEEDS * 2
+        candidate_lists = [rng.sample(agents, rng.randint(0, 120)) for _ in needs]
+        context = {"agent_stakes": {"agent-0001": 500.0, "agent-0002": 5000.0}}
+
+        batch = scorer.score_and_select_many(candidate_lists, needs, k=10, context=context)
+
+        assert len(batch) == len(needs)
+        for candidates, need, result in zip(candidate_lists, needs, batch):
+            expected = scorer.score_and_select(candidates, need, k=10, context=context)
+            assert [s.manifest.agent_id for s in result] == [s.manifest.agent_id for s in expected]
+            for got, want in zip(result, expected):
+                assert got.total_score == want.total_score
+                assert got.score_breakdown == want.score_breakdown
+
+    def test_ties_broken_by_agent_id(self, scorer):
+        """Agents tied at the Kth score are ordered by agent_id"""
+        agents = [
+            AgentManifest(agent_id=f"agent-{c}", capabilities=["x"], io_schema={}) for c in "dcbae"
+        ]
+
+        top = scorer.score_and_select(agents, {}, k=3, diversity_bonus=0)
+
+        assert [s.manifest.agent_id for s in top] == ["agent-a", "agent-b", "agent-c"]
+
+    def test_new_manifest_refreshes_row(self, scorer):
+        """Re-registered agents are re-read from their new manifest"""
+        old = AgentManifest(agent_id="a", capabilities=[], io_schema={}, price_per_task=90.0)
+        new = AgentManifest(agent_id="a", capabilities=[], io_schema={}, price_per_task=10.0)
+        need = {"max_price": 100.0}
+
+        scorer.score_columns([old], need)
+        columns = scorer.score_columns([new], need)
+
+        assert columns["price"][0] == pytest.approx(0.9)
+        assert len(scorer.table) == 1
+
+    def test_wide_vocabulary(self, scorer):
+        """Bitsets widen past one machine word of tags"""
+        tags = [f"tag-{i}" for i in range(150)]
+        agents = [
+            AgentManifest(agent_id=f"agent-{i}", capabilities=[], io_schema={}, tags=tags[i:])
+            for i in range(0, 150, 10)
+        ]
+        need = {"tags": tags[100:130]}
+
+        columns = scorer.score_columns(agents, need)
+
+        for i, agent in enumerate(agents):
+            reference = scorer.score_agent(agent, need)
+            assert columns["domain_fit"][i] == pytest.approx(
+                reference.score_breakdown["domain_fit"]
+            )
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
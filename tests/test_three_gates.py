@@ -9,6 +9,8 @@ Tests the three enforcement points:
 
 import pytest
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import patch
 
@@ -153,14 +155,44 @@ class TestIngressGate:
         with patch.object(
             gate_enforcer.wasm_runtime, "evaluate", return_value=mock_result
         ) as mock_eval:
-            with patch.object(gate_enforcer.gas_meter, "reset") as mock_reset:
-                with patch.object(gate_enforcer.gas_meter, "used", 100, create=True):
-                    gate_enforcer.ingress_validate(sample_envelope)
+            gate_enforcer.ingress_validate(sample_envelope)
 
-        # Verify gas meter was reset
-        mock_reset.assert_called_once()
-        # Verify WASM evaluation was called
+        # Verify WASM evaluation was called with a fresh meter at the gate's limit
         assert mock_eval.call_count == 1
+        meter = mock_eval.call_args.kwargs["gas_meter"]
+        assert meter is not gate_enforcer.gas_meter
+        assert meter.used == 0
+        assert meter.limit == gate_enforcer.gas_meter.limit
+
+    def test_ingress_reports_metered_gas(self, gate_enforcer, sample_envelope):
+        """Gas comes from the policy interpreter, charged per evaluation"""
+        decision = gate_enforcer.ingress_validate(sample_envelope)
+        batch = gate_enforcer.ingress_validate_batch([sample_envelope])
+
+        assert decision.gas_used > 0
+        assert gate_enforcer.gas_meter.used == 0
+        assert batch[0].gas_used == decision.gas_used
+
+    def test_concurrent_evaluations_meter_separately(self, gate_enforcer, sample_envelope):
+        """Evaluations in flight on several threads never share a meter"""
+        expected = gate_enforcer.ingress_validate(sample_envelope).gas_used
+        evaluate = gate_enforcer.wasm_runtime.evaluate
+        in_flight = threading.Barrier(8)
+        meters = []
+
+        def held_evaluate(policy_input, gas_meter=None):
+            meters.append(gas_meter)
+            in_flight.wait(timeout=5)
+            return evaluate(policy_input, gas_meter=gas_meter)
+
+        with patch.object(gate_enforcer.wasm_runtime, "evaluate", side_effect=held_evaluate):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                decisions = list(
+                    pool.map(lambda _: gate_enforcer.ingress_validate(sample_envelope), range(8))
+                )
+
+        assert len({id(m) for m in meters}) == 8
+        assert [d.gas_used for d in decisions] == [expected] * 8
 
 
 class TestCommitGate:
@@ -4,11 +4,13 @@ Unit tests for Verb Dispatcher and NEED Handler.
 Tests:
 - Dispatcher registration
 - Envelope routing
+- Concurrent dispatch with per-thread ordering
 - NEED handler task creation
 """
 
 import sys
 import os
+import asyncio
 import tempfile
 from pathlib import Path
 
@@ -124,6 +126,133 @@ class TestDispatcherDispatch:
         assert results["handler_b"] is True
 
 
+class TestConcurrentDispatch:
+    """Test submit(): concurrent across threads, ordered within a thread"""
+
+    @staticmethod
+    def _recording_dispatcher(log, max_concurrency=8, delays=None):
+        dispatcher = VerbDispatcher(max_concurrency=max_concurrency)
+
+        async def handler(envelope):
+            log.append(("start", envelope["thread_id"], envelope["n"]))
+            await asyncio.sleep((delays or {}).get(envelope["thread_id"], 0))
+            log.append(("end", envelope["thread_id"], envelope["n"]))
+
+        dispatcher.register("WORK", handler)
+        return dispatcher
+
+    @pytest.mark.asyncio
+    async def test_slow_thread_does_not_block_others(self):
+        log = []
+        dispatcher = self._recording_dispatcher(log, delays={"A": 0.1})
+
+        slow = dispatcher.submit({"kind": "WORK", "thread_id": "A", "n": 0})
+        fast = dispatcher.submit({"kind": "WORK", "thread_id": "B", "n": 0})
+
+        assert await fast is True
+        assert not slow.done()
+        assert await slow is True
+
+    @pytest.mark.asyncio
+    async def test_per_thread_order(self):
+        log = []
+        dispatcher = self._recording_dispatcher(log, delays={"A": 0.003, "B": 0.001})
+
+        for n in range(10):
+            for thread in ("A", "B", "C"):
+                dispatcher.submit({"kind": "WORK", "thread_id": thread, "n": n})
+        await dispatcher.join()
+
+        for thread in ("A", "B", "C"):
+            events = [(event, n) for event, t, n in log if t == thread]
+            # Strictly one at a time, in submission order
+            assert events == [(event, n) for n in range(10) for event in ("start", "end")]
+        assert dispatcher.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_max_concurrency(self):
+        running = 0
+        peak = 0
+        dispatcher = VerbDispatcher(max_concurrency=3)
+
+        async def handler(envelope):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+
+        dispatcher.register("WORK", handler)
+        await asyncio.gather(
+            *[dispatcher.submit({"kind": "WORK", "thread_id": f"t{i}"}) for i in range(10)]
+        )
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_threads_take_turns(self):
+        """A thread with a backlog does not starve one that arrives later"""
+        log = []
+        dispatcher = self._recording_dispatcher(log, max_concurrency=1)
+
+        for n in range(5):
+            dispatcher.submit({"kind": "WORK", "thread_id": "busy", "n": n})
+        dispatcher.submit({"kind": "WORK", "thread_id": "quiet", "n": 0})
+        await dispatcher.join()
+
+        starts = [(t, n) for event, t, n in log if event == "start"]
+        assert starts.index(("quiet", 0)) == 1
+
+    @pytest.mark.asyncio
+    async def test_handler_error_resolves_future(self):
+        dispatcher = VerbDispatcher()
+
+        async def broken(envelope):
+            raise RuntimeError("boom")
+
+        dispatcher.register("BROKEN", broken)
+        failed = dispatcher.submit({"kind": "BROKEN", "thread_id": "A"})
+        after = dispatcher.submit({"kind": "NOPE", "thread_id": "A"})
+
+        with pytest.raises(RuntimeError):
+            await failed
+        assert await after is False
+
+    @pytest.mark.asyncio
+    async def test_cancelled_worker_releases_thread(self):
+        """Cancelling a worker mid-handler cancels the thread's queue and frees it"""
+        dispatcher = VerbDispatcher(max_concurrency=1)
+        started = asyncio.Event()
+
+        async def hang(envelope):
+            started.set()
+            await asyncio.Event().wait()
+
+        async def work(envelope):
+            pass
+
+        dispatcher.register("HANG", hang)
+        dispatcher.register("WORK", work)
+        running = dispatcher.submit({"kind": "HANG", "thread_id": "A"})
+        queued = dispatcher.submit({"kind": "WORK", "thread_id": "A"})
+        other = dispatcher.submit({"kind": "WORK", "thread_id": "B"})
+        await started.wait()
+
+        for worker in list(dispatcher._workers):
+            worker.cancel()
+        await dispatcher.join()
+
+        assert running.cancelled()
+        assert queued.cancelled()
+        assert not other.done()
+        assert dispatcher.pending() == 1
+
+        # The thread accepts new work, and the other thread's envelope runs
+        assert await dispatcher.submit({"kind": "WORK", "thread_id": "A"}) is True
+        assert await other is True
+        assert dispatcher.pending() == 0
+
+
 class TestNeedHandler:
     """Test NEED handler task creation"""
 
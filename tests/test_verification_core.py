@@ -174,6 +174,45 @@ class TestOutputMismatch:
         assert not result.is_valid  # Challenge invalid (output matches)
 
 
+class TestArtifactVerification:
+    """Test zero-copy artifact hashing and decoding"""
+
+    def test_hash_over_mmap_view(self, tmp_path):
+        """Memory-mapped artifacts hash to their content address"""
+        from cas_core import FileCAS
+
+        store = FileCAS(tmp_path)
+        h = store.put(b'{"result": "ok"}' * 1000)
+        verifier = ChallengeVerifier()
+
+        result = verifier.verify_artifact_hash(store.get_view(h), h)
+        assert result.is_valid
+        assert result.evidence["size"] == 16000
+
+    def test_hash_over_chunks(self, tmp_path):
+        """Chunked iteration produces the same hash"""
+        from cas_core import FileCAS
+
+        store = FileCAS(tmp_path)
+        data = os.urandom(10 * 4096 + 5)
+        h = store.put(data)
+        verifier = ChallengeVerifier()
+
+        assert verifier.verify_artifact_hash(store.iter_chunks(h, chunk_size=4096), h).is_valid
+        assert not verifier.verify_artifact_hash(data[:-1], h).is_valid
+
+    def test_slice_and_decode_without_copy(self):
+        """Slices share memory with the artifact and decode as JSON"""
+        artifact = bytearray(b'{"a": 1}{"b": 2}')
+        verifier = ChallengeVerifier()
+
+        second = verifier.artifact_slice(artifact, 8)
+        assert verifier.load_artifact_json(second) == {"b": 2}
+
+        artifact[14] = ord("3")
+        assert verifier.load_artifact_json(second) == {"b": 3}
+
+
 class TestChallengeQueue:
     """Test challenge queue management"""
 
@@ -0,0 +1,92 @@
+"""
+Tests for label vocabulary interning and bitset algebra.
+"""
+
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest
+
+from vocabulary import (
+    Vocabulary,
+    from_bytes,
+    get_vocabulary,
+    is_subset,
+    jaccard,
+    overlap,
+    popcount,
+    reset_vocabulary,
+    to_bytes,
+)
+
+
+class TestVocabulary:
+    """Test label interning"""
+
+    def test_stable_positions(self):
+        vocab = Vocabulary(["python", "ml"])
+
+        assert vocab.intern("python") == 0
+        assert vocab.intern("rust") == 2
+        assert vocab.id("ml") == 1
+        assert vocab.id("go") is None
+        assert vocab.labels == ["python", "ml", "rust"]
+
+    def test_encode_decode(self):
+        vocab = Vocabulary()
+        mask = vocab.encode(["b", "a", "b", "c"])
+
+        assert popcount(mask) == 3
+        assert vocab.decode(mask) == ["b", "a", "c"]
+
+    def test_encode_known_does_not_intern(self):
+        vocab = Vocabulary(["a", "b"])
+
+        mask, unknown = vocab.encode_known(["a", "x", "x", "y"])
+
+        assert mask == vocab.encode(["a"])
+        assert unknown == 2
+        assert len(vocab) == 2
+
+    def test_global_vocabulary(self):
+        reset_vocabulary()
+        vocab = get_vocabulary()
+        vocab.intern("shared")
+
+        assert get_vocabulary() is vocab
+        reset_vocabulary()
+        assert "shared" not in get_vocabulary()
+
+
+class TestBitsetAlgebra:
+    """Test set operations on bitsets"""
+
+    @pytest.fixture
+    def vocab(self):
+        # Wider than one machine word
+        return Vocabulary(f"label-{i}" for i in range(200))
+
+    def test_subset(self, vocab):
+        required = vocab.encode(["label-3", "label-150"])
+        provided = vocab.encode(["label-3", "label-150", "label-199"])
+
+        assert is_subset(required, provided)
+        assert not is_subset(provided, required)
+        assert is_subset(0, provided)
+
+    def test_overlap_and_jaccard(self, vocab):
+        a = vocab.encode(["label-1", "label-70", "label-130"])
+        b = vocab.encode(["label-70", "label-130", "label-190", "label-2"])
+
+        assert overlap(a, b) == 2
+        assert jaccard(a, b) == pytest.approx(2 / 5)
+        assert jaccard(0, 0) == 0.0
+
+    def test_bytes_round_trip(self, vocab):
+        mask = vocab.encode(["label-0", "label-64", "label-199"])
+
+        assert from_bytes(to_bytes(mask)) == mask
+        assert from_bytes(to_bytes(0)) == 0
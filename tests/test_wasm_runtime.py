@@ -156,6 +156,35 @@ class TestGasLimitExceeded:
         assert meter.used == 0
         assert meter.operations == 0
 
+    def test_runtime_charges_given_meter(self):
+        """Gas from the interpreter lands on the caller's meter"""
+        runtime = WASMRuntime()
+        meter = GasMeter(gas_limit=100000)
+        meter.consume(100)
+
+        envelope = {"kind": "NEED", "thread_id": "t", "lamport": 1, "actor_id": "a"}
+        result = runtime.evaluate(envelope, gas_meter=meter)
+
+        assert result.gas_used > 0
+        assert meter.used == 100 + result.gas_used
+
+    def test_gas_depends_on_policy_work(self):
+        """Denials that evaluate deny_reason cost more than allows"""
+        runtime = WASMRuntime()
+        envelope = {
+            "kind": "NEED",
+            "thread_id": "t",
+            "lamport": 1,
+            "actor_id": "a",
+            "payload_size": 10,
+        }
+
+        allowed = runtime.evaluate(envelope)
+        denied = runtime.evaluate({**envelope, "kind": "BOGUS"})
+
+        assert allowed.allowed and not denied.allowed
+        assert denied.gas_used > allowed.gas_used
+
 
 class TestPolicyHashStability:
     """Test policy hash for integrity"""
@@ -3,9 +3,12 @@
 IPFS Migration Tool
 
 Migrates content from FileCAS to IPFS with hash-to-CID mapping and verification.
+Uploads and verification fetches run as concurrent batches over the async,
+connection-pooled IPFS client.
 """
 
 import sys
+import asyncio
 import json
 import logging
 import argparse
@@ -16,8 +19,8 @@ from datetime import datetime
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from cas.ipfs_store import IPFSContentStore
-from cas_core import FileCAS, sha256_hash
+from cas.async_ipfs_store import AsyncIPFSContentStore
+from cas_core import FileCAS, MANIFEST_SUFFIX, sha256_hash
 
 logging.basicConfig(
     level=logging.INFO,
@@ -26,23 +29,75 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class _BlockingIPFSStore:
+    """Synchronous facade over AsyncIPFSContentStore for the CLI and tests"""
+    
+    def __init__(self, store: AsyncIPFSContentStore, loop: asyncio.AbstractEventLoop):
+        self._store = store
+        self._loop = loop
+    
+    def put(self, data: bytes) -> str:
+        return self._loop.run_until_complete(self._store.put(data))
+    
+    def get(self, cid: str) -> bytes:
+        return self._loop.run_until_complete(self._store.get(cid))
+    
+    def exists(self, cid: str) -> bool:
+        return self._loop.run_until_complete(self._store.exists(cid))
+    
+    def close(self):
+        self._loop.run_until_complete(self._store.close())
+
+
 class IPFSMigration:
     """
     Handles migration of content from FileCAS to IPFS.
     
     Provides scanning, migration, mapping creation, and verification.
+    Artifacts are uploaded and verified in batches of ``batch_size``, each
+    batch running concurrently over at most ``max_concurrency`` pooled
+    keep-alive connections.
     """
     
-    def __init__(self, ipfs_host: str = "127.0.0.1", ipfs_port: int = 5001):
+    def __init__(
+        self,
+        ipfs_host: str = "127.0.0.1",
+        ipfs_port: int = 5001,
+        max_concurrency: int = 16,
+        batch_size: int = 64,
+        timeout: float = 30.0
+    ):
         """
         Initialize migration tool.
         
         Args:
             ipfs_host: IPFS API host
             ipfs_port: IPFS API port
+            max_concurrency: Maximum in-flight requests to the daemon
+            batch_size: Artifacts read into memory and uploaded per batch
+            timeout: Per-request timeout in seconds
+            
+        Raises:
+            ConnectionError: If the IPFS daemon is not reachable
         """
-        self.ipfs_store = IPFSContentStore(ipfs_host, ipfs_port, auto_pin=True)
-        logger.info(f"IPFS migration tool initialized")
+        self.batch_size = batch_size
+        self._loop = asyncio.new_event_loop()
+        self._store = AsyncIPFSContentStore(
+            ipfs_host,
+            ipfs_port,
+            auto_pin=True,
+            max_connections=max_concurrency,
+            timeout=timeout
+        )
+        
+        try:
+            self._loop.run_until_complete(self._store.connect())
+        except ConnectionError:
+            self._loop.close()
+            raise
+        
+        self.ipfs_store = _BlockingIPFSStore(self._store, self._loop)
+        logger.info(f"IPFS migration tool initialized (concurrency: {max_concurrency})")
     
     def scan_file_cas(self, cas_dir: Path) -> List[Tuple[str, Path]]:
         """
@@ -65,8 +120,13 @@ class IPFSMigration:
         # Walk the CAS directory
         for file_path in cas_dir.rglob('*'):
             if file_path.is_file():
-                # The filename should be the hash
+                # The filename should be the hash (chunked artifacts are
+                # stored as <hash>.manifest and reassembled on migration).
+                # Chunk blobs are migrated too: a chunk and a standalone put
+                # of the same bytes are the same file, so they can't be told apart
                 file_hash = file_path.name
+                if file_hash.endswith(MANIFEST_SUFFIX):
+                    file_hash = file_hash[: -len(MANIFEST_SUFFIX)]
                 
                 # Verify it's a valid hash (64 char hex string for SHA256)
                 if len(file_hash) == 64 and all(c in '0123456789abcdef' for c in file_hash):
@@ -101,38 +161,11 @@ class IPFSMigration:
             logger.warning("No artifacts found to migrate")
             return {}
         
-        mappings = {}
-        success_count = 0
-        error_count = 0
-        
-        for file_hash, file_path in artifacts:
-            try:
-                # Read content
-                content = file_path.read_bytes()
-                
-                # Verify hash matches if requested
-                if verify_hash:
-                    computed_hash = sha256_hash(content)
-                    if computed_hash != file_hash:
-                        logger.error(
-                            f"Hash mismatch for {file_path}: "
-                            f"expected {file_hash}, got {computed_hash}"
-                        )
-                        error_count += 1
-                        continue
-                
-                # Add to IPFS
-                cid = self.ipfs_store.put(content)
-                
-                # Store mapping
-                mappings[file_hash] = cid
-                success_count += 1
-                
-                logger.info(f"Migrated {file_hash} → {cid} ({len(content)} bytes)")
-                
-            except Exception as e:
-                logger.error(f"Failed to migrate {file_hash}: {e}")
-                error_count += 1
+        mappings = self._loop.run_until_complete(
+            self._migrate_async(cas_dir, artifacts, verify_hash)
+        )
+        success_count = len(mappings)
+        error_count = len(artifacts) - success_count
         
         logger.info(
             f"Migration complete: {success_count} successful, "
@@ -141,6 +174,65 @@ class IPFSMigration:
         
         return mappings
     
+    def _read_artifact(
+        self,
+        cas_dir: Path,
+        file_hash: str,
+        file_path: Path,
+        verify_hash: bool
+    ) -> Optional[bytes]:
+        """Read one artifact from FileCAS, returning None if it fails verification"""
+        if file_path.name.endswith(MANIFEST_SUFFIX):
+            content = FileCAS(cas_dir).get(file_hash)
+        else:
+            content = file_path.read_bytes()
+        
+        # Verify hash matches if requested
+        if verify_hash:
+            computed_hash = sha256_hash(content)
+            if computed_hash != file_hash:
+                logger.error(
+                    f"Hash mismatch for {file_path}: "
+                    f"expected {file_hash}, got {computed_hash}"
+                )
+                return None
+        
+        return content
+    
+    async def _migrate_async(
+        self,
+        cas_dir: Path,
+        artifacts: List[Tuple[str, Path]],
+        verify_hash: bool
+    ) -> Dict[str, str]:
+        """Upload artifacts batch by batch with concurrent put_many calls"""
+        mappings = {}
+        
+        for start in range(0, len(artifacts), self.batch_size):
+            batch_hashes = []
+            batch_content = []
+            
+            for file_hash, file_path in artifacts[start:start + self.batch_size]:
+                try:
+                    content = self._read_artifact(cas_dir, file_hash, file_path, verify_hash)
+                except Exception as e:
+                    logger.error(f"Failed to read {file_hash}: {e}")
+                    continue
+                if content is not None:
+                    batch_hashes.append(file_hash)
+                    batch_content.append(content)
+            
+            cids = await self._store.put_many(batch_content, return_exceptions=True)
+            
+            for file_hash, content, cid in zip(batch_hashes, batch_content, cids):
+                if isinstance(cid, Exception):
+                    logger.error(f"Failed to migrate {file_hash}: {cid}")
+                    continue
+                mappings[file_hash] = cid
+                logger.info(f"Migrated {file_hash} → {cid} ({len(content)} bytes)")
+        
+        return mappings
+    
     def create_mapping_file(
         self,
         mappings: Dict[str, str],
@@ -216,23 +308,46 @@ class IPFSMigration:
         # Load mappings
         mappings = self.load_mapping_file(mapping_file)
         
-        verified_count = 0
-        error_count = 0
-        
         # Load FileCAS if provided
         file_cas = FileCAS(cas_dir) if cas_dir else None
         
-        for old_hash, cid in mappings.items():
-            try:
-                # Check if content exists in IPFS
-                if not self.ipfs_store.exists(cid):
-                    logger.error(f"Content not found in IPFS: {cid} (hash: {old_hash})")
+        verified_count, error_count = self._loop.run_until_complete(
+            self._verify_async(mappings, file_cas)
+        )
+        
+        logger.info(
+            f"Verification complete: {verified_count} verified, "
+            f"{error_count} errors out of {len(mappings)} total"
+        )
+        
+        return verified_count, error_count
+    
+    async def _verify_async(
+        self,
+        mappings: Dict[str, str],
+        file_cas: Optional[FileCAS]
+    ) -> Tuple[int, int]:
+        """Fetch mapped CIDs batch by batch and check them against their hashes"""
+        verified_count = 0
+        error_count = 0
+        items = list(mappings.items())
+        
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            fetched = await self._store.get_many(
+                [cid for _, cid in batch], return_exceptions=True
+            )
+            
+            for old_hash, cid in batch:
+                ipfs_content = fetched[cid]
+                
+                if isinstance(ipfs_content, Exception):
+                    logger.error(
+                        f"Content not found in IPFS: {cid} (hash: {old_hash}): {ipfs_content}"
+                    )
                     error_count += 1
                     continue
                 
-                # Retrieve from IPFS
-                ipfs_content = self.ipfs_store.get(cid)
-                
                 # Verify hash of IPFS content
                 computed_hash = sha256_hash(ipfs_content)
                 if computed_hash != old_hash:
@@ -256,22 +371,16 @@ class IPFSMigration:
                 
                 verified_count += 1
                 logger.debug(f"Verified {old_hash} → {cid}")
-                
-            except Exception as e:
-                logger.error(f"Verification failed for {old_hash} → {cid}: {e}")
-                error_count += 1
-        
-        logger.info(
-            f"Verification complete: {verified_count} verified, "
-            f"{error_count} errors out of {len(mappings)} total"
-        )
         
         return verified_count, error_count
     
     def close(self):
-        """Close IPFS connection"""
+        """Close IPFS connections"""
         if self.ipfs_store:
             self.ipfs_store.close()
+            self.ipfs_store = None
+        if not self._loop.is_closed():
+            self._loop.close()
 
 
 def main():
@@ -308,6 +417,13 @@ def main():
         help='IPFS API port (default: 5001)'
     )
     
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=16,
+        help='Maximum concurrent requests to the IPFS daemon (default: 16)'
+    )
+    
     parser.add_argument(
         '--verify',
         action='store_true',
@@ -340,7 +456,9 @@ def main():
     
     try:
         # Initialize migration tool
-        migration = IPFSMigration(args.ipfs_host, args.ipfs_port)
+        migration = IPFSMigration(
+            args.ipfs_host, args.ipfs_port, max_concurrency=args.concurrency
+        )
         
         # Verify-only mode
         if args.verify_only: